@@ -0,0 +1,130 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Callback for logging the memory cache statistics for train, val, and test phases."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from lightning import Callback, LightningModule, Trainer
+
+from otx.core.data.mem_cache import MEM_CACHE_ENTRY_KINDS
+
+if TYPE_CHECKING:
+    from otx.core.data.mem_cache import MemCacheHandlerBase
+
+
+class MemCacheStatsLogger(Callback):
+    """Callback for logging the memory cache statistics for train, val, and test phases.
+
+    The statistics of the memory cache handler are cumulative and aggregated over all DataLoader workers.
+    This logs their increments during every epoch, e.g., `train/mem_cache_hit_rate`.
+    The increments during the validation in the middle of a training epoch are excluded from the training ones.
+
+    The statistics are the ones of the images looked up by the dataset. The other kinds of the entries,
+    e.g., the label maps or the lookups of the prefetcher, only log their hit rate if they are looked up,
+    e.g., `train/mem_cache_prefetch_hit_rate`.
+    """
+
+    def __init__(self, prog_bar: bool = False) -> None:
+        super().__init__()
+        self.prog_bar = prog_bar
+
+        self._start_stats: dict[str, dict[str, float]] = {}
+        self._epoch_stats: dict[str, dict[str, float]] = {}
+
+    @staticmethod
+    def _get_handler(trainer: Trainer) -> MemCacheHandlerBase | None:
+        datamodule = getattr(trainer, "datamodule", None)
+        handler = getattr(datamodule, "mem_cache_handler", None)
+        if handler is None or (handler.mem_size == 0 and handler.disk_cache is None):
+            return None
+        return handler
+
+    @staticmethod
+    def _get_stats(handler: MemCacheHandlerBase) -> dict[str, float]:
+        stats = {
+            f"{kind}/{key}": value
+            for kind, kind_stats in handler.stats_by_kind.items()
+            for key, value in kind_stats.items()
+        }
+        stats["frozen"] = float(handler.frozen)
+        return stats
+
+    def _pause(self, phase: str, stats: dict[str, float]) -> None:
+        if (start_stats := self._start_stats.pop(phase, None)) is None:
+            return
+        epoch_stats = self._epoch_stats.setdefault(phase, {})
+        for key, value in stats.items():
+            epoch_stats[key] = epoch_stats.get(key, 0.0) + value - start_stats[key]
+
+    def _on_epoch_start(self, trainer: Trainer, phase: str) -> None:
+        if (handler := self._get_handler(trainer)) is None:
+            return
+
+        stats = self._get_stats(handler)
+        # Validation can run in the middle of a training epoch
+        self._pause("train", stats)
+        self._epoch_stats[phase] = {}
+        self._start_stats[phase] = stats
+
+    def _on_epoch_end(self, trainer: Trainer, pl_module: LightningModule, phase: str) -> None:
+        if (handler := self._get_handler(trainer)) is None:
+            return
+
+        stats = self._get_stats(handler)
+        self._pause(phase, stats)
+        if (epoch_stats := self._epoch_stats.pop(phase, None)) is None:
+            return
+        if "train" in self._epoch_stats:
+            self._start_stats["train"] = stats
+
+        values = {
+            "hit_rate": self._get_hit_rate(epoch_stats, "image"),
+            **{
+                key: epoch_stats[f"image/{key}"]
+                for key in ("hits", "misses", "disk_hits", "hit_bytes", "inserts", "rejects")
+            },
+            "frozen": stats["frozen"],
+        }
+        for kind in MEM_CACHE_ENTRY_KINDS[1:]:
+            if epoch_stats[f"{kind}/hits"] + epoch_stats[f"{kind}/misses"] > 0:
+                values[f"{kind}_hit_rate"] = self._get_hit_rate(epoch_stats, kind)
+        for key, value in values.items():
+            pl_module.log(
+                name=f"{phase}/mem_cache_{key}",
+                value=value,
+                prog_bar=self.prog_bar and key == "hit_rate",
+                on_step=False,
+                on_epoch=True,
+            )
+
+    @staticmethod
+    def _get_hit_rate(stats: dict[str, float], kind: str) -> float:
+        num_lookups = stats[f"{kind}/hits"] + stats[f"{kind}/misses"]
+        return stats[f"{kind}/hits"] / num_lookups if num_lookups > 0 else 0.0
+
+    def on_train_epoch_start(self, trainer: Trainer, pl_module: LightningModule) -> None:
+        """Take a snapshot of the statistics before every train epoch starts."""
+        self._on_epoch_start(trainer, "train")
+
+    def on_train_epoch_end(self, trainer: Trainer, pl_module: LightningModule) -> None:
+        """Log the statistics of the train epoch."""
+        self._on_epoch_end(trainer, pl_module, "train")
+
+    def on_validation_epoch_start(self, trainer: Trainer, pl_module: LightningModule) -> None:
+        """Take a snapshot of the statistics before every validation epoch starts."""
+        self._on_epoch_start(trainer, "validation")
+
+    def on_validation_epoch_end(self, trainer: Trainer, pl_module: LightningModule) -> None:
+        """Log the statistics of the validation epoch."""
+        self._on_epoch_end(trainer, pl_module, "validation")
+
+    def on_test_epoch_start(self, trainer: Trainer, pl_module: LightningModule) -> None:
+        """Take a snapshot of the statistics before every test epoch starts."""
+        self._on_epoch_start(trainer, "test")
+
+    def on_test_epoch_end(self, trainer: Trainer, pl_module: LightningModule) -> None:
+        """Log the statistics of the test epoch."""
+        self._on_epoch_end(trainer, pl_module, "test")
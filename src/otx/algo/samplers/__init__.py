@@ -3,6 +3,7 @@
 
 """Custom samplers for the OTX2.0."""
 
+from .aspect_ratio_bucket_sampler import AspectRatioBucketSampler
 from .balanced_sampler import BalancedSampler
 
-__all__ = ["BalancedSampler"]
+__all__ = ["AspectRatioBucketSampler", "BalancedSampler"]
@@ -0,0 +1,177 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Aspect ratio bucketing sampler for the datasets of differently shaped images."""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+import numpy as np
+import torch
+from torch import distributed
+from torch.utils.data import DistributedSampler, RandomSampler, Sampler
+
+from otx.core.config.data import SamplerConfig
+from otx.core.utils.instantiators import instantiate_sampler
+
+if TYPE_CHECKING:
+    from otx.core.data.dataset.base import OTXDataset
+
+
+class AspectRatioBucketSampler(DistributedSampler):
+    """Sampler grouping the images of similar aspect ratio and size into the same batch.
+
+    The indices drawn by the given sampler (e.g., `BalancedSampler` or `ClassIncrementalSampler`) are
+    grouped into the buckets by the aspect ratio bin and the size class of their images,
+    which are taken from the annotation index of the dataset without decoding the images.
+    Every `batch_size` consecutive indices of a bucket make a batch and the batches are shuffled.
+    The remaining indices of the buckets are merged in the order of the aspect ratio into the mixed batches,
+    so that every batch except the last one has `batch_size` indices and
+    the DataLoader with the same `batch_size` yields exactly these batches.
+    If the pipeline resizes the images keeping the ratio and pads them to a size divisor,
+    the images of a batch have the same shape, so that they are stacked without any padding.
+
+    It is a `DistributedSampler`, so that Lightning does not wrap it with another distributed sampler
+    which would break the batches. Instead, it distributes the whole batches across the replicas
+    if the given sampler is not distributed yet. In this case, the generator of the given sampler is seeded
+    with `seed + epoch` on every epoch, so that every replica draws the same indices.
+
+    Args:
+        dataset (OTXDataset): A built-up dataset.
+        batch_size (int): Batch size of the DataLoader.
+        sampler (dict | Sampler | None): Sampler drawing the indices, or its configuration
+            with `class_path` and `init_args` as `SamplerConfig`. If None, the indices are shuffled.
+        aspect_ratio_step (float): Relative width of the aspect ratio bins.
+            The aspect ratios r1 < r2 are in the same bin only if r2 / r1 < 1 + aspect_ratio_step.
+        size_thresholds (Sequence[int]): Thresholds of the longer side of the images to split them into size classes.
+        num_replicas (int | None): Number of processes participating in distributed training.
+            By default, it is retrieved from the current distributed group.
+        rank (int | None): Rank of the current process within `num_replicas`.
+            By default, it is retrieved from the current distributed group.
+        seed (int): Random seed to draw the indices and shuffle the batches. It must be identical across all processes.
+    """
+
+    def __init__(
+        self,
+        dataset: OTXDataset,
+        batch_size: int,
+        sampler: dict[str, Any] | Sampler | None = None,
+        aspect_ratio_step: float = 0.05,
+        size_thresholds: Sequence[int] = (512, 1024, 2048),
+        num_replicas: int | None = None,
+        rank: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.generator: torch.Generator | None = None
+        if sampler is None:
+            self.generator = torch.Generator()
+            sampler = RandomSampler(dataset, generator=self.generator)
+        elif isinstance(sampler, dict):
+            sampler = instantiate_sampler(SamplerConfig(**sampler), dataset=dataset, batch_size=batch_size)
+
+        if isinstance(sampler, DistributedSampler) or getattr(sampler, "num_replicas", 1) > 1:
+            # The given sampler already draws the indices of this replica
+            num_replicas, rank = 1, 0
+        elif distributed.is_available() and distributed.is_initialized():
+            num_replicas = distributed.get_world_size() if num_replicas is None else num_replicas
+            rank = distributed.get_rank() if rank is None else rank
+        super().__init__(dataset, num_replicas=num_replicas or 1, rank=rank or 0, shuffle=True, seed=seed)  # type: ignore[arg-type]
+
+        # Every replica should draw the same indices from the given sampler, e.g., `BalancedSampler`,
+        # before taking its share of the batches
+        if self.generator is None and self.num_replicas > 1 and hasattr(sampler, "generator"):
+            if sampler.generator is None:
+                sampler.generator = torch.Generator()
+            self.generator = sampler.generator
+
+        self.sampler = sampler
+        self.batch_size = batch_size
+        self.aspect_ratio_step = aspect_ratio_step
+        self.size_thresholds = list(size_thresholds)
+        self.bucket_ids = self._get_bucket_ids(dataset)
+
+        num_batches = math.ceil(len(sampler) / batch_size)  # type: ignore[arg-type]
+        if self.num_replicas > 1:
+            self.num_batches = math.ceil(num_batches / self.num_replicas)
+            self.num_samples = self.num_batches * batch_size
+        else:
+            self.num_batches = num_batches
+            self.num_samples = len(sampler)  # type: ignore[arg-type]
+        self.total_size = self.num_samples * self.num_replicas
+
+    def _get_bucket_ids(self, dataset: OTXDataset) -> np.ndarray:
+        """Get the bucket id of each item. The buckets of the adjacent ids have the similar aspect ratios."""
+        if dataset.annotation_index is not None:
+            image_sizes = dataset.annotation_index.image_sizes
+        else:
+            image_sizes = np.array(
+                [item.media.size if getattr(item.media, "has_size", False) else (-1, -1) for item in dataset.dm_subset],
+                dtype=np.int64,
+            ).reshape(-1, 2)
+
+        heights, widths = image_sizes[:, 0].astype(np.float64), image_sizes[:, 1].astype(np.float64)
+        known = (heights > 0) & (widths > 0)
+        num_size_classes = len(self.size_thresholds) + 1
+        keys = np.full(len(image_sizes), np.iinfo(np.int64).max, dtype=np.int64)
+        if known.any():
+            aspect_ratio_bins = np.floor(
+                np.log(widths[known] / heights[known]) / np.log1p(self.aspect_ratio_step),
+            ).astype(np.int64)
+            size_classes = np.searchsorted(
+                self.size_thresholds,
+                np.maximum(heights[known], widths[known]),
+                side="right",
+            )
+            keys[known] = aspect_ratio_bins * num_size_classes + size_classes
+        # The images of unknown size are in the last bucket
+        return np.unique(keys, return_inverse=True)[1].reshape(-1)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iter."""
+        if self.generator is not None:
+            self.generator.manual_seed(self.seed + self.epoch)
+        indices = np.array([int(index) for index in self.sampler], dtype=np.int64)
+        if len(indices) == 0:
+            return iter([])
+
+        # Group the indices by the bucket while keeping the order drawn by the sampler
+        order = np.argsort(self.bucket_ids[indices], kind="stable")
+        grouped, buckets = indices[order], self.bucket_ids[indices[order]]
+        bucket_starts = np.flatnonzero(np.diff(buckets)) + 1
+
+        batches: list[np.ndarray] = []
+        leftovers: list[np.ndarray] = []
+        for group in np.split(grouped, bucket_starts):
+            num_full = len(group) // self.batch_size * self.batch_size
+            batches.extend(group[:num_full].reshape(-1, self.batch_size))
+            leftovers.append(group[num_full:])
+        remains = np.concatenate(leftovers)
+        num_full = len(remains) // self.batch_size * self.batch_size
+        batches.extend(remains[:num_full].reshape(-1, self.batch_size))
+
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        batches = [batches[i] for i in torch.randperm(len(batches), generator=generator).tolist()]
+        if num_full < len(remains):
+            batches.append(remains[num_full:])
+
+        if self.num_replicas > 1:
+            # Fill the last batch and repeat the batches to make them evenly divisible
+            batches[-1] = np.resize(batches[-1], self.batch_size)
+            num_batches = self.num_batches * self.num_replicas
+            batches = [batches[i % len(batches)] for i in range(num_batches)]
+            batches = batches[self.rank : num_batches : self.num_replicas]
+
+        return iter(np.concatenate(batches).tolist())
+
+    def __len__(self) -> int:
+        """Return length of selected samples."""
+        return self.num_samples
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch of the given sampler as well."""
+        super().set_epoch(epoch)
+        if hasattr(self.sampler, "set_epoch"):
+            self.sampler.set_epoch(epoch)
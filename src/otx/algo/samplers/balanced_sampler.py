@@ -61,7 +61,11 @@ class BalancedSampler(Sampler):
         super().__init__(dataset)
 
         # img_indices: dict[label: list[idx]]
-        ann_stats = get_idx_list_per_classes(dataset.dm_subset)
+        ann_stats = (
+            get_idx_list_per_classes(dataset.dm_subset)
+            if dataset.annotation_index is None
+            else dataset.annotation_index.get_idx_list_per_classes()
+        )
         self.img_indices = {k: torch.tensor(v, dtype=torch.int64) for k, v in ann_stats.items() if len(v) > 0}
         self.num_cls = len(self.img_indices.keys())
         self.data_length = len(self.dataset)
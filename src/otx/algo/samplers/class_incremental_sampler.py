@@ -65,7 +65,11 @@ class ClassIncrementalSampler(Sampler):
         super().__init__(dataset)
 
         # Need to split new classes dataset indices & old classses dataset indices
-        ann_stats = get_idx_list_per_classes(dataset.dm_subset, True)
+        ann_stats = (
+            get_idx_list_per_classes(dataset.dm_subset, True)
+            if dataset.annotation_index is None
+            else dataset.annotation_index.get_idx_list_per_classes(True)
+        )
         new_indices, old_indices = [], []
         for cls in new_classes:
             new_indices.extend(ann_stats[cls])
@@ -29,7 +29,14 @@ class SubsetConfig:
             Otherwise, it takes a Python dictionary that fits the configuration style used in mmcv
             (`TransformLibType.MMCV`, `TransformLibType.MMPRETRAIN`, ...).
         transform_lib_type (TransformLibType): Transform library type used by this subset.
+        batch_transforms (list[dict[str, Any] | BatchTransform] | Compose): List of the transforms applied on
+            the collated batch in the dataloader workers after `transforms`, e.g., `BatchRandomFlip`
+            and `BatchNormalize` in `otx.core.data.transform_libs.batch`. They process the stacked image tensor
+            of the batch at once instead of each image. If empty, there is no batch-level stage.
         num_workers (int): Number of workers for the dataloader of this subset.
+        prefetch_depth (int): Number of the next indices in the sampler order whose images are decoded
+            into the memory cache ahead by each worker. If 0, read-ahead is disabled.
+        prefetch_num_threads (int): Number of the threads per worker to decode the images ahead.
 
     Example:
         ```python
@@ -58,8 +65,11 @@ class SubsetConfig:
     transforms: list[dict[str, Any]]
 
     transform_lib_type: TransformLibType = TransformLibType.TORCHVISION
+    batch_transforms: list[dict[str, Any]] = field(default_factory=list)
     num_workers: int = 2
     sampler: SamplerConfig = field(default_factory=lambda: SamplerConfig())
+    prefetch_depth: int = 0
+    prefetch_num_threads: int = 4
 
 
 @dataclass
@@ -74,6 +84,9 @@ class TileConfig:
     max_num_instances: int = 1500
     object_tile_ratio: float = 0.03
     sampling_ratio: float = 1.0
+    # Number of tiles in each inference micro-batch. The tiles of all images in a batch are
+    # flattened across the images and split into micro-batches of this size. If None, the batch size is used.
+    inference_batch_size: Optional[int] = None
 
 
 @dataclass
@@ -100,8 +113,18 @@ class DataModuleConfig:
 
     mem_cache_size: str = "1GB"
     mem_cache_img_max_size: Optional[tuple[int, int]] = None
+    mem_cache_eviction_policy: str = "freeze"
+    mem_cache_codec: str = "none"
+    mem_cache_codec_quality: int = 95
+    mem_cache_transform_outputs: bool = False
+    disk_cache_dir: Optional[str] = None
+    dataset_cache_dir: Optional[str] = None
+    persist_annotation_index: bool = False
+    persist_dataset_snapshot: bool = False
     image_color_channel: ImageColorChannel = ImageColorChannel.RGB
     stack_images: bool = True
+    defer_normalization: bool = False
+    pack_batches: bool = False
 
     include_polygons: bool = False
     unannotated_items_ratio: float = 0.0
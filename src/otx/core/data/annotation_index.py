@@ -0,0 +1,260 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Columnar index of the items and annotations of a dataset subset."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass, fields
+from pathlib import Path
+from stat import S_ISREG
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import numpy as np
+from datumaro import Bbox, Polygon
+from datumaro.components.annotation import AnnotationType, LabelCategories
+from datumaro.plugins.data_formats.video import VIDEO_EXTENSIONS
+from datumaro.util.image import IMAGE_EXTENSIONS
+
+from otx.core.data.media_meta import MediaMetaCache
+
+if TYPE_CHECKING:
+    from datumaro import Dataset as DmDataset
+    from datumaro import DatasetSubset
+
+logger = logging.getLogger()
+
+__all__ = ["AnnotationIndex", "compute_dataset_hash", "get_dataset_cache_dir", "save_npz"]
+
+# Formats taking the items and the labels from the directory structure of the media files
+_FOLDER_FORMAT_PREFIXES = ("imagenet", "image_dir", "mvtec", "common_semantic_segmentation")
+# Names of the directories storing the masks as image files
+_MASK_DIR_NAMES = frozenset(("masks", "ground_truth", "SegmentationClass", "SegmentationObject"))
+
+
+@dataclass
+class AnnotationIndex:
+    """Columnar index of the items and annotations of a dataset subset.
+
+    It is built by a single pass over the subset, so that the consumers which need
+    the item ids, the image sizes or the labels of all items (e.g., `OTXDataset`, the samplers
+    and the adaptive tiling) do not iterate the whole subset again.
+    The annotations of the i-th item are located in `[ann_offsets[i], ann_offsets[i + 1])`.
+
+    Attributes:
+        item_ids: Item ids in the order of the subset.
+        image_sizes: (height, width) of each image probed from the file header (see `MediaMetaCache`).
+            It is -1 if it is unknown without decoding the image.
+        ann_offsets: Offsets of the annotations of each item. Its length is the number of the items + 1.
+        ann_types: `AnnotationType` of each annotation.
+        ann_labels: Label id of each annotation. It is -1 if the annotation has no label.
+        boxes: Bounding box (x1, y1, x2, y2) of each bounding box or polygon annotation. NaN for the others.
+        areas: Area of each bounding box or polygon (shoelace formula) annotation. Zero for the others.
+        label_names: Label names of the subset.
+    """
+
+    # Bump it if the layout is changed to invalidate the persisted indices
+    VERSION: ClassVar[int] = 2
+
+    item_ids: np.ndarray
+    image_sizes: np.ndarray
+    ann_offsets: np.ndarray
+    ann_types: np.ndarray
+    ann_labels: np.ndarray
+    boxes: np.ndarray
+    areas: np.ndarray
+    label_names: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    @property
+    def ann_items(self) -> np.ndarray:
+        """Item index of each annotation."""
+        return np.repeat(np.arange(len(self)), np.diff(self.ann_offsets))
+
+    @classmethod
+    def build(cls, dm_subset: DatasetSubset | DmDataset) -> AnnotationIndex:
+        """Build the index by iterating the given subset once."""
+        item_ids: list[str] = []
+        image_sizes: list[tuple[int, int]] = []
+        ann_offsets = [0]
+        ann_types: list[int] = []
+        ann_labels: list[int] = []
+        boxes: list[tuple[float, float, float, float]] = []
+        areas: list[float] = []
+        nan_box = (np.nan, np.nan, np.nan, np.nan)
+        media_meta = MediaMetaCache.current()
+
+        for item in dm_subset:
+            item_ids.append(item.id)
+            image_sizes.append(media_meta.get_image_size(item.media) or (-1, -1))
+
+            for ann in item.annotations:
+                ann_types.append(ann.type.value)
+                label = getattr(ann, "label", None)
+                ann_labels.append(label if label is not None else -1)
+                if isinstance(ann, (Bbox, Polygon)):
+                    x, y, w, h = ann.get_bbox()
+                    boxes.append((x, y, x + w, y + h))
+                    areas.append(w * h if isinstance(ann, Bbox) else _polygon_area(ann.points))
+                else:
+                    boxes.append(nan_box)
+                    areas.append(0.0)
+            ann_offsets.append(len(ann_types))
+
+        labels = dm_subset.categories().get(AnnotationType.label, LabelCategories())
+        return cls(
+            item_ids=np.array(item_ids, dtype=str),
+            image_sizes=np.array(image_sizes, dtype=np.int64).reshape(-1, 2),
+            ann_offsets=np.array(ann_offsets, dtype=np.int64),
+            ann_types=np.array(ann_types, dtype=np.int8),
+            ann_labels=np.array(ann_labels, dtype=np.int64),
+            boxes=np.array(boxes, dtype=np.float32).reshape(-1, 4),
+            areas=np.array(areas, dtype=np.float32),
+            label_names=np.array([label.name for label in labels.items], dtype=str),
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Save the index to the given `.npz` file atomically."""
+        save_npz(path, version=self.VERSION, **{f.name: getattr(self, f.name) for f in fields(self)})
+
+    @classmethod
+    def load(cls, path: str | Path) -> AnnotationIndex | None:
+        """Load the index from the given `.npz` file. Return None if it does not exist or is outdated."""
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                if int(npz["version"]) != cls.VERSION:
+                    return None
+                return cls(**{f.name: npz[f.name] for f in fields(cls)})
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @classmethod
+    def load_or_build(
+        cls,
+        dm_subset: DatasetSubset | DmDataset,
+        cache_dir: str | Path | None = None,
+        key: str | None = None,
+    ) -> AnnotationIndex:
+        """Load the persisted index of the subset or build and persist a new one.
+
+        Args:
+            dm_subset: Datumaro subset to index.
+            cache_dir: Directory to persist the index. If None, the index is not persisted.
+            key: Content hash of the dataset (see `compute_dataset_hash()`). If None, the index is not persisted.
+        """
+        if cache_dir is None or key is None:
+            return cls.build(dm_subset)
+
+        path = Path(cache_dir) / f"{key}_{getattr(dm_subset, 'name', 'default')}.npz"
+        if (index := cls.load(path)) is not None and len(index) == len(dm_subset):
+            logger.info(f"Load the annotation index from {path}.")
+            return index
+
+        index = cls.build(dm_subset)
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"Cannot store the annotation index in {cache_dir}: {e}")
+        return index
+
+    def get_idx_list_per_classes(self, use_string_label: bool = False) -> dict[Any, list[int]]:
+        """Get the item indices per label in the same way as `otx.core.utils.utils.get_idx_list_per_classes`.
+
+        An item index appears as many times as the number of its annotations of the label.
+        """
+        ann_items = self.ann_items
+        labels, first = np.unique(self.ann_labels, return_index=True)
+        # Sort the labels in the order of their first appearance
+        labels = labels[np.argsort(first)]
+        order = np.argsort(self.ann_labels, kind="stable")
+        sorted_labels = self.ann_labels[order]
+
+        stats: dict[Any, list[int]] = defaultdict(list)
+        for label in labels.tolist():
+            if label < 0 and use_string_label:
+                continue
+            start, end = np.searchsorted(sorted_labels, [label, label + 1])
+            key = (self.label_names[label].item() if use_string_label else label) if label >= 0 else None
+            stats[key] = ann_items[order[start:end]].tolist()
+        return stats
+
+
+def save_npz(path: str | Path, **arrays: Any) -> None:  # noqa: ANN401
+    """Save the arrays to the given `.npz` file atomically, so that the concurrent readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as fp:
+        tmp_path = Path(fp.name)
+        try:
+            np.savez(fp, **arrays)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    tmp_path.replace(path)
+
+
+def _polygon_area(points: list[float]) -> float:
+    xs, ys = np.asarray(points[0::2], dtype=np.float64), np.asarray(points[1::2], dtype=np.float64)
+    return float(0.5 * abs(np.dot(xs, np.roll(ys, 1)) - np.dot(ys, np.roll(xs, 1))))
+
+
+def compute_dataset_hash(data_root: str | Path, data_format: str, *args: Any) -> str:  # noqa: ANN401
+    """Compute the content hash of the dataset from the annotation files in the data root and the given arguments.
+
+    Every annotation file is hashed by its path, size and modification time without reading its contents,
+    so that the hash changes if any annotation file is added, removed or modified.
+    The image and video files are not stat-ed, since the items are defined by the annotation files.
+    The mask image files are hashed as the annotation files.
+    For the formats taking the items and the labels from the directory structure, e.g., ImageNet,
+    the paths of the media files are hashed as well, so that the hash changes if any media file is added or removed.
+    """
+    data_root = Path(data_root).resolve()
+    hasher = hashlib.blake2b(repr((AnnotationIndex.VERSION, data_format, args)).encode(), digest_size=16)
+    if data_root.is_file():
+        _update_file_hash(hasher, data_root, data_root.parent)
+        return hasher.hexdigest()
+
+    list_media = data_format.startswith(_FOLDER_FORMAT_PREFIXES)
+    for dir_path, dir_names, file_names in os.walk(data_root):
+        dir_names.sort()
+        is_mask_dir = Path(dir_path).name in _MASK_DIR_NAMES
+        for file_name in sorted(file_names):
+            path = Path(dir_path) / file_name
+            suffix = path.suffix.lower()
+            if is_mask_dir or not (suffix in IMAGE_EXTENSIONS or suffix[1:] in VIDEO_EXTENSIONS):
+                _update_file_hash(hasher, path, data_root.parent)
+            elif list_media:
+                hasher.update(os.fspath(path.relative_to(data_root.parent)).encode())
+    return hasher.hexdigest()
+
+
+def _update_file_hash(hasher: Any, path: Path, root: Path) -> None:  # noqa: ANN401
+    stat = path.stat()
+    if S_ISREG(stat.st_mode):
+        hasher.update(repr((os.fspath(path.relative_to(root)), stat.st_size, stat.st_mtime_ns)).encode())
+
+
+def get_dataset_cache_dir(data_root: str | Path, cache_root: str | Path | None = None) -> Path:
+    """Get the directory storing the caches derived from the files in the data root.
+
+    The caches are never written into the data root, since the dataset formats with the subset directories
+    would take any extra directory there as a subset. Each data root gets its own subdirectory of the cache root.
+
+    Args:
+        data_root: Root of the dataset.
+        cache_root: Root directory of the dataset caches.
+            If None, `otx/datasets` under `$XDG_CACHE_HOME` or `~/.cache` is used.
+    """
+    if cache_root is None:
+        cache_root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "otx" / "datasets"
+
+    data_root = Path(data_root).resolve()
+    digest = hashlib.blake2b(os.fspath(data_root).encode(), digest_size=8).hexdigest()
+    return Path(cache_root) / f"{data_root.name}-{digest}"
@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import Callable
+from typing import Any, Callable
 
 import torch
 from datumaro import Label
@@ -14,10 +14,18 @@ from datumaro import Label
 from otx.core.data.dataset.base import OTXDataset
 from otx.core.data.entity.action_classification import ActionClsBatchDataEntity, ActionClsDataEntity
 from otx.core.data.entity.base import ImageInfo
+from otx.core.data.video import VideoFrameCache
 
 
 class OTXActionClsDataset(OTXDataset[ActionClsDataEntity]):
-    """OTXDataset class for action classification task."""
+    """OTXDataset class for action classification task.
+
+    The frames decoded by `DecodeVideo` are cached in `mem_cache_handler` (see `VideoFrameCache`).
+    """
+
+    def __init__(self, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(**kwargs)
+        VideoFrameCache(self.mem_cache_handler, self.mem_cache_img_max_size).bind(self.transforms)
 
     def _get_item_impl(self, idx: int) -> ActionClsDataEntity | None:
         item = self.dm_subset.get(id=self.ids[idx], subset=self.dm_subset.name)
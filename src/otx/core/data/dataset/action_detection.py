@@ -5,10 +5,13 @@
 
 from __future__ import annotations
 
+import logging as log
 import pickle
+import tempfile
+from dataclasses import dataclass, fields
 from functools import partial
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
 
 import numpy as np
 import torch
@@ -19,14 +22,117 @@ from torchvision import tv_tensors
 from otx.core.data.dataset.base import OTXDataset
 from otx.core.data.entity.action_detection import ActionDetBatchDataEntity, ActionDetDataEntity
 from otx.core.data.entity.base import ImageInfo
+from otx.core.data.video import VideoFrameCache
+
+
+@dataclass
+class ProposalIndex:
+    """Proposals of the frames of an AVA proposal file in a compact form.
+
+    The proposal file is a pickled dictionary of numpy arrays keyed by `video,frame`.
+    Its entries are concatenated into a few arrays, so that it is unpickled only once per subset and
+    the data loader workers share its pages instead of touching the reference counts of many small objects.
+    If stored by `save()`, it is loaded as memory-mapped arrays shared by the processes and the next runs.
+    The proposals of the i-th key are located in `boxes[offsets[i]:offsets[i + 1]]`.
+
+    Attributes:
+        keys: Sorted `video,frame` keys.
+        offsets: Offsets of the proposals of each key. Its length is the number of the keys + 1.
+        boxes: Proposal boxes (x1, y1, x2, y2) concatenated in the order of the keys.
+    """
+
+    keys: np.ndarray
+    offsets: np.ndarray
+    boxes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_dict(cls, proposals: dict[str, np.ndarray]) -> ProposalIndex:
+        """Build the index from the dictionary of the proposal file."""
+        keys = sorted(proposals)
+        arrays = [np.asarray(proposals[key])[:, :4] for key in keys]
+        return cls(
+            keys=np.array(keys, dtype=str),
+            offsets=np.cumsum([0] + [len(array) for array in arrays], dtype=np.int64),
+            boxes=np.concatenate(arrays) if arrays else np.zeros((0, 4), dtype=np.float64),
+        )
+
+    @classmethod
+    def load_or_build(cls, proposal_file: Path, cache_dir: Path | None = None) -> ProposalIndex:
+        """Load the stored index of the proposal file or build and store a new one.
+
+        Args:
+            proposal_file: Pickled proposal file.
+            cache_dir: Directory to store the index. It should be unique to the dataset contents.
+                If None, the index is not stored.
+        """
+        if cache_dir is not None and (index := cls.load(cache_dir, proposal_file.stem)) is not None:
+            return index
+
+        with proposal_file.open("rb") as f:
+            index = cls.from_dict(pickle.load(f))  # noqa: S301
+        if cache_dir is not None:
+            try:
+                index.save(cache_dir, proposal_file.stem)
+            except OSError as e:
+                log.warning(f"Cannot store the proposal index in {cache_dir}: {e}")
+        return index
+
+    def save(self, cache_dir: Path, name: str) -> None:
+        """Save the arrays to `.npy` files atomically."""
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for field in fields(self):
+            with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as fp:
+                tmp_path = Path(fp.name)
+                try:
+                    np.save(fp, getattr(self, field.name), allow_pickle=False)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+            tmp_path.replace(cache_dir / f"{name}_{field.name}.npy")
+
+    @classmethod
+    def load(cls, cache_dir: Path, name: str) -> ProposalIndex | None:
+        """Load the memory-mapped arrays. Return None if any of them does not exist."""
+        try:
+            return cls(
+                **{
+                    field.name: np.load(cache_dir / f"{name}_{field.name}.npy", mmap_mode="r", allow_pickle=False)
+                    for field in fields(cls)
+                },
+            )
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str) -> np.ndarray | None:
+        """Get a copy of the proposals of the given `video,frame` key. Return None if there is no such key."""
+        i = int(np.searchsorted(self.keys, key))
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        return np.array(self.boxes[self.offsets[i] : self.offsets[i + 1]])
 
 
 class OTXActionDetDataset(OTXDataset[ActionDetDataEntity]):
-    """OTXDataset class for action detection task."""
+    """OTXDataset class for action detection task.
+
+    The proposal file of the subset is loaded into `ProposalIndex` only once when the dataset is created.
+    The frames decoded by `RawFrameDecode` are cached in `mem_cache_handler` (see `VideoFrameCache`).
 
-    def __init__(self, **kwargs) -> None:
+    Args:
+        proposal_dir: Directory to store the proposal index. It should be unique to the dataset contents.
+            If None, the proposal index is not stored on the disk.
+    """
+
+    def __init__(self, proposal_dir: str | Path | None = None, **kwargs: Any) -> None:  # noqa: ANN401
         super().__init__(**kwargs)
         self.num_classes = len(self.dm_subset.categories()[AnnotationType.label])
+        VideoFrameCache(self.mem_cache_handler, self.mem_cache_img_max_size).bind(self.transforms)
+        self.proposal_dir = Path(proposal_dir) if proposal_dir is not None else None
+        self.proposal_index = self._load_proposal_index(
+            self.dm_subset.infos().get(f"{self.dm_subset.name}_proposals", None),
+        )
 
     def _get_item_impl(self, idx: int) -> ActionDetDataEntity | None:
         item = self.dm_subset.get(id=self.ids[idx], subset=self.dm_subset.name)
@@ -66,9 +172,20 @@ class OTXActionDetDataset(OTXDataset[ActionDetDataEntity]):
 
         return self._apply_transforms(entity)
 
+    def _load_proposal_index(self, proposal_file: str | None) -> ProposalIndex | None:
+        """Load the proposal file of the subset. Return None if there is no proposal file."""
+        if proposal_file is None or len(self.ids) == 0:
+            return None
+
+        item = self.dm_subset.get(id=self.ids[0], subset=self.dm_subset.name)
+        proposal_file_path = self._get_annotation_dir(item.media.path) / "annotations" / proposal_file
+        if not proposal_file_path.exists():
+            return None
+        return ProposalIndex.load_or_build(proposal_file_path, self.proposal_dir)
+
     @staticmethod
-    def _get_proposals(frame_path: str, proposal_file: str | None) -> np.ndarray:
-        """Get proposal from frame path and proposal file name.
+    def _get_annotation_dir(frame_path: str) -> Path:
+        """Get the data root from the frame path.
 
         Datumaro AVA dataset expect data structure as
         - data_root/
@@ -82,20 +199,15 @@ class OTXActionDetDataset(OTXDataset[ActionDetDataEntity]):
                 - train.pkl
                 - val.pkl
         """
-        if proposal_file is None:
-            return np.array([[0, 0, 1, 1]], dtype=np.float64)
+        return Path(frame_path).parent.parent.parent
 
-        annotation_dir = Path(frame_path).parent.parent.parent
-        proposal_file_path = annotation_dir / "annotations" / proposal_file
-        if not proposal_file_path.exists():
+    def _get_proposals(self, frame_path: str, proposal_file: str | None) -> np.ndarray:
+        """Get proposal from frame path and proposal file name."""
+        if proposal_file is None or self.proposal_index is None:
             return np.array([[0, 0, 1, 1]], dtype=np.float64)
-        with Path.open(proposal_file_path, "rb") as f:
-            info = pickle.load(f)  # noqa: S301
-            return (
-                info[",".join(Path(frame_path).stem.rsplit("_", 1))][:, :4]
-                if ",".join(Path(frame_path).stem.rsplit("_", 1)) in info
-                else np.array([[0, 0, 1, 1]], dtype=np.float32)
-            )
+
+        proposals = self.proposal_index.get(",".join(Path(frame_path).stem.rsplit("_", 1)))
+        return proposals if proposals is not None else np.array([[0, 0, 1, 1]], dtype=np.float32)
 
     @property
     def collate_fn(self) -> Callable:
@@ -14,6 +14,7 @@ from datumaro import DatasetSubset, Image
 from torchvision import io
 from torchvision.tv_tensors import BoundingBoxes, BoundingBoxFormat, Mask
 
+from otx.core.data.annotation_index import AnnotationIndex
 from otx.core.data.dataset.base import OTXDataset, Transforms
 from otx.core.data.entity.anomaly import (
     AnomalyClassificationDataBatch,
@@ -42,6 +43,8 @@ class AnomalyDataset(OTXDataset):
         max_refetch: int = 1000,
         image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
         stack_images: bool = True,
+        num_deterministic_transforms: int = 0,
+        annotation_index: AnnotationIndex | None = None,
     ) -> None:
         self.task_type = task_type
         super().__init__(
@@ -52,6 +55,8 @@ class AnomalyDataset(OTXDataset):
             max_refetch,
             image_color_channel,
             stack_images,
+            num_deterministic_transforms,
+            annotation_index,
         )
 
     def _get_item_impl(
@@ -4,20 +4,25 @@
 """Base class for OTXDataset."""
 from __future__ import annotations
 
+import hashlib
+import pickle
+import time
 from abc import abstractmethod
 from collections.abc import Iterable
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Callable, Generic, Iterator, List, Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generic, Iterator, List, Union
 
 import cv2
 import numpy as np
 from datumaro.components.annotation import AnnotationType
-from datumaro.components.media import ImageFromFile
+from datumaro.components.media import ImageFromFile, RoIImageFromFile
 from datumaro.util.image import _IMAGE_BACKEND, _IMAGE_BACKENDS, IMAGE_COLOR_SCALE, ImageColorScale
 from torch.utils.data import Dataset
 from torchvision.transforms.v2 import Compose
 
 from otx.core.data.entity.base import T_OTXDataEntity
+from otx.core.data.media_meta import MediaMetaCache
 from otx.core.data.mem_cache import NULL_MEM_CACHE_HANDLER
 from otx.core.types.image import ImageColorChannel
 from otx.core.types.label import LabelInfo
@@ -25,7 +30,9 @@ from otx.core.types.label import LabelInfo
 if TYPE_CHECKING:
     from datumaro import DatasetSubset, Image
 
+    from otx.core.data.annotation_index import AnnotationIndex
     from otx.core.data.mem_cache import MemCacheHandlerBase
+    from otx.core.data.prefetch import ImagePrefetcher
 
 Transforms = Union[Compose, Callable, List[Callable]]
 
@@ -62,9 +69,23 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         max_refetch: Maximum number of images to fetch in cache
         image_color_channel: Color channel of images
         stack_images: Whether or not to stack images in collate function in OTXBatchData entity.
-
+        num_deterministic_transforms: Number of the leading transforms whose outputs only depend on their inputs.
+            Their outputs are cached by `mem_cache_handler` so that only the remaining transforms
+            are applied on every access to the data, without loading the image again.
+            If 0, the outputs of the transforms are not cached.
+        annotation_index: Columnar index of `dm_subset`. If given, the item ids are taken from it
+            instead of iterating `dm_subset` and it is shared with the samplers.
+
+    Attributes:
+        prefetcher: If set, the images of the next indices in the sampler order are decoded into
+            `mem_cache_handler` on its threads whenever an item is fetched. See `PrefetchSampler`.
+        has_random_item_construction: Whether `_get_item_impl()` itself is random, e.g., samples the prompts.
+            If True, the outputs of the transforms are never cached regardless of `num_deterministic_transforms`,
+            since the cached outputs would replay the random choices of the first access on every epoch.
     """
 
+    has_random_item_construction: ClassVar[bool] = False
+
     def __init__(
         self,
         dm_subset: DatasetSubset,
@@ -74,27 +95,65 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         max_refetch: int = 1000,
         image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
         stack_images: bool = True,
+        num_deterministic_transforms: int = 0,
+        annotation_index: AnnotationIndex | None = None,
     ) -> None:
         self.dm_subset = dm_subset
-        self.ids = [item.id for item in dm_subset]
+        self.annotation_index = annotation_index
+        self.ids = (
+            annotation_index.item_ids.tolist() if annotation_index is not None else [item.id for item in dm_subset]
+        )
         self.transforms = transforms
         self.mem_cache_handler = mem_cache_handler
         self.mem_cache_img_max_size = mem_cache_img_max_size
         self.max_refetch = max_refetch
         self.image_color_channel = image_color_channel
         self.stack_images = stack_images
+        self.num_deterministic_transforms = 0 if self.has_random_item_construction else num_deterministic_transforms
+        # Index of the item being fetched by `_fetch_item()`, which keys its cached transform outputs
+        self._fetch_index: int | None = None
+        self.prefetcher: ImagePrefetcher | None = None
         self.label_info = LabelInfo.from_dm_label_groups(self.dm_subset.categories()[AnnotationType.label])
 
     def __len__(self) -> int:
         return len(self.ids)
 
+    @cached_property
+    def _cache_id(self) -> str:
+        """Identify the entries of this dataset among the ones of other datasets sharing the memory cache.
+
+        It is derived from the subset and its items, so that the processes building the same dataset,
+        e.g., the DDP ranks attached to the memory pool of the node, share the entries.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self.dm_subset.name, len(self.ids))).encode())
+        for item_id in self.ids:
+            digest.update(f"{item_id}\0".encode())
+        return digest.hexdigest()
+
+    @cached_property
+    def _transform_cache_id(self) -> str:
+        """Identify the cached outputs of the deterministic transforms by the dataset and the transforms."""
+        prefix = (self._get_transform_list() or [])[: self.num_deterministic_transforms]
+        options = (self._cache_id, self.image_color_channel, self.mem_cache_img_max_size, prefix)
+        return hashlib.blake2b(repr(options).encode(), digest_size=16).hexdigest()
+
     def _sample_another_idx(self) -> int:
         return np.random.default_rng().integers(0, len(self))
 
+    def _get_transform_list(self) -> list[Callable] | None:
+        if isinstance(self.transforms, Compose):
+            return self.transforms.transforms
+        if isinstance(self.transforms, list):
+            return self.transforms
+        return None
+
     def _apply_transforms(self, entity: T_OTXDataEntity) -> T_OTXDataEntity | None:
         if isinstance(self.transforms, Compose):
             entity = entity.to_tv_image()
-            return self.transforms(entity)
+            if self.num_deterministic_transforms == 0:
+                return self.transforms(entity)
+            return self._apply_transform_list(entity, self.transforms.transforms)
         if isinstance(self.transforms, Iterable):
             return self._iterable_transforms(entity)
         if callable(self.transforms):
@@ -106,8 +165,26 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         if not isinstance(self.transforms, list):
             raise TypeError(item)
 
-        results = item
-        for transform in self.transforms:
+        return self._apply_transform_list(item, self.transforms)
+
+    def _apply_transform_list(self, item: T_OTXDataEntity, transforms: list[Callable]) -> T_OTXDataEntity | None:
+        """Apply the transforms in order while caching the outputs of the deterministic ones.
+
+        The cached outputs are taken by `_fetch_item()` before the item is loaded.
+        """
+        num_cached = self.num_deterministic_transforms
+        results = self._run_transforms(item, transforms[:num_cached])
+        if results is None:
+            return None
+        # The outputs are cached under the same index as the one `_fetch_item()` looks them up with
+        if num_cached > 0 and self._fetch_index is not None:
+            self._cache_transform_outputs((self._transform_cache_id, self._fetch_index), results)
+
+        return self._run_transforms(results, transforms[num_cached:])
+
+    @staticmethod
+    def _run_transforms(results: Any, transforms: list[Callable]) -> Any:  # noqa: ANN401
+        for transform in transforms:
             results = transform(results)
             # MMCV transform can produce None. Please see
             # https://github.com/open-mmlab/mmengine/blob/26f22ed283ae4ac3a24b756809e5961efe6f9da8/mmengine/dataset/base_dataset.py#L59-L66
@@ -116,9 +193,26 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
 
         return results
 
+    def _get_cached_transform_outputs(self, key: tuple[str, int]) -> Any:  # noqa: ANN401
+        data, _ = self.mem_cache_handler.get(key=key, kind="transform_outputs")
+        if data is None:
+            return None
+        # The outputs are deserialized on every access, so the following transforms can modify them in-place
+        return pickle.loads(data)  # noqa: S301
+
+    def _cache_transform_outputs(self, key: tuple[str, int], results: Any) -> None:  # noqa: ANN401
+        if self.mem_cache_handler.frozen:
+            return
+
+        data = np.frombuffer(pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8)
+        self.mem_cache_handler.put(key=key, data=data, meta=None, kind="transform_outputs")
+
     def __getitem__(self, index: int) -> T_OTXDataEntity:
+        if self.prefetcher is not None:
+            self.prefetcher.on_fetch(index, self._prefetch_img)
+
         for _ in range(self.max_refetch):
-            results = self._get_item_impl(index)
+            results = self._fetch_item(index)
 
             if results is not None:
                 return results
@@ -128,12 +222,44 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         msg = f"Reach the maximum refetch number ({self.max_refetch})"
         raise RuntimeError(msg)
 
-    def _get_img_data_and_shape(self, img: Image) -> tuple[np.ndarray, tuple[int, int]]:
+    def _fetch_item(self, index: int) -> T_OTXDataEntity | None:
+        """Get the item of the given index from the cached outputs of the deterministic transforms if any.
+
+        On a hit, neither the item nor its image is loaded and only the remaining transforms are applied.
+        """
+        if self.num_deterministic_transforms > 0:
+            results = self._get_cached_transform_outputs((self._transform_cache_id, index))
+            if results is not None:
+                transforms = self._get_transform_list() or []
+                return self._run_transforms(results, transforms[self.num_deterministic_transforms :])
+
+        self._fetch_index = index
+        try:
+            return self._get_item_impl(index)
+        finally:
+            self._fetch_index = None
+
+    def _prefetch_img(self, index: int) -> None:
+        """Decode the image of the given index into the cache ahead of `__getitem__`."""
+        handler = self.mem_cache_handler
+        if handler.frozen and handler.disk_cache is None:
+            return
+
+        item = self.dm_subset.get(id=self.ids[index], subset=self.dm_subset.name)
+        if isinstance(item.media, (ImageFromFile, RoIImageFromFile)):
+            # Count the lookups apart from the ones of the dataset to keep the image hit rate meaningful
+            self._get_img_data_and_shape(item.media, cache_kind="prefetch")
+
+    def _get_img_data_and_shape(self, img: Image, cache_kind: str = "image") -> tuple[np.ndarray, tuple[int, int]]:
+        if isinstance(img, RoIImageFromFile):
+            return self._get_roi_img_data_and_shape(img, cache_kind)
+
         key = img.path if isinstance(img, ImageFromFile) else id(img)
 
-        if (img_data := self.mem_cache_handler.get(key=key)[0]) is not None:
+        if (img_data := self.mem_cache_handler.get(key=key, kind=cache_kind)[0]) is not None:
             return img_data, img_data.shape[:2]
 
+        start = time.perf_counter()
         with image_decode_context():
             img_data = (
                 cv2.cvtColor(img.data, cv2.COLOR_BGR2RGB)
@@ -144,12 +270,39 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         if img_data is None:
             msg = "Cannot get image data"
             raise RuntimeError(msg)
+        self.mem_cache_handler.record_load_time(time.perf_counter() - start)
 
-        img_data = self._cache_img(key=key, img_data=img_data.astype(np.uint8))
+        img_data = self._cache_img(key=key, img_data=img_data.astype(np.uint8), cache_kind=cache_kind)
 
         return img_data, img_data.shape[:2]
 
-    def _cache_img(self, key: str | int, img_data: np.ndarray) -> np.ndarray:
+    def _get_roi_img_data_and_shape(
+        self,
+        img: RoIImageFromFile,
+        cache_kind: str = "image",
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        """Crop the region of the image from its full image in the cache.
+
+        The tiles of an image share its cached full image instead of decoding the full image for every tile.
+        If the cached image is downscaled by `mem_cache_img_max_size`, the scaled region is resized back to
+        the size of the region, so that it stays aligned with the annotations of the tile.
+        """
+        full_img = ImageFromFile(img.path)
+        img_data, (height, width) = self._get_img_data_and_shape(full_img, cache_kind)
+        x, y, w, h = img.roi
+
+        ori_size = MediaMetaCache.current().get_image_size(full_img) if self.mem_cache_img_max_size else None
+        if ori_size is None or ori_size == (height, width):
+            roi_data = img_data[y : y + h, x : x + w]
+            return roi_data, roi_data.shape[:2]
+
+        scale_y, scale_x = height / ori_size[0], width / ori_size[1]
+        x1, y1 = int(x * scale_x), int(y * scale_y)
+        x2, y2 = max(int(np.ceil((x + w) * scale_x)), x1 + 1), max(int(np.ceil((y + h) * scale_y)), y1 + 1)
+        roi_data = cv2.resize(img_data[y1:y2, x1:x2], dsize=(w, h), interpolation=cv2.INTER_LINEAR)
+        return roi_data, roi_data.shape[:2]
+
+    def _cache_img(self, key: str | int, img_data: np.ndarray, cache_kind: str = "image") -> np.ndarray:
         """Cache an image after resizing.
 
         If there is available space in the memory pool, the input image is cached.
@@ -161,22 +314,23 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         Args:
             key: The key associated with the image.
             img_data: The image data to be cached.
+            cache_kind: Kind of the entry to count the statistics of the memory cache.
 
         Returns:
             The resized image if it was resized. Otherwise, the original image.
         """
-        if self.mem_cache_handler.frozen:
+        if self.mem_cache_handler.frozen and self.mem_cache_handler.disk_cache is None:
             return img_data
 
         if self.mem_cache_img_max_size is None:
-            self.mem_cache_handler.put(key=key, data=img_data, meta=None)
+            self.mem_cache_handler.put(key=key, data=img_data, meta=None, kind=cache_kind)
             return img_data
 
         height, width = img_data.shape[:2]
         max_height, max_width = self.mem_cache_img_max_size
 
         if height <= max_height and width <= max_width:
-            self.mem_cache_handler.put(key=key, data=img_data, meta=None)
+            self.mem_cache_handler.put(key=key, data=img_data, meta=None, kind=cache_kind)
             return img_data
 
         # Preserve the image size ratio and fit to max_height or max_width
@@ -194,6 +348,7 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
             key=key,
             data=resized_img,
             meta=None,
+            kind=cache_kind,
         )
         return resized_img
 
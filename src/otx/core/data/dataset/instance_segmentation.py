@@ -41,24 +41,25 @@ class OTXInstanceSegDataset(OTXDataset[InstanceSegDataEntity]):
         ignored_labels: list[int] = []
         img_data, img_shape = self._get_img_data_and_shape(img)
 
-        gt_bboxes, gt_labels, gt_masks, gt_polygons = [], [], [], []
+        gt_bboxes, gt_labels, gt_polygons = [], [], []
 
         for annotation in item.annotations:
             if isinstance(annotation, Polygon):
                 bbox = np.array(annotation.get_bbox(), dtype=np.float32)
                 gt_bboxes.append(bbox)
                 gt_labels.append(annotation.label)
-
-                if self.include_polygons:
-                    gt_polygons.append(annotation)
-                else:
-                    gt_masks.append(polygon_to_bitmap([annotation], *img_shape)[0])
+                gt_polygons.append(annotation)
 
         # convert xywh to xyxy format
         bboxes = np.array(gt_bboxes, dtype=np.float32) if gt_bboxes else np.empty((0, 4))
         bboxes[:, 2:] += bboxes[:, :2]
 
-        masks = np.stack(gt_masks, axis=0) if gt_masks else np.zeros((0, *img_shape), dtype=bool)
+        if self.include_polygons:
+            # The polygons are rasterized by the model at the resolution it consumes
+            masks = np.zeros((0, *img_shape), dtype=bool)
+        else:
+            masks = polygon_to_bitmap(gt_polygons, *img_shape)
+            gt_polygons = []
         labels = np.array(gt_labels, dtype=np.int64)
 
         entity = InstanceSegDataEntity(
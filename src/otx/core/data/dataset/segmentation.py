@@ -5,9 +5,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import tempfile
 from functools import partial
+from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
+import cv2
 import numpy as np
 import torch
 from datumaro.components.annotation import Image, Mask
@@ -23,11 +27,22 @@ from otx.core.types.label import SegLabelInfo
 from .base import OTXDataset
 
 if TYPE_CHECKING:
-    from datumaro import DatasetSubset
+    from datumaro import DatasetItem, DatasetSubset
+
+    from otx.core.data.annotation_index import AnnotationIndex
 
 
 class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
-    """OTXDataset class for segmentation task."""
+    """OTXDataset class for segmentation task.
+
+    The label map of an item is built from its mask annotations only once and kept in
+    `mem_cache_handler` together with the images. If `label_map_dir` is given, it is also
+    stored as a PNG file there, so that the next runs read it instead of building it again.
+
+    Args:
+        label_map_dir: Directory to store the label maps. It should be unique to the dataset contents.
+            If None, the label maps are not stored on the disk.
+    """
 
     def __init__(
         self,
@@ -38,6 +53,9 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
         max_refetch: int = 1000,
         image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
         stack_images: bool = True,
+        num_deterministic_transforms: int = 0,
+        annotation_index: AnnotationIndex | None = None,
+        label_map_dir: str | Path | None = None,
     ) -> None:
         super().__init__(
             dm_subset,
@@ -47,11 +65,14 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
             max_refetch,
             image_color_channel,
             stack_images,
+            num_deterministic_transforms,
+            annotation_index,
         )
         self.label_info = SegLabelInfo(
             label_names=self.label_info.label_names,
             label_groups=self.label_info.label_groups,
         )
+        self.label_map_dir = Path(label_map_dir) if label_map_dir is not None else None
 
     def _get_item_impl(self, index: int) -> SegDataEntity | None:
         item = self.dm_subset.get(id=self.ids[index], subset=self.dm_subset.name)
@@ -60,13 +81,7 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
         ignored_labels: list[int] = []
         img_data, img_shape = self._get_img_data_and_shape(img)
 
-        # create 2D class mask. We use np.sum() since Datumaro returns 3D masks (one for each class)
-        mask_anns = np.sum(
-            [ann.as_class_mask() for ann in item.annotations if isinstance(ann, Mask)],
-            axis=0,
-            dtype=np.uint8,
-        )
-        mask = torch.as_tensor(mask_anns, dtype=torch.long)
+        mask = torch.as_tensor(self._get_label_map(item), dtype=torch.long)
         # assign possible ignored labels from dataset to max label class + 1.
         # it is needed to compute mDice metric.
         mask[mask == 255] = num_classes
@@ -85,7 +100,53 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
         )
         return self._apply_transforms(entity)
 
+    def _get_label_map(self, item: DatasetItem) -> np.ndarray:
+        """Get the 2D label map of the item from the memory cache, the label map directory or its annotations."""
+        key = (self._cache_id, "label_map", item.subset, item.id)
+        if (label_map := self.mem_cache_handler.get(key=key, kind="label_map")[0]) is not None:
+            return label_map
+
+        path = None
+        if self.label_map_dir is not None:
+            digest = hashlib.blake2b(repr((item.subset, item.id)).encode(), digest_size=16).hexdigest()
+            path = self.label_map_dir / f"{digest}.png"
+            label_map = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+
+        if label_map is None:
+            # create 2D class mask. We use np.sum() since Datumaro returns 3D masks (one for each class)
+            label_map = np.sum(
+                [ann.as_class_mask() for ann in item.annotations if isinstance(ann, Mask)],
+                axis=0,
+                dtype=np.uint8,
+            )
+            if label_map.ndim != 2:
+                # No mask annotation
+                return label_map
+            if path is not None:
+                _write_png(path, label_map)
+
+        if not self.mem_cache_handler.frozen:
+            self.mem_cache_handler.put(key=key, data=label_map, meta=None, kind="label_map")
+        return label_map
+
     @property
     def collate_fn(self) -> Callable:
         """Collection function to collect SegDataEntity into SegBatchDataEntity in data loader."""
         return partial(SegBatchDataEntity.collate_fn, stack_images=self.stack_images)
+
+
+def _write_png(path: Path, image: np.ndarray) -> None:
+    """Write the image to a temporary file and rename it, so that the concurrent readers never see a partial file."""
+    success, encoded = cv2.imencode(".png", image)
+    if not success:
+        return
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as fp:
+            tmp_path = Path(fp.name)
+            fp.write(encoded.tobytes())
+        tmp_path.replace(path)
+    except OSError:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
@@ -6,22 +6,22 @@
 from __future__ import annotations
 
 import logging as log
-from itertools import product
-from typing import TYPE_CHECKING, Callable
+from dataclasses import dataclass
+from functools import cache, partial
+from typing import TYPE_CHECKING, Callable, Iterator
 
 import numpy as np
+import shapely.geometry as sg
 import torch
-from datumaro import Bbox, DatasetItem, DatasetSubset, Image, Polygon
-from datumaro import Dataset as DmDataset
+from datumaro import Bbox, DatasetItem, Image, Polygon
+from datumaro.components.annotation import AnnotationType
+from datumaro.components.media import RoIImage
 from datumaro.plugins.tiling import Tile
-from datumaro.plugins.tiling.util import (
-    clip_x1y1x2y2,
-    cxcywh_to_x1y1x2y2,
-    x1y1x2y2_to_cxcywh,
-    x1y1x2y2_to_xywh,
-)
+from datumaro.plugins.tiling.util import xywh_to_x1y1x2y2
 from torchvision import tv_tensors
+from torchvision.transforms.v2 import Compose
 
+from otx.core.data.annotation_index import AnnotationIndex
 from otx.core.data.entity.base import ImageInfo
 from otx.core.data.entity.detection import DetDataEntity
 from otx.core.data.entity.instance_segmentation import InstanceSegDataEntity
@@ -31,12 +31,15 @@ from otx.core.data.entity.tile import (
     TileDetDataEntity,
     TileInstSegDataEntity,
 )
+from otx.core.data.media_meta import MediaMetaCache
 from otx.core.types.task import OTXTaskType
 from otx.core.utils.mask_util import polygon_to_bitmap
 
 from .base import OTXDataset
 
 if TYPE_CHECKING:
+    from datumaro import DatasetSubset
+    from datumaro.components.annotation import Annotation, Categories
     from datumaro.components.media import BboxIntCoords
 
     from otx.core.config.data import TileConfig
@@ -86,30 +89,338 @@ class OTXTileTransform(Tile):
         Returns:
             list[BboxIntCoords]: list of ROIs.
         """
-        if image.size is None:
+        # Probe the size from the file header not to decode the image only for its size
+        if (size := MediaMetaCache.current().get_image_size(image) or image.size) is None:
             msg = "Image size is None"
             raise ValueError(msg)
 
-        img_h, img_w = image.size
-        tile_h, tile_w = self._tile_size
-        h_ovl, w_ovl = self._overlap
+        img_h, img_w = size
+        rois = get_tile_rois(size, self._tile_size, self._overlap)
 
-        rois: list[BboxIntCoords] = []
-        cols = range(0, img_w, int(tile_w * (1 - w_ovl)))
-        rows = range(0, img_h, int(tile_h * (1 - h_ovl)))
+        log.info(f"image: {img_h}x{img_w} ~ tile_size: {self._tile_size}")
+        log.info(f"{len(rois)} tiles")
+        return [tuple(roi) for roi in rois.tolist()]
 
-        for offset_x, offset_y in product(cols, rows):
-            x2 = min(offset_x + tile_w, img_w)
-            y2 = min(offset_y + tile_h, img_h)
-            c_x, c_y, w, h = x1y1x2y2_to_cxcywh(offset_x, offset_y, x2, y2)
-            x1, y1, x2, y2 = cxcywh_to_x1y1x2y2(c_x, c_y, w, h)
-            x1, y1, x2, y2 = clip_x1y1x2y2(x1, y1, x2, y2, img_w, img_h)
-            x1, y1, x2, y2 = (int(v) for v in [x1, y1, x2, y2])
-            rois += [x1y1x2y2_to_xywh(x1, y1, x2, y2)]
 
-        log.info(f"image: {img_h}x{img_w} ~ tile_size: {self._tile_size}")
-        log.info(f"{len(rows)}x{len(cols)} tiles -> {len(rois)} tiles")
-        return rois
+def _get_tile_grid(size: int, tile_size: int, overlap: float) -> tuple[np.ndarray, np.ndarray]:
+    """Get the start and end coordinates of the tiles along an axis of the given size."""
+    starts = np.array(range(0, size, int(tile_size * (1 - overlap))), dtype=np.int64)
+    return starts, np.minimum(starts + tile_size, size)
+
+
+def get_tile_rois(
+    img_size: tuple[int, int],
+    tile_size: tuple[int, int],
+    overlap: tuple[float, float],
+) -> np.ndarray:
+    """Get the ROIs of the tiles of an image.
+
+    Args:
+        img_size (tuple[int, int]): Image size (height, width).
+        tile_size (tuple[int, int]): Tile size (height, width).
+        overlap (tuple[float, float]): Overlap ratio (height, width).
+
+    Returns:
+        np.ndarray: ROIs (x, y, w, h) of shape (N, 4). The tiles are ordered column by column.
+    """
+    y1, y2 = _get_tile_grid(int(img_size[0]), int(tile_size[0]), overlap[0])
+    x1, x2 = _get_tile_grid(int(img_size[1]), int(tile_size[1]), overlap[1])
+    cols, rows = np.repeat(np.arange(len(x1)), len(y1)), np.tile(np.arange(len(y1)), len(x1))
+    return np.stack([x1[cols], y1[rows], x2[cols] - x1[cols], y2[rows] - y1[rows]], axis=1)
+
+
+@dataclass
+class TileIndex:
+    """Lazy index of the tiles of a dataset subset for training.
+
+    Instead of materializing every tile item and its clipped annotations up front,
+    only the ROI of each tile and the annotations which remain in it are indexed.
+    The tile items are created from them on access (see `TileSubset`).
+    The i-th row is the tile of `roi_idxs[i]` in the ROIs (see `get_tile_rois()`) of the `item_idxs[i]`-th item,
+    or the item itself if `roi_idxs[i]` is -1.
+    Its annotations are `ann_idxs[ann_offsets[i]:ann_offsets[i + 1]]` in the annotations of the item.
+
+    Attributes:
+        item_idxs: Index of the item of each row in the original subset.
+        roi_idxs: Index of the ROI of each row in the tiles of its item. It is -1 for the original items.
+        rois: ROI (x, y, w, h) of each row. It is the whole image for the original items.
+        ann_offsets: Offsets of the annotations of each row. Its length is the number of the rows + 1.
+        ann_idxs: Index of each annotation in the annotations of its item.
+    """
+
+    item_idxs: np.ndarray
+    roi_idxs: np.ndarray
+    rois: np.ndarray
+    ann_offsets: np.ndarray
+    ann_idxs: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.item_idxs)
+
+    @classmethod
+    def build(
+        cls,
+        dm_subset: DatasetSubset,
+        annotation_index: AnnotationIndex,
+        tile_size: tuple[int, int],
+        overlap: tuple[float, float],
+        threshold_drop_ann: float,
+    ) -> TileIndex:
+        """Build the index of the tiles which have any annotation followed by the original items.
+
+        It yields the same tiles and annotations as `OTXTileTransform` followed by filtering out the empty tiles,
+        but only the bounding boxes and the polygons are tiled as only they are consumed by the tile datasets
+        (see `find_tile_annotations()`).
+
+        Args:
+            dm_subset (DatasetSubset): Dataset subset to extract tiles from.
+            annotation_index (AnnotationIndex): Columnar index of `dm_subset`.
+            tile_size (tuple[int, int]): Tile size.
+            overlap (tuple[float, float]): Overlap ratio.
+            threshold_drop_ann (float): Threshold to drop annotations.
+        """
+        media_meta = MediaMetaCache.current()
+        image_sizes = annotation_index.image_sizes
+        is_polygon = annotation_index.ann_types == AnnotationType.polygon.value
+        is_tiled = is_polygon | (annotation_index.ann_types == AnnotationType.bbox.value)
+
+        item_idxs, roi_idxs, rois, ann_counts, ann_idxs = [], [], [], [], []
+        for item_idx, (start, end) in enumerate(
+            zip(annotation_index.ann_offsets[:-1], annotation_index.ann_offsets[1:]),
+        ):
+            # The item is loaded only if its image size is unknown or its polygons are partially covered by a tile
+            get_item = cache(
+                partial(dm_subset.get, id=annotation_index.item_ids[item_idx].item(), subset=dm_subset.name),
+            )
+            if image_sizes[item_idx, 0] < 0:
+                media = get_item().media
+                if (size := media_meta.get_image_size(media) or media.size) is None:
+                    msg = "Image size is None"
+                    raise ValueError(msg)
+            else:
+                size = tuple(image_sizes[item_idx].tolist())
+
+            anns = np.flatnonzero(is_tiled[start:end])
+            tile_idxs, tile_anns = find_tile_annotations(
+                size,
+                annotation_index.boxes[start + anns],
+                is_polygon[start + anns],
+                tile_size,
+                overlap,
+                threshold_drop_ann,
+                get_annotation=lambda i, anns=anns, get_item=get_item: get_item().annotations[anns[i]],
+            )
+            tile_anns = anns[tile_anns]
+            item_rois = get_tile_rois(size, tile_size, overlap)
+
+            unique_tiles, counts = np.unique(tile_idxs, return_counts=True)
+            item_idxs.append(np.full(len(unique_tiles), item_idx))
+            roi_idxs.append(unique_tiles)
+            rois.append(item_rois[unique_tiles])
+            ann_counts.append(counts)
+            ann_idxs.append(tile_anns)
+
+        # Include the original items for training
+        num_items = len(annotation_index)
+        item_idxs.append(np.arange(num_items))
+        roi_idxs.append(np.full(num_items, -1))
+        rois.append(np.concatenate([np.zeros((num_items, 2), dtype=np.int64), image_sizes[:, ::-1]], axis=1))
+        ann_counts.append(np.diff(annotation_index.ann_offsets))
+        ann_idxs.append(
+            np.arange(annotation_index.ann_offsets[-1]) - np.repeat(annotation_index.ann_offsets[:-1], ann_counts[-1]),
+        )
+
+        return cls(
+            item_idxs=np.concatenate(item_idxs).astype(np.int64),
+            roi_idxs=np.concatenate(roi_idxs).astype(np.int64),
+            rois=np.concatenate(rois).astype(np.int64).reshape(-1, 4),
+            ann_offsets=np.concatenate([[0], np.cumsum(np.concatenate(ann_counts))]).astype(np.int64),
+            ann_idxs=np.concatenate(ann_idxs).astype(np.int64),
+        )
+
+    def to_annotation_index(self, annotation_index: AnnotationIndex) -> AnnotationIndex:
+        """Get the columnar index of the tiles from the one of the original subset.
+
+        The boxes of the tile annotations are clipped to the tiles.
+        The areas of the clipped polygons are approximated by the ratio of their clipped boxes.
+        """
+        item_ids = annotation_index.item_ids[self.item_idxs]
+        is_tile = self.roi_idxs >= 0
+        tile_ids = np.char.add(np.char.add(item_ids, "_tile_"), self.roi_idxs.astype(str))
+
+        ann_rows = self.ann_idxs + np.repeat(annotation_index.ann_offsets[self.item_idxs], np.diff(self.ann_offsets))
+        ann_rois = np.repeat(self.rois, np.diff(self.ann_offsets), axis=0)
+        ann_is_tile = np.repeat(is_tile, np.diff(self.ann_offsets))
+
+        boxes = annotation_index.boxes[ann_rows]
+        areas = annotation_index.areas[ann_rows]
+        offset = np.tile(ann_rois[:, :2], 2).astype(np.float32)
+        clipped = np.clip(boxes - offset, 0, np.tile(ann_rois[:, 2:], 2).astype(np.float32))
+        box_areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        clipped_areas = (clipped[:, 2] - clipped[:, 0]) * (clipped[:, 3] - clipped[:, 1])
+        scale = np.divide(clipped_areas, box_areas, out=np.ones_like(box_areas), where=box_areas > 0)
+
+        return AnnotationIndex(
+            item_ids=np.where(is_tile, tile_ids, item_ids),
+            image_sizes=np.where(is_tile[:, None], self.rois[:, [3, 2]], annotation_index.image_sizes[self.item_idxs]),
+            ann_offsets=self.ann_offsets,
+            ann_types=annotation_index.ann_types[ann_rows],
+            ann_labels=annotation_index.ann_labels[ann_rows],
+            boxes=np.where(ann_is_tile[:, None] & np.isfinite(boxes), clipped, boxes),
+            areas=np.where(ann_is_tile, areas * scale, areas).astype(np.float32),
+            label_names=annotation_index.label_names,
+        )
+
+
+def find_tile_annotations(
+    img_size: tuple[int, int],
+    boxes: np.ndarray,
+    is_polygon: np.ndarray,
+    tile_size: tuple[int, int],
+    overlap: tuple[float, float],
+    threshold_drop_ann: float,
+    get_annotation: Callable[[int], Annotation],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the bounding boxes and polygons of an image remaining in its tiles in the same way as `OTXTileTransform`.
+
+    The tiles overlapping each annotation are found from the tile grid and the area of the annotation
+    remaining in the tile is computed from its bounding box.
+    The area of a polygon remaining in a tile can be larger than the one of its bounding box,
+    so that the polygons partially covered by a tile are tiled by Datumaro to compute their exact area.
+
+    Args:
+        img_size (tuple[int, int]): Image size (height, width).
+        boxes (np.ndarray): Bounding boxes (x1, y1, x2, y2) of the annotations.
+        is_polygon (np.ndarray): Whether each annotation is a polygon.
+        tile_size (tuple[int, int]): Tile size.
+        overlap (tuple[float, float]): Overlap ratio.
+        threshold_drop_ann (float): Threshold to drop annotations.
+        get_annotation (Callable[[int], Annotation]): Function to get the i-th annotation. It is called only for
+            the polygons partially covered by a tile.
+
+    Returns:
+        Tile index (see `get_tile_rois()`) and annotation index of each pair of a tile and an annotation remaining
+        in it, sorted by the tile index and then by the annotation index.
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    y1, y2 = _get_tile_grid(int(img_size[0]), int(tile_size[0]), overlap[0])
+    x1, x2 = _get_tile_grid(int(img_size[1]), int(tile_size[1]), overlap[1])
+    # The tiles of each axis overlapping a box are contiguous as both of their starts and ends are sorted
+    col_lo, col_hi = np.searchsorted(x2, boxes[:, 0], "right"), np.searchsorted(x1, boxes[:, 2], "left")
+    row_lo, row_hi = np.searchsorted(y2, boxes[:, 1], "right"), np.searchsorted(y1, boxes[:, 3], "left")
+    num_rows = np.maximum(row_hi - row_lo, 0)
+    counts = np.maximum(col_hi - col_lo, 0) * num_rows
+
+    ann_idxs = np.repeat(np.arange(len(boxes)), counts)
+    pos = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cols = col_lo[ann_idxs] + pos // num_rows[ann_idxs]
+    rows = row_lo[ann_idxs] + pos % num_rows[ann_idxs]
+
+    pair_boxes = boxes[ann_idxs]
+    inter_w = np.minimum(pair_boxes[:, 2], x2[cols]) - np.maximum(pair_boxes[:, 0], x1[cols])
+    inter_h = np.minimum(pair_boxes[:, 3], y2[rows]) - np.maximum(pair_boxes[:, 1], y1[rows])
+    inter_areas = np.maximum(inter_w, 0) * np.maximum(inter_h, 0)
+    areas = (pair_boxes[:, 2] - pair_boxes[:, 0]) * (pair_boxes[:, 3] - pair_boxes[:, 1])
+    pair_is_polygon = is_polygon[ann_idxs]
+    keep = (areas > 0) & ((inter_areas >= threshold_drop_ann * areas) | (pair_is_polygon & (inter_areas > 0)))
+    is_partial = pair_is_polygon & (inter_areas < areas)
+
+    tile_idxs = cols * len(y1) + rows
+    if (keep & is_partial).any():
+        rois = np.stack([x1[cols], y1[rows], x2[cols] - x1[cols], y2[rows] - y1[rows]], axis=1)
+        for i in np.flatnonzero(keep & is_partial).tolist():
+            roi = tuple(rois[i].tolist())
+            keep[i] = _tile_annotation(get_annotation(ann_idxs[i]), roi, threshold_drop_ann) is not None
+
+    tile_idxs, ann_idxs = tile_idxs[keep], ann_idxs[keep]
+    order = np.lexsort((ann_idxs, tile_idxs))
+    return tile_idxs[order], ann_idxs[order]
+
+
+def _tile_annotation(ann: Annotation, roi: BboxIntCoords, threshold_drop_ann: float) -> Annotation | None:
+    """Tile the annotation in the same way as `OTXTileTransform`."""
+    return OTXTileTransform._tile_ann_func_map[ann.type](
+        ann,
+        roi_int=roi,
+        roi_box=sg.box(*xywh_to_x1y1x2y2(*roi)),
+        threshold_drop_ann=threshold_drop_ann,
+    )
+
+
+class TileSubset:
+    """Dataset subset of the tiles which creates the tile items from `TileIndex` on access.
+
+    It provides the methods of `DatasetSubset` used by `OTXDataset`.
+    The tile items are the same as the ones of `OTXTileTransform`: the media is a `RoIImage` of the original image
+    and its annotations are clipped to the tile.
+
+    Args:
+        dm_subset (DatasetSubset): Original dataset subset.
+        tile_index (TileIndex): Index of the tiles of `dm_subset`.
+        item_ids (np.ndarray): Item ids of the original subset.
+        tile_ids (list[str]): Item id of each row of `tile_index`.
+        threshold_drop_ann (float): Threshold to drop annotations.
+    """
+
+    def __init__(
+        self,
+        dm_subset: DatasetSubset,
+        tile_index: TileIndex,
+        item_ids: np.ndarray,
+        tile_ids: list[str],
+        threshold_drop_ann: float,
+    ) -> None:
+        self.dm_subset = dm_subset
+        self.tile_index = tile_index
+        self.item_ids = item_ids
+        self.tile_ids = tile_ids
+        self.threshold_drop_ann = threshold_drop_ann
+        self._rows = {tile_id: i for i, tile_id in enumerate(tile_ids)}
+
+    @property
+    def name(self) -> str:
+        """Name of the subset."""
+        return self.dm_subset.name
+
+    def categories(self) -> dict[AnnotationType, Categories]:
+        """Categories of the original subset."""
+        return self.dm_subset.categories()
+
+    def infos(self) -> dict:
+        """Infos of the original subset."""
+        return self.dm_subset.infos()
+
+    def __len__(self) -> int:
+        return len(self.tile_index)
+
+    def __iter__(self) -> Iterator[DatasetItem]:
+        for tile_id in self.tile_ids:
+            yield self.get(tile_id)
+
+    def get(self, id: str, subset: str | None = None) -> DatasetItem | None:  # noqa: A002
+        """Create the tile item of the given id."""
+        if (row := self._rows.get(id)) is None:
+            return None
+        index = self.tile_index
+        item = self.dm_subset.get(id=self.item_ids[index.item_idxs[row]].item(), subset=self.dm_subset.name)
+        roi_idx = int(index.roi_idxs[row])
+        if roi_idx < 0:
+            return item
+
+        roi = tuple(index.rois[row].tolist())
+        start, end = index.ann_offsets[row : row + 2]
+        annotations = [
+            tiled_ann
+            for ann_idx in index.ann_idxs[start:end].tolist()
+            if (tiled_ann := _tile_annotation(item.annotations[ann_idx], roi, self.threshold_drop_ann)) is not None
+        ]
+
+        return item.wrap(
+            id=id,
+            media=RoIImage.from_image(item.media, roi),
+            attributes=Tile._get_tiled_attributes(item, roi_idx, roi),
+            annotations=annotations,
+        )
 
 
 class OTXTileDatasetFactory:
@@ -162,6 +473,7 @@ class OTXTileDataset(OTXDataset):
             dataset.mem_cache_handler,
             dataset.mem_cache_img_max_size,
             dataset.max_refetch,
+            annotation_index=dataset.annotation_index,
         )
         self.tile_config = tile_config
         self._dataset = dataset
@@ -176,16 +488,19 @@ class OTXTileDataset(OTXDataset):
 
     def _get_item_impl(self, index: int) -> OTXDataEntity | None:
         """Get item implementation from the original dataset."""
-        return self._dataset._get_item_impl(index)
+        return self._dataset._fetch_item(index)
 
-    def _convert_entity(self, image: np.ndarray, dataset_item: DatasetItem) -> OTXDataEntity:
-        """Convert a tile dataset item to OTXDataEntity."""
+    def _convert_entity(self, tile_img: np.ndarray, img_idx: int) -> OTXDataEntity:
+        """Convert a tile image to OTXDataEntity."""
         msg = "Method _convert_entity is not implemented."
         raise NotImplementedError(msg)
 
     def get_tiles(self, image: np.ndarray, item: DatasetItem) -> tuple[list[OTXDataEntity], list[dict]]:
         """Retrieves tiles from the given image and dataset item.
 
+        The ROIs of the tiles are computed from the image shape and the tiles are cropped as views of the image.
+        For the validation, only the tiles keeping any annotation after `OTXTileTransform` are retrieved.
+
         Args:
             image (np.ndarray): The input image.
             item (DatasetItem): The dataset item.
@@ -195,30 +510,61 @@ class OTXTileDataset(OTXDataset):
             - tile_entities (list[OTXDataEntity]): List of tile entities.
             - tile_attrs (list[dict]): List of tile attributes.
         """
-        tile_ds = DmDataset.from_iterable([item])
-        tile_ds = tile_ds.transform(
-            OTXTileTransform,
-            tile_size=self.tile_config.tile_size,
-            overlap=(self.tile_config.overlap, self.tile_config.overlap),
-            threshold_drop_ann=0.5,
-        )
+        overlap = (self.tile_config.overlap, self.tile_config.overlap)
+        rois = get_tile_rois(image.shape[:2], self.tile_config.tile_size, overlap)
+        roi_idxs: list[int] = list(range(len(rois)))
 
         if self.dm_subset.name == "val":
             # NOTE: filter validation tiles with annotations only to avoid evaluation on empty tiles.
-            tile_ds = tile_ds.filter("/item/annotation", filter_annotations=True, remove_empty=True)
+            threshold_drop_ann = 0.5
+            anns = [ann for ann in item.annotations if isinstance(ann, (Bbox, Polygon))]
+            tile_idxs, _ = find_tile_annotations(
+                image.shape[:2],
+                np.array([xywh_to_x1y1x2y2(*ann.get_bbox()) for ann in anns], dtype=np.float64),
+                np.array([isinstance(ann, Polygon) for ann in anns], dtype=bool),
+                self.tile_config.tile_size,
+                overlap,
+                threshold_drop_ann=threshold_drop_ann,
+                get_annotation=anns.__getitem__,
+            )
+            # The other annotations, e.g., the masks and the labels, are tiled by Datumaro as before
+            other_anns = [ann for ann in item.annotations if not isinstance(ann, (Bbox, Polygon))]
+            other_tile_idxs = [
+                roi_idx
+                for roi_idx, roi in enumerate(rois.tolist())
+                if any(_tile_annotation(ann, tuple(roi), threshold_drop_ann) is not None for ann in other_anns)
+            ]
+            roi_idxs = np.union1d(tile_idxs, other_tile_idxs).astype(np.int64).tolist()
 
         tile_entities: list[OTXDataEntity] = []
         tile_attrs: list[dict] = []
-        for tile in tile_ds:
-            tile_entity = self._convert_entity(image, tile)
-            # apply the same transforms as the original dataset
-            transformed_tile = self._apply_transforms(tile_entity)
-            if transformed_tile is None:
-                msg = "Transformed tile is None"
-                raise RuntimeError(msg)
-            tile_entities.append(transformed_tile)
-            tile_attrs.append(tile.attributes)
-        return tile_entities, tile_attrs
+        for roi_idx in roi_idxs:
+            x, y, w, h = roi = tuple(rois[roi_idx].tolist())
+            tile_entities.append(self._convert_entity(image[y : y + h, x : x + w], item.attributes["id"]))
+            tile_attrs.append(Tile._get_tiled_attributes(item, roi_idx, roi))
+        return self._apply_tile_transforms(tile_entities), tile_attrs
+
+    def _apply_tile_transforms(self, tile_entities: list[OTXDataEntity]) -> list[OTXDataEntity]:
+        """Apply the same transforms as the original dataset to each tile of an image.
+
+        The outputs of the deterministic transforms are not cached by `num_deterministic_transforms`,
+        as all the tiles of an image share the same image index.
+        """
+        if isinstance(self.transforms, Compose):
+            results = [self.transforms(tile_entity.to_tv_image()) for tile_entity in tile_entities]
+        elif isinstance(self.transforms, list):
+            results = tile_entities
+            for transform in self.transforms:
+                results = [transform(result) for result in results]
+                if any(result is None for result in results):
+                    break
+        else:
+            results = [self._apply_transforms(tile_entity) for tile_entity in tile_entities]
+
+        if any(result is None for result in results):
+            msg = "Transformed tile is None"
+            raise RuntimeError(msg)
+        return results
 
 
 class OTXTileTrainDataset(OTXTileDataset):
@@ -230,19 +576,25 @@ class OTXTileTrainDataset(OTXTileDataset):
     """
 
     def __init__(self, dataset: OTXDataset, tile_config: TileConfig) -> None:
-        dm_dataset = dataset.dm_subset.as_dataset()
-        dm_dataset = dm_dataset.transform(
-            OTXTileTransform,
+        annotation_index = dataset.annotation_index or AnnotationIndex.build(dataset.dm_subset)
+        tile_index = TileIndex.build(
+            dataset.dm_subset,
+            annotation_index,
             tile_size=tile_config.tile_size,
             overlap=(tile_config.overlap, tile_config.overlap),
             threshold_drop_ann=0.5,
         )
-        dm_dataset = dm_dataset.filter("/item/annotation", filter_annotations=True, remove_empty=True)
-        # Include original dataset for training
-        dm_dataset.update(dataset.dm_subset.as_dataset())
-        dm_subset = DatasetSubset(dm_dataset, dataset.dm_subset.name)
-        dataset.dm_subset = dm_subset
-        dataset.ids = [item.id for item in dm_subset]
+        log.info(f"{len(tile_index) - len(annotation_index)} tiles are extracted from {len(annotation_index)} images")
+        # The index of the original subset is replaced by the one of the tiles
+        dataset.annotation_index = tile_index.to_annotation_index(annotation_index)
+        dataset.ids = dataset.annotation_index.item_ids.tolist()
+        dataset.dm_subset = TileSubset(  # type: ignore[assignment]
+            dataset.dm_subset,
+            tile_index,
+            annotation_index.item_ids,
+            dataset.ids,
+            threshold_drop_ann=0.5,
+        )
         super().__init__(dataset, tile_config)
 
 
@@ -313,13 +665,11 @@ class OTXTileDetTestDataset(OTXTileDataset):
             ori_labels=labels,
         )
 
-    def _convert_entity(self, image: np.ndarray, dataset_item: DatasetItem) -> DetDataEntity:
-        """Convert a tile datumaro dataset item to DetDataEntity."""
-        x1, y1, w, h = dataset_item.attributes["roi"]
-        tile_img = image[y1 : y1 + h, x1 : x1 + w]
+    def _convert_entity(self, tile_img: np.ndarray, img_idx: int) -> DetDataEntity:
+        """Convert a tile image to DetDataEntity."""
         tile_shape = tile_img.shape[:2]
         img_info = ImageInfo(
-            img_idx=dataset_item.attributes["id"],
+            img_idx=img_idx,
             img_shape=tile_shape,
             ori_shape=tile_shape,
         )
@@ -376,24 +726,24 @@ class OTXTileInstSegTestDataset(OTXTileDataset):
         img = item.media_as(Image)
         img_data, img_shape = self._get_img_data_and_shape(img)
 
-        gt_bboxes, gt_labels, gt_masks, gt_polygons = [], [], [], []
+        gt_bboxes, gt_labels, gt_polygons = [], [], []
 
         for annotation in item.annotations:
             if isinstance(annotation, Polygon):
                 bbox = np.array(annotation.get_bbox(), dtype=np.float32)
                 gt_bboxes.append(bbox)
                 gt_labels.append(annotation.label)
-
-                if self._dataset.include_polygons:
-                    gt_polygons.append(annotation)
-                else:
-                    gt_masks.append(polygon_to_bitmap([annotation], *img_shape)[0])
+                gt_polygons.append(annotation)
 
         # convert xywh to xyxy format
         bboxes = np.array(gt_bboxes, dtype=np.float32)
         bboxes[:, 2:] += bboxes[:, :2]
 
-        masks = np.stack(gt_masks, axis=0) if gt_masks else np.zeros((0, *img_shape), dtype=bool)
+        if self._dataset.include_polygons:
+            masks = np.zeros((0, *img_shape), dtype=bool)
+        else:
+            masks = polygon_to_bitmap(gt_polygons, *img_shape)
+            gt_polygons = []
         labels = np.array(gt_labels, dtype=np.int64)
 
         tile_entities, tile_attrs = self.get_tiles(img_data, item)
@@ -417,13 +767,11 @@ class OTXTileInstSegTestDataset(OTXTileDataset):
             ori_polygons=gt_polygons,
         )
 
-    def _convert_entity(self, image: np.ndarray, dataset_item: DatasetItem) -> InstanceSegDataEntity:
-        """Convert a tile dataset item to InstanceSegDataEntity."""
-        x1, y1, w, h = dataset_item.attributes["roi"]
-        tile_img = image[y1 : y1 + h, x1 : x1 + w]
+    def _convert_entity(self, tile_img: np.ndarray, img_idx: int) -> InstanceSegDataEntity:
+        """Convert a tile image to InstanceSegDataEntity."""
         tile_shape = tile_img.shape[:2]
         img_info = ImageInfo(
-            img_idx=dataset_item.attributes["id"],
+            img_idx=img_idx,
             img_shape=tile_shape,
             ori_shape=tile_shape,
         )
@@ -11,11 +11,8 @@ from typing import Callable
 
 import torch
 import torchvision.transforms.v2.functional as F  # noqa: N812
-from datumaro import Bbox as dmBbox
 from datumaro import DatasetSubset
 from datumaro import Image as dmImage
-from datumaro import Mask as dmMask
-from datumaro import Points as dmPoints
 from datumaro import Polygon as dmPolygon
 from torchvision import tv_tensors
 
@@ -40,6 +37,9 @@ class OTXVisualPromptingDataset(OTXDataset[VisualPromptingDataEntity]):
         **kwargs: Additional keyword arguments passed to the base class.
     """
 
+    # The prompts are sampled randomly whenever the item is built
+    has_random_item_construction = True
+
     def __init__(
         self,
         dm_subset: DatasetSubset,
@@ -71,51 +71,52 @@ class OTXVisualPromptingDataset(OTXDataset[VisualPromptingDataEntity]):
         gt_polygons = defaultdict(list)
         gt_labels = defaultdict(list)
 
-        for annotation in item.annotations:
-            if isinstance(annotation, dmPolygon):
-                mask = tv_tensors.Mask(polygon_to_bitmap([annotation], *img_shape)[0])
-                mask_points = torch.nonzero(mask)
-                if len(mask_points[0]) == 0:
-                    # skip very small region
-                    continue
-
-                if torch.rand(1) < self.prob:
-                    # get bbox
-                    bbox = tv_tensors.BoundingBoxes(
-                        annotation.get_bbox(),
-                        format=tv_tensors.BoundingBoxFormat.XYWH,
+        polygons = [annotation for annotation in item.annotations if isinstance(annotation, dmPolygon)]
+        # rasterize all the polygons at once
+        for annotation, bitmap in zip(polygons, polygon_to_bitmap(polygons, *img_shape)):
+            mask = tv_tensors.Mask(bitmap)
+            mask_points = torch.nonzero(mask)
+            if len(mask_points[0]) == 0:
+                # skip very small region
+                continue
+
+            if torch.rand(1) < self.prob:
+                # get bbox
+                bbox = tv_tensors.BoundingBoxes(
+                    annotation.get_bbox(),
+                    format=tv_tensors.BoundingBoxFormat.XYWH,
+                    canvas_size=img_shape,
+                    dtype=torch.float32,
+                )
+                bbox = F._meta.convert_bounding_box_format(  # noqa: SLF001
+                    bbox,
+                    new_format=tv_tensors.BoundingBoxFormat.XYXY,
+                )
+                gt_bboxes.append(bbox)
+                gt_labels["bboxes"].append(annotation.label)
+                gt_masks["bboxes"].append(mask)
+                gt_polygons["bboxes"].append(annotation)
+            else:
+                # get point
+                if self.dm_subset.name == "train":
+                    # get random point from the mask
+                    idx_chosen = torch.randperm(len(mask_points[0]))[0]
+                    point = Points(
+                        (mask_points[1][idx_chosen], mask_points[0][idx_chosen]),
                         canvas_size=img_shape,
                         dtype=torch.float32,
                     )
-                    bbox = F._meta.convert_bounding_box_format(  # noqa: SLF001
-                        bbox,
-                        new_format=tv_tensors.BoundingBoxFormat.XYXY,
-                    )
-                    gt_bboxes.append(bbox)
-                    gt_labels["bboxes"].append(annotation.label)
-                    gt_masks["bboxes"].append(mask)
-                    gt_polygons["bboxes"].append(annotation)
                 else:
-                    # get point
-                    if self.dm_subset.name == "train":
-                        # get random point from the mask
-                        idx_chosen = torch.randperm(len(mask_points[0]))[0]
-                        point = Points(
-                            (mask_points[1][idx_chosen], mask_points[0][idx_chosen]),
-                            canvas_size=img_shape,
-                            dtype=torch.float32,
-                        )
-                    else:
-                        # get center point
-                        point = Points(
-                            torch.tensor(annotation.get_points()).mean(dim=0),
-                            canvas_size=img_shape,
-                            dtype=torch.float32,
-                        )
-                    gt_points.append(point)
-                    gt_labels["points"].append(annotation.label)
-                    gt_masks["points"].append(mask)
-                    gt_polygons["points"].append(annotation)
+                    # get center point
+                    point = Points(
+                        torch.tensor(annotation.get_points()).mean(dim=0),
+                        canvas_size=img_shape,
+                        dtype=torch.float32,
+                    )
+                gt_points.append(point)
+                gt_labels["points"].append(annotation.label)
+                gt_masks["points"].append(mask)
+                gt_polygons["points"].append(annotation)
 
         assert (  # noqa: S101
             len(gt_bboxes) > 0 or len(gt_points) > 0
@@ -165,6 +166,9 @@ class OTXZeroShotVisualPromptingDataset(OTXDataset[ZeroShotVisualPromptingDataEn
         **kwargs: Additional keyword arguments passed to the base class.
     """
 
+    # The prompts are sampled randomly whenever the item is built
+    has_random_item_construction = True
+
     def __init__(
         self,
         dm_subset: DatasetSubset,
@@ -192,44 +196,42 @@ class OTXZeroShotVisualPromptingDataset(OTXDataset[ZeroShotVisualPromptingDataEn
         img_data, img_shape = self._get_img_data_and_shape(img)
 
         gt_prompts, gt_masks, gt_polygons, gt_labels = [], [], [], []
-        for annotation in item.annotations:
-            if isinstance(annotation, dmPolygon):
-                # generate prompts from polygon
-                mask = tv_tensors.Mask(polygon_to_bitmap([annotation], *img_shape)[0])
-                mask_points = torch.nonzero(mask)
-                if len(mask_points[0]) == 0:
-                    # skip very small region
-                    continue
-
-                if torch.rand(1) < self.prob:
-                    # get bbox
-                    bbox = tv_tensors.BoundingBoxes(
-                        annotation.get_bbox(),
-                        format=tv_tensors.BoundingBoxFormat.XYWH,
-                        canvas_size=img_shape,
-                        dtype=torch.float32,
-                    )
-                    bbox = F._meta.convert_bounding_box_format(  # noqa: SLF001
-                        bbox,
-                        new_format=tv_tensors.BoundingBoxFormat.XYXY,
-                    )
-                    gt_prompts.append(bbox)
-                else:
-                    # get center point
-                    point = Points(
-                        torch.tensor(annotation.get_points()).mean(dim=0),
-                        canvas_size=img_shape,
-                        dtype=torch.float32,
-                    )
-                    gt_prompts.append(point)
+        # TODO(sungchul): for mask, bounding box, and point annotation
+        polygons = [annotation for annotation in item.annotations if isinstance(annotation, dmPolygon)]
+        # rasterize all the polygons at once
+        for annotation, bitmap in zip(polygons, polygon_to_bitmap(polygons, *img_shape)):
+            # generate prompts from polygon
+            mask = tv_tensors.Mask(bitmap)
+            mask_points = torch.nonzero(mask)
+            if len(mask_points[0]) == 0:
+                # skip very small region
+                continue
 
-                gt_labels.append(annotation.label)
-                gt_masks.append(mask)
-                gt_polygons.append(annotation)
+            if torch.rand(1) < self.prob:
+                # get bbox
+                bbox = tv_tensors.BoundingBoxes(
+                    annotation.get_bbox(),
+                    format=tv_tensors.BoundingBoxFormat.XYWH,
+                    canvas_size=img_shape,
+                    dtype=torch.float32,
+                )
+                bbox = F._meta.convert_bounding_box_format(  # noqa: SLF001
+                    bbox,
+                    new_format=tv_tensors.BoundingBoxFormat.XYXY,
+                )
+                gt_prompts.append(bbox)
+            else:
+                # get center point
+                point = Points(
+                    torch.tensor(annotation.get_points()).mean(dim=0),
+                    canvas_size=img_shape,
+                    dtype=torch.float32,
+                )
+                gt_prompts.append(point)
 
-            # TODO(sungchul): for mask, bounding box, and point annotation
-            elif isinstance(annotation, (dmBbox, dmMask, dmPoints)):
-                pass
+            gt_labels.append(annotation.label)
+            gt_masks.append(mask)
+            gt_polygons.append(annotation)
 
         assert len(gt_prompts) > 0, "#prompts must be greater than 0."  # noqa: S101
 
@@ -0,0 +1,103 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Persistent on-disk cache of decoded images shared across processes and runs."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger()
+
+__all__ = ["DiskCacheHandler"]
+
+
+class DiskCacheHandler:
+    """Persistent cache of decoded images on the local disk.
+
+    It is the second tier behind the memory cache handler.
+    Every decoded image is stored as a `.npy` file whose name is derived from the image path,
+    the modification time and size of the image file, and `variant`.
+    Therefore, the cached image is invalidated automatically if the image file is changed.
+    Any process on the node (e.g., HPO trials or `otx test` after `otx train`) can open
+    the cached image read-only with zero copy since it is loaded as `np.memmap`.
+    A new file is written to a temporary file and renamed atomically,
+    so that concurrent writers and readers are safe without any lock.
+
+    Args:
+        cache_dir: Directory to store the cached images.
+        variant: String to distinguish how the cached image was produced from the original file,
+            e.g., the color channel order and the maximum image size of the cache.
+        min_free_space: Stop writing a new file if the free space of the disk is less than this (bytes).
+    """
+
+    def __init__(self, cache_dir: str | Path, variant: str = "", min_free_space: int = 1024**3) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.variant = variant
+        self.min_free_space = min_free_space
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_cache_path(self, path: str) -> Path | None:
+        try:
+            stat = os.stat(path)  # noqa: PTH116
+        except OSError:
+            return None
+
+        digest = hashlib.blake2b(
+            repr((os.path.abspath(path), stat.st_mtime_ns, stat.st_size, self.variant)).encode(),  # noqa: PTH100
+            digest_size=16,
+        ).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.npy"
+
+    def get(self, path: str) -> np.ndarray | None:
+        """Look up the cached image of the given image file path.
+
+        Returns:
+            Read-only memory-mapped array if found, otherwise None.
+        """
+        if (cache_path := self._get_cache_path(path)) is None:
+            return None
+
+        try:
+            return np.load(cache_path, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            # Not cached yet or the file is broken
+            return None
+
+    def put(self, path: str, data: np.ndarray) -> bool:
+        """Store the decoded image of the given image file path.
+
+        Returns:
+            True if it is newly stored, otherwise False.
+        """
+        if (cache_path := self._get_cache_path(path)) is None or cache_path.exists():
+            return False
+
+        tmp_path = None
+        try:
+            if shutil.disk_usage(self.cache_dir).free < self.min_free_space + data.nbytes:
+                return False
+
+            cache_path.parent.mkdir(exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=cache_path.parent, suffix=".tmp", delete=False) as fp:
+                tmp_path = Path(fp.name)
+                np.save(fp, data, allow_pickle=False)
+            tmp_path.replace(cache_path)
+        except OSError as e:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Cannot store the decoded image of {path} in {self.cache_dir}: {e}")
+            return False
+
+        return True
+
+    def __repr__(self) -> str:
+        """Representation for the current handler status."""
+        return f"{self.__class__.__name__}(cache_dir={self.cache_dir}, variant={self.variant})"
@@ -18,6 +18,7 @@ from otx.core.data.entity.base import (
     OTXPredEntity,
     OTXPredEntityWithXAI,
 )
+from otx.core.data.entity.ragged import RaggedTensor, pack_ragged_fields
 from otx.core.data.entity.utils import register_pytree_node
 from otx.core.types.task import OTXTaskType
 
@@ -99,10 +100,26 @@ class DetBatchDataEntity(OTXBatchDataEntity[DetDataEntity]):
     def pin_memory(self) -> DetBatchDataEntity:
         """Pin memory for member tensor variables."""
         super().pin_memory()
-        self.bboxes = [tv_tensors.wrap(bbox.pin_memory(), like=bbox) for bbox in self.bboxes]
-        self.labels = [label.pin_memory() for label in self.labels]
+        self.bboxes = (
+            self.bboxes.pin_memory()
+            if isinstance(self.bboxes, RaggedTensor)
+            else [tv_tensors.wrap(bbox.pin_memory(), like=bbox) for bbox in self.bboxes]
+        )
+        self.labels = (
+            self.labels.pin_memory()
+            if isinstance(self.labels, RaggedTensor)
+            else [label.pin_memory() for label in self.labels]
+        )
         return self
 
+    def pack_ragged(self) -> DetBatchDataEntity:
+        """Pack the per-image `bboxes`, `labels` and `scores` of the predictions into `RaggedTensor`.
+
+        It is opt-in for the consumers processing a whole batch at once, e.g., `DetectionTileMerge`.
+        The packed fields can still be indexed and iterated as the lists of the tensors of each image.
+        """
+        return pack_ragged_fields(self, ("bboxes", "labels", "scores"))
+
 
 @dataclass
 class DetBatchPredEntity(DetBatchDataEntity, OTXBatchPredEntity):
@@ -13,6 +13,7 @@ from torchvision import tv_tensors
 from otx.core.types.task import OTXTaskType
 
 from .base import OTXBatchDataEntity, OTXBatchPredEntity, OTXBatchPredEntityWithXAI, OTXDataEntity, OTXPredEntity
+from .ragged import RaggedTensor, pack_ragged_fields
 
 if TYPE_CHECKING:
     from datumaro import Polygon
@@ -102,11 +103,27 @@ class InstanceSegBatchDataEntity(OTXBatchDataEntity[InstanceSegDataEntity]):
     def pin_memory(self) -> InstanceSegBatchDataEntity:
         """Pin memory for member tensor variables."""
         super().pin_memory()
-        self.bboxes = [tv_tensors.wrap(bbox.pin_memory(), like=bbox) for bbox in self.bboxes]
+        self.bboxes = (
+            self.bboxes.pin_memory()
+            if isinstance(self.bboxes, RaggedTensor)
+            else [tv_tensors.wrap(bbox.pin_memory(), like=bbox) for bbox in self.bboxes]
+        )
         self.masks = [tv_tensors.wrap(mask.pin_memory(), like=mask) for mask in self.masks]
-        self.labels = [label.pin_memory() for label in self.labels]
+        self.labels = (
+            self.labels.pin_memory()
+            if isinstance(self.labels, RaggedTensor)
+            else [label.pin_memory() for label in self.labels]
+        )
         return self
 
+    def pack_ragged(self) -> InstanceSegBatchDataEntity:
+        """Pack the per-image `bboxes`, `labels` and `scores` of the predictions into `RaggedTensor`.
+
+        It is opt-in for the consumers processing a whole batch at once, e.g., `DetectionTileMerge`.
+        The packed fields can still be indexed and iterated as the lists of the tensors of each image.
+        """
+        return pack_ragged_fields(self, ("bboxes", "labels", "scores"))
+
 
 @dataclass
 class InstanceSegBatchPredEntity(InstanceSegBatchDataEntity, OTXBatchPredEntity):
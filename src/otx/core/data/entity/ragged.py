@@ -0,0 +1,134 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Packed representation of the per-image tensors of a batch."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Any, Iterator, Sequence, overload
+
+import torch
+from torch import Tensor
+
+if TYPE_CHECKING:
+    from otx.core.data.entity.base import T_OTXBatchDataEntity
+
+
+class RaggedTensor(Sequence[Tensor]):
+    """Per-image tensors of a batch packed into a single tensor concatenated along the first dimension.
+
+    It is an opt-in replacement of `list[Tensor]` in the batch entities, e.g., the boxes, labels and scores
+    of each image, so that a whole batch can be processed by a single vectorized operation on `data`
+    with the image index of each row from `batch_index()`.
+    For compatibility, indexing and iterating it give the views of `data` for each image,
+    which are rebuilt as the original tv_tensors (e.g., `tv_tensors.BoundingBoxes` with its canvas size).
+
+    Args:
+        data: Tensor concatenated along the first dimension.
+        offsets: Offsets of the tensors of each image in `data` with the total length at the end.
+        tv_tensor_type: Type of the tensors of each image. Defaults to `Tensor`.
+        metas: Attributes of the tensors of each image to rebuild them as `tv_tensor_type`, e.g., `canvas_size`.
+    """
+
+    def __init__(
+        self,
+        data: Tensor,
+        offsets: list[int],
+        tv_tensor_type: type[Tensor] = Tensor,
+        metas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        self.data = data
+        self.offsets = offsets
+        self.tv_tensor_type = tv_tensor_type
+        self.metas = metas if metas is not None else [{} for _ in range(len(offsets) - 1)]
+
+    @classmethod
+    def from_tensors(cls, tensors: Sequence[Tensor]) -> RaggedTensor:
+        """Pack the tensors with the same trailing dimensions of each image into `RaggedTensor`."""
+        if isinstance(tensors, RaggedTensor):
+            return tensors
+        if len(tensors) == 0:
+            msg = "RaggedTensor needs at least one tensor to know the dtype and the trailing dimensions."
+            raise ValueError(msg)
+
+        offsets = [0]
+        for tensor in tensors:
+            offsets.append(offsets[-1] + len(tensor))
+        return cls(
+            data=torch.cat([tensor.as_subclass(Tensor) for tensor in tensors]),
+            offsets=offsets,
+            tv_tensor_type=type(tensors[0]),
+            metas=[dict(tensor.__dict__) for tensor in tensors],
+        )
+
+    @property
+    def lengths(self) -> Tensor:
+        """Number of rows of each image."""
+        return torch.diff(torch.tensor(self.offsets, device=self.data.device))
+
+    def batch_index(self) -> Tensor:
+        """Image index of each row of `data`."""
+        lengths = self.lengths
+        return torch.repeat_interleave(torch.arange(len(lengths), device=self.data.device), lengths)
+
+    def tolist(self) -> list[Tensor]:
+        """Unpack it into the list of the views for each image."""
+        return list(self)
+
+    def to(self, *args, **kwargs) -> RaggedTensor:
+        """Move the data to another device or convert its dtype as `Tensor.to` does."""
+        return RaggedTensor(self.data.to(*args, **kwargs), self.offsets, self.tv_tensor_type, self.metas)
+
+    def pin_memory(self) -> RaggedTensor:
+        """Pin the memory of the data."""
+        return RaggedTensor(self.data.pin_memory(), self.offsets, self.tv_tensor_type, self.metas)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> Tensor:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Tensor]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Tensor | list[Tensor]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        view = self.data[self.offsets[index] : self.offsets[index + 1]]
+        if self.tv_tensor_type is Tensor:
+            return view
+        view = view.as_subclass(self.tv_tensor_type)
+        view.__dict__.update(self.metas[index])
+        return view
+
+    def __iter__(self) -> Iterator[Tensor]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"RaggedTensor(lengths={self.lengths.tolist()}, data={self.data!r})"
+
+
+def pack_ragged_fields(entity: T_OTXBatchDataEntity, names: Sequence[str]) -> T_OTXBatchDataEntity:
+    """Return a copy of the batch entity whose given fields of the per-image tensors are packed into `RaggedTensor`.
+
+    The fields which are missing, empty or not the lists of tensors (e.g., tile batches without annotations)
+    are kept as they are.
+    """
+    fields = {
+        name: RaggedTensor.from_tensors(value)
+        for name in names
+        if isinstance(value := getattr(entity, name, None), (list, RaggedTensor))
+        and len(value) > 0
+        and all(isinstance(tensor, Tensor) for tensor in value)
+    }
+    return dataclasses.replace(entity, **fields)
@@ -85,8 +85,41 @@ class OTXTileBatchDataEntity(Generic[T_OTXBatchDataEntity]):
     batch_tile_attr_list: list[list[dict[str, int | str]]]
     imgs_info: list[ImageInfo]
 
-    def unbind(self) -> list[T_OTXBatchDataEntity]:
-        """Unbind batch data entity."""
+    @property
+    def tile_img_indices(self) -> list[int]:
+        """Index of the original image of each tile in the order of `unbind()`."""
+        return [img_idx for img_idx, tiles in enumerate(self.batch_tiles) for _ in tiles]
+
+    def unbind(self, batch_size: int | None = None) -> list[tuple[list[dict[str, int | str]], T_OTXBatchDataEntity]]:
+        """Flatten the tiles of all images in the batch and split them into micro-batches for inference.
+
+        Args:
+            batch_size (int | None): The number of tiles in each micro-batch.
+                If None, the number of images in the batch is used.
+
+        Returns:
+            list[tuple[list[dict[str, int | str]], T_OTXBatchDataEntity]]: The tile attributes and
+                the batch data entity of each micro-batch.
+        """
+        batch_size = batch_size or self.batch_size
+        tiles = [tile for tiles in self.batch_tiles for tile in tiles]
+        tile_infos = [tile_info for tile_infos in self.batch_tile_img_infos for tile_info in tile_infos]
+        tile_attr_list = [tile_attr for tile_attrs in self.batch_tile_attr_list for tile_attr in tile_attrs]
+
+        return [
+            (
+                tile_attr_list[i : i + batch_size],
+                self._create_tile_batch(tiles[i : i + batch_size], tile_infos[i : i + batch_size]),
+            )
+            for i in range(0, len(tiles), batch_size)
+        ]
+
+    def _create_tile_batch(
+        self,
+        tiles: list[tv_tensors.Image],
+        tile_infos: list[ImageInfo],
+    ) -> T_OTXBatchDataEntity:
+        """Create the batch data entity of a micro-batch of tiles."""
         raise NotImplementedError
 
 
@@ -102,27 +135,15 @@ class TileBatchDetDataEntity(OTXTileBatchDataEntity):
     bboxes: list[tv_tensors.BoundingBoxes]
     labels: list[LongTensor]
 
-    def unbind(self) -> list[tuple[list[dict[str, int | str]], DetBatchDataEntity]]:
-        """Unbind batch data entity for detection task."""
-        tiles = [tile for tiles in self.batch_tiles for tile in tiles]
-        tile_infos = [tile_info for tile_infos in self.batch_tile_img_infos for tile_info in tile_infos]
-        tile_attr_list = [tile_attr for tile_attrs in self.batch_tile_attr_list for tile_attr in tile_attrs]
-
-        batch_tile_attr_list = [
-            tile_attr_list[i : i + self.batch_size] for i in range(0, len(tile_attr_list), self.batch_size)
-        ]
-
-        batch_data_entities = [
-            DetBatchDataEntity(
-                batch_size=self.batch_size,
-                images=tiles[i : i + self.batch_size],
-                imgs_info=tile_infos[i : i + self.batch_size],
-                bboxes=[[] for _ in range(self.batch_size)],
-                labels=[[] for _ in range(self.batch_size)],
-            )
-            for i in range(0, len(tiles), self.batch_size)
-        ]
-        return list(zip(batch_tile_attr_list, batch_data_entities))
+    def _create_tile_batch(self, tiles: list[tv_tensors.Image], tile_infos: list[ImageInfo]) -> DetBatchDataEntity:
+        """Create the detection batch data entity of a micro-batch of tiles."""
+        return DetBatchDataEntity(
+            batch_size=len(tiles),
+            images=tiles,
+            imgs_info=tile_infos,
+            bboxes=[[] for _ in tiles],
+            labels=[[] for _ in tiles],
+        )
 
     @classmethod
     def collate_fn(cls, batch_entities: list[TileDetDataEntity]) -> TileBatchDetDataEntity:
@@ -194,28 +215,21 @@ class TileBatchInstSegDataEntity(OTXTileBatchDataEntity):
     masks: list[tv_tensors.Mask]
     polygons: list[list[Polygon]]
 
-    def unbind(self) -> list[tuple[list[dict[str, int | str]], InstanceSegBatchDataEntity]]:
-        """Unbind batch data entity for instance segmentation task."""
-        tiles = [tile for tiles in self.batch_tiles for tile in tiles]
-        tile_infos = [tile_info for tile_infos in self.batch_tile_img_infos for tile_info in tile_infos]
-        tile_attr_list = [tile_attr for tile_attrs in self.batch_tile_attr_list for tile_attr in tile_attrs]
-
-        batch_tile_attr_list = [
-            tile_attr_list[i : i + self.batch_size] for i in range(0, len(tile_attr_list), self.batch_size)
-        ]
-        batch_data_entities = [
-            InstanceSegBatchDataEntity(
-                batch_size=self.batch_size,
-                images=tiles[i : i + self.batch_size],
-                imgs_info=tile_infos[i : i + self.batch_size],
-                bboxes=[[] for _ in range(self.batch_size)],
-                labels=[[] for _ in range(self.batch_size)],
-                masks=[[] for _ in range(self.batch_size)],
-                polygons=[[] for _ in range(self.batch_size)],
-            )
-            for i in range(0, len(tiles), self.batch_size)
-        ]
-        return list(zip(batch_tile_attr_list, batch_data_entities))
+    def _create_tile_batch(
+        self,
+        tiles: list[tv_tensors.Image],
+        tile_infos: list[ImageInfo],
+    ) -> InstanceSegBatchDataEntity:
+        """Create the instance segmentation batch data entity of a micro-batch of tiles."""
+        return InstanceSegBatchDataEntity(
+            batch_size=len(tiles),
+            images=tiles,
+            imgs_info=tile_infos,
+            bboxes=[[] for _ in tiles],
+            labels=[[] for _ in tiles],
+            masks=[[] for _ in tiles],
+            polygons=[[] for _ in tiles],
+        )
 
     @classmethod
     def collate_fn(cls, batch_entities: list[TileInstSegDataEntity]) -> TileBatchInstSegDataEntity:
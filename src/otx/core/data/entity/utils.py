@@ -14,7 +14,7 @@ from torchvision import tv_tensors
 from torchvision.utils import _log_api_usage_once
 
 if TYPE_CHECKING:
-    from otx.core.data.entity.base import Points, T_OTXDataEntity  # noqa: TCH004
+    from otx.core.data.entity.base import ImageInfo, Points, T_OTXDataEntity  # noqa: TCH004
 
 
 def register_pytree_node(cls: type[T_OTXDataEntity]) -> type[T_OTXDataEntity]:
@@ -71,3 +71,68 @@ def clamp_points(inpt: Tensor, canvas_size: tuple[int, int] | None = None) -> Te
         raise TypeError(  # noqa: TRY003
             f"Input can either be a plain tensor or a point tv_tensor, but got {type(inpt)} instead.",  # noqa: EM102
         )
+
+
+def normalize_images(
+    images: list[tv_tensors.Image] | tv_tensors.Image,
+    imgs_info: list[ImageInfo],
+) -> list[tv_tensors.Image] | tv_tensors.Image:
+    """Cast and normalize the images whose normalization is deferred to the model.
+
+    The dataset keeps the images in uint8 and records the mean and standard deviation to normalize them
+    in their `ImageInfo` with `normalized=False` (see `DataModuleConfig.defer_normalization`).
+    They are normalized with a single fused multiply-add over the batch, on the device of the images.
+    The images already normalized or without the deferred mean and standard deviation are returned as they are.
+
+    Args:
+        images: Stacked image tensor (B x ... x C x H x W) or list of image tensors (... x C x H x W).
+        imgs_info: Meta information of the images.
+
+    Returns:
+        Normalized float32 images of the same structure as `images`.
+    """
+    pending = [
+        not img_info.normalized and (img_info.norm_mean != (0.0, 0.0, 0.0) or img_info.norm_std != (1.0, 1.0, 1.0))
+        for img_info in imgs_info
+    ]
+    if not any(pending):
+        return images
+
+    device = images.device if isinstance(images, Tensor) else images[0].device
+    means = torch.tensor(
+        [img_info.norm_mean if is_pending else (0.0, 0.0, 0.0) for img_info, is_pending in zip(imgs_info, pending)],
+        dtype=torch.float32,
+    )
+    stds = torch.tensor(
+        [img_info.norm_std if is_pending else (1.0, 1.0, 1.0) for img_info, is_pending in zip(imgs_info, pending)],
+        dtype=torch.float32,
+    )
+    # (x - mean) / std = x * (1 / std) + (-mean / std)
+    scales = stds.reciprocal().to(device, non_blocking=True)
+    shifts = (-means / stds).to(device, non_blocking=True)
+
+    if isinstance(images, Tensor):
+        shape = (len(imgs_info),) + (1,) * (images.ndim - 4) + (-1, 1, 1)
+        output = torch.addcmul(
+            shifts.view(shape),
+            images.as_subclass(Tensor).to(torch.float32),
+            scales.view(shape),
+        )
+        normalized: list[tv_tensors.Image] | tv_tensors.Image = tv_tensors.wrap(output, like=images)
+    else:
+        normalized = [
+            tv_tensors.wrap(
+                torch.addcmul(
+                    shift.view(-1, 1, 1),
+                    image.as_subclass(Tensor).to(torch.float32),
+                    scale.view(-1, 1, 1),
+                ),
+                like=image,
+            )
+            for image, scale, shift in zip(images, scales, shifts)
+        ]
+
+    for img_info, is_pending in zip(imgs_info, pending):
+        if is_pending:
+            img_info.normalized = True
+    return normalized
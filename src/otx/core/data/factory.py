@@ -5,7 +5,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from otx.core.types.task import OTXTaskType
 from otx.core.types.transformer_libs import TransformLibType
@@ -13,9 +13,12 @@ from otx.core.types.transformer_libs import TransformLibType
 from .dataset.base import OTXDataset, Transforms
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from datumaro import DatasetSubset
 
     from otx.core.config.data import DataModuleConfig, SubsetConfig
+    from otx.core.data.annotation_index import AnnotationIndex
     from otx.core.data.mem_cache import MemCacheHandlerBase
 
 
@@ -28,35 +31,55 @@ class TransformLibFactory:
     @classmethod
     def generate(cls: type[TransformLibFactory], config: SubsetConfig) -> Transforms:
         """Create transforms from factory."""
+        return cls._get_transform_lib(config).generate(config)
+
+    @classmethod
+    def count_deterministic_prefix(cls: type[TransformLibFactory], config: SubsetConfig, transforms: Transforms) -> int:
+        """Count the leading transforms whose outputs can be cached instead of being computed on every access."""
+        return cls._get_transform_lib(config).count_deterministic_prefix(transforms)
+
+    @classmethod
+    def defer_normalization(cls: type[TransformLibFactory], config: SubsetConfig, transforms: Transforms) -> Transforms:
+        """Defer the normalization of the images to the model, so that the dataset keeps them in uint8.
+
+        Only the TorchVision pipelines normalize the images in the dataset.
+        The others keep them as they are and the data preprocessor of the model normalizes them.
+        """
+        if config.transform_lib_type != TransformLibType.TORCHVISION:
+            return transforms
+        return cls._get_transform_lib(config).defer_normalization(transforms)
+
+    @classmethod
+    def _get_transform_lib(cls: type[TransformLibFactory], config: SubsetConfig) -> Any:  # noqa: ANN401
         if config.transform_lib_type == TransformLibType.TORCHVISION:
             from .transform_libs.torchvision import TorchVisionTransformLib
 
-            return TorchVisionTransformLib.generate(config)
+            return TorchVisionTransformLib
 
         if config.transform_lib_type == TransformLibType.MMCV:
             from .transform_libs.mmcv import MMCVTransformLib
 
-            return MMCVTransformLib.generate(config)
+            return MMCVTransformLib
 
         if config.transform_lib_type == TransformLibType.MMPRETRAIN:
             from .transform_libs.mmpretrain import MMPretrainTransformLib
 
-            return MMPretrainTransformLib.generate(config)
+            return MMPretrainTransformLib
 
         if config.transform_lib_type == TransformLibType.MMDET:
             from .transform_libs.mmdet import MMDetTransformLib
 
-            return MMDetTransformLib.generate(config)
+            return MMDetTransformLib
 
         if config.transform_lib_type == TransformLibType.MMSEG:
             from .transform_libs.mmseg import MMSegTransformLib
 
-            return MMSegTransformLib.generate(config)
+            return MMSegTransformLib
 
         if config.transform_lib_type == TransformLibType.MMACTION:
             from .transform_libs.mmaction import MMActionTransformLib
 
-            return MMActionTransformLib.generate(config)
+            return MMActionTransformLib
 
         raise NotImplementedError(config.transform_lib_type)
 
@@ -72,9 +95,19 @@ class OTXDatasetFactory:
         mem_cache_handler: MemCacheHandlerBase,
         cfg_subset: SubsetConfig,
         cfg_data_module: DataModuleConfig,
+        annotation_index: AnnotationIndex | None = None,
+        label_map_dir: str | Path | None = None,
+        proposal_dir: str | Path | None = None,
     ) -> OTXDataset:
         """Create OTXDataset."""
         transforms = TransformLibFactory.generate(cfg_subset)
+        if cfg_data_module.defer_normalization:
+            transforms = TransformLibFactory.defer_normalization(cfg_subset, transforms)
+        num_deterministic_transforms = (
+            TransformLibFactory.count_deterministic_prefix(cfg_subset, transforms)
+            if cfg_data_module.mem_cache_transform_outputs
+            else 0
+        )
         common_kwargs = {
             "dm_subset": dm_subset,
             "transforms": transforms,
@@ -82,6 +115,8 @@ class OTXDatasetFactory:
             "mem_cache_img_max_size": cfg_data_module.mem_cache_img_max_size,
             "image_color_channel": cfg_data_module.image_color_channel,
             "stack_images": cfg_data_module.stack_images,
+            "num_deterministic_transforms": num_deterministic_transforms,
+            "annotation_index": annotation_index,
         }
 
         if task in (
@@ -123,7 +158,7 @@ class OTXDatasetFactory:
         if task == OTXTaskType.SEMANTIC_SEGMENTATION:
             from .dataset.segmentation import OTXSegmentationDataset
 
-            return OTXSegmentationDataset(**common_kwargs)
+            return OTXSegmentationDataset(label_map_dir=label_map_dir, **common_kwargs)
 
         if task == OTXTaskType.ACTION_CLASSIFICATION:
             from .dataset.action_classification import OTXActionClsDataset
@@ -133,7 +168,7 @@ class OTXDatasetFactory:
         if task == OTXTaskType.ACTION_DETECTION:
             from .dataset.action_detection import OTXActionDetDataset
 
-            return OTXActionDetDataset(**common_kwargs)
+            return OTXActionDetDataset(proposal_dir=proposal_dir, **common_kwargs)
 
         if task == OTXTaskType.VISUAL_PROMPTING:
             from .dataset.visual_prompting import OTXVisualPromptingDataset
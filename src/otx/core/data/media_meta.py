@@ -0,0 +1,255 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Metadata of the media files, e.g., image sizes and video frame counts, obtained without decoding them."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, ClassVar
+
+from datumaro.components.media import ImageFromFile
+
+from otx.core.data.video import probe_num_frames
+
+if TYPE_CHECKING:
+    from datumaro.components.media import MediaElement, Video
+
+logger = logging.getLogger()
+
+__all__ = ["MediaMetaCache", "probe_image_size"]
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Start of frame markers of JPEG except DHT (0xC4), JPG (0xC8) and DAC (0xCC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without the segment length: TEM, RST0-7, SOI and EOI
+_JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xDA)])
+_TIFF_IMAGE_WIDTH = 256
+_TIFF_IMAGE_LENGTH = 257
+_TIFF_SHORT = 3
+_TIFF_LONG = 4
+
+
+def probe_image_size(path: str | Path) -> tuple[int, int] | None:
+    """Get the (height, width) of a JPEG, PNG, TIFF or BMP image from its header without decoding it.
+
+    The size is the one of the stored pixels, i.e., the EXIF orientation is not applied,
+    as the image backends of Datumaro decode the image.
+
+    Returns:
+        (height, width) of the image or None if the format is not supported or the header is broken.
+    """
+    try:
+        with Path(path).open("rb") as fp:
+            head = fp.read(32)
+            if head.startswith(_PNG_SIGNATURE):
+                return _probe_png(head)
+            if head.startswith(b"\xff\xd8"):
+                return _probe_jpeg(fp)
+            if head[:4] in (b"II*\x00", b"MM\x00*"):
+                return _probe_tiff(fp, head)
+            if head.startswith(b"BM"):
+                return _probe_bmp(head)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def _probe_png(head: bytes) -> tuple[int, int] | None:
+    # The first chunk is always IHDR: length (4), type (4), width (4) and height (4)
+    if head[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", head[16:24])
+    return height, width
+
+
+def _probe_jpeg(fp: IO[bytes]) -> tuple[int, int] | None:
+    fp.seek(2)
+    while True:
+        byte = fp.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            # Not a marker, e.g., the entropy-coded data
+            continue
+        marker = fp.read(1)
+        while marker == b"\xff":
+            # Fill bytes
+            marker = fp.read(1)
+        if not marker:
+            return None
+        if marker[0] in _JPEG_STANDALONE_MARKERS or marker[0] == 0x00:
+            continue
+        (length,) = struct.unpack(">H", fp.read(2))
+        if marker[0] in _JPEG_SOF_MARKERS:
+            # Precision (1), height (2) and width (2)
+            _, height, width = struct.unpack(">BHH", fp.read(5))
+            return (height, width) if height > 0 and width > 0 else None
+        fp.seek(length - 2, os.SEEK_CUR)
+
+
+def _probe_tiff(fp: IO[bytes], head: bytes) -> tuple[int, int] | None:
+    endian = "<" if head[:2] == b"II" else ">"
+    (ifd_offset,) = struct.unpack(f"{endian}I", head[4:8])
+    fp.seek(ifd_offset)
+    (num_entries,) = struct.unpack(f"{endian}H", fp.read(2))
+    entries = fp.read(12 * num_entries)
+
+    values: dict[int, int] = {}
+    for i in range(num_entries):
+        tag, value_type, _ = struct.unpack(f"{endian}HHI", entries[12 * i : 12 * i + 8])
+        if tag in (_TIFF_IMAGE_WIDTH, _TIFF_IMAGE_LENGTH):
+            if value_type not in (_TIFF_SHORT, _TIFF_LONG):
+                return None
+            # The value fits in the entry and is left-justified
+            fmt = f"{endian}H" if value_type == _TIFF_SHORT else f"{endian}I"
+            (values[tag],) = struct.unpack_from(fmt, entries, 12 * i + 8)
+
+    if _TIFF_IMAGE_WIDTH not in values or _TIFF_IMAGE_LENGTH not in values:
+        return None
+    return values[_TIFF_IMAGE_LENGTH], values[_TIFF_IMAGE_WIDTH]
+
+
+def _probe_bmp(head: bytes) -> tuple[int, int] | None:
+    (header_size,) = struct.unpack("<I", head[14:18])
+    if header_size == 12:
+        # BITMAPCOREHEADER
+        width, height = struct.unpack("<HH", head[18:22])
+    else:
+        # The height is negative for the top-down bitmap
+        width, height = struct.unpack("<ii", head[18:26])
+    return abs(height), width
+
+
+class MediaMetaCache:
+    """Per-dataset cache of the image sizes and the video frame counts.
+
+    Getting the size of `ImageFromFile` decodes the whole image and counting the frames of `Video`
+    decodes the whole video. This cache probes the image size from the file header
+    and the frame count from the video container instead, and gets them only once.
+    The results are appended to a JSON lines file, e.g., `media_meta.jsonl` in the dataset cache directory,
+    so that they are free for the next runs and for the other processes such as the data loader workers.
+    Each entry is keyed by the path of the media file with its modification time and size,
+    so that it is invalidated automatically if the file is modified.
+    A line is appended by a single `write()` in the append mode,
+    so that the concurrent writers are safe without any lock.
+
+    Args:
+        path: JSON lines file to persist the metadata. If None, it is kept in memory only.
+    """
+
+    _current: ClassVar[MediaMetaCache | None] = None
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._entries: dict[tuple, tuple[int, int, Any]] = {}
+        self._fd: int | None = None
+        self._fd_pid: int | None = None
+        if self.path is not None:
+            self._load()
+
+    @classmethod
+    def current(cls) -> MediaMetaCache:
+        """Get the cache of the current dataset. It is an in-memory cache if no cache has been set."""
+        if cls._current is None:
+            cls._current = cls()
+        return cls._current
+
+    @classmethod
+    def set_current(cls, cache: MediaMetaCache | None) -> None:
+        """Set the cache of the current dataset, which is inherited by the data loader workers."""
+        cls._current = cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_image_size(self, media: MediaElement) -> tuple[int, int] | None:
+        """Get the (height, width) of the image without decoding it.
+
+        Returns:
+            (height, width) of the image or None if it cannot be obtained without decoding the image.
+        """
+        if getattr(media, "has_size", False):
+            return media.size
+        if not isinstance(media, ImageFromFile):
+            return None
+        return self._get(("image_size", media.path), lambda: probe_image_size(media.path))
+
+    def get_num_frames(self, video: Video) -> int:
+        """Get the number of the frames of the video.
+
+        It is read from the container if available. Otherwise, the frames are counted by decoding them.
+        """
+        # The frames depend on the range and the step of the video
+        clip = (video._start_frame, video._end_frame, video._step)  # noqa: SLF001
+
+        def _count() -> int:
+            if clip == (0, None, 1) and (num_frames := probe_num_frames(video.path)) is not None:
+                return num_frames
+            return sum(1 for _ in video)
+
+        return self._get(("num_frames", video.path, *clip), _count)
+
+    def _get(self, key: tuple, compute: Callable[[], Any]) -> Any:  # noqa: ANN401
+        try:
+            stat = os.stat(key[1])  # noqa: PTH116
+        except OSError:
+            return compute()
+
+        if (entry := self._entries.get(key)) is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+            return entry[2]
+
+        value = compute()
+        if value is not None:
+            self._entries[key] = (stat.st_mtime_ns, stat.st_size, value)
+            self._append({"key": key, "mtime": stat.st_mtime_ns, "size": stat.st_size, "value": value})
+        return value
+
+    def _load(self) -> None:
+        try:
+            with self.path.open(encoding="utf-8") as fp:  # type: ignore[union-attr]
+                lines = fp.readlines()
+        except OSError:
+            return
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+                value = record["value"]
+                self._entries[tuple(record["key"])] = (
+                    record["mtime"],
+                    record["size"],
+                    tuple(value) if isinstance(value, list) else value,
+                )
+            except (ValueError, KeyError, TypeError):  # noqa: PERF203
+                # The last line can be partial if a writer was killed
+                continue
+        logger.info(f"Load the metadata of {len(self._entries)} media files from {self.path}.")
+
+    def _append(self, record: dict[str, Any]) -> None:
+        if self.path is None:
+            return
+
+        try:
+            # The file descriptor inherited from the parent process is not shared
+            if self._fd is None or self._fd_pid != os.getpid():
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                self._fd_pid = os.getpid()
+            os.write(self._fd, (json.dumps(record) + "\n").encode())
+        except OSError as e:
+            logger.warning(f"Cannot store the media metadata in {self.path}: {e}")
+            self.path = None
+
+    def close(self) -> None:
+        """Close the file to append the metadata."""
+        if self._fd is not None and self._fd_pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+
+    def __del__(self) -> None:
+        self.close()
@@ -5,34 +5,73 @@
 
 from __future__ import annotations
 
+import contextlib
 import ctypes as ct
+import hashlib
 import logging
+import mmap
 import multiprocessing as mp
+import os
+import pickle
 import re
 import signal
-from typing import TYPE_CHECKING, Any, ClassVar
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from contextvars import ContextVar
+from enum import IntEnum
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, Iterator
 
 import numpy as np
 import psutil
 
+from otx.core.data.mem_cache_codec import MEM_CACHE_CODECS, MemCacheCodecBase
 from otx.utils import append_signal_handler
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
     from multiprocessing.synchronize import Lock
 
+    from otx.core.data.disk_cache import DiskCacheHandler
+
 logger = logging.getLogger()
 
 GIB = 1024**3
+# File system backing the named shared memory on Linux
+_SHM_DIR = "/dev/shm"  # noqa: S108
 
 __all__ = [
     "MemCacheHandlerSingleton",
+    "SharedMemoryIndex",
+    "EvictionPolicyBase",
+    "LRUEvictionPolicy",
+    "CLOCKEvictionPolicy",
+    "FrequencyEvictionPolicy",
+    "EVICTION_POLICIES",
     "MemCacheHandlerBase",
     "NULL_MEM_CACHE_HANDLER",
     "MemCacheHandlerError",
+    "MEM_CACHE_ENTRY_KINDS",
     "parse_mem_cache_size_to_int",
 ]
 
+# Kinds of the cache lookups whose statistics are counted separately.
+# "prefetch" is the lookups of the images made ahead by `ImagePrefetcher`, not by the dataset itself.
+MEM_CACHE_ENTRY_KINDS = ("image", "video_frame", "label_map", "transform_outputs", "prefetch")
+# Kinds of the items which the lossy codec may encode. The others, e.g., the label maps, are never encoded lossily.
+_LOSSY_CODEC_KIND_INDICES = frozenset(
+    MEM_CACHE_ENTRY_KINDS.index(kind) for kind in ("image", "video_frame", "prefetch")
+)
+
 
 def parse_mem_cache_size_to_int(mem_cache_size: str) -> int:
     """Parse memory size string to integer.
@@ -68,36 +107,718 @@ def parse_mem_cache_size_to_int(mem_cache_size: str) -> int:
     return number * units[unit]
 
 
-class _DummyLock:
-    def __enter__(self, *args, **kwargs):
-        pass
+class MemCacheHandlerError(Exception):
+    """Exception class for MemCacheHandler."""
+
+
+class _SharedMemoryArena:
+    """Carve the shared data structures of the memory cache handler out of a named shared memory.
+
+    The data structures are allocated one after another in the order of their creation.
+    Because the handler creates them in the same order in every process,
+    any process on the node can map them by attaching to the shared memory with its name,
+    i.e., it does not need to inherit them from the creator process by fork.
+    The first `ALIGN` bytes are reserved for the header, see `MemCacheHandlerForMP`.
+
+    Args:
+        shm: Named shared memory to allocate on. If None, it only measures the required size
+            and allocates on the anonymous memory which is not committed until it is written.
+        create: If True, initialize the allocated values. Otherwise, they are already initialized by the creator.
+    """
+
+    ALIGN: ClassVar[int] = 64
+
+    def __init__(self, shm: SharedMemory | None = None, create: bool = True) -> None:
+        # Map it apart from `shm.buf`, otherwise `SharedMemory.__del__()` fails to close it
+        # while the allocated objects are alive.
+        self.buf = mmap.mmap(shm._fd, shm.size) if shm is not None else None  # noqa: SLF001
+        self.create = create
+        self.nbytes = self.ALIGN
+
+    @property
+    def header(self) -> np.ndarray:
+        """Header of the shared memory."""
+        if self.buf is None:
+            return np.zeros(self.ALIGN // 8, dtype=np.uint64)
+        return np.frombuffer(self.buf, dtype=np.uint64, count=self.ALIGN // 8)
+
+    def new(self, ctype: type) -> Any:  # noqa: ANN401
+        """Allocate a zero-initialized ctypes object of the given type."""
+        size = ct.sizeof(ctype)
+        offset = self.nbytes
+        self.nbytes += -(-size // self.ALIGN) * self.ALIGN
+        if self.buf is None:
+            return ctype.from_buffer(mmap.mmap(-1, max(size, 1)))
+        return ctype.from_buffer(self.buf, offset)
+
+
+_ARENA: ContextVar[_SharedMemoryArena | None] = ContextVar("_ARENA", default=None)
+
+
+@contextlib.contextmanager
+def _allocate_on(arena: _SharedMemoryArena) -> Iterator[_SharedMemoryArena]:
+    """Allocate the shared data structures on the given arena instead of `multiprocessing.sharedctypes`."""
+    token = _ARENA.set(arena)
+    try:
+        yield arena
+    finally:
+        _ARENA.reset(token)
+
+
+def _new_ctypes_array(ctype: type, size: int, shared: bool) -> Any:  # noqa: ANN401
+    """Allocate a zero-initialized ctypes array on the shared memory if `shared`, otherwise on the private memory."""
+    if shared and (arena := _ARENA.get()) is not None:
+        return arena.new(ctype * size)
+    return mp.Array(ctype, size, lock=False) if shared else (ctype * size)()
+
+
+def _new_array(ctype: type, size: int, shared: bool) -> np.ndarray:
+    """Allocate a zero-initialized numpy array on the shared memory if `shared`, otherwise on the private memory."""
+    return np.frombuffer(_new_ctypes_array(ctype, size, shared), dtype=np.dtype(ctype))
+
+
+def _new_value(ctype: type, value: Any, shared: bool) -> Any:  # noqa: ANN401
+    """Allocate a ctypes value on the shared memory if `shared`, otherwise on the private memory."""
+    if shared and (arena := _ARENA.get()) is not None:
+        obj = arena.new(ctype)
+        if arena.create:
+            obj.value = value
+        return obj
+    return mp.Value(ctype, value, lock=False) if shared else ctype(value)
+
+
+class _FileLock:
+    """Inter-process lock on a lock file which any process on the node can acquire by its path.
+
+    Unlike `multiprocessing.Lock`, it does not need to be inherited from the creator process.
+    The lock file is reopened in every process because `flock()` on the inherited file descriptor
+    is shared with the parent process. It also serializes the threads in the same process.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._pid = -1
+        self._fd = -1
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self) -> None:
+        if self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+            self._thread_lock = threading.Lock()
+        self._thread_lock.acquire()
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *args) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+_EMPTY = 0
+_TOMBSTONE = 1
+
+
+class _Stat(IntEnum):
+    """Column index of the statistics array of the memory cache handler."""
+
+    HIT = 0
+    MISS = 1
+    DISK_HIT = 2
+    HIT_BYTES = 3
+    INSERT = 4
+    REJECT = 5
+    ENCODE = 6
+    ENCODE_TIME = 7
+    RAW_BYTES = 8
+    ENCODED_BYTES = 9
+    DECODE = 10
+    DECODE_TIME = 11
+    LOAD = 12
+    LOAD_TIME = 13
+
+
+def _hash_key(key: Any) -> int:  # noqa: ANN401
+    """Hash the given key to a 64-bit integer which is stable across processes.
+
+    Python's builtin `hash()` is salted per interpreter for `str`, so it cannot be used
+    to look up the shared index from a spawned process.
+    The returned value is never `_EMPTY` or `_TOMBSTONE`.
+    """
+    return _hash_key_with_check(key)[0]
+
+
+def _hash_key_with_check(key: Any) -> tuple[int, int]:  # noqa: ANN401
+    """Hash the given key to the key hash of `_hash_key()` and an independent 64-bit check value.
+
+    The key type is hashed along with its `repr()`, e.g., `1` and `"1"` are different keys.
+    The index verifies the check value of an entry found by the key hash, so that two keys are confused
+    only if both 64-bit values collide, i.e., with the probability about `n^2 / 2^129` for `n` keys.
+    """
+    data = f"{type(key).__module__}.{type(key).__qualname__}:{key!r}".encode()
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return max(int.from_bytes(digest[:8], "little"), _TOMBSTONE + 1), int.from_bytes(digest[8:], "little")
+
+
+class SharedMemoryIndex:
+    """Open-addressing hash table living in the shared memory.
+
+    It maps a key to a picklable value (the address of the cached item).
+    The hash table slots point to the entries, and every entry has a fixed size record
+    to store its pickled value, so that the entry of the removed key can be reused.
+    Every entry also stores the check value of its key given by `_hash_key_with_check()`,
+    which is verified on a lookup to tell the keys with the same key hash apart.
+    A lookup is a linear probing over the slots, so that it never leaves the calling process.
+    On the other hand, an insertion or removal should be protected by the external lock of the handler.
+
+    Each entry has a version number which is odd while the entry is being written or freed
+    (a seqlock). A lock-free reader should check the entry version with `validate()`
+    after it finishes to read the data associated with the entry.
+
+    Args:
+        capacity: The maximum number of keys to store. The number of slots is twice of it.
+        value_bytes: The maximum size of the pickled value (bytes).
+        shared: If True, allocate the table in the shared memory, so that it can be shared with the forked processes.
+    """
+
+    def __init__(self, capacity: int, value_bytes: int = 128, shared: bool = True) -> None:
+        num_slots = 1 << max(2 * capacity - 1, 1).bit_length()
+
+        self._slot_keys = _new_array(ct.c_uint64, num_slots, shared)
+        self._slot_entries = _new_array(ct.c_uint64, num_slots, shared)
+
+        self._entry_keys = _new_array(ct.c_uint64, capacity, shared)
+        self._entry_checks = _new_array(ct.c_uint64, capacity, shared)
+        self._entry_versions = _new_array(ct.c_uint64, capacity, shared)
+        self._value_lens = _new_array(ct.c_uint32, capacity, shared)
+        self._values = _new_array(ct.c_uint8, capacity * value_bytes, shared)
+        self._free_entries = _new_array(ct.c_uint64, capacity, shared)
+
+        self._num_free = _new_value(ct.c_size_t, 0, shared)
+        self._num_used = _new_value(ct.c_size_t, 0, shared)
+        self._num_items = _new_value(ct.c_size_t, 0, shared)
+        self._num_tombstones = _new_value(ct.c_size_t, 0, shared)
+
+        self._capacity = capacity
+        self._value_bytes = value_bytes
+        self._num_slots = num_slots
+        self._mask = num_slots - 1
+
+    def __len__(self) -> int:
+        """Get the number of stored keys."""
+        return self._num_items.value
+
+    @property
+    def capacity(self) -> int:
+        """Get the maximum number of keys to store."""
+        return self._capacity
+
+    @property
+    def full(self) -> bool:
+        """True if no more keys can be inserted."""
+        return self._num_items.value >= self._capacity
+
+    @property
+    def entry_keys(self) -> np.ndarray:
+        """Key hashes of the entries. It is `_EMPTY` for the unused entry."""
+        return self._entry_keys
+
+    def _probe(self, key_hash: int) -> tuple[int, int]:
+        """Find the slot of the given key hash.
+
+        Returns:
+            A tuple of the slot having the key hash (-1 if not found) and
+            the first free slot (empty or tombstone) in its probing sequence.
+        """
+        idx = key_hash & self._mask
+        free_slot = -1
+        for _ in range(self._num_slots):
+            slot_key = int(self._slot_keys[idx])
+            if slot_key == key_hash:
+                return idx, free_slot
+            if slot_key == _EMPTY:
+                return -1, idx if free_slot < 0 else free_slot
+            if slot_key == _TOMBSTONE and free_slot < 0:
+                free_slot = idx
+            idx = (idx + 1) & self._mask
+        return -1, free_slot
+
+    def lookup(self, key_hash: int, key_check: int = 0) -> tuple[int, int, Any] | None:
+        """Look up the entry of the given key hash without any lock.
+
+        Args:
+            key_hash: Key hash to find the entry.
+            key_check: Check value of the key given at the insertion.
+
+        Returns:
+            A tuple of the entry, its version and the stored value if found, otherwise None.
+        """
+        slot, _ = self._probe(key_hash)
+        if slot < 0:
+            return None
+
+        entry = int(self._slot_entries[slot])
+        version = int(self._entry_versions[entry])
+        if version & 1 or int(self._entry_keys[entry]) != key_hash or int(self._entry_checks[entry]) != key_check:
+            return None
+
+        start = entry * self._value_bytes
+        try:
+            value = pickle.loads(self._values[start : start + int(self._value_lens[entry])].data)  # noqa: S301
+        except Exception:
+            # The entry is being overwritten by another process
+            return None
+
+        return (entry, version, value) if self.validate(entry, version) else None
 
-    def __exit__(self, *args, **kwargs):
-        pass
+    def validate(self, entry: int, version: int) -> bool:
+        """Return true if the entry has not been changed since the given version was read."""
+        return int(self._entry_versions[entry]) == version
+
+    def get(self, key: Any, default: Any = None) -> Any:  # noqa: ANN401
+        """Look up the value of the given key without any lock."""
+        found = self.lookup(*_hash_key_with_check(key))
+        return default if found is None else found[2]
+
+    def insert(self, key_hash: int, value: Any, key_check: int = 0) -> int:  # noqa: ANN401
+        """Store the value with the given key hash. The caller should hold the handler's lock.
+
+        Args:
+            key_hash: Key hash to store the value.
+            value: Picklable value to store.
+            key_check: Check value of the key to be verified by `lookup()`.
+
+        Returns:
+            The entry assigned to the key.
+
+        Raises:
+            MemCacheHandlerError: If there is no space left in the table, the value is too large
+                or another key having the same key hash is stored.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self._value_bytes:
+            msg = f"The value is too large ({len(blob)} > {self._value_bytes} bytes) to store in the index."
+            raise MemCacheHandlerError(msg)
+
+        slot, _ = self._probe(key_hash)
+        if slot >= 0 and int(self._entry_checks[int(self._slot_entries[slot])]) != key_check:
+            # Its memory is still owned by the other key, so that it should not be overwritten
+            msg = "Another key having the same key hash is stored in the index."
+            raise MemCacheHandlerError(msg)
+
+        self.remove(key_hash)
+
+        if self.full:
+            msg = "The index of the memory pool reaches its limit."
+            raise MemCacheHandlerError(msg)
+
+        if self._num_free.value > 0:
+            self._num_free.value -= 1
+            entry = int(self._free_entries[self._num_free.value])
+        else:
+            entry = self._num_used.value
+            self._num_used.value += 1
+
+        if self._entry_versions[entry] % 2 == 0:
+            self._entry_versions[entry] += 1
+
+        start = entry * self._value_bytes
+        self._values[start : start + len(blob)] = np.frombuffer(blob, dtype=np.uint8)
+        self._value_lens[entry] = len(blob)
+        self._entry_keys[entry] = key_hash
+        self._entry_checks[entry] = key_check
+        self._entry_versions[entry] += 1
+
+        _, slot = self._probe(key_hash)
+        if self._slot_keys[slot] == _TOMBSTONE:
+            self._num_tombstones.value -= 1
+        # Publish the key hash at last, so that the reader can see the slot after it is fully written.
+        self._slot_entries[slot] = entry
+        self._slot_keys[slot] = key_hash
+        self._num_items.value += 1
+
+        return entry
+
+    def remove(self, key_hash: int) -> int:
+        """Remove the given key hash. The caller should hold the handler's lock.
+
+        Returns:
+            The entry which was assigned to the key, or -1 if there is no such key.
+        """
+        slot, _ = self._probe(key_hash)
+        if slot < 0:
+            return -1
+
+        entry = int(self._slot_entries[slot])
+        self._entry_versions[entry] += 1
+        self._slot_keys[slot] = _TOMBSTONE
+        self._entry_keys[entry] = _EMPTY
+        self._free_entries[self._num_free.value] = entry
+        self._num_free.value += 1
+        self._num_items.value -= 1
+        self._num_tombstones.value += 1
+
+        if self._num_tombstones.value > self._num_slots // 4:
+            self._rehash()
+
+        return entry
+
+    def _rehash(self) -> None:
+        """Rebuild the slots to get rid of the tombstones.
+
+        A lock-free reader can miss a key during the rebuild, but it never reads a wrong entry
+        since `lookup()` checks the key hash of the entry.
+        """
+        self._slot_keys[:] = _EMPTY
+        for entry in np.flatnonzero(self._entry_keys != _EMPTY):
+            key_hash = int(self._entry_keys[entry])
+            _, slot = self._probe(key_hash)
+            self._slot_entries[slot] = entry
+            self._slot_keys[slot] = key_hash
+        self._num_tombstones.value = 0
+
+
+class _BlockAllocator:
+    """Segregated free-list allocator over the memory pool.
+
+    The requested size is rounded up to a size class. There are `NUM_SUBCLASSES` size classes
+    per power of two, so that the internal fragmentation is bounded to 1 / `NUM_SUBCLASSES`.
+    Every size class has its own free-list whose next pointers are stored in the first 8 bytes of the free blocks.
+    A new block is taken from the free-list of the exact size class first,
+    then from the unallocated space of the pool, and finally by splitting a larger free block.
+    """
+
+    GRANULE = 4096
+    NUM_SUBCLASSES = 8
+    NUM_CLASSES = 256
+
+    def __init__(self, pool: np.ndarray, cur_page: Any, shared: bool) -> None:  # noqa: ANN401
+        self._pool = pool
+        self._cur_page = cur_page
+        # Offset + 1 of the head of the free-list. Zero means the empty free-list.
+        self._free_heads = _new_array(ct.c_uint64, self.NUM_CLASSES, shared)
+
+    @classmethod
+    def size_class(cls, nbytes: int) -> int:
+        """Get the smallest size class which can hold the given bytes."""
+        nbytes = max(-(-nbytes // cls.GRANULE), 1) * cls.GRANULE
+        linear_limit = cls.GRANULE * cls.NUM_SUBCLASSES
+        if nbytes <= linear_limit:
+            return nbytes // cls.GRANULE - 1
+
+        exp = (nbytes - 1).bit_length() - 1
+        step = 1 << (exp - 3)
+        sub = -(-(nbytes - (1 << exp)) // step)
+        if sub == cls.NUM_SUBCLASSES:
+            exp, sub = exp + 1, 0
+        # The first size class of this range follows the last linear size class, `linear_limit`.
+        return cls.NUM_SUBCLASSES * (exp - linear_limit.bit_length() + 2) + sub - 1
+
+    @classmethod
+    def class_size(cls, size_class: int) -> int:
+        """Get the block size (bytes) of the given size class."""
+        if size_class < cls.NUM_SUBCLASSES:
+            return (size_class + 1) * cls.GRANULE
+
+        exp = (cls.GRANULE * cls.NUM_SUBCLASSES).bit_length() - 2 + (size_class + 1) // cls.NUM_SUBCLASSES
+        sub = (size_class + 1) % cls.NUM_SUBCLASSES
+        return (1 << exp) + sub * (1 << (exp - 3))
+
+    @classmethod
+    def _floor_class(cls, nbytes: int) -> int:
+        """Get the largest size class which fits in the given bytes."""
+        size_class = cls.size_class(nbytes)
+        return size_class if cls.class_size(size_class) <= nbytes else size_class - 1
+
+    def _next_ptr(self, offset: int) -> np.ndarray:
+        return self._pool[offset : offset + 8].view(np.uint64)
+
+    def _push(self, offset: int, size_class: int) -> None:
+        self._next_ptr(offset)[0] = self._free_heads[size_class]
+        self._free_heads[size_class] = offset + 1
+
+    def _pop(self, size_class: int) -> int | None:
+        if (head := int(self._free_heads[size_class])) == 0:
+            return None
+        offset = head - 1
+        self._free_heads[size_class] = self._next_ptr(offset)[0]
+        return offset
+
+    def alloc(self, size_class: int) -> int | None:
+        """Allocate a block of the given size class and return its offset. Return None if there is no space."""
+        if (offset := self._pop(size_class)) is not None:
+            return offset
+
+        size = self.class_size(size_class)
+        if self._cur_page.value + size <= len(self._pool):
+            offset = self._cur_page.value
+            self._cur_page.value += size
+            return offset
+
+        for larger_class in np.flatnonzero(self._free_heads[size_class + 1 :]) + size_class + 1:
+            offset = self._pop(int(larger_class))
+            self.split(offset, int(larger_class), size_class)
+            return offset
+
+        return None
+
+    def free(self, offset: int, size_class: int) -> None:
+        """Return the block to the free-list of its size class."""
+        self._push(offset, size_class)
+
+    def split(self, offset: int, size_class: int, target_class: int) -> None:
+        """Shrink the block to the target size class and return the remainder to the free-lists."""
+        pos = offset + self.class_size(target_class)
+        remainder = self.class_size(size_class) - self.class_size(target_class)
+        while remainder >= self.GRANULE:
+            remainder_class = self._floor_class(remainder)
+            self._push(pos, remainder_class)
+            size = self.class_size(remainder_class)
+            pos, remainder = pos + size, remainder - size
+
+
+class EvictionPolicyBase:
+    """Base class of the eviction policy for the memory cache handler.
+
+    The states of the policy are stored in arrays indexed by the entries of `SharedMemoryIndex`.
+    They are located in the shared memory for the multiprocessing handler,
+    so that the accesses from all DataLoader workers are accounted.
+    The updates on a cache hit are not protected by any lock, so that they are approximate.
+
+    Args:
+        capacity: The number of entries of the index.
+        shared: If True, allocate the states in the shared memory.
+    """
+
+    def __init__(self, capacity: int, shared: bool) -> None:
+        self.capacity = capacity
+
+    def on_hit(self, entry: int, key_hash: int) -> None:
+        """Called when the cached item is found."""
+
+    def on_miss(self, key_hash: int) -> None:
+        """Called when the requested item is not in the cache."""
+
+    def on_insert(self, entry: int, key_hash: int) -> None:
+        """Called when a new item is stored. The caller holds the handler's lock."""
+
+    def select_victim(self, candidates: np.ndarray, key_hash: int) -> int | None:
+        """Select an entry to evict among the candidates to store the given key.
+
+        Args:
+            candidates: Non-empty array of the entries which can be evicted.
+            key_hash: Key hash of the new item.
+
+        Returns:
+            The entry to evict or None if the new item should not be admitted.
+        """
+        raise NotImplementedError
+
+
+class LRUEvictionPolicy(EvictionPolicyBase):
+    """Evict the least recently used item."""
+
+    def __init__(self, capacity: int, shared: bool) -> None:
+        super().__init__(capacity, shared)
+        self._last_access = _new_array(ct.c_uint64, capacity, shared)
+        self._clock = _new_value(ct.c_uint64, 0, shared)
+
+    def _touch(self, entry: int) -> None:
+        self._clock.value += 1
+        self._last_access[entry] = self._clock.value
+
+    def on_hit(self, entry: int, key_hash: int) -> None:  # noqa: D102
+        self._touch(entry)
+
+    def on_insert(self, entry: int, key_hash: int) -> None:  # noqa: D102
+        self._touch(entry)
+
+    def select_victim(self, candidates: np.ndarray, key_hash: int) -> int | None:  # noqa: D102
+        return int(candidates[np.argmin(self._last_access[candidates])])
+
+
+class CLOCKEvictionPolicy(EvictionPolicyBase):
+    """Evict the item in the CLOCK (second chance) order.
+
+    Every access sets the reference bit of the item. The clock hand sweeps the items
+    clearing their reference bits and evicts the first item whose reference bit is not set.
+    """
+
+    def __init__(self, capacity: int, shared: bool) -> None:
+        super().__init__(capacity, shared)
+        self._ref_bits = _new_array(ct.c_uint8, capacity, shared)
+        self._hand = _new_value(ct.c_size_t, 0, shared)
+
+    def on_hit(self, entry: int, key_hash: int) -> None:  # noqa: D102
+        self._ref_bits[entry] = 1
+
+    def on_insert(self, entry: int, key_hash: int) -> None:  # noqa: D102
+        self._ref_bits[entry] = 1
+
+    def select_victim(self, candidates: np.ndarray, key_hash: int) -> int | None:  # noqa: D102
+        # Sweep the candidates from the clock hand
+        order = np.roll(candidates, -int(np.searchsorted(candidates, self._hand.value)))
+        unreferenced = np.flatnonzero(self._ref_bits[order] == 0)
+        pos = int(unreferenced[0]) if len(unreferenced) > 0 else len(order)
+
+        # Every swept item consumes its second chance
+        self._ref_bits[order[:pos]] = 0
+        victim = int(order[pos % len(order)])
+        self._hand.value = (victim + 1) % self.capacity
+        return victim
+
+
+class FrequencyEvictionPolicy(EvictionPolicyBase):
+    """Evict the least frequently requested item and admit a new item only if it is requested more frequently.
+
+    The request frequencies of all keys (not only the cached ones) are estimated by a Count-Min sketch
+    which is halved periodically to forget the old history (TinyLFU).
+    It keeps the items which the sampler draws often in the cache,
+    e.g., the images of the tail classes oversampled by `BalancedSampler`.
+
+    Args:
+        capacity: The number of entries of the index.
+        shared: If True, allocate the states in the shared memory.
+    """
+
+    DEPTH = 4
+    # Multipliers to derive the independent hash functions for the sketch rows
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, capacity: int, shared: bool) -> None:
+        super().__init__(capacity, shared)
+        self._width_bits = max(4 * capacity - 1, 1023).bit_length()
+        self._sketch = _new_array(ct.c_uint32, self.DEPTH << self._width_bits, shared).reshape(self.DEPTH, -1)
+        self._freqs = _new_array(ct.c_uint32, capacity, shared)
+        self._num_records = _new_value(ct.c_size_t, 0, shared)
+        self._sample_size = 10 * max(capacity, 1)
+
+    def _cols(self, key_hash: int) -> list[int]:
+        return [((key_hash * seed) & 0xFFFFFFFFFFFFFFFF) >> (64 - self._width_bits) for seed in self._SEEDS]
+
+    def _record(self, key_hash: int) -> int:
+        """Count the request of the key hash and return its estimated frequency."""
+        cols = self._cols(key_hash)
+        rows = range(self.DEPTH)
+        self._sketch[rows, cols] += 1
+
+        self._num_records.value += 1
+        if self._num_records.value >= self._sample_size:
+            self._sketch >>= 1
+            self._freqs >>= 1
+            self._num_records.value //= 2
+
+        return int(self._sketch[rows, cols].min())
+
+    def _estimate(self, key_hash: int) -> int:
+        return int(self._sketch[range(self.DEPTH), self._cols(key_hash)].min())
+
+    def on_hit(self, entry: int, key_hash: int) -> None:  # noqa: D102
+        self._freqs[entry] = self._record(key_hash)
+
+    def on_miss(self, key_hash: int) -> None:  # noqa: D102
+        self._record(key_hash)
+
+    def on_insert(self, entry: int, key_hash: int) -> None:  # noqa: D102
+        self._freqs[entry] = self._estimate(key_hash)
+
+    def select_victim(self, candidates: np.ndarray, key_hash: int) -> int | None:  # noqa: D102
+        victim = int(candidates[np.argmin(self._freqs[candidates])])
+        if self._estimate(key_hash) < self._freqs[victim]:
+            return None
+        return victim
+
+
+EVICTION_POLICIES: dict[str, type[EvictionPolicyBase]] = {
+    "lru": LRUEvictionPolicy,
+    "clock": CLOCKEvictionPolicy,
+    "frequency": FrequencyEvictionPolicy,
+}
 
 
 class MemCacheHandlerBase:
     """Base class for memory cache handler.
 
     It will be combined with LoadImageFromOTXDataset to store/retrieve the samples in memory.
+
+    Args:
+        mem_size: The size of memory pool (bytes).
+        eviction_policy: What to do if the memory pool is full.
+            If "freeze", the handler is frozen and never stores a new item (default).
+            Otherwise, one of `EVICTION_POLICIES` ("lru", "clock" or "frequency") evicts a cached item
+            to make a room for the new item. In this case, `get()` returns a copy of the cached item
+            since its memory can be reused by another process anytime.
+        disk_cache: Optional persistent cache tier behind the memory pool.
+            It is looked up if an image file path is not found in the memory pool,
+            and it stores every image put with its file path as a key even if the memory pool is frozen.
+        codec: How to compress the items in the memory pool.
+            If "none", the items are stored as they are (default).
+            Otherwise, one of `MEM_CACHE_CODECS` ("lz4", "zstd", "jpeg" or "webp") encodes them on `put()`
+            and decodes them on every cache hit. "jpeg" and "webp" are lossy and only encode uint8 images
+            put as the image kinds ("image", "video_frame" and "prefetch"). The other kinds are stored losslessly.
+            See `codec_stats` to check whether the decoding cost pays off.
+        codec_quality: Quality of the lossy codec from 0 to 100.
     """
 
-    def __init__(self, mem_size: int):
+    # Whether to allocate the data structures in the shared memory
+    _shared: ClassVar[bool] = False
+    # Expected minimum size of the cached item to estimate the capacity of the index
+    INDEX_ITEM_BYTES: ClassVar[int] = 16 * 1024
+    # Maximum size of the pickled address of the cached item
+    INDEX_VALUE_BYTES: ClassVar[int] = 128
+    # Number of the rows of the statistics array
+    NUM_STAT_ROWS: ClassVar[int] = 64
+
+    def __init__(
+        self,
+        mem_size: int,
+        eviction_policy: str = "freeze",
+        disk_cache: DiskCacheHandler | None = None,
+        codec: str = "none",
+        codec_quality: int = 95,
+    ):
+        if eviction_policy != "freeze" and eviction_policy not in EVICTION_POLICIES:
+            msg = f"{eviction_policy} is unknown eviction policy. Choose one of {['freeze', *EVICTION_POLICIES]}."
+            raise MemCacheHandlerError(msg)
+        if codec != "none" and codec not in MEM_CACHE_CODECS:
+            msg = f"{codec} is unknown codec. Choose one of {['none', *MEM_CACHE_CODECS]}."
+            raise MemCacheHandlerError(msg)
+
         self._mem_size = mem_size
+        self._eviction_policy = eviction_policy
+        self._disk_cache = disk_cache
+        self._codec_name = codec
+        self._codec_quality = codec_quality
+        self._codec: MemCacheCodecBase | None = (
+            MEM_CACHE_CODECS[codec](quality=codec_quality) if codec in MEM_CACHE_CODECS else None
+        )
         self._init_data_structs(mem_size)
 
     def _init_data_structs(self, mem_size: int) -> None:
-        self._arr = (ct.c_uint8 * mem_size)()
-        self._cur_page = ct.c_size_t(0)
-        self._cache_addr: (
-            dict[Any, tuple[Any, ...]]
-            | DictProxy[
-                Any,
-                tuple[Any, ...],
-            ]
-        ) = {}
-        self._lock: Lock | _DummyLock = _DummyLock()
-        self._freeze = ct.c_bool(False)
+        shared = self._shared
+        self._arr = _new_ctypes_array(ct.c_uint8, mem_size, shared)
+        self._cur_page = _new_value(ct.c_size_t, 0, shared)
+
+        capacity = max(mem_size // self.INDEX_ITEM_BYTES, 1024) if mem_size > 0 else 0
+        self._cache_addr = SharedMemoryIndex(capacity=capacity, value_bytes=self.INDEX_VALUE_BYTES, shared=shared)
+        # The single processing handler can be used by the prefetching threads
+        self._lock: Lock | _FileLock | threading.Lock = mp.Lock() if shared else threading.Lock()
+        self._freeze = _new_value(ct.c_bool, False, shared)
+        # The statistics are updated without the lock. Each process adds to the row of its PID
+        # so that the concurrent DataLoader workers (with consecutive PIDs) do not lose their updates.
+        # The statistics of each kind of the entries are counted separately.
+        num_stats = self.NUM_STAT_ROWS * len(MEM_CACHE_ENTRY_KINDS) * len(_Stat)
+        self._stats = _new_array(ct.c_double, num_stats, shared).reshape(
+            self.NUM_STAT_ROWS,
+            len(MEM_CACHE_ENTRY_KINDS),
+            len(_Stat),
+        )
+
+        self._policy: EvictionPolicyBase | None = None
+        if self._eviction_policy in EVICTION_POLICIES:
+            self._policy = EVICTION_POLICIES[self._eviction_policy](capacity, shared)
+            self._allocator = _BlockAllocator(np.frombuffer(self._arr, dtype=np.uint8), self._cur_page, shared)
+            self._block_offsets = _new_array(ct.c_uint64, capacity, shared)
+            self._block_classes = _new_array(ct.c_int16, capacity, shared)
 
     def __len__(self) -> int:
         """Get the number of cached items."""
@@ -108,35 +829,148 @@ class MemCacheHandlerBase:
         """Get the reserved memory pool size (bytes)."""
         return len(self._arr)
 
-    def get(self, key: Any) -> tuple[np.ndarray | None, dict | None]:  # noqa: ANN401
+    @property
+    def eviction_policy(self) -> str:
+        """Get the eviction policy name."""
+        return self._eviction_policy
+
+    @property
+    def disk_cache(self) -> DiskCacheHandler | None:
+        """Get the persistent cache tier behind the memory pool."""
+        return self._disk_cache
+
+    @property
+    def codec(self) -> str:
+        """Get the codec name."""
+        return self._codec_name
+
+    @property
+    def codec_stats(self) -> dict[str, float]:
+        """Get the statistics of the codec to check whether it pays off.
+
+        Compression pays off if `decode_ms` (the mean time to decode a cached item) is less than
+        `load_ms` (the mean time to load an original image reported by `record_load_time()`),
+        since the items which could not be cached without compression should be loaded from the original file.
+        """
+        stats = self._stats.sum(axis=(0, 1))
+        return {
+            "compression_ratio": stats[_Stat.RAW_BYTES] / max(stats[_Stat.ENCODED_BYTES], 1.0),
+            "encode_ms": 1e3 * stats[_Stat.ENCODE_TIME] / max(stats[_Stat.ENCODE], 1.0),
+            "decode_ms": 1e3 * stats[_Stat.DECODE_TIME] / max(stats[_Stat.DECODE], 1.0),
+            "load_ms": 1e3 * stats[_Stat.LOAD_TIME] / max(stats[_Stat.LOAD], 1.0),
+        }
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Get the cumulative statistics aggregated over all processes sharing this handler and all entry kinds.
+
+        - hits / misses: The number of lookups found / not found in the memory pool.
+        - disk_hits: The number of lookups missed in the memory pool but found in the disk cache.
+        - hit_bytes: The total bytes of the items served from the memory pool.
+        - inserts / rejects: The number of items stored / not stored in the memory pool.
+        - frozen: 1.0 if the handler is frozen, otherwise 0.0.
+        """
+        return {**self._to_stats_dict(self._stats.sum(axis=(0, 1))), "frozen": float(self.frozen)}
+
+    @property
+    def stats_by_kind(self) -> dict[str, dict[str, float]]:
+        """Get the cumulative statistics of each kind in `MEM_CACHE_ENTRY_KINDS`, e.g., the hit rate of the images.
+
+        See `stats` for the meaning of the values.
+        """
+        stats = self._stats.sum(axis=0)
+        return {kind: self._to_stats_dict(stats[i]) for i, kind in enumerate(MEM_CACHE_ENTRY_KINDS)}
+
+    @staticmethod
+    def _to_stats_dict(stats: np.ndarray) -> dict[str, float]:
+        return {
+            "hits": stats[_Stat.HIT],
+            "misses": stats[_Stat.MISS],
+            "disk_hits": stats[_Stat.DISK_HIT],
+            "hit_bytes": stats[_Stat.HIT_BYTES],
+            "inserts": stats[_Stat.INSERT],
+            "rejects": stats[_Stat.REJECT],
+        }
+
+    @staticmethod
+    def _kind_index(kind: str) -> int:
+        if kind not in MEM_CACHE_ENTRY_KINDS:
+            msg = f"{kind} is unknown entry kind. Choose one of {list(MEM_CACHE_ENTRY_KINDS)}."
+            raise MemCacheHandlerError(msg)
+        return MEM_CACHE_ENTRY_KINDS.index(kind)
+
+    def _record(self, stat: _Stat, value: float = 1.0, kind: int = 0) -> None:
+        self._stats[os.getpid() % self.NUM_STAT_ROWS, kind, stat] += value
+
+    def record_load_time(self, seconds: float) -> None:
+        """Record the time to load an original image which was not found in the cache."""
+        self._record(_Stat.LOAD)
+        self._record(_Stat.LOAD_TIME, seconds)
+
+    def get(self, key: Any, kind: str = "image") -> tuple[np.ndarray | None, dict | None]:  # noqa: ANN401
         """Try to look up the cached item with the given key.
 
         Args:
             key (Any): A key for looking up the cached item
+            kind (str): Kind of the item in `MEM_CACHE_ENTRY_KINDS` to count the statistics of the lookup
 
         Returns:
             If succeed return (np.ndarray, Dict), otherwise return (None, None)
         """
-        try:
-            if self.mem_size == 0 or (addr := self._cache_addr.get(key, None)) is None:
+        kind_idx = self._kind_index(kind)
+        data, meta = self._get_from_memory(key, kind_idx) if self.mem_size > 0 else (None, None)
+
+        if data is None and self._disk_cache is not None and isinstance(key, str):
+            if (disk_data := self._disk_cache.get(key)) is None:
                 return None, None
+            # The memory-mapped array is read-only, so that copy it to the private memory
+            data = np.array(disk_data)
+            self._record(_Stat.DISK_HIT, kind=kind_idx)
+            self._put_to_memory(key, data, kind=kind_idx)
+
+        return data, meta
+
+    def _get_from_memory(self, key: Any, kind: int) -> tuple[np.ndarray | None, dict | None]:  # noqa: ANN401
+        key_hash, key_check = _hash_key_with_check(key)
+        if (found := self._cache_addr.lookup(key_hash, key_check)) is None:
+            if self._policy is not None:
+                self._policy.on_miss(key_hash)
+            self._record(_Stat.MISS, kind=kind)
+            return None, None
 
-            offset, count, dtype, shape, strides, meta = addr
+        entry, version, (offset, count, dtype, shape, strides, meta, encoded) = found
 
+        if encoded:
+            data = np.frombuffer(self._arr, dtype=np.uint8, count=count, offset=offset)
+        else:
             data = np.frombuffer(self._arr, dtype=dtype, count=count, offset=offset)
-            return np.lib.stride_tricks.as_strided(data, shape, strides), meta
+            data = np.lib.stride_tricks.as_strided(data, shape, strides)
 
-        except BrokenPipeError:
-            # It is possible that the manager is dead but
-            # the multi-processing worker in DataLoader is alive.
-            # In this case, we need to handle this error.
-            return None, None
+        if self._policy is not None:
+            # The item can be evicted and its memory can be overwritten by another process while copying.
+            data = data.copy()
+            if not self._cache_addr.validate(entry, version):
+                self._record(_Stat.MISS, kind=kind)
+                return None, None
+            self._policy.on_hit(entry, key_hash)
+
+        if encoded and self._codec is not None:
+            start = time.perf_counter()
+            data = self._codec.decode(data, dtype, shape)
+            self._record(_Stat.DECODE)
+            self._record(_Stat.DECODE_TIME, time.perf_counter() - start)
+
+        self._record(_Stat.HIT, kind=kind)
+        self._record(_Stat.HIT_BYTES, data.nbytes, kind=kind)
+        # Copy is not needed for the decoded item
+        return data, meta
 
     def put(
         self,
         key: Any,  # noqa: ANN401
         data: np.ndarray,
         meta: dict | None = None,
+        kind: str = "image",
     ) -> int | None:
         """Try to store np.ndarray and metadata with a key to the reserved memory pool.
 
@@ -144,46 +978,130 @@ class MemCacheHandlerBase:
             key (Any): A key to store the cached item
             data (np.ndarray): A data sample to store
             meta (Optional[Dict]): A metadata of the data sample
+            kind (str): Kind of the item in `MEM_CACHE_ENTRY_KINDS` to count the statistics of the insertion
 
         Returns:
             Optional[int]: If succeed return the address of cached item in memory pool
         """
+        kind_idx = self._kind_index(kind)
+        if self._disk_cache is not None and isinstance(key, str):
+            self._disk_cache.put(key, data)
+
+        return self._put_to_memory(key, data, meta, kind_idx)
+
+    def _accepts_codec(self, data: np.ndarray, kind: int) -> bool:
+        if self._codec is None or (self._codec.lossy and kind not in _LOSSY_CODEC_KIND_INDICES):
+            return False
+        return self._codec.accepts(data)
+
+    def _put_to_memory(
+        self,
+        key: Any,  # noqa: ANN401
+        data: np.ndarray,
+        meta: dict | None = None,
+        kind: int = 0,
+    ) -> int | None:
+        if self.mem_size == 0:
+            return None
         if self._freeze.value:
+            self._record(_Stat.REJECT, kind=kind)
             return None
 
-        try:
-            if (addr := self._cache_addr.get(key, None)) is not None:
-                return addr[0]
+        key_hash, key_check = _hash_key_with_check(key)
+        if (found := self._cache_addr.lookup(key_hash, key_check)) is not None:
+            return found[2][0]
 
-            data_bytes = data.size * data.itemsize
+        value = (data.size, data.dtype.str, data.shape, data.strides, meta, False)
+        if self._accepts_codec(data, kind):
+            start = time.perf_counter()
+            encoded = self._codec.encode(data)
+            self._record(_Stat.ENCODE)
+            self._record(_Stat.ENCODE_TIME, time.perf_counter() - start)
+            self._record(_Stat.RAW_BYTES, data.nbytes)
+            self._record(_Stat.ENCODED_BYTES, encoded.nbytes)
 
-            with self._lock:
-                new_page = self._cur_page.value + data_bytes
+            value = (encoded.size, data.dtype.str, data.shape, None, meta, True)
+            data = encoded
 
-                if new_page > self.mem_size:
+        data_bytes = data.size * data.itemsize
+
+        with self._lock:
+            if self._policy is None:
+                offset = self._cur_page.value
+                if offset + data_bytes > self.mem_size:
                     self.freeze()
                     msg = "Memory pool reaches it's limit. Cannot cache more. Freeze it."
                     logger.warning(msg)
+                    self._record(_Stat.REJECT, kind=kind)
+                    return None
+            else:
+                size_class = _BlockAllocator.size_class(data_bytes)
+                if (offset := self._alloc_with_eviction(size_class, key_hash)) is None:
+                    self._record(_Stat.REJECT, kind=kind)
                     return None
 
-                offset = ct.byref(self._arr, self._cur_page.value)
-                ct.memmove(offset, data.ctypes.data, data_bytes)
+            ct.memmove(ct.byref(self._arr, offset), data.ctypes.data, data_bytes)
+
+            try:
+                entry = self._cache_addr.insert(key_hash, (offset, *value), key_check)
+            except MemCacheHandlerError as e:
+                self._record(_Stat.REJECT, kind=kind)
+                if self._policy is not None:
+                    self._allocator.free(offset, size_class)
+                # Only a full index stops the pool. Otherwise, e.g., the value is too large, reject the item only.
+                if self._policy is not None or not self._cache_addr.full:
+                    logger.warning(f"{e} Cannot cache it.")
+                    return None
 
-                self._cache_addr[key] = (
-                    self._cur_page.value,
-                    data.size,
-                    data.dtype,
-                    data.shape,
-                    data.strides,
-                    meta,
-                )
-                self._cur_page.value = new_page
-                return new_page
-        except BrokenPipeError:
-            # It is possible that the manager is dead but
-            # the multi-processing worker in DataLoader is alive.
-            # In this case, we need to handle this error.
+                self.freeze()
+                logger.warning(f"{e} Cannot cache more. Freeze it.")
+                return None
+
+            if self._policy is None:
+                self._cur_page.value = offset + data_bytes
+            else:
+                self._block_offsets[entry] = offset
+                self._block_classes[entry] = size_class
+                self._policy.on_insert(entry, key_hash)
+            self._record(_Stat.INSERT, kind=kind)
+
+            return offset + data_bytes
+
+    def _evict(self, entry: int) -> tuple[int, int]:
+        """Evict the entry from the index and return its memory block (offset, size class)."""
+        self._cache_addr.remove(int(self._cache_addr.entry_keys[entry]))
+        return int(self._block_offsets[entry]), int(self._block_classes[entry])
+
+    def _alloc_with_eviction(self, size_class: int, key_hash: int) -> int | None:
+        """Allocate a memory block of the size class by evicting a cached item if needed.
+
+        Returns:
+            The offset of the allocated block, or None if it cannot be stored.
+        """
+        if _BlockAllocator.class_size(size_class) > self.mem_size or self._policy is None:
+            return None
+
+        in_use = self._cache_addr.entry_keys != _EMPTY
+
+        if self._cache_addr.full:
+            if (victim := self._policy.select_victim(np.flatnonzero(in_use), key_hash)) is None:
+                return None
+            self._allocator.free(*self._evict(victim))
+            in_use[victim] = False
+
+        if (offset := self._allocator.alloc(size_class)) is not None:
+            return offset
+
+        # Only an item of the same or larger size class can make a room without coalescing the free blocks.
+        candidates = np.flatnonzero(in_use & (self._block_classes >= size_class))
+        if len(candidates) == 0:
             return None
+        if (victim := self._policy.select_victim(candidates, key_hash)) is None:
+            return None
+
+        offset, victim_class = self._evict(victim)
+        self._allocator.split(offset, victim_class, size_class)
+        return offset
 
     def __repr__(self) -> str:
         """Representation for the current handler status."""
@@ -191,12 +1109,16 @@ class MemCacheHandlerBase:
         return (
             f"{self.__class__.__name__} "
             f"uses {self._cur_page.value} / {self.mem_size} ({perc:.1f}%) memory pool and "
-            f"store {len(self)} items."
+            f"store {len(self)} items with {self._eviction_policy} policy."
+            + (f" {self._codec_name} codec stats: {self.codec_stats}" if self._codec is not None else "")
         )
 
     def __reduce__(self):
-        """Dump just mem_size and re-initialize with that value when unpickled."""
-        return (self.__class__, (self._mem_size,))
+        """Dump just the constructor arguments and re-initialize with those values when unpickled."""
+        return (
+            self.__class__,
+            (self._mem_size, self._eviction_policy, self._disk_cache, self._codec_name, self._codec_quality),
+        )
 
     @property
     def frozen(self) -> bool:
@@ -229,27 +1151,160 @@ class MemCacheHandlerForMP(MemCacheHandlerBase):
     """Memory caching handler for multi processing.
 
     Use if PyTorch's DataLoader.num_workers > 0.
+    The memory pool, the index of the cached items and the eviction policy states are located in the shared memory,
+    so that DataLoader workers can look up the cache without any IPC round-trip.
+
+    If `name` is given and the platform supports it (POSIX), they are located in a single named shared memory
+    which any process on the node can attach to by its name, e.g., the DDP ranks other than the local rank 0
+    or the spawned DataLoader workers. The creator unlinks the shared memory on `shutdown()`.
+    Otherwise, or if there is not enough space in `/dev/shm`, they are located in the shared memory
+    of `multiprocessing`, which falls back to a file in the temporary directory, and inherited by the forked workers.
+
+    Args:
+        name: Name of the shared memory. If None, the data structures are not located in a named shared memory.
+        attach: If True, attach to the shared memory created by another process with the same arguments.
+            Otherwise, create a new one.
+        attach_timeout: How long to wait for the creator to initialize the shared memory (seconds).
+        (See `MemCacheHandlerBase` for the other arguments.)
     """
 
+    _shared = True
+    # The first word of the header is set to this after the creator initializes the shared memory.
+    # The next words are the total size of the data structures and `mem_size` to check the arguments.
+    _READY: ClassVar[int] = 0x4F54584D454D4331  # "OTXMEMC1"
+    NODE_SHARING: ClassVar[bool] = fcntl is not None
+
+    def __init__(
+        self,
+        mem_size: int,
+        eviction_policy: str = "freeze",
+        disk_cache: DiskCacheHandler | None = None,
+        codec: str = "none",
+        codec_quality: int = 95,
+        name: str | None = None,
+        attach: bool = False,
+        attach_timeout: float = 300.0,
+    ):
+        self._name = name
+        self._attach = attach
+        self._attach_timeout = attach_timeout
+        self._shm: SharedMemory | None = None
+        super().__init__(mem_size, eviction_policy, disk_cache, codec, codec_quality)
+
+    @property
+    def name(self) -> str | None:
+        """Name of the shared memory. It is None if the handler is not backed by a named shared memory."""
+        return self._name if self._shm is not None else None
+
     def _init_data_structs(self, mem_size: int) -> None:
-        self._arr = mp.Array(ct.c_uint8, mem_size, lock=False)
-        self._cur_page = mp.Value(ct.c_size_t, 0, lock=False)
+        if not self.NODE_SHARING or self._name is None:
+            super()._init_data_structs(mem_size)
+            return
+
+        # Measure the layout first to know the size of the shared memory
+        with _allocate_on(_SharedMemoryArena()) as layout:
+            super()._init_data_structs(mem_size)
+
+        # The pages beyond the free space of /dev/shm fault on the first write instead of failing here
+        if not self._attach and not _has_shm_space(layout.nbytes):
+            logger.warning(
+                f"There is not enough space in {_SHM_DIR} for the {layout.nbytes} bytes memory pool {self._name}. "
+                "It is not shared with the other processes on the node.",
+            )
+            super()._init_data_structs(mem_size)
+            return
+
+        self._shm = self._attach_shm() if self._attach else SharedMemory(self._name, create=True, size=layout.nbytes)
+        with _allocate_on(_SharedMemoryArena(self._shm, create=not self._attach)) as arena:
+            super()._init_data_structs(mem_size)
+        self._shm.close()
+        lock = _FileLock(os.path.join(tempfile.gettempdir(), f"{self._name}.lock"))  # noqa: PTH118
+        self._lock = lock
+
+        header = arena.header
+        if self._attach:
+            self._wait_ready(header)
+            if header[1] != arena.nbytes or header[2] != mem_size:
+                msg = (
+                    f"Cannot attach to {self._name} created with different arguments: "
+                    f"mem_size={header[2]} (expected {mem_size})."
+                )
+                raise MemCacheHandlerError(msg)
+        else:
+            header[1:3] = [arena.nbytes, mem_size]
+            header[0] = self._READY
+            self._finalizer = weakref.finalize(self, _unlink_shm, self._shm, lock.path, os.getpid())
+
+    def _attach_shm(self) -> SharedMemory:
+        deadline = time.monotonic() + self._attach_timeout
+        while True:
+            try:
+                shm = SharedMemory(self._name)
+                break
+            except (FileNotFoundError, ValueError):
+                # Not created yet or not resized yet
+                if time.monotonic() > deadline:
+                    msg = f"Cannot find the shared memory {self._name} in {self._attach_timeout} seconds."
+                    raise MemCacheHandlerError(msg) from None
+                time.sleep(0.1)
+        # Only the creator should unlink it
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: SLF001
+        return shm
+
+    def _wait_ready(self, header: np.ndarray) -> None:
+        deadline = time.monotonic() + self._attach_timeout
+        while header[0] != self._READY:
+            if time.monotonic() > deadline:
+                msg = f"The shared memory {self._name} is not initialized in {self._attach_timeout} seconds."
+                raise MemCacheHandlerError(msg)
+            time.sleep(0.1)
 
-        self._manager = mp.Manager()
-        self._cache_addr: DictProxy = self._manager.dict()
-        self._lock = mp.Lock()
-        self._freeze = mp.Value(ct.c_bool, False, lock=False)
+    def __reduce__(self):
+        """Attach to the same shared memory by its name when unpickled, e.g., in the spawned process."""
+        if self._shm is None:
+            return super().__reduce__()
+        return (
+            self.__class__,
+            (
+                self._mem_size,
+                self._eviction_policy,
+                self._disk_cache,
+                self._codec_name,
+                self._codec_quality,
+                self._name,
+                True,
+                self._attach_timeout,
+            ),
+        )
 
     def shutdown(self) -> None:
-        """Shutdown mem caching handler.
+        """Unlink the shared memory if this handler created it.
 
-        It is effective only for the multiprocessing handler.
+        The processes which already attached to it can keep using it until they exit.
         """
-        self._manager.shutdown()
+        if self._shm is not None and not self._attach:
+            self._finalizer()
 
 
-class MemCacheHandlerError(Exception):
-    """Exception class for MemCacheHandler."""
+def _has_shm_space(nbytes: int) -> bool:
+    try:
+        stat = os.statvfs(_SHM_DIR)
+    except (AttributeError, OSError):
+        # The platform does not back the named shared memory with a file system to check
+        return True
+    return stat.f_bavail * stat.f_frsize >= nbytes
+
+
+def _unlink_shm(shm: SharedMemory, lock_path: str, creator_pid: int) -> None:
+    # The forked processes inherit the handler, but only the creator process should unlink it
+    if os.getpid() != creator_pid:
+        return
+    # The attaching process in the same process tree may have unregistered it from the shared resource tracker
+    resource_tracker.register(shm._name, "shared_memory")  # noqa: SLF001
+    with contextlib.suppress(FileNotFoundError):
+        shm.unlink()
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(lock_path)  # noqa: PTH107
 
 
 NULL_MEM_CACHE_HANDLER = MemCacheHandlerBase(mem_size=0)
@@ -261,25 +1316,80 @@ class MemCacheHandlerSingleton:
 
     instances: ClassVar[list[MemCacheHandlerBase]] = []
     CPU_MEM_LIMITS_GIB: int = 30
+    # Environment variable to share the name prefix of the memory pool with the other local ranks
+    NODE_SHM_NAME_ENV: ClassVar[str] = "OTX_MEM_CACHE_NAME"
+    _num_node_pools: ClassVar[int] = 0
+    # The prefix exported to `NODE_SHM_NAME_ENV` by this process
+    _exported_prefix: ClassVar[str | None] = None
+    # How long the other local ranks wait for the local rank 0 to create the memory pool (seconds)
+    ATTACH_TIMEOUT: ClassVar[float] = 300.0
+    # The files published by this process to tell the other local ranks the memory pool of the local rank 0
+    _status_paths: ClassVar[list[str]] = []
 
     @classmethod
-    def create(cls, mode: str, mem_size: int) -> MemCacheHandlerBase:
+    def create(
+        cls,
+        mode: str,
+        mem_size: int,
+        eviction_policy: str = "freeze",
+        disk_cache: DiskCacheHandler | None = None,
+        codec: str = "none",
+        codec_quality: int = 95,
+    ) -> MemCacheHandlerBase:
         """Create a new MemCacheHandlerBase instance.
 
         Args:
             mode (str): There are two options: null, multiprocessing or singleprocessing.
             mem_size (int): The size of memory pool (bytes).
+            eviction_policy (str): What to do if the memory pool is full: freeze, lru, clock or frequency.
+            disk_cache (DiskCacheHandler | None): Optional persistent cache tier behind the memory pool.
+            codec (str): How to compress the items in the memory pool: none, lz4, zstd, jpeg or webp.
+            codec_quality (int): Quality of the lossy codec from 0 to 100.
         """
         # COPY FROM mmcv.runner.get_dist_info
         from torch import distributed
 
-        world_size = distributed.get_world_size() if distributed.is_available() and distributed.is_initialized() else 1
+        dist_initialized = distributed.is_available() and distributed.is_initialized()
+        world_size = distributed.get_world_size() if dist_initialized else 1
+
+        # Local rank 0 creates the memory pool and the other ranks on the node attach to it
+        local_rank = int(os.environ.get("LOCAL_RANK", 0))
+        # The process group may not be initialized yet, e.g., `torchrun` only sets the environment variables
+        expected_world_size = world_size if dist_initialized else int(os.environ.get("WORLD_SIZE", 1))
+        node_sharing = mode == "multiprocessing" and MemCacheHandlerForMP.NODE_SHARING and expected_world_size > 1
+        shm_name = cls._get_node_shm_name(local_rank) if node_sharing else None
+        if shm_name is not None and local_rank == 0:
+            # The status left by a crashed run of the same rendezvous would mislead the other local ranks
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(cls._get_status_path(shm_name))  # noqa: PTH107
+
+        if shm_name is not None and local_rank > 0 and mem_size > 0:
+            try:
+                # The local rank 0 tells whether it created a memory pool and its actual name
+                if (pool_name := cls._wait_node_pool(shm_name)) is None:
+                    msg = "The local rank 0 did not create a shared memory pool."
+                    raise MemCacheHandlerError(msg)  # noqa: TRY301
+                instance = MemCacheHandlerForMP(
+                    mem_size,
+                    eviction_policy,
+                    disk_cache,
+                    codec,
+                    codec_quality,
+                    name=pool_name,
+                    attach=True,
+                    attach_timeout=cls.ATTACH_TIMEOUT,
+                )
+                logger.info(f"Attach to the {mem_size} size memory pool of the local rank 0 ({pool_name}).")
+                return cls._register(instance)
+            except MemCacheHandlerError as e:
+                logger.warning(f"{e} Create a memory pool for the local rank {local_rank} instead.")
+                shm_name = None
 
         # Prevent CPU OOM issue
         memory_info = psutil.virtual_memory()
         available_cpu_mem = memory_info.available / GIB
 
-        if world_size > 1:
+        if world_size > 1 and shm_name is None:
             mem_size = mem_size // world_size
             available_cpu_mem = available_cpu_mem // world_size
             logger.info(
@@ -291,16 +1401,80 @@ class MemCacheHandlerSingleton:
             logger.warning("No available CPU memory left, mem_size will be set to 0.")
             mem_size = 0
 
-        if mode == "null" or mem_size == 0:
+        if (mode == "null" or mem_size == 0) and disk_cache is None:
             instance = NULL_MEM_CACHE_HANDLER
+        elif mode == "null" or mem_size == 0:
+            instance = MemCacheHandlerForSP(0, disk_cache=disk_cache)
+            instance.freeze()
         elif mode == "multiprocessing":
-            instance = MemCacheHandlerForMP(mem_size)
+            try:
+                instance = MemCacheHandlerForMP(
+                    mem_size,
+                    eviction_policy,
+                    disk_cache,
+                    codec,
+                    codec_quality,
+                    name=shm_name,
+                )
+            except FileExistsError:
+                # Another process already created a memory pool with the agreed name, e.g., a stale prefix.
+                # The other local ranks take the new name from the status of the local rank 0.
+                new_name = f"{shm_name}_{uuid.uuid4().hex[:8]}"
+                logger.warning(f"The memory pool {shm_name} already exists. Create a memory pool {new_name} instead.")
+                instance = MemCacheHandlerForMP(
+                    mem_size,
+                    eviction_policy,
+                    disk_cache,
+                    codec,
+                    codec_quality,
+                    name=new_name,
+                )
         elif mode == "singleprocessing":
-            instance = MemCacheHandlerForSP(mem_size)
+            instance = MemCacheHandlerForSP(mem_size, eviction_policy, disk_cache, codec, codec_quality)
         else:
             msg = f"{mode} is unknown mode."
             raise MemCacheHandlerError(msg)
 
+        if shm_name is not None and local_rank == 0:
+            cls._publish_node_pool(shm_name, instance)
+        return cls._register(instance)
+
+    @staticmethod
+    def _get_status_path(shm_name: str) -> str:
+        return os.path.join(tempfile.gettempdir(), f"{shm_name}.status")  # noqa: PTH118
+
+    @classmethod
+    def _publish_node_pool(cls, shm_name: str, instance: MemCacheHandlerBase) -> None:
+        """Publish the actual name of the memory pool created by the local rank 0, or that there is none.
+
+        The pool may not be created with the agreed name, e.g., if there is not enough memory,
+        so that the other local ranks do not wait for it until `ATTACH_TIMEOUT`.
+        """
+        pool_name = instance.name if isinstance(instance, MemCacheHandlerForMP) else None
+        path = cls._get_status_path(shm_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:  # noqa: PTH123
+            f.write(pool_name or "")
+        Path(tmp_path).replace(path)
+        cls._status_paths.append(path)
+
+    @classmethod
+    def _wait_node_pool(cls, shm_name: str) -> str | None:
+        """Wait for the local rank 0 to publish its memory pool and get its name, or None if there is no pool."""
+        path = cls._get_status_path(shm_name)
+        deadline = time.monotonic() + cls.ATTACH_TIMEOUT
+        while True:
+            try:
+                with open(path) as f:  # noqa: PTH123
+                    return f.read() or None
+            except FileNotFoundError:  # noqa: PERF203
+                if time.monotonic() > deadline:
+                    msg = f"The local rank 0 did not create the memory pool {shm_name} in {cls.ATTACH_TIMEOUT} seconds."
+                    raise MemCacheHandlerError(msg) from None
+                time.sleep(0.1)
+
+    @classmethod
+    def _register(cls, instance: MemCacheHandlerBase) -> MemCacheHandlerBase:
         # Should delete if receive sigint to gracefully terminate
         def _new_handler(signum_, frame_) -> None:  # noqa: ARG001, ANN001
             instance.shutdown()
@@ -312,6 +1486,37 @@ class MemCacheHandlerSingleton:
 
         return instance
 
+    @classmethod
+    def _get_node_shm_name(cls, local_rank: int) -> str | None:
+        """Get the name of the shared memory pool which the local ranks on this node agree on.
+
+        It is called only if the world size is larger than 1.
+        The ranks launched by `torchrun` derive the name from the rendezvous.
+        Otherwise, the local rank 0 exports a random prefix to `NODE_SHM_NAME_ENV`,
+        so that the other ranks launched by it as subprocesses (e.g., by Lightning) inherit it.
+        The local rank 0 ignores the prefix inherited from its parent process, e.g., in a HPO trial,
+        and the exported prefix is removed by `delete()`.
+        Every rank creates the memory pools in the same order, so that the prefix is suffixed with the count.
+        If the local rank is not 0 and there is no way to agree on the name, return None.
+        """
+        prefix = os.environ.get(cls.NODE_SHM_NAME_ENV)
+        if local_rank == 0 and prefix != cls._exported_prefix:
+            prefix = None
+        if prefix is None and "TORCHELASTIC_RUN_ID" in os.environ:
+            rdzv = [
+                os.environ.get(var, "") for var in ("TORCHELASTIC_RUN_ID", "MASTER_ADDR", "MASTER_PORT", "GROUP_RANK")
+            ]
+            prefix = "otx_mem_cache_" + hashlib.blake2b(repr(rdzv).encode(), digest_size=8).hexdigest()
+        if prefix is None:
+            if local_rank > 0:
+                return None
+            prefix = f"otx_mem_cache_{uuid.uuid4().hex[:16]}"
+            os.environ[cls.NODE_SHM_NAME_ENV] = cls._exported_prefix = prefix
+            cls._num_node_pools = 0
+
+        cls._num_node_pools += 1
+        return f"{prefix}_{cls._num_node_pools}"
+
     @classmethod
     def check_system_memory(cls, mem_size: int, available_cpu_mem: int) -> bool:
         """Check there is enough system memory to maintain memory caching pool.
@@ -332,3 +1537,12 @@ class MemCacheHandlerSingleton:
             instance.shutdown()
 
         cls.instances = []
+        for path in cls._status_paths:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)  # noqa: PTH107
+        cls._status_paths = []
+        # Do not let the processes launched later inherit the name of the memory pools which are gone
+        if cls._exported_prefix is not None:
+            if os.environ.get(cls.NODE_SHM_NAME_ENV) == cls._exported_prefix:
+                del os.environ[cls.NODE_SHM_NAME_ENV]
+            cls._exported_prefix = None
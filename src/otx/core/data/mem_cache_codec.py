@@ -0,0 +1,141 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Codecs to compress the items stored in the memory cache."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from importlib.util import find_spec
+from typing import ClassVar
+
+import cv2
+import numpy as np
+
+__all__ = [
+    "MemCacheCodecBase",
+    "LZ4Codec",
+    "ZstdCodec",
+    "JPEGCodec",
+    "WebPCodec",
+    "MEM_CACHE_CODECS",
+]
+
+
+class MemCacheCodecBase:
+    """Base class of the codec compressing the items stored in the memory cache.
+
+    More items can be cached in the same memory pool at the cost of decoding them on every cache hit.
+
+    Args:
+        quality: Quality of the lossy codec from 0 to 100. It is ignored by the lossless codec.
+    """
+
+    lossy: ClassVar[bool] = False
+
+    def __init__(self, quality: int = 95) -> None:
+        self.quality = quality
+
+    def accepts(self, data: np.ndarray) -> bool:
+        """Whether this codec can encode the given array. Otherwise, the array is cached as it is."""
+        return data.size > 0
+
+    @abstractmethod
+    def encode(self, data: np.ndarray) -> np.ndarray:
+        """Encode the given array into 1-D uint8 array."""
+
+    @abstractmethod
+    def decode(self, buf: np.ndarray, dtype: str, shape: tuple[int, ...]) -> np.ndarray:
+        """Decode 1-D uint8 array into a new writable array of the given dtype and shape."""
+
+
+class LZ4Codec(MemCacheCodecBase):
+    """Fast lossless codec using LZ4 block compression. It requires `lz4` package."""
+
+    def __init__(self, quality: int = 95) -> None:
+        super().__init__(quality)
+        if not find_spec("lz4"):
+            msg = "lz4 codec requires lz4. Please install it by `pip install lz4`."
+            raise ModuleNotFoundError(msg)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:  # noqa: D102
+        import lz4.block
+
+        return np.frombuffer(lz4.block.compress(np.ascontiguousarray(data), store_size=True), dtype=np.uint8)
+
+    def decode(self, buf: np.ndarray, dtype: str, shape: tuple[int, ...]) -> np.ndarray:  # noqa: D102
+        import lz4.block
+
+        return np.frombuffer(lz4.block.decompress(buf, return_bytearray=True), dtype=dtype).reshape(shape)
+
+
+class ZstdCodec(MemCacheCodecBase):
+    """Lossless codec using Zstandard compression at the fastest level. It requires `zstandard` package."""
+
+    LEVEL: ClassVar[int] = 1
+
+    def __init__(self, quality: int = 95) -> None:
+        super().__init__(quality)
+        if not find_spec("zstandard"):
+            msg = "zstd codec requires zstandard. Please install it by `pip install zstandard`."
+            raise ModuleNotFoundError(msg)
+
+    def encode(self, data: np.ndarray) -> np.ndarray:  # noqa: D102
+        import zstandard
+
+        # (De)compressor object is not thread-safe, so that create it every time
+        compressed = zstandard.ZstdCompressor(level=self.LEVEL).compress(np.ascontiguousarray(data))
+        return np.frombuffer(compressed, dtype=np.uint8)
+
+    def decode(self, buf: np.ndarray, dtype: str, shape: tuple[int, ...]) -> np.ndarray:  # noqa: D102
+        import zstandard
+
+        decompressed = bytearray(zstandard.ZstdDecompressor().decompress(buf))
+        return np.frombuffer(decompressed, dtype=dtype).reshape(shape)
+
+
+class JPEGCodec(MemCacheCodecBase):
+    """Lossy codec re-encoding the decoded image to JPEG with the given quality.
+
+    Only uint8 images of one or three channels are encoded.
+    """
+
+    lossy = True
+    EXT: ClassVar[str] = ".jpg"
+    QUALITY_FLAG: ClassVar[int] = cv2.IMWRITE_JPEG_QUALITY
+    NUM_CHANNELS: ClassVar[tuple[int, ...]] = (1, 3)
+
+    def accepts(self, data: np.ndarray) -> bool:  # noqa: D102
+        if not super().accepts(data) or data.dtype != np.uint8 or data.ndim not in (2, 3):
+            return False
+        num_channels = 1 if data.ndim == 2 else data.shape[2]
+        return num_channels in self.NUM_CHANNELS
+
+    def encode(self, data: np.ndarray) -> np.ndarray:  # noqa: D102
+        success, buf = cv2.imencode(self.EXT, data, [self.QUALITY_FLAG, self.quality])
+        if not success:
+            msg = f"Cannot encode the image to {self.EXT}."
+            raise RuntimeError(msg)
+        return buf.reshape(-1)
+
+    def decode(self, buf: np.ndarray, dtype: str, shape: tuple[int, ...]) -> np.ndarray:  # noqa: D102
+        return cv2.imdecode(buf, cv2.IMREAD_UNCHANGED).astype(dtype, copy=False).reshape(shape)
+
+
+class WebPCodec(JPEGCodec):
+    """Lossy codec re-encoding the decoded image to WebP with the given quality.
+
+    Only uint8 images of three or four channels are encoded.
+    """
+
+    EXT = ".webp"
+    QUALITY_FLAG = cv2.IMWRITE_WEBP_QUALITY
+    NUM_CHANNELS = (3, 4)
+
+
+MEM_CACHE_CODECS: dict[str, type[MemCacheCodecBase]] = {
+    "lz4": LZ4Codec,
+    "zstd": ZstdCodec,
+    "jpeg": JPEGCodec,
+    "webp": WebPCodec,
+}
@@ -6,31 +6,40 @@
 from __future__ import annotations
 
 import logging as log
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
-from datumaro import Dataset as DmDataset
 from lightning import LightningDataModule
 from omegaconf import DictConfig, OmegaConf
-from torch.utils.data import DataLoader, RandomSampler
+from torch.utils.data import DataLoader, RandomSampler, Sampler, SequentialSampler
 
+from otx.core.data.annotation_index import AnnotationIndex, compute_dataset_hash, get_dataset_cache_dir
 from otx.core.data.dataset.tile import OTXTileDatasetFactory
+from otx.core.data.disk_cache import DiskCacheHandler
 from otx.core.data.factory import OTXDatasetFactory
+from otx.core.data.media_meta import MediaMetaCache
 from otx.core.data.mem_cache import (
     MemCacheHandlerSingleton,
     parse_mem_cache_size_to_int,
 )
+from otx.core.data.packed_batch import PackedCollateFn
 from otx.core.data.pre_filtering import pre_filtering
+from otx.core.data.prefetch import ImagePrefetcher, PrefetchSampler
+from otx.core.data.snapshot import import_dataset
 from otx.core.data.tile_adaptor import adapt_tile_config
+from otx.core.data.transform_libs.batch import BatchTransformCollateFn, BatchTransformLib
 from otx.core.types.device import DeviceType
+from otx.core.types.image import ImageColorChannel
 from otx.core.types.label import LabelInfo
 from otx.core.types.task import OTXTaskType
 from otx.core.utils.instantiators import instantiate_sampler
 from otx.core.utils.utils import get_adaptive_num_workers
 
 if TYPE_CHECKING:
+    from datumaro import Dataset as DmDataset
     from lightning.pytorch.utilities.parsing import AttributeDict
 
-    from otx.core.config.data import DataModuleConfig
+    from otx.core.config.data import DataModuleConfig, SubsetConfig
     from otx.core.data.dataset.base import OTXDataset
 
 
@@ -56,11 +65,28 @@ class OTXDataModule(LightningDataModule):
 
         VIDEO_EXTENSIONS.append(".mp4")
 
-        dataset = DmDataset.import_from(self.config.data_root, format=self.config.data_format)
+        cache_dir, dataset_hash = self._get_dataset_cache()
+        # The image sizes and the video frame counts are probed once and shared with the next runs
+        MediaMetaCache.set_current(
+            MediaMetaCache(cache_dir / "media_meta.jsonl" if cache_dir and config.persist_annotation_index else None),
+        )
+        dataset = import_dataset(
+            self.config.data_root,
+            self.config.data_format,
+            cache_dir=cache_dir / "snapshot" if cache_dir and config.persist_dataset_snapshot else None,
+            key=dataset_hash,
+        )
         if self.task != "H_LABEL_CLS":
-            dataset = pre_filtering(dataset, self.config.data_format, self.config.unannotated_items_ratio)
+            dataset = pre_filtering(
+                dataset,
+                self.config.data_format,
+                self.config.unannotated_items_ratio,
+                cache_dir=cache_dir / "pre_filtering" if cache_dir and config.persist_annotation_index else None,
+                key=dataset_hash,
+            )
+        annotation_indices = self._build_annotation_indices(dataset, cache_dir, dataset_hash)
         if config.tile_config.enable_tiler and config.tile_config.enable_adaptive_tiling:
-            adapt_tile_config(config.tile_config, dataset=dataset)
+            adapt_tile_config(config.tile_config, dataset=dataset, annotation_index=annotation_indices.get("train"))
 
         config_mapping = {
             self.config.train_subset.subset_name: self.config.train_subset,
@@ -88,10 +114,28 @@ class OTXDataModule(LightningDataModule):
             if all(config.num_workers == 0 for config in config_mapping.values())
             else "multiprocessing"
         )
+        disk_cache = None
+        if config.disk_cache_dir is not None:
+            # The cached image depends on the color channel order and the maximum image size
+            img_max_size = tuple(config.mem_cache_img_max_size) if config.mem_cache_img_max_size else None
+            disk_cache = DiskCacheHandler(
+                cache_dir=config.disk_cache_dir,
+                variant=f"{ImageColorChannel(config.image_color_channel).value}_{img_max_size}",
+            )
         mem_cache_handler = MemCacheHandlerSingleton.create(
             mode=mem_cache_mode,
             mem_size=mem_size,
+            eviction_policy=config.mem_cache_eviction_policy,
+            disk_cache=disk_cache,
+            codec=config.mem_cache_codec,
+            codec_quality=config.mem_cache_codec_quality,
         )
+        self.mem_cache_handler = mem_cache_handler
+
+        label_map_dir = proposal_dir = None
+        if cache_dir is not None and dataset_hash is not None and config.persist_annotation_index:
+            label_map_dir = cache_dir / "label_maps" / dataset_hash
+            proposal_dir = cache_dir / "proposals" / dataset_hash
 
         label_infos: list[LabelInfo] = []
         for name, dm_subset in dataset.subsets().items():
@@ -105,6 +149,9 @@ class OTXDataModule(LightningDataModule):
                 mem_cache_handler=mem_cache_handler,
                 cfg_subset=config_mapping[name],
                 cfg_data_module=config,
+                annotation_index=annotation_indices[name],
+                label_map_dir=label_map_dir,
+                proposal_dir=proposal_dir,
             )
 
             if config.tile_config.enable_tiler:
@@ -124,6 +171,37 @@ class OTXDataModule(LightningDataModule):
 
         self.label_info = next(iter(label_infos))
 
+    def _get_dataset_cache(self) -> tuple[Path | None, str | None]:
+        """Get the cache directory of the data root and the content hash of the dataset if any cache is enabled."""
+        data_root = Path(self.config.data_root)
+        if not (self.config.persist_dataset_snapshot or self.config.persist_annotation_index) or not data_root.exists():
+            return None, None
+
+        cache_dir = get_dataset_cache_dir(data_root, self.config.dataset_cache_dir)
+        return cache_dir, compute_dataset_hash(data_root, self.config.data_format)
+
+    def _build_annotation_indices(
+        self,
+        dataset: DmDataset,
+        cache_dir: Path | None,
+        dataset_hash: str | None,
+    ) -> dict[str, AnnotationIndex]:
+        """Build the columnar index of each subset or load the persisted one if the dataset is not changed."""
+        key = None
+        # The pre-filtering samples the unannotated items randomly, so that the index cannot be reused
+        if (
+            cache_dir is not None
+            and self.config.persist_annotation_index
+            and (self.task == OTXTaskType.H_LABEL_CLS or self.config.unannotated_items_ratio == 0)
+        ):
+            cache_dir = cache_dir / "annotation_index"
+            key = f"{dataset_hash}_{OTXTaskType(self.task).value}"
+
+        return {
+            name: AnnotationIndex.load_or_build(dm_subset, cache_dir, key)
+            for name, dm_subset in dataset.subsets().items()
+        }
+
     def _is_meta_info_valid(self, label_infos: list[LabelInfo]) -> bool:
         """Check whether there are mismatches in the metainfo for the all subsets."""
         if all(label_info == label_infos[0] for label_info in label_infos):
@@ -147,7 +225,7 @@ class OTXDataModule(LightningDataModule):
             "batch_size": config.batch_size,
             "num_workers": config.num_workers,
             "pin_memory": True,
-            "collate_fn": dataset.collate_fn,
+            "collate_fn": self._get_collate_fn(dataset, config),
             "persistent_workers": config.num_workers > 0,
             "sampler": sampler,
             "shuffle": sampler is None,
@@ -163,6 +241,18 @@ class OTXDataModule(LightningDataModule):
                     "sampler": RandomSampler(dataset, num_samples=num_samples),
                 },
             )
+
+        if config.prefetch_depth > 0:
+            common_args.update(
+                {
+                    "shuffle": False,
+                    "sampler": self._get_prefetch_sampler(
+                        dataset,
+                        config,
+                        common_args["sampler"] or RandomSampler(dataset),
+                    ),
+                },
+            )
         return DataLoader(**common_args)
 
     def val_dataloader(self) -> DataLoader:
@@ -174,9 +264,10 @@ class OTXDataModule(LightningDataModule):
             dataset=dataset,
             batch_size=config.batch_size,
             shuffle=False,
+            sampler=self._get_prefetch_sampler(dataset, config, SequentialSampler(dataset)),
             num_workers=config.num_workers,
             pin_memory=True,
-            collate_fn=dataset.collate_fn,
+            collate_fn=self._get_collate_fn(dataset, config),
             persistent_workers=config.num_workers > 0,
         )
 
@@ -189,9 +280,10 @@ class OTXDataModule(LightningDataModule):
             dataset=dataset,
             batch_size=config.batch_size,
             shuffle=False,
+            sampler=self._get_prefetch_sampler(dataset, config, SequentialSampler(dataset)),
             num_workers=config.num_workers,
             pin_memory=True,
-            collate_fn=dataset.collate_fn,
+            collate_fn=self._get_collate_fn(dataset, config),
             persistent_workers=config.num_workers > 0,
         )
 
@@ -204,12 +296,47 @@ class OTXDataModule(LightningDataModule):
             dataset=dataset,
             batch_size=config.batch_size,
             shuffle=False,
+            sampler=self._get_prefetch_sampler(dataset, config, SequentialSampler(dataset)),
             num_workers=config.num_workers,
             pin_memory=True,
-            collate_fn=dataset.collate_fn,
+            collate_fn=self._get_collate_fn(dataset, config),
             persistent_workers=config.num_workers > 0,
         )
 
+    def _get_collate_fn(self, dataset: OTXDataset, config: SubsetConfig) -> Callable:
+        """Apply `config.batch_transforms` to the batches collated by the dataset and pack them if configured."""
+        collate_fn = dataset.collate_fn
+        if config.batch_transforms:
+            collate_fn = BatchTransformCollateFn(collate_fn, BatchTransformLib.generate(config))
+        if self.config.pack_batches:
+            collate_fn = PackedCollateFn(collate_fn)
+        return collate_fn
+
+    def _get_prefetch_sampler(
+        self,
+        dataset: OTXDataset,
+        config: SubsetConfig,
+        sampler: Sampler,
+    ) -> PrefetchSampler | None:
+        """Follow the given sampler to decode the images ahead if `config.prefetch_depth` > 0."""
+        if config.prefetch_depth <= 0:
+            return None
+
+        if self.mem_cache_handler.frozen and self.mem_cache_handler.disk_cache is None:
+            log.warning(
+                f"prefetch_depth of {config.subset_name} subset is ignored since there is no cache to decode into. "
+                "Please set mem_cache_size or disk_cache_dir.",
+            )
+            return None
+
+        dataset.prefetcher = ImagePrefetcher(
+            depth=config.prefetch_depth,
+            num_threads=config.prefetch_num_threads,
+            batch_size=config.batch_size,
+            num_workers=config.num_workers,
+        )
+        return PrefetchSampler(sampler, dataset.prefetcher)
+
     def setup(self, stage: str) -> None:
         """Setup for each stage."""
 
@@ -0,0 +1,212 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Batch entity packed into a few flat tensors to be sent from the data loader workers cheaply."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+import numpy as np
+import torch
+from torch import Tensor
+from torch.utils.data import get_worker_info
+
+from otx.core.data.entity.base import ImageInfo
+from otx.core.types.image import ImageColorChannel
+
+if TYPE_CHECKING:
+    from otx.core.data.entity.base import OTXBatchDataEntity
+    from otx.core.data.entity.tile import OTXTileBatchDataEntity
+
+__all__ = ["PackedBatch", "PackedCollateFn"]
+
+IMAGE_COLOR_CHANNELS = list(ImageColorChannel)
+
+IMAGE_INFO_DTYPE = np.dtype(
+    [
+        ("img_idx", np.int64),
+        ("img_shape", np.int64, 2),
+        ("ori_shape", np.int64, 2),
+        ("padding", np.int64, 4),
+        ("scale_factor", np.float64, 2),
+        ("normalized", np.bool_),
+        ("norm_mean", np.float64, 3),
+        ("norm_std", np.float64, 3),
+        ("image_color_channel", np.uint8),
+    ],
+)
+
+
+class _TensorRef(NamedTuple):
+    """Location of a tensor in the buffer of its dtype and the metadata to rebuild it."""
+
+    dtype: torch.dtype
+    offset: int
+    shape: tuple[int, ...]
+    cls: type[Tensor]
+    meta: dict[str, Any]
+
+
+class _ImageInfoRecords(NamedTuple):
+    """List of `ImageInfo` stored as a structured array."""
+
+    records: np.ndarray
+    ignored_labels: list[list[int]]
+
+
+class PackedBatch:
+    """Batch entity whose tensors are packed into a single flat buffer per dtype.
+
+    When the data loader workers send a batch entity to the main process, every tensor in it,
+    including the empty tensors behind `ImageInfo`, is moved to its own shared memory and unpickled separately.
+    It costs more than the forward pass of a small model if there are many small tensors, e.g., labels and boxes.
+    `PackedBatch` copies them into a few buffers allocated in shared memory in the worker
+    and stores `ImageInfo` as a structured array, so that only the buffers are shared, pinned and transferred.
+    The batch entity is rebuilt from the views of the buffers by `unpack()` in the main process.
+
+    Args:
+        batch: Batch entity to pack. It should be a dataclass.
+    """
+
+    def __init__(self, batch: OTXBatchDataEntity | OTXTileBatchDataEntity) -> None:
+        self.entity_cls = type(batch)
+        tensors: dict[torch.dtype, list[Tensor]] = {}
+        sizes: dict[torch.dtype, int] = {}
+        self.fields = {
+            field.name: self._pack(getattr(batch, field.name), tensors, sizes) for field in dataclasses.fields(batch)
+        }
+
+        in_worker = get_worker_info() is not None
+        self.buffers: dict[torch.dtype, Tensor] = {}
+        for dtype, dtype_tensors in tensors.items():
+            if in_worker:
+                # Allocate the buffer in shared memory directly as `default_collate()` does
+                storage = torch.empty(0, dtype=dtype)._typed_storage()._new_shared(sizes[dtype])  # noqa: SLF001
+                buffer = torch.empty(0, dtype=dtype).new(storage)
+            else:
+                buffer = torch.empty(sizes[dtype], dtype=dtype)
+            torch.cat(dtype_tensors, out=buffer)
+            self.buffers[dtype] = buffer
+
+    def _pack(self, obj: Any, tensors: dict[torch.dtype, list[Tensor]], sizes: dict[torch.dtype, int]) -> Any:  # noqa: ANN401
+        if (
+            isinstance(obj, list)
+            and obj
+            and all(isinstance(item, ImageInfo) for item in obj)
+            and (records := _pack_image_infos(obj)) is not None
+        ):
+            return records
+        if isinstance(obj, Tensor) and not isinstance(obj, ImageInfo) and obj.device.type == "cpu":
+            offset = sizes.get(obj.dtype, 0)
+            tensors.setdefault(obj.dtype, []).append(obj.as_subclass(Tensor).reshape(-1))
+            sizes[obj.dtype] = offset + obj.numel()
+            return _TensorRef(obj.dtype, offset, tuple(obj.shape), type(obj), dict(obj.__dict__))
+        if type(obj) in (list, tuple):
+            return type(obj)(self._pack(item, tensors, sizes) for item in obj)
+        if isinstance(obj, dict):
+            return {key: self._pack(value, tensors, sizes) for key, value in obj.items()}
+        return obj
+
+    def _unpack(self, obj: Any, device: torch.device) -> Any:  # noqa: ANN401
+        if isinstance(obj, _TensorRef):
+            numel = int(np.prod(obj.shape, dtype=np.int64))
+            tensor = self.buffers[obj.dtype][obj.offset : obj.offset + numel].view(obj.shape)
+            if obj.cls is not Tensor:
+                tensor = tensor.as_subclass(obj.cls)
+                tensor.__dict__.update(obj.meta)
+            return tensor
+        if isinstance(obj, _ImageInfoRecords):
+            return _unpack_image_infos(obj, device)
+        if type(obj) in (list, tuple):
+            return type(obj)(self._unpack(item, device) for item in obj)
+        if isinstance(obj, dict):
+            return {key: self._unpack(value, device) for key, value in obj.items()}
+        return obj
+
+    def unpack(self) -> OTXBatchDataEntity | OTXTileBatchDataEntity:
+        """Rebuild the batch entity whose tensors are the views of the buffers.
+
+        `ImageInfo` is rebuilt on the device of the buffers, as the models read `img_info.device`.
+        """
+        device = next((buffer.device for buffer in self.buffers.values()), torch.device("cpu"))
+        return self.entity_cls(**{name: self._unpack(value, device) for name, value in self.fields.items()})
+
+    def pin_memory(self) -> PackedBatch:
+        """Pin the buffers. It is called by the pin memory thread of the data loader."""
+        self.buffers = {dtype: buffer.pin_memory() for dtype, buffer in self.buffers.items()}
+        return self
+
+    def to(self, device: str | torch.device, non_blocking: bool = False) -> PackedBatch:
+        """Move the buffers to the device. It is called by Lightning to transfer the batch."""
+        # The pinned buffers can be copied to GPU asynchronously
+        is_cuda = torch.device(device).type == "cuda"
+        self.buffers = {
+            dtype: buffer.to(device, non_blocking=non_blocking or (is_cuda and buffer.is_pinned()))
+            for dtype, buffer in self.buffers.items()
+        }
+        return self
+
+
+class PackedCollateFn:
+    """Collate function to pack the batch entities collated by the given collate function.
+
+    Args:
+        collate_fn: Collate function of the dataset.
+    """
+
+    def __init__(self, collate_fn: Callable) -> None:
+        self.collate_fn = collate_fn
+
+    def __call__(self, entities: list) -> PackedBatch:
+        """Collate the entities and pack the batch."""
+        return PackedBatch(self.collate_fn(entities))
+
+
+def _pack_image_infos(img_infos: list[ImageInfo]) -> _ImageInfoRecords | None:
+    """Store the list of `ImageInfo` as a structured array. Return None if it has unexpected values."""
+    try:
+        records = np.array(
+            [
+                (
+                    img_info.img_idx,
+                    tuple(img_info.img_shape),
+                    tuple(img_info.ori_shape),
+                    tuple(img_info.padding),
+                    (np.nan, np.nan) if img_info.scale_factor is None else tuple(img_info.scale_factor),
+                    img_info.normalized,
+                    tuple(img_info.norm_mean),
+                    tuple(img_info.norm_std),
+                    IMAGE_COLOR_CHANNELS.index(img_info.image_color_channel),
+                )
+                for img_info in img_infos
+            ],
+            dtype=IMAGE_INFO_DTYPE,
+        )
+    except (TypeError, ValueError):
+        return None
+    return _ImageInfoRecords(records, [list(img_info.ignored_labels) for img_info in img_infos])
+
+
+def _unpack_image_infos(packed: _ImageInfoRecords, device: torch.device) -> list[ImageInfo]:
+    img_infos = []
+    for record, ignored_labels in zip(packed.records.tolist(), packed.ignored_labels):
+        img_idx, img_shape, ori_shape, padding, scale_factor, normalized, norm_mean, norm_std, color_channel = record
+        img_infos.append(
+            ImageInfo(
+                img_idx=img_idx,
+                img_shape=tuple(img_shape),
+                ori_shape=tuple(ori_shape),
+                padding=tuple(padding),
+                scale_factor=None if np.isnan(scale_factor[0]) else tuple(scale_factor),
+                normalized=normalized,
+                norm_mean=tuple(norm_mean),
+                norm_std=tuple(norm_std),
+                image_color_channel=IMAGE_COLOR_CHANNELS[color_channel],
+                ignored_labels=ignored_labels,
+            ),
+        )
+    if device.type != "cpu":
+        img_infos = [img_info.to(device) for img_info in img_infos]
+    return img_infos
@@ -5,45 +5,238 @@
 
 from __future__ import annotations
 
+import logging
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
 from random import sample
 from typing import TYPE_CHECKING
 
-from datumaro.components.annotation import Annotation, Bbox, Polygon
-from datumaro.components.dataset import Dataset as DmDataset
+import numpy as np
+import pycocotools.mask as mask_utils
+from datumaro.components.annotation import Annotation, AnnotationType, Bbox, Polygon
+from datumaro.components.transformer import ItemTransform
+
+from otx.core.data.annotation_index import save_npz
 
 if TYPE_CHECKING:
-    from datumaro.components.dataset_base import DatasetItem
+    from datumaro.components.dataset import Dataset as DmDataset
+    from datumaro.components.dataset_base import DatasetItem, IDataset
+
+logger = logging.getLogger()
+
+# Rasterize the polygons on a process pool if there are more polygons than this number per process
+MIN_POLYGONS_PER_WORKER = 10000
+
+# Bump it if the cached results are changed
+_CACHE_VERSION = 1
+
+_BBOX_MSG = "There are bounding box which is not `x1 < x2 and y1 < y2`, they will be filtered out before training."
+_POLYGON_MSG = "There are invalid polygon, they will be filtered out before training."
 
 
-def pre_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio: float) -> DmDataset:
+def pre_filtering(
+    dataset: DmDataset,
+    data_format: str,
+    unannotated_items_ratio: float,
+    cache_dir: str | Path | None = None,
+    key: str | None = None,
+) -> DmDataset:
     """Pre-filtering function to filter the dataset based on certain criteria.
 
+    The annotations are validated in the same way as `is_valid_annot()`, but the boxes and polygons
+    of the whole dataset are checked at once as packed arrays and only the polygons with a valid extent
+    are rasterized to compute their areas, on a process pool for a large dataset.
+
     Args:
         dataset (DmDataset): The input dataset to be filtered.
         data_format (str): The format of the dataset.
         unannotated_items_ratio (float): The ratio of background unannotated items to be used.
             This must be a float between 0 and 1.
+        cache_dir (str | Path | None): Directory to cache the validity of the annotations.
+            If None, it is not cached.
+        key (str | None): Content hash of the dataset (see `compute_dataset_hash()`). If None, it is not cached.
 
     Returns:
         DmDataset: The filtered dataset.
     """
-    used_background_items = set()
     msg = f"There are empty annotation items in train set, Of these, only {unannotated_items_ratio*100}% are used."
     warnings.warn(msg, stacklevel=2)
+
+    cache_path = Path(cache_dir) / f"{key}.npz" if cache_dir is not None and key is not None else None
+    stats = _load_stats(cache_path, len(dataset)) if cache_path is not None else None
+    if stats is None:
+        stats = _collect_stats(dataset)
+        if cache_path is not None:
+            try:
+                save_npz(cache_path, version=_CACHE_VERSION, **stats)
+            except OSError as e:
+                logger.warning(f"Cannot store the pre-filtering results in {cache_dir}: {e}")
+
+    item_ids, subsets, ann_offsets = stats["item_ids"], stats["subsets"], stats["ann_offsets"]
+    ann_types, ann_valid = stats["ann_types"], stats["ann_valid"]
+    num_anns = np.diff(ann_offsets)
+
+    is_empty_train = (subsets == "train") & (num_anns == 0)
+    used_background_items = set()
     if unannotated_items_ratio > 0:
-        empty_items = [item.id for item in dataset if item.subset == "train" and len(item.annotations) == 0]
+        empty_items = item_ids[is_empty_train].tolist()
         used_background_items = set(sample(empty_items, int(len(empty_items) * unannotated_items_ratio)))
+    is_dropped = is_empty_train & ~np.isin(item_ids, list(used_background_items))
+
+    if not ann_valid[ann_types == AnnotationType.bbox.value].all():
+        warnings.warn(_BBOX_MSG, stacklevel=2)
+    if not ann_valid[ann_types == AnnotationType.polygon.value].all():
+        warnings.warn(_POLYGON_MSG, stacklevel=2)
+
+    has_invalid = np.zeros(len(item_ids), dtype=bool)
+    has_invalid[np.repeat(np.arange(len(item_ids)), num_anns)[~ann_valid]] = True
+    dataset = dataset.transform(
+        _PreFilter,
+        dropped_items={(subsets[i], item_ids[i]) for i in np.flatnonzero(is_dropped).tolist()},
+        ann_valid={
+            (subsets[i], item_ids[i]): ann_valid[ann_offsets[i] : ann_offsets[i + 1]]
+            for i in np.flatnonzero(has_invalid).tolist()
+        },
+    )
+
+    ann_labels = stats["ann_labels"]
+    is_used = ann_valid & np.repeat(~is_dropped, num_anns) & (ann_labels >= 0)
+    return remove_unused_labels(dataset, data_format, used_labels=np.unique(ann_labels[is_used]).tolist())
+
+
+class _PreFilter(ItemTransform):
+    """Remove the dropped items and the invalid annotations in a single pass."""
+
+    def __init__(
+        self,
+        extractor: IDataset,
+        dropped_items: set[tuple[str, str]],
+        ann_valid: dict[tuple[str, str], np.ndarray],
+    ) -> None:
+        super().__init__(extractor)
+        self._dropped_items = dropped_items
+        self._ann_valid = ann_valid
 
-    dataset = DmDataset.filter(
-        dataset,
-        lambda item: not (
-            item.subset == "train" and len(item.annotations) == 0 and item.id not in used_background_items
-        ),
+    def transform_item(self, item: DatasetItem) -> DatasetItem | None:
+        key = (item.subset, item.id)
+        if key in self._dropped_items:
+            return None
+        if (valid := self._ann_valid.get(key)) is None:
+            return item
+        return self.wrap_item(item, annotations=[ann for ann, v in zip(item.annotations, valid) if v])
+
+
+def _load_stats(cache_path: Path, num_items: int) -> dict[str, np.ndarray] | None:
+    try:
+        with np.load(cache_path, allow_pickle=False) as npz:
+            if int(npz["version"]) != _CACHE_VERSION or len(npz["item_ids"]) != num_items:
+                return None
+            logger.info(f"Load the pre-filtering results from {cache_path}.")
+            return {name: npz[name] for name in npz.files if name != "version"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _collect_stats(dataset: DmDataset) -> dict[str, np.ndarray]:
+    """Collect the annotations of the dataset into packed arrays and validate them."""
+    item_ids: list[str] = []
+    subsets: list[str] = []
+    ann_offsets = [0]
+    ann_types: list[int] = []
+    ann_labels: list[int] = []
+    boxes: list[list[float]] = []
+    box_anns: list[int] = []
+    polygon_points: list[list[float]] = []
+    polygon_anns: list[int] = []
+
+    for item in dataset:
+        item_ids.append(item.id)
+        subsets.append(item.subset)
+        for ann in item.annotations:
+            if isinstance(ann, Bbox):
+                box_anns.append(len(ann_types))
+                boxes.append(ann.points)
+            elif isinstance(ann, Polygon):
+                polygon_anns.append(len(ann_types))
+                polygon_points.append(ann.points)
+            ann_types.append(ann.type.value)
+            label = getattr(ann, "label", None)
+            ann_labels.append(label if label is not None else -1)
+        ann_offsets.append(len(ann_types))
+
+    ann_valid = np.ones(len(ann_types), dtype=bool)
+    if boxes:
+        x1, y1, x2, y2 = np.array(boxes, dtype=np.float64).T
+        ann_valid[box_anns] = (x1 < x2) & (y1 < y2)
+    if polygon_points:
+        ann_valid[polygon_anns] = _validate_polygons(polygon_points)
+
+    return {
+        "item_ids": np.array(item_ids, dtype=str),
+        "subsets": np.array(subsets, dtype=str),
+        "ann_offsets": np.array(ann_offsets, dtype=np.int64),
+        "ann_types": np.array(ann_types, dtype=np.int8),
+        "ann_labels": np.array(ann_labels, dtype=np.int64),
+        "ann_valid": ann_valid,
+    }
+
+
+def _validate_polygons(polygon_points: list[list[float]]) -> np.ndarray:
+    """Validate the polygons in the same way as `is_valid_annot()`."""
+    lengths = np.array([len(points) // 2 for points in polygon_points], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    points = np.fromiter(
+        chain.from_iterable(points[: 2 * length] for points, length in zip(polygon_points, lengths.tolist())),
+        dtype=np.float64,
+        count=2 * int(lengths.sum()),
     )
-    dataset = DmDataset.filter(dataset, is_valid_annot, filter_annotations=True)
+    xs, ys = points[0::2], points[1::2]
 
-    return remove_unused_labels(dataset, data_format)
+    num_polygons = len(polygon_points)
+    x0, y0, x1, y1 = (np.zeros(num_polygons) for _ in range(4))
+    nonempty = lengths > 0
+    starts = offsets[:-1][nonempty]
+    x0[nonempty], x1[nonempty] = np.minimum.reduceat(xs, starts), np.maximum.reduceat(xs, starts)
+    y0[nonempty], y1[nonempty] = np.minimum.reduceat(ys, starts), np.maximum.reduceat(ys, starts)
+
+    # The canvas size is computed from `Polygon.get_bbox()` as `Polygon.get_area()` does
+    heights, widths = y0 + (y1 - y0), x0 + (x1 - x0)
+    candidates = nonempty & (x0 < x1) & (y0 < y1) & (heights >= 0) & (widths >= 0)
+
+    num_workers = min(os.cpu_count() or 1, int(candidates.sum()) // MIN_POLYGONS_PER_WORKER)
+    if num_workers <= 1:
+        return _rasterized_areas(points, offsets, heights, widths, candidates) > 0
+
+    chunks = [
+        (
+            points[2 * offsets[c[0]] : 2 * offsets[c[-1] + 1]],
+            offsets[c[0] : c[-1] + 2] - offsets[c[0]],
+            heights[c],
+            widths[c],
+            candidates[c],
+        )
+        for c in np.array_split(np.arange(num_polygons), num_workers)
+    ]
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        return np.concatenate(list(executor.map(_rasterized_areas, *zip(*chunks)))) > 0
+
+
+def _rasterized_areas(
+    points: np.ndarray,
+    offsets: np.ndarray,
+    heights: np.ndarray,
+    widths: np.ndarray,
+    candidates: np.ndarray,
+) -> np.ndarray:
+    """Compute the rasterized areas of the candidate polygons. Zero for the others."""
+    areas = np.zeros(len(candidates), dtype=np.int64)
+    for i in np.flatnonzero(candidates).tolist():
+        polygon = points[2 * offsets[i] : 2 * offsets[i + 1]].tolist()
+        areas[i] = mask_utils.area(mask_utils.frPyObjects([polygon], float(heights[i]), float(widths[i])))[0]
+    return areas
 
 
 def is_valid_annot(item: DatasetItem, annotation: Annotation) -> bool:  # noqa: ARG001
@@ -52,8 +245,7 @@ def is_valid_annot(item: DatasetItem, annotation: Annotation) -> bool:  # noqa:
         x1, y1, x2, y2 = annotation.points
         if x1 < x2 and y1 < y2:
             return True
-        msg = "There are bounding box which is not `x1 < x2 and y1 < y2`, they will be filtered out before training."
-        warnings.warn(msg, stacklevel=2)
+        warnings.warn(_BBOX_MSG, stacklevel=2)
         return False
     if isinstance(annotation, Polygon):
         # TODO(JaegukHyun): This process is computationally intensive.
@@ -62,22 +254,26 @@ def is_valid_annot(item: DatasetItem, annotation: Annotation) -> bool:  # noqa:
         y_points = [annotation.points[i + 1] for i in range(0, len(annotation.points), 2)]
         if min(x_points) < max(x_points) and min(y_points) < max(y_points) and annotation.get_area() > 0:
             return True
-        msg = "There are invalid polygon, they will be filtered out before training."
         return False
     return True
 
 
-def remove_unused_labels(dataset: DmDataset, data_format: str) -> DmDataset:
-    """Remove unused labels in Datumaro dataset."""
+def remove_unused_labels(dataset: DmDataset, data_format: str, used_labels: list[int] | None = None) -> DmDataset:
+    """Remove unused labels in Datumaro dataset.
+
+    Args:
+        dataset (DmDataset): The input dataset.
+        data_format (str): The format of the dataset.
+        used_labels (list[int] | None): Label ids used by the annotations in ascending order.
+            If None, they are collected from the dataset.
+    """
     original_categories: list[str] = dataset.get_label_cat_names()
-    used_labels: list[int] = list({ann.label for item in dataset for ann in item.annotations})
+    if used_labels is None:
+        used_labels = list({ann.label for item in dataset for ann in item.annotations})
     if data_format == "ava":
         used_labels = [0, *used_labels]
     elif data_format == "common_semantic_segmentation_with_subset_dirs":
-        if 0 in used_labels:
-            used_labels = [label - 1 for label in used_labels[1:]]
-        else:
-            used_labels = [label - 1 for label in used_labels]
+        used_labels = [label - 1 for label in used_labels if label != 0]
     if len(used_labels) == len(original_categories):
         return dataset
     msg = "There are unused labels in dataset, they will be filtered out before training."
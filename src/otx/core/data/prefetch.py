@@ -0,0 +1,195 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Read-ahead of the images in the sampler order inside DataLoader workers."""
+
+from __future__ import annotations
+
+import ctypes as ct
+import math
+import multiprocessing as mp
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterator
+
+import numpy as np
+import torch
+from torch import distributed
+from torch.utils.data import DistributedSampler, Sampler, get_worker_info
+
+__all__ = ["ImagePrefetcher", "PrefetchSampler"]
+
+
+class ImagePrefetcher:
+    """Decode the images of the next indices in the sampler order on a thread pool of each DataLoader worker.
+
+    The main process publishes the indices drawn by the sampler to the shared memory on every epoch
+    (see `PrefetchSampler`). Since DataLoader dispatches the batches to the workers in round-robin,
+    a worker can find the indices of its own next batches in the published order.
+    Whenever the dataset fetches an index, the worker loads the next `depth` indices of its own
+    with `num_threads` threads, e.g., into the memory cache, while the current item is being transformed.
+    If the fetched index does not match the order (e.g., a worker died), it looks for the index in the order again.
+
+    Args:
+        depth: Number of the indices to read ahead per worker.
+        num_threads: Number of the threads per worker.
+        batch_size: Batch size of the DataLoader.
+        num_workers: Number of the workers of the DataLoader.
+    """
+
+    def __init__(self, depth: int, num_threads: int, batch_size: int, num_workers: int) -> None:
+        self.depth = depth
+        self.num_threads = num_threads
+        self.batch_size = max(batch_size, 1)
+        self.num_workers = max(num_workers, 1)
+
+        self._order_arr: ct.Array | None = None
+        self._order_len = mp.Value(ct.c_int64, 0, lock=False)
+        self._epoch = mp.Value(ct.c_int64, 0, lock=False)
+        self._reset_local_states()
+
+    def _reset_local_states(self) -> None:
+        self._pid = os.getpid()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[int, Future] = {}
+        self._local_epoch = -1
+        # Number of the indices fetched by this worker and the last one scheduled to load
+        self._num_fetched = 0
+        self._num_scheduled = 0
+
+    def __getstate__(self) -> dict:
+        """Do not pickle the thread pool of this process."""
+        state = self.__dict__.copy()
+        state.update(_executor=None, _futures={}, _pid=-1)
+        return state
+
+    @property
+    def _order(self) -> np.ndarray:
+        if self._order_arr is None:
+            return np.empty(0, dtype=np.int64)
+        return np.frombuffer(self._order_arr, dtype=np.int64)
+
+    def reserve(self, size: int) -> None:
+        """Allocate the shared order to publish up to `size` indices.
+
+        It should be called in the main process before the DataLoader workers are started.
+        """
+        if size > len(self._order):
+            self._order_arr = mp.Array(ct.c_int64, size, lock=False)
+
+    def publish(self, indices: list[int]) -> None:
+        """Publish the order of the indices for a new epoch. It is called by the main process."""
+        order = self._order
+        num_indices = min(len(indices), len(order))
+        order[:num_indices] = indices[:num_indices]
+        self._order_len.value = num_indices
+        self._epoch.value += 1
+
+    def _position(self, num_fetched: int, worker_id: int) -> int:
+        """Get the position in the order of the `num_fetched`-th index fetched by the given worker."""
+        num_batches, offset = divmod(num_fetched, self.batch_size)
+        return (num_batches * self.num_workers + worker_id) * self.batch_size + offset
+
+    def _resync(self, index: int, worker_id: int) -> bool:
+        """Find the index in the order among the positions of the worker and update the number of the fetched ones."""
+        order = self._order[: self._order_len.value]
+        positions = np.flatnonzero(order == index)
+        positions = positions[(positions // self.batch_size) % self.num_workers == worker_id]
+        positions = positions[positions >= self._position(self._num_fetched, worker_id)]
+        if len(positions) == 0:
+            return False
+
+        num_batches, offset = divmod(int(positions[0]), self.batch_size)
+        self._num_fetched = num_batches // self.num_workers * self.batch_size + offset
+        return True
+
+    def on_fetch(self, index: int, load: Callable[[int], None]) -> None:
+        """Wait for the index if it is being loaded and schedule to load the next indices of this worker.
+
+        Args:
+            index: Index being fetched by the dataset.
+            load: Function loading the given index, e.g., into the memory cache. It is called on the threads.
+        """
+        if self._pid != os.getpid():
+            # The thread pool is not inherited by the forked worker
+            self._reset_local_states()
+        if (epoch := self._epoch.value) != self._local_epoch:
+            self._futures.clear()
+            self._local_epoch = epoch
+            self._num_fetched = self._num_scheduled = 0
+
+        worker_info = get_worker_info()
+        worker_id = worker_info.id if worker_info is not None else 0
+        order_len = self._order_len.value
+
+        order = self._order
+        pos = self._position(self._num_fetched, worker_id)
+        if (pos >= order_len or order[pos] != index) and not self._resync(index, worker_id):
+            return
+        pos = self._position(self._num_fetched, worker_id)
+
+        if (future := self._futures.pop(pos, None)) is not None:
+            wait([future])
+        for stale in [p for p in self._futures if p < pos]:
+            self._futures.pop(stale).cancel()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_threads, thread_name_prefix="otx_prefetch")
+
+        self._num_fetched += 1
+        self._num_scheduled = max(self._num_scheduled, self._num_fetched)
+        while self._num_scheduled < self._num_fetched + self.depth:
+            next_pos = self._position(self._num_scheduled, worker_id)
+            if next_pos >= order_len:
+                break
+            self._futures[next_pos] = self._executor.submit(load, int(order[next_pos]))
+            self._num_scheduled += 1
+
+
+class PrefetchSampler(DistributedSampler):
+    """Sampler publishing the indices drawn by the given sampler to `ImagePrefetcher` on every epoch.
+
+    It is a `DistributedSampler`, so that Lightning does not wrap it with another distributed sampler
+    which would change the order seen by the workers. Instead, it splits the indices across the replicas
+    in the same way as Lightning (without shuffling) if the given sampler is not distributed yet.
+    In this case, the generator of the given sampler is seeded with `seed + epoch` on every epoch,
+    so that every replica draws the same indices before taking its share.
+
+    Args:
+        sampler: Sampler to follow, e.g., `BalancedSampler` or `RandomSampler` for tiling.
+        prefetcher: Prefetcher of the dataset.
+    """
+
+    def __init__(self, sampler: Sampler, prefetcher: ImagePrefetcher) -> None:
+        num_replicas, rank = 1, 0
+        if not isinstance(sampler, DistributedSampler) and distributed.is_available() and distributed.is_initialized():
+            num_replicas, rank = distributed.get_world_size(), distributed.get_rank()
+
+        super().__init__(sampler, num_replicas=num_replicas, rank=rank, shuffle=False)  # type: ignore[arg-type]
+        self.sampler = sampler
+        self.prefetcher = prefetcher
+        prefetcher.reserve(len(sampler))  # type: ignore[arg-type]
+
+        self.generator: torch.Generator | None = None
+        if self.num_replicas > 1 and hasattr(sampler, "generator"):
+            if sampler.generator is None:
+                sampler.generator = torch.Generator()
+            self.generator = sampler.generator
+
+    def __iter__(self) -> Iterator[int]:
+        if self.generator is not None:
+            self.generator.manual_seed(self.seed + self.epoch)
+        indices = list(self.sampler)
+        if self.num_replicas > 1:
+            total_size = math.ceil(len(indices) / self.num_replicas) * self.num_replicas
+            indices = (indices * math.ceil(total_size / max(len(indices), 1)))[:total_size]
+            indices = indices[self.rank : total_size : self.num_replicas]
+
+        self.prefetcher.publish(indices)
+        return iter(indices)
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch of the given sampler as well."""
+        super().set_epoch(epoch)
+        if hasattr(self.sampler, "set_epoch"):
+            self.sampler.set_epoch(epoch)
@@ -0,0 +1,106 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Binary snapshot of the imported Datumaro dataset."""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+
+from datumaro import Dataset as DmDataset
+from datumaro.components.annotation import Mask, RleMask
+from datumaro.components.errors import DatumaroError
+from datumaro.components.media import Image
+
+logger = logging.getLogger()
+
+__all__ = ["import_dataset"]
+
+SNAPSHOT_FORMAT = "datumaro_binary"
+# Suffix of the empty file recording that the snapshot of the dataset with the key is not available
+UNAVAILABLE_SUFFIX = ".unavailable"
+
+
+def import_dataset(
+    data_root: str | Path,
+    data_format: str,
+    cache_dir: str | Path | None = None,
+    key: str | None = None,
+) -> DmDataset:
+    """Import the dataset from the snapshot if it exists. Otherwise, import it from the source and store the snapshot.
+
+    The snapshot is a Datumaro binary export of the annotations without the media.
+    It is loaded much faster than parsing the original annotation files (e.g., a large COCO json) again.
+    The media paths are stored as absolute paths, so that the snapshot refers to the original media files.
+    It is skipped if the dataset is not an image dataset or has the masks from the image files,
+    which would be decoded and stored in the snapshot instead of being loaded lazily.
+    The unavailability is recorded in the cache directory as well, so that the annotations are checked only once.
+
+    Args:
+        data_root: Root directory or file of the dataset.
+        data_format: Format of the dataset.
+        cache_dir: Directory to store the snapshot. If None, the snapshot is not used.
+        key: Content hash of the dataset (see `compute_dataset_hash()`). If None, the snapshot is not used.
+    """
+    if cache_dir is None or key is None:
+        return DmDataset.import_from(data_root, format=data_format)
+
+    snapshot_dir = Path(cache_dir) / key
+    if snapshot_dir.exists():
+        try:
+            dataset = DmDataset.import_from(str(snapshot_dir), format=SNAPSHOT_FORMAT)
+            logger.info(f"Load the dataset snapshot from {snapshot_dir}.")
+            return dataset  # noqa: TRY300
+        except (DatumaroError, OSError, ValueError) as e:
+            logger.warning(f"Cannot load the dataset snapshot from {snapshot_dir}: {e}")
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    dataset = DmDataset.import_from(str(Path(data_root).resolve()), format=data_format)
+    unavailable_path = snapshot_dir.with_name(f"{key}{UNAVAILABLE_SUFFIX}")
+    if unavailable_path.exists():
+        return dataset
+
+    if _is_snapshot_available(dataset):
+        _save_snapshot(dataset, snapshot_dir)
+    else:
+        _mark_unavailable(unavailable_path)
+    return dataset
+
+
+def _is_snapshot_available(dataset: DmDataset) -> bool:
+    if dataset.media_type() is not Image:
+        return False
+    return not any(
+        isinstance(ann, Mask) and not isinstance(ann, RleMask) for item in dataset for ann in item.annotations
+    )
+
+
+def _mark_unavailable(path: Path) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    except OSError as e:
+        logger.warning(f"Cannot record the unavailable dataset snapshot in {path.parent}: {e}")
+
+
+def _save_snapshot(dataset: DmDataset, snapshot_dir: Path) -> None:
+    """Export the dataset to a temporary directory and move it to the snapshot directory atomically."""
+    try:
+        snapshot_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(dir=snapshot_dir.parent, suffix=".tmp"))
+    except OSError as e:
+        logger.warning(f"Cannot store the dataset snapshot in {snapshot_dir.parent}: {e}")
+        return
+
+    try:
+        dataset.export(str(tmp_dir), format=SNAPSHOT_FORMAT, save_media=False)
+        tmp_dir.rename(snapshot_dir)
+    except (DatumaroError, NotImplementedError, OSError) as e:
+        # Another process may have stored the same snapshot first
+        if not snapshot_dir.exists():
+            logger.warning(f"Cannot store the dataset snapshot in {snapshot_dir}: {e}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -5,12 +5,18 @@
 from __future__ import annotations
 
 import logging as log
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
-from datumaro import Bbox, Dataset, DatasetSubset, Polygon
+from datumaro.components.annotation import AnnotationType
 
-from otx.core.config.data import TileConfig
+from otx.core.data.annotation_index import AnnotationIndex
+from otx.core.data.media_meta import MediaMetaCache
+
+if TYPE_CHECKING:
+    from datumaro import Dataset, DatasetSubset
+
+    from otx.core.config.data import TileConfig
 
 
 def compute_robust_statistics(values: np.array) -> dict[str, float]:
@@ -72,6 +78,7 @@ def compute_robust_dataset_statistics(
     dataset: DatasetSubset,
     ann_stat: bool = False,
     max_samples: int = 1000,
+    annotation_index: AnnotationIndex | None = None,
 ) -> dict[str, Any]:
     """Computes robust statistics of image & annotation sizes.
 
@@ -79,6 +86,8 @@ def compute_robust_dataset_statistics(
         dataset (DatasetSubset): Input dataset.
         ann_stat (bool, optional): Whether to compute annotation size statistics. Defaults to False.
         max_samples (int, optional): Maximum number of dataset subsamples to analyze. Defaults to 1000.
+        annotation_index (AnnotationIndex | None, optional): Columnar index of the dataset.
+            If None, it is built from the dataset. Defaults to None.
 
     Returns:
         Dict[str, Any]: Robust avg, min, max values for images, and annotations optionally.
@@ -94,44 +103,40 @@ def compute_robust_dataset_statistics(
     if len(dataset) == 0 or max_samples <= 0:
         return stat
 
-    data_ids = [item.id for item in dataset]
-    max_image_samples = min(max_samples, len(dataset))
+    if annotation_index is None:
+        annotation_index = AnnotationIndex.build(dataset)
+
+    max_image_samples = min(max_samples, len(annotation_index))
     # NOTE: current OTX does not set seed globally
     rng = np.random.default_rng(42)
-    data_ids = rng.choice(data_ids, max_image_samples, replace=False)[:max_image_samples]
+    indices = rng.choice(len(annotation_index), max_image_samples, replace=False)[:max_image_samples]
 
-    image_sizes = []
-    for idx in data_ids:
-        data = dataset.get(id=idx, subset=dataset.name)
-        height, width = data.media.size
-        image_sizes.append(np.sqrt(width * height))
-    stat["image"] = compute_robust_scale_statistics(np.array(image_sizes))
+    image_sizes = annotation_index.image_sizes[indices]
+    for i in np.flatnonzero(image_sizes[:, 0] < 0):
+        # The image size is unknown without loading the image
+        media = dataset.get(id=annotation_index.item_ids[indices[i]].item(), subset=dataset.name).media
+        image_sizes[i] = MediaMetaCache.current().get_image_size(media) or media.size
+    stat["image"] = compute_robust_scale_statistics(np.sqrt(image_sizes[:, 0] * image_sizes[:, 1]))
 
     if ann_stat:
         stat["annotation"] = {}
         num_per_images: list[int] = []
         size_of_box_shapes: list[float] = []
         size_of_polygon_shapes: list[float] = []
-        for idx in data_ids:
-            data = dataset.get(id=idx, subset=dataset.name)
-            annotations: dict[str, list] = {"boxes": [], "polygons": []}
-            for ann in data.annotations:
-                if isinstance(ann, Bbox):
-                    annotations["boxes"].append(ann)
-                elif isinstance(ann, Polygon):
-                    annotations["polygons"].append(ann)
-
-            num_per_images.append(max(len(annotations["boxes"]), len(annotations["polygons"])))
+        offsets = annotation_index.ann_offsets
+        is_polygon = annotation_index.ann_types == AnnotationType.polygon.value
+        is_box = np.isfinite(annotation_index.boxes[:, 0]) & ~is_polygon
+        sizes = np.sqrt(annotation_index.areas)
+        for idx in indices:
+            anns = slice(offsets[idx], offsets[idx + 1])
+            num_per_images.append(max(int(is_box[anns].sum()), int(is_polygon[anns].sum())))
 
             if len(size_of_box_shapes) >= max_samples or len(size_of_polygon_shapes) >= max_samples:
                 continue
 
-            size_of_box_shapes.extend(
-                filter(lambda x: x >= 1, [np.sqrt(anno.get_area()) for anno in annotations["boxes"]]),
-            )
-            size_of_polygon_shapes.extend(
-                filter(lambda x: x >= 1, [np.sqrt(anno.get_area()) for anno in annotations["polygons"]]),
-            )
+            valid = sizes[anns] >= 1
+            size_of_box_shapes.extend(sizes[anns][is_box[anns] & valid].tolist())
+            size_of_polygon_shapes.extend(sizes[anns][is_polygon[anns] & valid].tolist())
 
         stat["annotation"]["num_per_image"] = compute_robust_statistics(np.array(num_per_images))
         stat["annotation"]["size_of_shape"] = compute_robust_scale_statistics(
@@ -141,7 +146,11 @@ def compute_robust_dataset_statistics(
     return stat
 
 
-def adapt_tile_config(tile_config: TileConfig, dataset: Dataset) -> None:
+def adapt_tile_config(
+    tile_config: TileConfig,
+    dataset: Dataset,
+    annotation_index: AnnotationIndex | None = None,
+) -> None:
     """Config tile parameters.
 
     Adapt based on annotation statistics.
@@ -150,9 +159,10 @@ def adapt_tile_config(tile_config: TileConfig, dataset: Dataset) -> None:
     Args:
         tile_config (TileConfig): tiling parameters of the model
         dataset (Dataset): Datumaro dataset including all subsets
+        annotation_index (AnnotationIndex | None): Columnar index of the train subset
     """
     if (train_dataset := dataset.subsets().get("train")) is not None:
-        stat = compute_robust_dataset_statistics(train_dataset, ann_stat=True)
+        stat = compute_robust_dataset_statistics(train_dataset, ann_stat=True, annotation_index=annotation_index)
         max_num_objects = round(stat["annotation"]["num_per_image"]["max"])
         avg_size = stat["annotation"]["size_of_shape"]["avg"]
         min_size = stat["annotation"]["size_of_shape"]["robust_min"]
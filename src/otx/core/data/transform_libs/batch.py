@@ -0,0 +1,329 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Helper to support the transforms applied on a collated batch."""
+
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Sequence
+
+import torch
+import torchvision.transforms.v2 as tvt_v2
+from lightning.pytorch.cli import instantiate_class
+from omegaconf import DictConfig
+from torchvision import tv_tensors
+from torchvision.transforms.v2 import functional as F  # noqa: N812
+
+from otx.core.data.entity.base import OTXBatchDataEntity, Points
+
+if TYPE_CHECKING:
+    from datumaro import Polygon
+    from torchvision.transforms.v2 import Compose
+
+    from otx.core.config.data import SubsetConfig
+
+
+class BatchTransform:
+    """Base class of the transforms applied on a collated `OTXBatchDataEntity`.
+
+    Unlike the transforms applied to each `OTXDataEntity` in the dataset, the images of the batch
+    are processed as a single B x C x H x W tensor, so that the per-sample Python overhead is paid once per batch.
+    The random parameters are still drawn for each sample.
+    Besides the images, the transforms update `imgs_info` and the spatial annotations of the batch,
+    `bboxes`, `masks`, `points` and `polygons`, if they exist.
+    """
+
+    @abstractmethod
+    def __call__(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Apply the transform to the batch in-place and return it."""
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{key}={value}" for key, value in vars(self).items() if not key.startswith("_"))
+        return f"{self.__class__.__name__}({args})"
+
+    @staticmethod
+    def _get_stacked_images(batch: OTXBatchDataEntity) -> tv_tensors.Image:
+        if isinstance(batch.images, list) and any(image.shape != batch.images[0].shape for image in batch.images):
+            msg = (
+                f"{batch.__class__.__name__} has images of different shapes, which cannot be transformed at once. "
+                "Please resize them to the same size in the dataset transforms or with `BatchResize` first."
+            )
+            raise ValueError(msg)
+        return batch.stacked_images
+
+
+class BatchNormalize(BatchTransform):
+    """Convert the images to float32 and normalize them at once.
+
+    It is equivalent to `ToDtype(torch.float32, scale=scale)` followed by `Normalize(mean, std)`.
+
+    Args:
+        mean: Mean of each channel.
+        std: Standard deviation of each channel.
+        scale: If True, the images are scaled from [0, 255] to [0, 1] before normalization.
+    """
+
+    def __init__(self, mean: Sequence[float], std: Sequence[float], scale: bool = False) -> None:
+        self.mean = list(mean)
+        self.std = list(std)
+        self.scale = scale
+
+    def __call__(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:  # noqa: D102
+        images = F.to_dtype(self._get_stacked_images(batch), torch.float32, scale=self.scale)
+        batch.images = F.normalize(images, mean=self.mean, std=self.std)
+        batch.imgs_info = [F.normalize(img_info, mean=self.mean, std=self.std) for img_info in batch.imgs_info]
+        return batch
+
+
+class BatchRandomFlip(BatchTransform):
+    """Flip each image of the batch with the given probability.
+
+    Args:
+        p: Probability of each image to be flipped.
+        direction: "horizontal" or "vertical".
+    """
+
+    def __init__(self, p: float = 0.5, direction: str = "horizontal") -> None:
+        if direction not in ("horizontal", "vertical"):
+            msg = f"direction should be 'horizontal' or 'vertical', but got {direction}."
+            raise ValueError(msg)
+        self.p = p
+        self.direction = direction
+
+    def __call__(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:  # noqa: D102
+        images = self._get_stacked_images(batch)
+        flipped = (torch.rand(len(images)) < self.p).nonzero().flatten()
+        if len(flipped) == 0:
+            batch.images = images
+            return batch
+
+        dim = -1 if self.direction == "horizontal" else -2
+        flip_fn = F.horizontal_flip if self.direction == "horizontal" else F.vertical_flip
+        images[flipped] = images[flipped].flip(dim)
+        batch.images = images
+
+        height, width = images.shape[-2:]
+        for i in flipped.tolist():
+            _update_annotations(
+                batch,
+                i,
+                bboxes_fn=flip_fn,
+                masks_fn=lambda mask: tv_tensors.wrap(mask.flip(dim), like=mask),
+                points_fn=lambda points: self._flip_points(points, height, width),
+                polygon_fn=lambda polygon: self._flip_polygon(polygon, height, width),
+            )
+        return batch
+
+    def _flip_points(self, points: Points, height: int, width: int) -> Points:
+        flipped = points.clone()
+        if self.direction == "horizontal":
+            flipped[..., 0] = width - points[..., 0]
+        else:
+            flipped[..., 1] = height - points[..., 1]
+        return tv_tensors.wrap(flipped, like=points)
+
+    def _flip_polygon(self, polygon: Polygon, height: int, width: int) -> Polygon:
+        points = list(polygon.points)
+        if self.direction == "horizontal":
+            points[0::2] = [width - x for x in points[0::2]]
+        else:
+            points[1::2] = [height - y for y in points[1::2]]
+        return polygon.wrap(points=points)
+
+
+class BatchResize(BatchTransform):
+    """Resize all the images of the batch to the fixed size.
+
+    The images of different shapes are resized group by group and stacked,
+    so that it can follow the dataset transforms producing the images of different shapes.
+
+    Args:
+        size: Output size (height, width).
+        interpolation: Interpolation mode of the images. The masks are always resized by the nearest neighbor.
+        antialias: Whether to apply antialiasing to the images.
+    """
+
+    def __init__(
+        self,
+        size: Sequence[int],
+        interpolation: F.InterpolationMode | int = F.InterpolationMode.BILINEAR,
+        antialias: bool = True,
+    ) -> None:
+        self.size = list(size)
+        self.interpolation = F._geometry._check_interpolation(interpolation)  # noqa: SLF001
+        self.antialias = antialias
+
+    def __call__(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:  # noqa: D102
+        images = batch.images if isinstance(batch.images, list) else list(batch.images)
+        sizes = [tuple(image.shape[-2:]) for image in images]
+
+        resized: list[torch.Tensor] = list(images)
+        for size in set(sizes):
+            indices = [i for i, image_size in enumerate(sizes) if image_size == size]
+            group = torch.stack([images[i] for i in indices])
+            group = F.resize(group, self.size, interpolation=self.interpolation, antialias=self.antialias)
+            for i, image in zip(indices, group):
+                resized[i] = image
+        batch.images = tv_tensors.Image(torch.stack(resized))
+        batch.imgs_info = [F.resize(img_info, self.size) for img_info in batch.imgs_info]
+
+        for i, (height, width) in enumerate(sizes):
+            scale_x, scale_y = self.size[1] / width, self.size[0] / height
+            _update_annotations(
+                batch,
+                i,
+                bboxes_fn=lambda bboxes: F.resize(bboxes, self.size),
+                masks_fn=self._resize_mask,
+                points_fn=lambda points: F.resize(points, self.size),
+                polygon_fn=lambda polygon, sx=scale_x, sy=scale_y: self._resize_polygon(polygon, sx, sy),
+            )
+        return batch
+
+    def _resize_mask(self, mask: tv_tensors.Mask) -> tv_tensors.Mask:
+        if mask.numel() == 0:
+            return tv_tensors.wrap(mask.new_zeros((*mask.shape[:-2], *self.size)), like=mask)
+        return F.resize(mask, self.size, interpolation=F.InterpolationMode.NEAREST)
+
+    @staticmethod
+    def _resize_polygon(polygon: Polygon, scale_x: float, scale_y: float) -> Polygon:
+        points = list(polygon.points)
+        points[0::2] = [x * scale_x for x in points[0::2]]
+        points[1::2] = [y * scale_y for y in points[1::2]]
+        return polygon.wrap(points=points)
+
+
+class BatchColorJitter(BatchTransform):
+    """Randomly change the brightness, contrast and saturation of each image of the batch.
+
+    The factors are drawn for each image, and the adjustments are applied in a random order for each batch.
+    They are computed in the same way as `torchvision.transforms.v2.ColorJitter` except that
+    the intermediate results are not rounded for the integer images and the hue is not supported,
+    since it cannot be adjusted with the different factors at once.
+
+    Args:
+        brightness: How much to jitter the brightness. The factor is chosen uniformly from
+            [max(0, 1 - brightness), 1 + brightness] or the given [min, max].
+        contrast: How much to jitter the contrast in the same way as `brightness`.
+        saturation: How much to jitter the saturation in the same way as `brightness`.
+    """
+
+    def __init__(
+        self,
+        brightness: float | Sequence[float] | None = None,
+        contrast: float | Sequence[float] | None = None,
+        saturation: float | Sequence[float] | None = None,
+    ) -> None:
+        self.brightness = self._check_input(brightness, "brightness")
+        self.contrast = self._check_input(contrast, "contrast")
+        self.saturation = self._check_input(saturation, "saturation")
+
+    @staticmethod
+    def _check_input(value: float | Sequence[float] | None, name: str) -> tuple[float, float] | None:
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            if value < 0:
+                msg = f"If {name} is a single number, it must be non negative, but got {value}."
+                raise ValueError(msg)
+            value = (1.0 - value, 1.0 + value)
+        low, high = (float(v) for v in value)
+        low = max(low, 0.0)
+        if low > high:
+            msg = f"{name} values should be [min, max] with min <= max, but got {value}."
+            raise ValueError(msg)
+        return None if low == high == 1.0 else (low, high)
+
+    def __call__(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:  # noqa: D102
+        images = self._get_stacked_images(batch)
+        dtype = images.dtype
+        bound = 1.0 if dtype.is_floating_point else float(torch.iinfo(dtype).max)
+        outputs = images.as_subclass(torch.Tensor).float()
+
+        adjustments: list[Callable[[torch.Tensor, torch.Tensor], torch.Tensor]] = []
+        factors: list[tuple[float, float]] = []
+        for value, adjustment in (
+            (self.brightness, self._adjust_brightness),
+            (self.contrast, self._adjust_contrast),
+            (self.saturation, self._adjust_saturation),
+        ):
+            if value is not None:
+                adjustments.append(adjustment)
+                factors.append(value)
+
+        for i in torch.randperm(len(adjustments)).tolist():
+            low, high = factors[i]
+            factor = torch.empty(len(outputs), 1, 1, 1).uniform_(low, high)
+            outputs = adjustments[i](outputs, factor).clamp_(0, bound)
+
+        batch.images = tv_tensors.wrap(outputs.to(dtype), like=images)
+        return batch
+
+    @staticmethod
+    def _adjust_brightness(images: torch.Tensor, factor: torch.Tensor) -> torch.Tensor:
+        return images * factor
+
+    @staticmethod
+    def _adjust_contrast(images: torch.Tensor, factor: torch.Tensor) -> torch.Tensor:
+        mean = F.rgb_to_grayscale(images).mean(dim=(-3, -2, -1), keepdim=True)
+        return factor * images + (1.0 - factor) * mean
+
+    @staticmethod
+    def _adjust_saturation(images: torch.Tensor, factor: torch.Tensor) -> torch.Tensor:
+        return factor * images + (1.0 - factor) * F.rgb_to_grayscale(images)
+
+
+def _update_annotations(
+    batch: OTXBatchDataEntity,
+    index: int,
+    bboxes_fn: Callable[[tv_tensors.BoundingBoxes], tv_tensors.BoundingBoxes],
+    masks_fn: Callable[[tv_tensors.Mask], tv_tensors.Mask],
+    points_fn: Callable[[Points], Points],
+    polygon_fn: Callable[[Polygon], Polygon],
+) -> None:
+    """Update the spatial annotations of the `index`-th sample of the batch in-place."""
+    for name, fn in (("bboxes", bboxes_fn), ("masks", masks_fn), ("points", points_fn)):
+        if (values := getattr(batch, name, None)) is not None and values[index] is not None:
+            values[index] = fn(values[index])
+    if (polygons := getattr(batch, "polygons", None)) is not None:
+        polygons[index] = [polygon_fn(polygon) for polygon in polygons[index]]
+
+
+class BatchTransformCollateFn:
+    """Collate function applying the batch transforms to the output of the given collate function.
+
+    It is picklable, so that the batch transforms run in the DataLoader workers.
+    """
+
+    def __init__(self, collate_fn: Callable, transforms: Compose) -> None:
+        self.collate_fn = collate_fn
+        self.transforms = transforms
+
+    def __call__(self, entities: list[Any]) -> OTXBatchDataEntity:
+        """Collate the entities and apply the batch transforms."""
+        return self.transforms(self.collate_fn(entities))
+
+
+class BatchTransformLib:
+    """Helper to build the batch transforms of `SubsetConfig.batch_transforms`."""
+
+    @classmethod
+    def generate(cls, config: SubsetConfig) -> Compose:
+        """Generate the batch transforms from the configuration."""
+        if isinstance(config.batch_transforms, tvt_v2.Compose):
+            return config.batch_transforms
+        return tvt_v2.Compose([cls._dispatch_transform(cfg_transform) for cfg_transform in config.batch_transforms])
+
+    @classmethod
+    def _dispatch_transform(cls, cfg_transform: DictConfig | dict | BatchTransform) -> BatchTransform:
+        if isinstance(cfg_transform, (DictConfig, dict)):
+            return instantiate_class(args=(), init=cfg_transform)
+        if isinstance(cfg_transform, BatchTransform):
+            return cfg_transform
+
+        msg = (
+            "BatchTransformLib accepts only three types "
+            "for config.batch_transforms: DictConfig | dict | BatchTransform. "
+            f"However, its type is {type(cfg_transform)}."
+        )
+        raise TypeError(msg)
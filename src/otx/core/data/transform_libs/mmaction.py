@@ -26,6 +26,7 @@ if TYPE_CHECKING:
     from mmengine.registry import Registry
 
     from otx.core.config.data import SubsetConfig
+    from otx.core.data.video import VideoFrameCache
 
 
 @TRANSFORMS.register_module()
@@ -105,6 +106,8 @@ class RawFrameDecode(MMRawFrameDecode):
     """
 
     file_client: FileClient | None
+    # Set by the dataset to cache the decoded frames in its memory cache handler
+    frame_cache: VideoFrameCache | None = None
 
     def transform(self, results: dict) -> dict:
         """Perform the ``RawFrameDecode`` to pick frames given indices.
@@ -130,20 +133,28 @@ class RawFrameDecode(MMRawFrameDecode):
 
         offset = results.get("offset", 0)
 
-        cache: dict[int, int] = {}
-        for i, frame_idx in enumerate(results["frame_inds"]):
-            # Avoid loading duplicated frames
-            if frame_idx in cache:
-                imgs.append(deepcopy(imgs[cache[frame_idx]]))
-                continue
-            cache[frame_idx] = i
-
-            frame_idx_with_offset = frame_idx + offset
-            filepath = Path(directory) / filename_tmpl.format(video=video, idx=frame_idx_with_offset, ext=ext)
-            img_bytes = self.file_client.get(filepath)
+        def _read_frame(frame_idx: int) -> np.ndarray:
+            filepath = Path(directory) / filename_tmpl.format(video=video, idx=frame_idx, ext=ext)
+            img_bytes = self.file_client.get(filepath)  # type: ignore[union-attr]
             # Get frame with channel order RGB directly.
-            cur_frame = mmcv.imfrombytes(img_bytes, channel_order="rgb")
-            imgs.append(cur_frame)
+            return mmcv.imfrombytes(img_bytes, channel_order="rgb")
+
+        if self.frame_cache is not None:
+            frames = self.frame_cache.get_frames(
+                str(directory),
+                results["frame_inds"] + offset,
+                lambda frame_inds: np.stack([_read_frame(frame_idx) for frame_idx in frame_inds.tolist()]),
+            )
+            imgs = list(frames)
+        else:
+            cache: dict[int, int] = {}
+            for i, frame_idx in enumerate(results["frame_inds"]):
+                # Avoid loading duplicated frames
+                if frame_idx in cache:
+                    imgs.append(deepcopy(imgs[cache[frame_idx]]))
+                    continue
+                cache[frame_idx] = i
+                imgs.append(_read_frame(frame_idx + offset))
 
         results["imgs"] = imgs
         results["original_shape"] = imgs[0].shape[:2]
@@ -247,3 +258,11 @@ class MMActionTransformLib:
     def generate(cls, config: SubsetConfig) -> list[Callable]:
         """Generate MMCV transforms from the configuration."""
         return [cls.get_builder().build(convert_conf_to_mmconfig_dict(cfg)) for cfg in config.transforms]
+
+    @classmethod
+    def count_deterministic_prefix(cls, transforms: list[Callable]) -> int:  # noqa: ARG003
+        """Count the leading transforms of the pipeline whose outputs can be cached.
+
+        Decoded video clips are too large to be cached, so it always returns zero.
+        """
+        return 0
@@ -5,7 +5,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, ClassVar
 
 import numpy as np
 from mmcv.transforms import LoadImageFromFile as MMCVLoadImageFromFile
@@ -44,6 +44,11 @@ class LoadImageFromFile(MMCVLoadImageFromFile):
 class MMCVTransformLib:
     """Helper to support MMCV transforms in OTX."""
 
+    # Names of the transforms whose outputs only depend on their inputs
+    deterministic_transforms: ClassVar[frozenset[str]] = frozenset(
+        {"LoadImageFromFile", "Normalize", "Pad", "Resize", "ImageToTensor", "ToTensor", "Transpose"},
+    )
+
     @classmethod
     def get_builder(cls) -> Registry:
         """Transform builder obtained from MMCV."""
@@ -74,3 +79,17 @@ class MMCVTransformLib:
         )
 
         return transforms
+
+    @classmethod
+    def count_deterministic_prefix(cls, transforms: list[Callable]) -> int:
+        """Count the leading transforms of the pipeline whose outputs can be cached.
+
+        Only the remaining transforms need to be applied on every access to the data.
+        If there is no random transform in the pipeline (e.g., validation or test), it returns the length of it.
+        """
+        num_transforms = 0
+        for transform in transforms:
+            if type(transform).__name__ not in cls.deterministic_transforms:
+                break
+            num_transforms += 1
+        return num_transforms
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import logging as log
 from copy import deepcopy
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, ClassVar
 
 import numpy as np
 import torch
@@ -282,6 +282,10 @@ class PerturbBoundingBoxes(BaseTransform):
 class MMDetTransformLib(MMCVTransformLib):
     """Helper to support MMDET transforms in OTX."""
 
+    deterministic_transforms: ClassVar[frozenset[str]] = MMCVTransformLib.deterministic_transforms | frozenset(
+        {"LoadAnnotations", "PackDetInputs"},
+    )
+
     @classmethod
     def get_builder(cls) -> Registry:
         """Transform builder obtained from MMDet."""
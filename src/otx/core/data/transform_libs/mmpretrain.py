@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, ClassVar
 
 from mmpretrain.datasets.transforms import (
     PackInputs as MMPretrainPackInputs,
@@ -109,6 +109,10 @@ class PackInputs(MMPretrainPackInputs):
 class MMPretrainTransformLib(MMCVTransformLib):
     """Helper to support MMPretrain transforms in OTX."""
 
+    deterministic_transforms: ClassVar[frozenset[str]] = MMCVTransformLib.deterministic_transforms | frozenset(
+        {"CenterCrop", "ResizeEdge", "PackInputs"},
+    )
+
     @classmethod
     def get_builder(cls) -> Registry:
         """Transform builder obtained from MMPretrain."""
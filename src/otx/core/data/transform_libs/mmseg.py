@@ -6,7 +6,7 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, ClassVar
 
 from mmseg.datasets.transforms import (
     LoadAnnotations as MMSegLoadAnnotations,
@@ -80,6 +80,10 @@ class PackSegInputs(MMSegPackInputs):
 class MMSegTransformLib(MMCVTransformLib):
     """Helper to support MMSeg transforms in OTX."""
 
+    deterministic_transforms: ClassVar[frozenset[str]] = MMCVTransformLib.deterministic_transforms | frozenset(
+        {"LoadAnnotations", "PackSegInputs"},
+    )
+
     @classmethod
     def get_builder(cls) -> Registry:
         """Transform builder obtained from MMSeg."""
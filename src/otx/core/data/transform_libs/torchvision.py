@@ -5,8 +5,9 @@
 
 from __future__ import annotations
 
+from functools import partial
 from inspect import isclass
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar, Sequence
 
 import numpy as np
 import PIL.Image
@@ -20,7 +21,9 @@ from torchvision._utils import sequence_to_str
 from torchvision.transforms.v2 import functional as F  # noqa: N812
 
 from otx.core.data.entity.action_classification import ActionClsDataEntity
-from otx.core.data.entity.base import Points
+from otx.core.data.entity.base import ImageInfo, Points
+from otx.core.data.media_meta import MediaMetaCache
+from otx.core.data.video import VideoFrameCache, decode_video_frames
 
 if TYPE_CHECKING:
     from torchvision.transforms.v2 import Compose
@@ -146,6 +149,8 @@ class DecodeVideo(tvt_v2.Transform):
         self.num_clips = num_clips
         self.out_of_bound_opt = out_of_bound_opt
         self._transformed_types = [Video]
+        # Set by the dataset to cache the decoded frames in its memory cache handler
+        self.frame_cache: VideoFrameCache | None = None
 
     def _transform(self, inpt: Video, params: dict) -> tv_tensors.Video:
         total_frames = self._get_total_frames(inpt)
@@ -169,10 +174,17 @@ class DecodeVideo(tvt_v2.Transform):
             msg = "Illegal out_of_bound optio."
             raise ValueError(msg)
 
-        start_index = 0
-        frame_inds = np.concatenate(frame_inds) + start_index
+        # The indices are relative to the range and the step of the video, e.g., a clip of a Datumaro video item.
+        # Map them to the frames in the container, which also key the cached frames.
+        start_index = inpt._start_frame  # noqa: SLF001
+        frame_inds = np.concatenate(frame_inds) * inpt._step + start_index  # noqa: SLF001
 
-        outputs = torch.stack([torch.tensor(inpt[idx].data) for idx in frame_inds], dim=0)
+        # Decode the frames in a single forward pass instead of the random access to each frame
+        if self.frame_cache is None:
+            frames = decode_video_frames(inpt.path, frame_inds)
+        else:
+            frames = self.frame_cache.get_frames(inpt.path, frame_inds, partial(decode_video_frames, inpt.path))
+        outputs = torch.from_numpy(frames)
         outputs = outputs.permute(0, 3, 1, 2)
         outputs = tv_tensors.Video(outputs)
         inpt.close()
@@ -181,10 +193,8 @@ class DecodeVideo(tvt_v2.Transform):
 
     @staticmethod
     def _get_total_frames(inpt: Video) -> int:
-        length = 0
-        for _ in inpt:
-            length += 1
-        return length
+        # The frames are counted only once per video file
+        return MediaMetaCache.current().get_num_frames(inpt)
 
     def _get_train_clips(self, num_frames: int, ori_clip_len: float) -> np.array:
         """Get clip offsets in train mode.
@@ -281,6 +291,31 @@ class PackVideo(tvt_v2.Transform):
         return inputs[0]
 
 
+class DeferredNormalize(tvt_v2.Transform):
+    """Record the mean and standard deviation to normalize the image in `ImageInfo` instead of normalizing it.
+
+    The image is kept in its original dtype (uint8) and normalized by the model in a batch.
+    The mean and standard deviation are in the scale of the image, e.g., [0, 255] for uint8 images.
+
+    Args:
+        mean (Sequence[float]): Mean of each channel.
+        std (Sequence[float]): Standard deviation of each channel.
+    """
+
+    _transformed_types = (ImageInfo,)
+
+    def __init__(self, mean: Sequence[float], std: Sequence[float]) -> None:
+        super().__init__()
+        self.mean = list(mean)
+        self.std = list(std)
+
+    def _transform(self, inpt: ImageInfo, params: dict[str, Any]) -> ImageInfo:
+        inpt.normalized = False
+        inpt.norm_mean = (self.mean[0], self.mean[1], self.mean[2])
+        inpt.norm_std = (self.std[0], self.std[1], self.std[2])
+        return inpt
+
+
 tvt_v2.PerturbBoundingBoxes = PerturbBoundingBoxes
 tvt_v2.PadtoSquare = PadtoSquare
 tvt_v2.ResizetoLongestEdge = ResizetoLongestEdge
@@ -289,6 +324,24 @@ tvt_v2.ResizetoLongestEdge = ResizetoLongestEdge
 class TorchVisionTransformLib:
     """Helper to support TorchVision transforms (only V2) in OTX."""
 
+    # Transforms whose outputs only depend on their inputs
+    deterministic_transforms: ClassVar[frozenset[type[tvt_v2.Transform]]] = frozenset(
+        {
+            tvt_v2.CenterCrop,
+            tvt_v2.ClampBoundingBoxes,
+            tvt_v2.ConvertBoundingBoxFormat,
+            tvt_v2.Normalize,
+            tvt_v2.Pad,
+            tvt_v2.Resize,
+            tvt_v2.ToDtype,
+            tvt_v2.ToImage,
+            tvt_v2.ToPureTensor,
+            DeferredNormalize,
+            PadtoSquare,
+            ResizetoLongestEdge,
+        },
+    )
+
     @classmethod
     def list_available_transforms(cls) -> list[type[tvt_v2.Transform]]:
         """List available TorchVision transform (only V2) classes."""
@@ -311,6 +364,46 @@ class TorchVisionTransformLib:
 
         return tvt_v2.Compose(transforms)
 
+    @classmethod
+    def count_deterministic_prefix(cls, transforms: Compose) -> int:
+        """Count the leading transforms of the pipeline whose outputs can be cached.
+
+        Only the remaining transforms need to be applied on every access to the data.
+        If there is no random transform in the pipeline (e.g., validation or test), it returns the length of it.
+        """
+        num_transforms = 0
+        for transform in transforms.transforms:
+            if type(transform) not in cls.deterministic_transforms:
+                break
+            num_transforms += 1
+        return num_transforms
+
+    @classmethod
+    def defer_normalization(cls, transforms: Compose) -> Compose:
+        """Replace the trailing `ToDtype` and `Normalize` with `DeferredNormalize` to keep the images in uint8.
+
+        The images are normalized by the model after they are transferred to the device
+        (see `otx.core.data.entity.utils.normalize_images()`).
+        If `ToDtype` scales the images, the scale is folded into the mean and standard deviation.
+        If the pipeline does not end with `Normalize`, it is returned as it is.
+        """
+        pipeline = list(transforms.transforms)
+        if not pipeline or type(pipeline[-1]) is not tvt_v2.Normalize:
+            return transforms
+
+        normalize = pipeline.pop()
+        mean, std = list(normalize.mean), list(normalize.std)
+        if pipeline and type(pipeline[-1]) is tvt_v2.ToDtype:
+            to_dtype = pipeline.pop()
+            if not isinstance(to_dtype.dtype, torch.dtype) or not to_dtype.dtype.is_floating_point:
+                return transforms
+            if to_dtype.scale:
+                max_value = float(torch.iinfo(torch.uint8).max)
+                mean = [value * max_value for value in mean]
+                std = [value * max_value for value in std]
+
+        return tvt_v2.Compose([*pipeline, DeferredNormalize(mean=mean, std=std)])
+
     @classmethod
     def _dispatch_transform(cls, cfg_transform: DictConfig | dict | tvt_v2.Transform) -> tvt_v2.Transform:
         if isinstance(cfg_transform, (DictConfig, dict)):
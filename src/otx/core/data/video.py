@@ -0,0 +1,189 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Helpers to decode the frames of a video file directly with OpenCV."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Callable, Iterable, Sequence
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from otx.core.data.mem_cache import MemCacheHandlerBase
+
+__all__ = ["VideoFrameCache", "decode_video_frames", "probe_num_frames"]
+
+# Seek to the frame instead of decoding the frames in between if the gap is larger than this.
+# Seeking restarts decoding from the previous keyframe, so that it only pays off for a large gap.
+SEEK_MIN_GAP = 32
+
+
+def probe_num_frames(path: str) -> int | None:
+    """Read the number of the frames of the video from its container without decoding it.
+
+    Returns:
+        The number of the frames or None if the container does not provide it.
+    """
+    cap = cv2.VideoCapture(path)
+    try:
+        num_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+    finally:
+        cap.release()
+    return num_frames if num_frames > 0 else None
+
+
+def decode_video_frames(path: str, frame_inds: Sequence[int] | np.ndarray) -> np.ndarray:
+    """Decode the frames of the given indices from the video in a single forward pass.
+
+    Datumaro decodes the video from the beginning whenever a frame before the current position is requested
+    and converts every decoded frame to float64. Instead, the unique indices are decoded in ascending order,
+    the frames in small gaps are only grabbed without being converted,
+    a large gap is skipped by seeking to the nearest keyframe,
+    and each frame is retrieved directly into its row of a single preallocated buffer.
+    If the container reports more frames than the video actually has,
+    the frames after the end are filled with the last decoded frame.
+
+    Args:
+        path: Path to the video file.
+        frame_inds: Indices of the frames to decode. They can be unsorted and repeated.
+
+    Returns:
+        BGR frames of shape (len(frame_inds), height, width, 3) in the order of `frame_inds`.
+    """
+    frame_inds = np.asarray(frame_inds, dtype=np.int64).reshape(-1)
+    unique_inds, inverse = np.unique(frame_inds, return_inverse=True)
+    if len(unique_inds) > 0 and unique_inds[0] < 0:
+        msg = f"Frame indices should not be negative, but got {unique_inds[0]}."
+        raise IndexError(msg)
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        msg = f"Cannot open the video {path}."
+        raise OSError(msg)
+
+    frames: np.ndarray | None = None
+    # Index of the frame which will be decoded by the next `grab()`
+    pos = 0
+    num_decoded = 0
+    try:
+        for i, idx in enumerate(unique_inds.tolist()):
+            if idx - pos > SEEK_MIN_GAP:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+                pos = idx
+            while pos <= idx and cap.grab():
+                pos += 1
+            if pos <= idx:
+                # The end of the video
+                break
+            if frames is None:
+                ok, frame = cap.retrieve()
+                if not ok:
+                    break
+                # Allocate the buffer once the frame size is known
+                frames = np.empty((len(unique_inds), *frame.shape), dtype=frame.dtype)
+                frames[i] = frame
+            elif not cap.retrieve(frames[i])[0]:
+                break
+            num_decoded += 1
+    finally:
+        cap.release()
+
+    if frames is None or num_decoded == 0:
+        msg = f"Cannot decode any frame of {frame_inds.tolist()} from the video {path}."
+        raise IndexError(msg)
+    frames[num_decoded:] = frames[num_decoded - 1]
+    return frames[inverse]
+
+
+class VideoFrameCache:
+    """Decoded video frames kept in the memory cache handler of the images.
+
+    Each frame is cached with the key of `(video path, frame index, target size)`,
+    so that the clips sampled from the neighbouring frames in the later epochs hit the cache
+    instead of decoding the video again. The frame index is of the video file, not of a clip of the video.
+    The frames share the budget, the eviction policy and the statistics of `mem_cache_handler` with the images.
+    As `OTXDataset` does for the images, the frames larger than `max_size` are downscaled before being cached,
+    so that a frame is the same whether it is decoded or taken from the cache.
+
+    The video decoding transforms, e.g., `DecodeVideo` and `RawFrameDecode`, have `frame_cache` attribute
+    which is set by `bind()` from the dataset.
+
+    Args:
+        mem_cache_handler: Memory cache handler of the dataset.
+        max_size: Maximum (height, width) of the cached frames. If None, the frames are cached as they are.
+    """
+
+    def __init__(self, mem_cache_handler: MemCacheHandlerBase, max_size: tuple[int, int] | None = None) -> None:
+        self.mem_cache_handler = mem_cache_handler
+        self.max_size = tuple(max_size) if max_size is not None else None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the memory pool can hold any frame."""
+        return self.mem_cache_handler.mem_size > 0
+
+    def bind(self, transforms: Iterable[Callable] | Callable) -> None:
+        """Set itself to `frame_cache` attribute of the video decoding transforms if it is enabled."""
+        if not self.enabled:
+            return
+        # `Compose` of TorchVision, a list of MMAction transforms or a single transform
+        transforms = getattr(transforms, "transforms", transforms)
+        for transform in transforms if isinstance(transforms, Iterable) else [transforms]:
+            if hasattr(transform, "frame_cache"):
+                transform.frame_cache = self
+
+    def get_frames(
+        self,
+        video: str,
+        frame_inds: Sequence[int] | np.ndarray,
+        decode: Callable[[np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        """Get the frames of the given indices from the cache and decode only the missing ones.
+
+        Args:
+            video: Path to the video file or the directory of the frames.
+            frame_inds: Indices of the frames. They can be unsorted and repeated.
+            decode: Function to decode the frames of the given sorted unique indices into an array of
+                shape (N, height, width, channels).
+
+        Returns:
+            Frames of shape (len(frame_inds), height, width, channels) in the order of `frame_inds`.
+        """
+        frame_inds = np.asarray(frame_inds, dtype=np.int64).reshape(-1)
+        unique_inds, inverse = np.unique(frame_inds, return_inverse=True)
+
+        frames: list[np.ndarray | None] = [
+            self.mem_cache_handler.get(key=(video, idx, self.max_size), kind="video_frame")[0]
+            for idx in unique_inds.tolist()
+        ]
+        missing = [i for i, frame in enumerate(frames) if frame is None]
+        if missing:
+            start = time.perf_counter()
+            decoded = decode(unique_inds[missing])
+            elapsed = (time.perf_counter() - start) / len(missing)
+            for i, frame in zip(missing, decoded):
+                self.mem_cache_handler.record_load_time(elapsed)
+                frame = self._resize(frame)  # noqa: PLW2901
+                self.mem_cache_handler.put(
+                    key=(video, int(unique_inds[i]), self.max_size),
+                    data=frame,
+                    kind="video_frame",
+                )
+                frames[i] = frame
+
+        return np.stack(frames)[inverse]
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        if self.max_size is None:
+            return frame
+        height, width = frame.shape[:2]
+        max_height, max_width = self.max_size
+        if height <= max_height and width <= max_width:
+            return frame
+        scale = min(max_height / height, max_width / width)
+        resized = cv2.resize(frame, (int(scale * width), int(scale * height)), interpolation=cv2.INTER_LINEAR)
+        # Keep the channel dimension of the single channel frames
+        return resized.reshape(*resized.shape[:2], *frame.shape[2:])
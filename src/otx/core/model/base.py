@@ -25,12 +25,15 @@ from torch.optim.sgd import SGD
 from torchmetrics import Metric, MetricCollection
 
 from otx.core.data.entity.base import (
+    OTXBatchDataEntity,
     OTXBatchLossEntity,
     T_OTXBatchDataEntity,
     T_OTXBatchPredEntity,
     T_OTXBatchPredEntityWithXAI,
 )
 from otx.core.data.entity.tile import OTXTileBatchDataEntity, T_OTXTileBatchDataEntity
+from otx.core.data.entity.utils import normalize_images
+from otx.core.data.packed_batch import PackedBatch
 from otx.core.exporter.base import OTXModelExporter
 from otx.core.metrics import MetricInput, NullMetricCallable
 from otx.core.types.export import OTXExportFormatType
@@ -420,6 +423,23 @@ class OTXModel(
     def _create_model(self) -> nn.Module:
         """Create a PyTorch model for this class."""
 
+    def on_after_batch_transfer(self, batch: Any, dataloader_idx: int) -> Any:  # noqa: ANN401
+        """Unpack the packed batch and normalize the images whose normalization is deferred to the model."""
+        if isinstance(batch, PackedBatch):
+            batch = batch.unpack()
+        return self._normalize_inputs(batch)
+
+    def _normalize_inputs(self, inputs: Any) -> Any:  # noqa: ANN401
+        """Normalize the images of the batch if the dataset defers it (see `DataModuleConfig.defer_normalization`)."""
+        if isinstance(inputs, OTXTileBatchDataEntity):
+            inputs.batch_tiles = [
+                normalize_images(tiles, tile_infos)
+                for tiles, tile_infos in zip(inputs.batch_tiles, inputs.batch_tile_img_infos)
+            ]
+        elif isinstance(inputs, OTXBatchDataEntity):
+            inputs.images = normalize_images(inputs.images, inputs.imgs_info)
+        return inputs
+
     def _customize_inputs(self, inputs: T_OTXBatchDataEntity) -> dict[str, Any]:
         """Customize OTX input batch data entity if needed for your model."""
         raise NotImplementedError
@@ -437,6 +457,7 @@ class OTXModel(
         inputs: T_OTXBatchDataEntity,
     ) -> T_OTXBatchPredEntity | T_OTXBatchPredEntityWithXAI | OTXBatchLossEntity:
         """Model forward function."""
+        inputs = self._normalize_inputs(inputs)
         # If customize_inputs is overridden
         if isinstance(inputs, OTXTileBatchDataEntity):
             return self.forward_tiles(inputs)
@@ -754,7 +775,9 @@ class OVModel(OTXModel, Generic[T_OTXBatchDataEntity, T_OTXBatchPredEntity, T_OT
             msg = "Model is already optimized by PTQ"
             raise RuntimeError(msg)
 
-        def transform_fn(data_batch: T_OTXBatchDataEntity) -> np.array:
+        def transform_fn(data_batch: T_OTXBatchDataEntity | PackedBatch) -> np.array:
+            if isinstance(data_batch, PackedBatch):
+                data_batch = data_batch.unpack()
             np_data = self._customize_inputs(data_batch)
             image = np_data["inputs"][0]
             resized_image = self.model.resize(image, (self.model.w, self.model.h))
@@ -78,14 +78,14 @@ class OTXDetectionModel(
             self.tile_config.iou_threshold,
             self.tile_config.max_num_instances,
         )
-        for batch_tile_attrs, batch_tile_input in inputs.unbind():
+        for batch_tile_attrs, batch_tile_input in inputs.unbind(self.tile_config.inference_batch_size):
             output = self.forward(batch_tile_input)
             if isinstance(output, OTXBatchLossEntity):
                 msg = "Loss output is not supported for tile merging"
                 raise TypeError(msg)
             tile_preds.append(output)
             tile_attrs.append(batch_tile_attrs)
-        pred_entities = merger.merge(tile_preds, tile_attrs)
+        pred_entities = merger.merge(tile_preds, tile_attrs, inputs.tile_img_indices)
 
         return DetBatchPredEntity(
             batch_size=inputs.batch_size,
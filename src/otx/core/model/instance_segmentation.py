@@ -33,7 +33,7 @@ from otx.core.metrics import MetricInput
 from otx.core.metrics.mean_ap import MaskRLEMeanAPCallable
 from otx.core.model.base import DefaultOptimizerCallable, DefaultSchedulerCallable, OTXModel, OVModel
 from otx.core.utils.config import inplace_num_classes
-from otx.core.utils.mask_util import encode_rle, polygon_to_rle
+from otx.core.utils.mask_util import encode_rles, polygon_to_rle
 from otx.core.utils.tile_merge import InstanceSegTileMerge
 from otx.core.utils.utils import get_mean_std_from_data_processing
 
@@ -93,14 +93,14 @@ class OTXInstanceSegModel(
             self.tile_config.iou_threshold,
             self.tile_config.max_num_instances,
         )
-        for batch_tile_attrs, batch_tile_input in inputs.unbind():
+        for batch_tile_attrs, batch_tile_input in inputs.unbind(self.tile_config.inference_batch_size):
             output = self.forward(batch_tile_input)
             if isinstance(output, OTXBatchLossEntity):
                 msg = "Loss output is not supported for tile merging"
                 raise TypeError(msg)
             tile_preds.append(output)
             tile_attrs.append(batch_tile_attrs)
-        pred_entities = merger.merge(tile_preds, tile_attrs)
+        pred_entities = merger.merge(tile_preds, tile_attrs, inputs.tile_img_indices)
 
         return InstanceSegBatchPredEntity(
             batch_size=inputs.batch_size,
@@ -211,7 +211,7 @@ class OTXInstanceSegModel(
             pred_info.append(
                 {
                     "boxes": bboxes.data,
-                    "masks": [encode_rle(mask) for mask in masks.data],
+                    "masks": encode_rles(masks.data),
                     "scores": scores,
                     "labels": labels,
                 },
@@ -224,11 +224,7 @@ class OTXInstanceSegModel(
             inputs.polygons,
             inputs.labels,
         ):
-            rles = (
-                [encode_rle(mask) for mask in masks.data]
-                if len(masks)
-                else polygon_to_rle(polygons, *imgs_info.ori_shape)
-            )
+            rles = encode_rles(masks.data) if len(masks) else polygon_to_rle(polygons, *imgs_info.ori_shape)
             target_info.append(
                 {
                     "boxes": bboxes.data,
@@ -705,7 +701,7 @@ class OVInstanceSegmentationModel(
             pred_info.append(
                 {
                     "boxes": bboxes.data,
-                    "masks": [encode_rle(mask) for mask in masks.data],
+                    "masks": encode_rles(masks.data),
                     "scores": scores,
                     "labels": labels,
                 },
@@ -718,11 +714,7 @@ class OVInstanceSegmentationModel(
             inputs.polygons,
             inputs.labels,
         ):
-            rles = (
-                [encode_rle(mask) for mask in masks.data]
-                if len(masks)
-                else polygon_to_rle(polygons, *imgs_info.ori_shape)
-            )
+            rles = encode_rles(masks.data) if len(masks) else polygon_to_rle(polygons, *imgs_info.ori_shape)
             target_info.append(
                 {
                     "boxes": bboxes.data,
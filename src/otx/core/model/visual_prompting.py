@@ -35,6 +35,7 @@ from otx.core.data.entity.visual_prompting import (
     ZeroShotVisualPromptingBatchPredEntity,
     ZeroShotVisualPromptingBatchPredEntityWithXAI,
 )
+from otx.core.data.packed_batch import PackedBatch
 from otx.core.exporter.base import OTXModelExporter
 from otx.core.exporter.visual_prompting import OTXVisualPromptingModelExporter
 from otx.core.metrics import MetricInput
@@ -635,6 +636,8 @@ class OVVisualPromptingModel(
             data_batch: VisualPromptingBatchDataEntity | ZeroShotVisualPromptingBatchDataEntity,
             module: Literal["image_encoder", "decoder"],
         ) -> np.ndarray | dict[str, Any]:
+            if isinstance(data_batch, PackedBatch):
+                data_batch = data_batch.unpack()  # type: ignore[assignment]
             images, _, prompts = self._customize_inputs(data_batch)  # type: ignore[arg-type]
 
             image = images[0]["images"]  # use only the first image
@@ -7,11 +7,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pycocotools.mask as mask_utils
 import torch
 
 if TYPE_CHECKING:
-    import numpy as np
     from datumaro import Polygon
 
 
@@ -30,9 +30,11 @@ def polygon_to_bitmap(
     Returns:
         np.ndarray: bitmap masks
     """
-    polygons = [polygon.points for polygon in polygons]
-    rles = mask_utils.frPyObjects(polygons, height, width)
-    return mask_utils.decode(rles).astype(bool).transpose((2, 0, 1))
+    rles = _polygons_to_rles(polygons, height, width)
+    if not rles:
+        return np.zeros((0, height, width), dtype=bool)
+    # Decode all the polygons at once and make the N x H x W masks contiguous in a single copy
+    return np.ascontiguousarray(mask_utils.decode(rles).transpose((2, 0, 1)), dtype=bool)
 
 
 def polygon_to_rle(
@@ -50,10 +52,31 @@ def polygon_to_rle(
     Returns:
         list[dict]: List of RLE masks.
     """
-    polygons = [polygon.points for polygon in polygons]
-    if len(polygons):
-        return mask_utils.frPyObjects(polygons, height, width)
-    return []
+    return _polygons_to_rles(polygons, height, width)
+
+
+def _polygons_to_rles(polygons: list[Polygon], height: int, width: int) -> list[dict]:
+    """Convert all the polygons of an image to RLEs with a single call to pycocotools."""
+    if not polygons:
+        return []
+    return mask_utils.frPyObjects([polygon.points for polygon in polygons], height, width)
+
+
+def encode_rles(masks: torch.Tensor) -> list[dict]:
+    """Encode a batch of binary masks into the compressed RLE format at once.
+
+    It is much faster than calling `encode_rle()` for each mask, but the masks are moved to CPU.
+
+    Args:
+        masks (torch.Tensor): Binary masks (0 or 1) of shape (N, H, W).
+
+    Returns:
+        list[dict]: List of dictionaries with keys "counts" (bytes) and "size".
+    """
+    if len(masks) == 0:
+        return []
+    masks_np = masks.detach().to(device="cpu", dtype=torch.uint8).numpy()
+    return mask_utils.encode(np.asfortranarray(masks_np.transpose((1, 2, 0))))
 
 
 def encode_rle(mask: torch.Tensor) -> dict:
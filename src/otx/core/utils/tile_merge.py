@@ -6,7 +6,6 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from collections import defaultdict
 from typing import Generic
 
 import torch
@@ -20,11 +19,15 @@ from otx.core.data.entity.instance_segmentation import (
     InstanceSegBatchPredEntityWithXAI,
     InstanceSegPredEntity,
 )
+from otx.core.data.entity.ragged import RaggedTensor
 
 
 class TileMerge(Generic[T_OTXDataEntity, T_OTXBatchPredEntity]):
     """Base class for tile merge.
 
+    The predictions of all tiles are packed into `RaggedTensor`s and
+    the non-maximum suppression runs once for all images in the batch.
+
     Args:
         img_infos (list[ImageInfo]): Original image information before tiling.
         iou_threshold (float, optional): IoU threshold for non-maximum suppression. Defaults to 0.45.
@@ -42,51 +45,95 @@ class TileMerge(Generic[T_OTXDataEntity, T_OTXBatchPredEntity]):
         self.iou_threshold = iou_threshold
         self.max_num_instances = max_num_instances
 
-    @abstractmethod
-    def _merge_entities(self, img_info: ImageInfo, entities: list[T_OTXDataEntity]) -> T_OTXDataEntity:
-        """Merge tile predictions to one single full-size prediction data entity.
-
-        Args:
-            img_info (ImageInfo): Image information about the original image before tiling.
-            entities (list[T_OTXDataEntity]): List of tile prediction entities.
-
-        Returns:
-            T_OTXDataEntity: Merged prediction entity.
-        """
-        raise NotImplementedError
-
     @abstractmethod
     def merge(
         self,
         batch_tile_preds: list[T_OTXBatchPredEntity],
         batch_tile_attrs: list[list[dict]],
+        tile_img_indices: list[int] | None = None,
     ) -> list[T_OTXDataEntity]:
         """Merge batch tile predictions to a list of full-size prediction data entities.
 
         Args:
             batch_tile_preds (list): list of tile predictions.
             batch_tile_attrs (list): list of tile attributes.
+            tile_img_indices (list[int] | None): Index of the original image in `img_infos` of each tile.
+                If None, the images are indexed in the order of the first appearance of their tiles.
         """
         raise NotImplementedError
 
-    def nms_postprocess(
+    @staticmethod
+    def _get_tile_img_indices(
+        batch_tile_attrs: list[list[dict]],
+        tile_img_indices: list[int] | None = None,
+    ) -> list[int]:
+        """Get the index of the original image of each tile."""
+        if tile_img_indices is not None:
+            return tile_img_indices
+        img_indices: dict[str | int, int] = {}
+        return [
+            img_indices.setdefault(tile_attr["tile_id"], len(img_indices))
+            for tile_attrs in batch_tile_attrs
+            for tile_attr in tile_attrs
+        ]
+
+    def _pack_tiles(
+        self,
+        tile_bboxes: list[torch.Tensor],
+        tile_labels: list[torch.Tensor],
+        tile_scores: list[torch.Tensor],
+        tile_rois: list[tuple[int, int, int, int]],
+        tile_img_indices: list[int],
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Pack the predictions of all tiles and move the boxes to the coordinates of the original images.
+
+        Returns:
+            Boxes, labels, scores and the index of the original image of every prediction.
+        """
+        bboxes = RaggedTensor.from_tensors(tile_bboxes)
+        tile_indices = bboxes.batch_index()
+        device = bboxes.data.device
+
+        offsets = torch.tensor([roi[:2] for roi in tile_rois], dtype=bboxes.data.dtype, device=device)
+        img_indices = torch.tensor(tile_img_indices, dtype=torch.long, device=device)
+        return (
+            bboxes.data + offsets.repeat(1, 2)[tile_indices],
+            torch.cat([labels.as_subclass(torch.Tensor) for labels in tile_labels]),
+            torch.cat([scores.as_subclass(torch.Tensor) for scores in tile_scores]),
+            img_indices[tile_indices],
+        )
+
+    def batched_nms_postprocess(
         self,
         bboxes: torch.Tensor,
         scores: torch.Tensor,
         labels: torch.Tensor,
-        masks: None | list[torch.Tensor] = None,
-    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, None | torch.Tensor]:
-        """Non-maximum suppression and post-process."""
-        keep = batched_nms(bboxes, scores, labels, self.iou_threshold)
-        if len(keep) > self.max_num_instances:
-            keep = keep[: self.max_num_instances]
-        bboxes = bboxes[keep]
-        labels = labels[keep]
-        scores = scores[keep]
-        if masks is not None and len(masks) > 0:
-            # coalesce sparse tensors to prevent them from growing too large.
-            masks = torch.stack([masks[idx] for idx in keep]).coalesce().to_dense()
-        return bboxes, labels, scores, masks
+        img_indices: torch.Tensor,
+    ) -> list[torch.Tensor]:
+        """Non-maximum suppression of the predictions of all images at once and post-process.
+
+        Args:
+            bboxes (torch.Tensor): Boxes of all images.
+            scores (torch.Tensor): Scores of all images.
+            labels (torch.Tensor): Labels of all images.
+            img_indices (torch.Tensor): Index of the original image of each prediction.
+
+        Returns:
+            list[torch.Tensor]: Indices of the kept predictions of each image in decreasing order of the scores.
+        """
+        num_images = len(self.img_infos)
+        if len(bboxes) == 0:
+            return [torch.empty((0,), dtype=torch.long, device=bboxes.device) for _ in range(num_images)]
+
+        # Suppress only the boxes of the same label in the same image.
+        # They are in float64 not to lose the precision by the offsets separating the groups.
+        groups = img_indices * (int(labels.max()) + 1) + labels.long()
+        keep = batched_nms(bboxes.to(torch.float64), scores.to(torch.float64), groups, self.iou_threshold)
+
+        # Group the kept indices by the image while keeping the order of the scores
+        keep = keep[torch.argsort(img_indices[keep], stable=True)]
+        counts = torch.bincount(img_indices[keep], minlength=num_images).tolist()
+        return [indices[: self.max_num_instances] for indices in keep.split(counts)]
 
 
 class DetectionTileMerge(TileMerge):
@@ -96,89 +143,67 @@ class DetectionTileMerge(TileMerge):
         self,
         batch_tile_preds: list[DetBatchPredEntity | DetBatchPredEntityWithXAI],
         batch_tile_attrs: list[list[dict]],
+        tile_img_indices: list[int] | None = None,
     ) -> list[DetPredEntity]:
         """Merge batch tile predictions to a list of full-size prediction data entities.
 
         Args:
             batch_tile_preds (list): detection tile predictions.
             batch_tile_attrs (list): detection tile attributes.
+            tile_img_indices (list[int] | None): Index of the original image of each tile.
 
         """
-        entities_to_merge = defaultdict(list)
-        img_ids = []
+        tile_img_indices = self._get_tile_img_indices(batch_tile_attrs, tile_img_indices)
+        tile_bboxes, tile_labels, tile_scores, tile_rois = [], [], [], []
 
         for tile_preds, tile_attrs in zip(batch_tile_preds, batch_tile_attrs):
-            for tile_attr, tile_img_info, tile_bboxes, tile_labels, tile_scores in zip(
+            for tile_attr, tile_img_info, bboxes, labels, scores in zip(
                 tile_attrs,
                 tile_preds.imgs_info,
                 tile_preds.bboxes,
                 tile_preds.labels,
                 tile_preds.scores,
             ):
-                offset_x, offset_y, _, _ = tile_attr["roi"]
-                tile_bboxes[:, 0::2] += offset_x
-                tile_bboxes[:, 1::2] += offset_y
-
-                tile_id = tile_attr["tile_id"]
-                if tile_id not in img_ids:
-                    img_ids.append(tile_id)
                 tile_img_info.padding = tile_attr["roi"]
-
-                entities_to_merge[tile_id].append(
-                    DetPredEntity(
-                        image=torch.empty(tile_img_info.ori_shape),
-                        img_info=tile_img_info,
-                        bboxes=tile_bboxes,
-                        labels=tile_labels,
-                        score=tile_scores,
-                    ),
-                )
+                tile_bboxes.append(bboxes)
+                tile_labels.append(labels)
+                tile_scores.append(scores)
+                tile_rois.append(tile_attr["roi"])
+
+        if not tile_bboxes:
+            return [self._create_entity(img_info) for img_info in self.img_infos]
+
+        bboxes, labels, scores, img_indices_per_box = self._pack_tiles(
+            tile_bboxes,
+            tile_labels,
+            tile_scores,
+            tile_rois,
+            tile_img_indices,
+        )
+        keeps = self.batched_nms_postprocess(bboxes, scores, labels, img_indices_per_box)
         return [
-            self._merge_entities(image_info, entities_to_merge[img_id])
-            for img_id, image_info in zip(img_ids, self.img_infos)
+            self._create_entity(img_info, bboxes[keep], labels[keep], scores[keep])
+            for img_info, keep in zip(self.img_infos, keeps)
         ]
 
-    def _merge_entities(self, img_info: ImageInfo, entities: list[DetPredEntity]) -> DetPredEntity:
-        """Merge tile predictions to one single prediction.
-
-        Args:
-            img_info (ImageInfo): Image information about the original image before tiling.
-            entities (list[DetPredEntity]): List of tile prediction entities.
-
-        Returns:
-            DetPredEntity: Merged prediction entity.
-        """
-        bboxes: list | torch.Tensor = []
-        labels: list | torch.Tensor = []
-        scores: list | torch.Tensor = []
+    def _create_entity(
+        self,
+        img_info: ImageInfo,
+        bboxes: torch.Tensor | None = None,
+        labels: torch.Tensor | None = None,
+        scores: torch.Tensor | None = None,
+    ) -> DetPredEntity:
         img_size = img_info.ori_shape
-        for tile_entity in entities:
-            num_preds = len(tile_entity.bboxes)
-            if num_preds > 0:
-                bboxes.extend(tile_entity.bboxes)
-                labels.extend(tile_entity.labels)
-                scores.extend(tile_entity.score)
-
-        bboxes = torch.stack(bboxes) if len(bboxes) > 0 else torch.empty((0, 4), device=img_info.device)
-        labels = torch.stack(labels) if len(labels) > 0 else torch.empty((0,), device=img_info.device)
-        scores = torch.stack(scores) if len(scores) > 0 else torch.empty((0,), device=img_info.device)
-
-        bboxes, labels, scores, _ = self.nms_postprocess(
-            bboxes,
-            scores,
-            labels,
-        )
-
         return DetPredEntity(
             image=torch.empty(img_size),
             img_info=img_info,
-            score=scores,
+            score=scores if scores is not None else torch.empty((0,), device=img_info.device),
             bboxes=tv_tensors.BoundingBoxes(
-                bboxes,
+                bboxes if bboxes is not None else torch.empty((0, 4), device=img_info.device),
                 canvas_size=img_size,
                 format="XYXY",
             ),
-            labels=labels,
+            labels=labels if labels is not None else torch.empty((0,), device=img_info.device),
         )
 
 
@@ -189,19 +214,23 @@ class InstanceSegTileMerge(TileMerge):
         self,
         batch_tile_preds: list[InstanceSegBatchPredEntity | InstanceSegBatchPredEntityWithXAI],
         batch_tile_attrs: list[list[dict]],
+        tile_img_indices: list[int] | None = None,
     ) -> list[InstanceSegPredEntity]:
         """Merge inst-seg tile predictions to one single prediction.
 
         Args:
             batch_tile_preds (list): instance-seg tile predictions.
             batch_tile_attrs (list): instance-seg tile attributes.
+            tile_img_indices (list[int] | None): Index of the original image of each tile.
 
         """
-        entities_to_merge = defaultdict(list)
-        img_ids = []
+        tile_img_indices = self._get_tile_img_indices(batch_tile_attrs, tile_img_indices)
+        tile_bboxes, tile_labels, tile_scores, tile_rois = [], [], [], []
+        img_masks: list[list[torch.Tensor]] = [[] for _ in self.img_infos]
 
+        tile_idx = 0
         for tile_preds, tile_attrs in zip(batch_tile_preds, batch_tile_attrs):
-            for tile_attr, tile_img_info, tile_bboxes, tile_labels, tile_scores, tile_masks in zip(
+            for tile_attr, tile_img_info, bboxes, labels, scores, masks in zip(
                 tile_attrs,
                 tile_preds.imgs_info,
                 tile_preds.bboxes,
@@ -209,86 +238,79 @@ class InstanceSegTileMerge(TileMerge):
                 tile_preds.scores,
                 tile_preds.masks,
             ):
-                keep_indices = tile_masks.to_sparse().sum((1, 2)).to_dense() > 0
+                keep_indices = masks.to_sparse().sum((1, 2)).to_dense() > 0
                 keep_indices = keep_indices.nonzero(as_tuple=True)[0]
-                _bboxes = tile_bboxes[keep_indices]
-                _labels = tile_labels[keep_indices]
-                _scores = tile_scores[keep_indices]
-                _masks = tile_masks[keep_indices]
-
-                offset_x, offset_y, _, _ = tile_attr["roi"]
-                _bboxes[:, 0::2] += offset_x
-                _bboxes[:, 1::2] += offset_y
-
-                tile_id = tile_attr["tile_id"]
-                if tile_id not in img_ids:
-                    img_ids.append(tile_id)
+                img_index = tile_img_indices[tile_idx]
+                tile_idx += 1
                 tile_img_info.padding = tile_attr["roi"]
 
-                entities_to_merge[tile_id].append(
-                    InstanceSegPredEntity(
-                        image=torch.empty(tile_img_info.ori_shape),
-                        img_info=tile_img_info,
-                        bboxes=_bboxes,
-                        labels=_labels,
-                        score=_scores,
-                        masks=_masks.to_sparse(),
-                        polygons=[],
-                    ),
-                )
+                tile_bboxes.append(bboxes[keep_indices])
+                tile_labels.append(labels[keep_indices])
+                tile_scores.append(scores[keep_indices])
+                tile_rois.append(tile_attr["roi"])
 
-        return [
-            self._merge_entities(image_info, entities_to_merge[img_id])
-            for img_id, image_info in zip(img_ids, self.img_infos)
-        ]
-
-    def _merge_entities(self, img_info: ImageInfo, entities: list[InstanceSegPredEntity]) -> InstanceSegPredEntity:
-        """Merge tile predictions to one single prediction.
-
-        Args:
-            img_info (ImageInfo): Image information about the original image before tiling.
-            entities (list[InstanceSegPredEntity]): List of tile prediction entities.
-
-        Returns:
-            InstanceSegPredEntity: Merged prediction entity.
-        """
-        bboxes: list | torch.Tensor = []
-        labels: list | torch.Tensor = []
-        scores: list | torch.Tensor = []
-        masks: list | torch.Tensor = []
-        img_size = img_info.ori_shape
-        for tile_entity in entities:
-            num_preds = len(tile_entity.bboxes)
-            if num_preds > 0:
-                bboxes.extend(tile_entity.bboxes)
-                labels.extend(tile_entity.labels)
-                scores.extend(tile_entity.score)
-
-                offset_x, offset_y, _, _ = tile_entity.img_info.padding
-                mask_indices = tile_entity.masks.indices()
-                mask_values = tile_entity.masks.values()
+                # Move the masks to the coordinates of the original image
+                offset_x, offset_y, _, _ = tile_attr["roi"]
+                sparse_masks = masks[keep_indices].to_sparse()
+                mask_indices = sparse_masks.indices()
                 mask_indices[1] += offset_y
                 mask_indices[2] += offset_x
-                masks.extend(
-                    torch.sparse_coo_tensor(mask_indices, mask_values, (num_preds, *img_size)),
+                img_masks[img_index].append(
+                    torch.sparse_coo_tensor(
+                        mask_indices,
+                        sparse_masks.values(),
+                        (len(keep_indices), *self.img_infos[img_index].ori_shape),
+                    ),
                 )
 
-        bboxes = torch.stack(bboxes) if len(bboxes) > 0 else torch.empty((0, 4), device=img_info.device)
-        labels = torch.stack(labels) if len(labels) > 0 else torch.empty((0,), device=img_info.device)
-        scores = torch.stack(scores) if len(scores) > 0 else torch.empty((0,), device=img_info.device)
-        masks = masks if len(masks) > 0 else torch.empty((0, *img_size))
+        if not tile_bboxes:
+            return [self._create_entity(img_info) for img_info in self.img_infos]
 
-        bboxes, labels, scores, masks = self.nms_postprocess(bboxes, scores, labels, masks)
+        bboxes, labels, scores, img_indices_per_box = self._pack_tiles(
+            tile_bboxes,
+            tile_labels,
+            tile_scores,
+            tile_rois,
+            tile_img_indices,
+        )
+        keeps = self.batched_nms_postprocess(bboxes, scores, labels, img_indices_per_box)
+
+        # Index of each prediction among the predictions of its image, whose masks are concatenated in order
+        order = torch.argsort(img_indices_per_box, stable=True)
+        counts = torch.bincount(img_indices_per_box, minlength=len(self.img_infos))
+        starts = torch.cumsum(counts, dim=0) - counts
+        local_indices = torch.empty_like(order)
+        local_indices[order] = torch.arange(len(order), device=order.device) - starts[img_indices_per_box[order]]
+
+        entities = []
+        for img_info, keep, masks in zip(self.img_infos, keeps, img_masks):
+            merged_masks = (
+                torch.cat(masks).index_select(0, local_indices[keep].to(masks[0].device)).coalesce().to_dense()
+                if len(keep) > 0
+                else torch.empty((0, *img_info.ori_shape))
+            )
+            entities.append(self._create_entity(img_info, bboxes[keep], labels[keep], scores[keep], merged_masks))
+        return entities
+
+    def _create_entity(
+        self,
+        img_info: ImageInfo,
+        bboxes: torch.Tensor | None = None,
+        labels: torch.Tensor | None = None,
+        scores: torch.Tensor | None = None,
+        masks: torch.Tensor | None = None,
+    ) -> InstanceSegPredEntity:
+        img_size = img_info.ori_shape
         return InstanceSegPredEntity(
             image=torch.empty(img_size),
             img_info=img_info,
-            score=scores,
+            score=scores if scores is not None else torch.empty((0,), device=img_info.device),
             bboxes=tv_tensors.BoundingBoxes(
-                bboxes,
+                bboxes if bboxes is not None else torch.empty((0, 4), device=img_info.device),
                 canvas_size=img_size,
                 format="XYXY",
             ),
-            labels=labels,
-            masks=tv_tensors.Mask(masks, dtype=bool),
+            labels=labels if labels is not None else torch.empty((0,), device=img_info.device),
+            masks=tv_tensors.Mask(masks if masks is not None else torch.empty((0, *img_size)), dtype=bool),
             polygons=[],
         )
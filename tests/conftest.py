@@ -10,6 +10,23 @@ from otx.core.data.mem_cache import MemCacheHandlerSingleton
 from torchvision.tv_tensors import Image, Mask
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--run-benchmark",
+        action="store_true",
+        help="Run the wall-clock benchmarks marked with `benchmark` (default: false).",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("--run-benchmark"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="Benchmarks run only with --run-benchmark.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(scope="session")
 def fxt_seg_data_entity() -> tuple[tuple, SegDataEntity, SegBatchDataEntity]:
     img_size = (32, 32)
@@ -0,0 +1,100 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from otx.algo.callbacks.mem_cache_stats import MemCacheStatsLogger
+from otx.core.data.mem_cache import NULL_MEM_CACHE_HANDLER, MemCacheHandlerForSP
+
+
+class TestMemCacheStatsLogger:
+    @pytest.fixture()
+    def fxt_trainer(self) -> MagicMock:
+        trainer = MagicMock()
+        trainer.datamodule.mem_cache_handler = MemCacheHandlerForSP(mem_size=1024 * 1024)
+        return trainer
+
+    @staticmethod
+    def _get_logged(pl_module: MagicMock) -> dict[str, float]:
+        return {call.kwargs["name"]: call.kwargs["value"] for call in pl_module.log.call_args_list}
+
+    @pytest.mark.parametrize("phase", ["train", "validation", "test"])
+    def test_all_phases(self, fxt_trainer, phase) -> None:
+        handler = fxt_trainer.datamodule.mem_cache_handler
+        callback = MemCacheStatsLogger()
+
+        for epoch_idx in range(2):
+            pl_module = MagicMock()
+            getattr(callback, f"on_{phase}_epoch_start")(trainer=fxt_trainer, pl_module=pl_module)
+
+            key = f"image_{epoch_idx}"
+            handler.get(key)
+            handler.put(key, np.zeros((10, 10, 3), dtype=np.uint8))
+            handler.get(key)
+            handler.get(key)
+
+            getattr(callback, f"on_{phase}_epoch_end")(trainer=fxt_trainer, pl_module=pl_module)
+
+            # Only the increments during the epoch are logged
+            logged = self._get_logged(pl_module)
+            assert logged[f"{phase}/mem_cache_hits"] == 2
+            assert logged[f"{phase}/mem_cache_misses"] == 1
+            assert logged[f"{phase}/mem_cache_hit_rate"] == pytest.approx(2 / 3)
+            assert logged[f"{phase}/mem_cache_hit_bytes"] == 2 * 300
+            assert logged[f"{phase}/mem_cache_inserts"] == 1
+            assert logged[f"{phase}/mem_cache_frozen"] == 0.0
+
+    def test_count_images_only(self, fxt_trainer) -> None:
+        handler = fxt_trainer.datamodule.mem_cache_handler
+        callback = MemCacheStatsLogger()
+        pl_module = MagicMock()
+
+        callback.on_train_epoch_start(trainer=fxt_trainer, pl_module=pl_module)
+        handler.get("image")
+        handler.get("image", kind="prefetch")
+        handler.put("image", np.zeros((10, 10, 3), dtype=np.uint8), kind="prefetch")
+        handler.get("image")
+        handler.get(("dataset", 0), kind="transform_outputs")
+        callback.on_train_epoch_end(trainer=fxt_trainer, pl_module=pl_module)
+
+        # The lookups of the other kinds are not counted in the image hit rate
+        logged = self._get_logged(pl_module)
+        assert logged["train/mem_cache_hits"] == 1
+        assert logged["train/mem_cache_misses"] == 1
+        assert logged["train/mem_cache_inserts"] == 0
+        assert logged["train/mem_cache_hit_rate"] == 0.5
+        assert logged["train/mem_cache_prefetch_hit_rate"] == 0.0
+        assert logged["train/mem_cache_transform_outputs_hit_rate"] == 0.0
+        assert "train/mem_cache_label_map_hit_rate" not in logged
+
+    def test_exclude_validation_from_train(self, fxt_trainer) -> None:
+        handler = fxt_trainer.datamodule.mem_cache_handler
+        callback = MemCacheStatsLogger()
+        pl_module = MagicMock()
+
+        callback.on_train_epoch_start(trainer=fxt_trainer, pl_module=pl_module)
+        handler.get("train_0")
+        callback.on_validation_epoch_start(trainer=fxt_trainer, pl_module=pl_module)
+        handler.get("validation_0")
+        handler.get("validation_1")
+        callback.on_validation_epoch_end(trainer=fxt_trainer, pl_module=pl_module)
+        handler.get("train_1")
+        callback.on_train_epoch_end(trainer=fxt_trainer, pl_module=pl_module)
+
+        logged = self._get_logged(pl_module)
+        assert logged["validation/mem_cache_misses"] == 2
+        assert logged["train/mem_cache_misses"] == 2
+
+    def test_null_handler(self, fxt_trainer) -> None:
+        fxt_trainer.datamodule.mem_cache_handler = NULL_MEM_CACHE_HANDLER
+        callback = MemCacheStatsLogger()
+        pl_module = MagicMock()
+
+        callback.on_train_epoch_start(trainer=fxt_trainer, pl_module=pl_module)
+        callback.on_train_epoch_end(trainer=fxt_trainer, pl_module=pl_module)
+
+        pl_module.log.assert_not_called()
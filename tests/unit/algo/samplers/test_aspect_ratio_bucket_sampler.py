@@ -0,0 +1,122 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+from datumaro.components.annotation import Label
+from datumaro.components.dataset import Dataset as DmDataset
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.media import Image
+from otx.algo.samplers.aspect_ratio_bucket_sampler import AspectRatioBucketSampler
+from otx.algo.samplers.balanced_sampler import BalancedSampler
+from otx.core.data.annotation_index import AnnotationIndex
+from otx.core.data.dataset.base import OTXDataset
+from torch.utils.data import DataLoader
+
+# (height, width) of the images: 10 landscape, 7 portrait, 5 large landscape and 3 of unknown size
+IMAGE_SIZES = [(480, 640)] * 10 + [(640, 480)] * 7 + [(1536, 2048)] * 5 + [None] * 3
+
+
+@pytest.fixture(params=[False, True], ids=["dm_subset", "annotation_index"])
+def fxt_dataset(request) -> OTXDataset:
+    dataset_items = [
+        DatasetItem(
+            id=f"item{i:03d}",
+            subset="train",
+            media=Image.from_file(path=f"item{i:03d}.jpg", size=size),
+            annotations=[Label(label=i % 2)],
+        )
+        for i, size in enumerate(IMAGE_SIZES)
+    ]
+    dm_subset = DmDataset.from_iterable(dataset_items, categories=["0", "1"]).get_subset("train")
+    return OTXDataset(
+        dm_subset=dm_subset,
+        transforms=[],
+        annotation_index=AnnotationIndex.build(dm_subset) if request.param else None,
+    )
+
+
+def _get_bucket(index: int) -> tuple[int, int] | None:
+    return IMAGE_SIZES[index]
+
+
+class TestAspectRatioBucketSampler:
+    def test_sampler_iter(self, fxt_dataset):
+        sampler = AspectRatioBucketSampler(fxt_dataset, batch_size=4)
+        assert len(sampler) == len(IMAGE_SIZES)
+
+        indices = list(sampler)
+        assert sorted(indices) == list(range(len(IMAGE_SIZES)))
+
+        batches = [indices[i : i + 4] for i in range(0, len(indices), 4)]
+        num_homogeneous = sum(len({_get_bucket(index) for index in batch}) == 1 for batch in batches[:-1])
+        # 2 + 1 + 1 full batches of a single bucket, then the remaining 2 + 3 + 1 + 3 items are mixed
+        assert num_homogeneous == 4
+        assert len(batches[-1]) == len(IMAGE_SIZES) % 4
+
+    def test_reproducible(self, fxt_dataset):
+        sampler = AspectRatioBucketSampler(fxt_dataset, batch_size=4, seed=3)
+        sampler.set_epoch(1)
+        first = list(sampler)
+        assert list(sampler) == first
+        sampler.set_epoch(2)
+        assert list(sampler) != first
+
+    def test_distributed(self, fxt_dataset):
+        samplers = [AspectRatioBucketSampler(fxt_dataset, batch_size=4, num_replicas=2, rank=rank) for rank in range(2)]
+        # ceil(25 / 4) = 7 batches are padded to 8 and split into 4 batches per replica
+        assert all(len(sampler) == 16 for sampler in samplers)
+
+        indices = [list(sampler) for sampler in samplers]
+        assert all(len(rank_indices) == 16 for rank_indices in indices)
+        assert set(indices[0]) | set(indices[1]) == set(range(len(IMAGE_SIZES)))
+
+    def test_inner_sampler(self, fxt_dataset):
+        sampler = AspectRatioBucketSampler(
+            fxt_dataset,
+            batch_size=4,
+            sampler={"class_path": "otx.algo.samplers.balanced_sampler.BalancedSampler", "init_args": {}},
+        )
+        assert isinstance(sampler.sampler, BalancedSampler)
+        assert len(sampler) == len(sampler.sampler)
+        assert len(list(sampler)) == len(sampler)
+
+        # The batches of the dataloader follow the buckets
+        dataloader = DataLoader(list(range(len(IMAGE_SIZES))), batch_size=4, sampler=sampler)
+        assert sum(len(batch) for batch in dataloader) == len(sampler)
+
+    @pytest.mark.parametrize(
+        "class_path",
+        [
+            "otx.algo.samplers.balanced_sampler.BalancedSampler",
+            "otx.algo.samplers.class_incremental_sampler.ClassIncrementalSampler",
+        ],
+    )
+    def test_distributed_inner_sampler(self, fxt_dataset, class_path):
+        init_args = {"old_classes": ["0"], "new_classes": ["1"]} if "ClassIncremental" in class_path else {}
+        samplers = [
+            AspectRatioBucketSampler(
+                fxt_dataset,
+                batch_size=4,
+                sampler={"class_path": class_path, "init_args": init_args},
+                num_replicas=2,
+                rank=rank,
+            )
+            for rank in range(2)
+        ]
+
+        for epoch in range(2):
+            for sampler in samplers:
+                sampler.set_epoch(epoch)
+            # Every replica draws the same indices from its inner sampler before taking its share of the batches
+            draws = []
+            for sampler in samplers:
+                sampler.generator.manual_seed(sampler.seed + epoch)
+                draws.append([int(idx) for idx in sampler.sampler])
+            assert draws[0] == draws[1]
+
+            shards = [list(sampler) for sampler in samplers]
+            assert Counter(shards[0]) + Counter(shards[1]) >= Counter(draws[0])
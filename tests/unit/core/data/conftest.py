@@ -8,6 +8,7 @@ from unittest.mock import MagicMock
 import cv2
 import numpy as np
 import pytest
+from datumaro.components import media_manager
 from datumaro.components.annotation import Bbox, Label, Mask
 from datumaro.components.dataset import DatasetSubset
 from datumaro.components.dataset_base import DatasetItem
@@ -27,6 +28,8 @@ from otx.core.data.dataset.segmentation import (
 from otx.core.data.mem_cache import MemCacheHandlerSingleton
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from otx.core.data.dataset.base import OTXDataset, T_OTXDataEntity
     from otx.core.data.mem_cache import MemCacheHandlerBase
     from pytest_mock import MockerFixture
@@ -40,6 +43,15 @@ def fxt_mem_cache_handler(monkeypatch) -> MemCacheHandlerBase:
     MemCacheHandlerSingleton.delete()
 
 
+@pytest.fixture()
+def fxt_clear_media_manager() -> Iterator[None]:
+    # Datumaro keeps the opened videos in a global manager, which fails to push the videos of the later tests.
+    # Its entries cannot even be cleared, so that a new manager is created for the test and after it.
+    media_manager._instance = None
+    yield
+    media_manager._instance = None
+
+
 @pytest.fixture(params=["bytes", "numpy"])
 def fxt_dm_item(request) -> DatasetItem:
     np_img = np.zeros(shape=(10, 10, 3), dtype=np.uint8)
@@ -0,0 +1,76 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests of action detection datasets."""
+
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from datumaro import Dataset as DmDataset
+from otx.core.data.dataset.action_detection import OTXActionDetDataset, ProposalIndex
+
+DATA_ROOT = Path(__file__).parents[4] / "assets" / "action_detection_dataset"
+
+
+@pytest.fixture()
+def fxt_ava_subset():
+    return DmDataset.import_from(str(DATA_ROOT), "ava").get_subset("train")
+
+
+@pytest.fixture()
+def fxt_proposals() -> dict[str, np.ndarray]:
+    with (DATA_ROOT / "annotations" / "train.pkl").open("rb") as f:
+        return pickle.load(f)  # noqa: S301
+
+
+class TestProposalIndex:
+    def test_get(self, fxt_proposals) -> None:
+        proposals = {**fxt_proposals, "empty_video,0000": np.zeros((0, 5))}
+        index = ProposalIndex.from_dict(proposals)
+
+        assert len(index) == len(proposals)
+        for key, expected in proposals.items():
+            assert np.array_equal(index.get(key), expected[:, :4])
+        assert index.get("missing,0000") is None
+        assert index.get("") is None
+
+    def test_load_or_build(self, tmp_path, fxt_proposals, mocker) -> None:
+        proposal_file = DATA_ROOT / "annotations" / "train.pkl"
+        index = ProposalIndex.load_or_build(proposal_file, tmp_path)
+        assert len(list(tmp_path.glob("train_*.npy"))) == 3
+
+        # The next load does not unpickle the proposal file
+        spy_load = mocker.spy(pickle, "load")
+        index = ProposalIndex.load_or_build(proposal_file, tmp_path)
+        spy_load.assert_not_called()
+        assert isinstance(index.boxes, np.memmap)
+        key = next(iter(fxt_proposals))
+        proposals = index.get(key)
+        assert np.array_equal(proposals, fxt_proposals[key][:, :4])
+        assert proposals.flags.writeable
+
+
+class TestOTXActionDetDataset:
+    def test_get_proposals(self, fxt_ava_subset, fxt_proposals, tmp_path, mocker) -> None:
+        spy_load = mocker.spy(pickle, "load")
+        dataset = OTXActionDetDataset(dm_subset=fxt_ava_subset, transforms=lambda x: x, proposal_dir=tmp_path)
+
+        for i in range(len(dataset)):
+            entity = dataset[i]
+            key = ",".join(Path(entity.frame_path).stem.rsplit("_", 1))
+            assert np.array_equal(entity.proposals, fxt_proposals[key][:, :4])
+        # The proposal file is loaded only once
+        assert spy_load.call_count == 1
+
+        assert np.array_equal(
+            dataset._get_proposals("frames/video/missing_0000.jpg", "train.pkl"),
+            np.array([[0, 0, 1, 1]], dtype=np.float32),
+        )
+        assert np.array_equal(
+            dataset._get_proposals("frames/video/missing_0000.jpg", None),
+            np.array([[0, 0, 1, 1]], dtype=np.float64),
+        )
@@ -0,0 +1,56 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests of segmentation datasets."""
+
+import numpy as np
+import pytest
+from datumaro import Dataset as DmDataset
+from datumaro import DatasetItem, Image, Mask
+from otx.core.data.dataset.segmentation import OTXSegmentationDataset
+
+
+@pytest.fixture()
+def fxt_seg_dataset_subset():
+    mask = np.zeros((4, 6), dtype=np.uint8)
+    mask[1:3, 2:5] = 1
+    item = DatasetItem(
+        id="item",
+        subset="train",
+        media=Image.from_numpy(np.zeros((4, 6, 3), dtype=np.uint8)),
+        annotations=[Mask(image=mask, label=1), Mask(image=1 - mask, label=2)],
+    )
+    dataset = DmDataset.from_iterable([item], categories=["background", "a", "b"])
+    return dataset.get_subset("train")
+
+
+class TestOTXSegmentationDataset:
+    def test_label_map(self, fxt_seg_dataset_subset, fxt_mem_cache_handler, tmp_path, mocker) -> None:
+        expected = np.sum(
+            [ann.as_class_mask() for ann in fxt_seg_dataset_subset.get(id="item", subset="train").annotations],
+            axis=0,
+            dtype=np.uint8,
+        )
+
+        dataset = OTXSegmentationDataset(
+            dm_subset=fxt_seg_dataset_subset,
+            transforms=lambda x: x,
+            mem_cache_handler=fxt_mem_cache_handler,
+            label_map_dir=tmp_path,
+        )
+        assert np.array_equal(dataset[0].gt_seg_map.numpy(), expected)
+        assert len(list(tmp_path.glob("*.png"))) == 1
+
+        # The label map is taken from the memory cache
+        spy_as_class_mask = mocker.spy(Mask, "as_class_mask")
+        assert np.array_equal(dataset[0].gt_seg_map.numpy(), expected)
+        spy_as_class_mask.assert_not_called()
+
+        # The label map is read from the directory by another dataset without the memory cache
+        dataset = OTXSegmentationDataset(
+            dm_subset=fxt_seg_dataset_subset,
+            transforms=lambda x: x,
+            label_map_dir=tmp_path,
+        )
+        assert np.array_equal(dataset[0].gt_seg_map.numpy(), expected)
+        spy_as_class_mask.assert_not_called()
@@ -0,0 +1,195 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests of tile datasets."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from datumaro import Bbox, Label, Mask, Points
+from datumaro import Dataset as DmDataset
+from otx.core.config.data import TileConfig
+from otx.core.data.annotation_index import AnnotationIndex
+from otx.core.data.dataset.detection import OTXDetectionDataset
+from otx.core.data.dataset.tile import (
+    OTXTileDetTestDataset,
+    OTXTileTrainDataset,
+    OTXTileTransform,
+    TileIndex,
+    TileSubset,
+    get_tile_rois,
+)
+from otx.core.data.mem_cache import MemCacheHandlerSingleton
+
+DATA_ROOT = Path(__file__).parents[4] / "assets" / "car_tree_bug"
+
+
+@pytest.fixture()
+def fxt_dm_subset():
+    return DmDataset.import_from(str(DATA_ROOT), "coco_instances").get_subset("train")
+
+
+def test_get_tile_rois() -> None:
+    rois = get_tile_rois((100, 150), tile_size=(60, 80), overlap=(0.5, 0.25))
+    # The tiles are ordered column by column and clipped to the image
+    assert rois.tolist() == [
+        [0, 0, 80, 60],
+        [0, 30, 80, 60],
+        [0, 60, 80, 40],
+        [0, 90, 80, 10],
+        [60, 0, 80, 60],
+        [60, 30, 80, 60],
+        [60, 60, 80, 40],
+        [60, 90, 80, 10],
+        [120, 0, 30, 60],
+        [120, 30, 30, 60],
+        [120, 60, 30, 40],
+        [120, 90, 30, 10],
+    ]
+
+
+class TestTileIndex:
+    @pytest.mark.parametrize(("tile_size", "overlap"), [((200, 200), 0.2), ((333, 150), 0.5)])
+    def test_build(self, fxt_dm_subset, tile_size, overlap) -> None:
+        annotation_index = AnnotationIndex.build(fxt_dm_subset)
+        tile_index = TileIndex.build(fxt_dm_subset, annotation_index, tile_size, (overlap, overlap), 0.5)
+        tile_annotation_index = tile_index.to_annotation_index(annotation_index)
+        tile_ids = tile_annotation_index.item_ids.tolist()
+        tile_subset = TileSubset(fxt_dm_subset, tile_index, annotation_index.item_ids, tile_ids, 0.5)
+
+        # The same tiles as the ones of Datumaro followed by the original items
+        dm_dataset = fxt_dm_subset.as_dataset().transform(
+            OTXTileTransform,
+            tile_size=tile_size,
+            overlap=(overlap, overlap),
+            threshold_drop_ann=0.5,
+        )
+        dm_dataset = dm_dataset.filter("/item/annotation", filter_annotations=True, remove_empty=True)
+        expected_ids = [item.id for item in dm_dataset]
+        assert tile_ids == expected_ids + annotation_index.item_ids.tolist()
+
+        for i, expected in enumerate(dm_dataset):
+            tile = tile_subset.get(expected.id)
+            assert tile.annotations == expected.annotations
+            assert tile.attributes == expected.attributes
+            assert tile.media.roi == expected.media.roi
+            assert tuple(tile_annotation_index.image_sizes[i]) == expected.media.size
+            start, end = tile_annotation_index.ann_offsets[i : i + 2]
+            assert tile_annotation_index.ann_labels[start:end].tolist() == [ann.label for ann in expected.annotations]
+            # The boxes are clipped to the tile
+            boxes = tile_annotation_index.boxes[start:end]
+            assert np.all(boxes >= 0)
+            assert np.all(boxes[:, 2:] <= expected.media.roi[2:])
+
+        for item in fxt_dm_subset:
+            assert tile_subset.get(item.id).annotations == item.annotations
+        assert tile_subset.get("missing") is None
+        assert len(tile_subset) == len(tile_ids)
+
+
+class TestOTXTileTrainDataset:
+    @pytest.mark.parametrize("mem_cache_img_max_size", [None, (360, 640)])
+    def test_get_item(self, fxt_dm_subset, mem_cache_img_max_size, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        mem_cache_handler = MemCacheHandlerSingleton.create(mode="singleprocessing", mem_size=64 * 1024 * 1024)
+        try:
+            dataset = OTXDetectionDataset(
+                fxt_dm_subset,
+                transforms=lambda x: x,
+                mem_cache_handler=mem_cache_handler,
+                mem_cache_img_max_size=mem_cache_img_max_size,
+            )
+            tile_dataset = OTXTileTrainDataset(dataset, TileConfig(tile_size=(200, 200), overlap=0.2))
+            assert len(tile_dataset) > len(fxt_dm_subset)
+
+            for i in range(len(tile_dataset)):
+                entity = tile_dataset[i]
+                item = tile_dataset.dm_subset.get(tile_dataset.ids[i])
+                assert len(entity.bboxes) == sum(isinstance(ann, Bbox) for ann in item.annotations)
+                if "tile_idx" not in item.attributes:
+                    continue
+                # The tile is resized back to its size if the cached image is downscaled
+                assert entity.image.shape[:2] == item.media.size
+                if mem_cache_img_max_size is None:
+                    # The tile is a view of the cached image
+                    assert entity.image.base is not None
+                    assert np.array_equal(entity.image[..., ::-1], item.media.data.astype(np.uint8))
+
+            # Only the full images are cached
+            assert len(mem_cache_handler) == len(fxt_dm_subset)
+        finally:
+            MemCacheHandlerSingleton.delete()
+
+
+class TestOTXTileDetTestDataset:
+    @pytest.mark.parametrize("subset", ["val", "test"])
+    def test_get_tiles(self, subset, mocker) -> None:
+        dm_subset = DmDataset.import_from(str(DATA_ROOT), "coco_instances").get_subset(subset)
+        tile_config = TileConfig(tile_size=(200, 200), overlap=0.2)
+        dataset = OTXDetectionDataset(dm_subset, transforms=[lambda x: x], num_deterministic_transforms=1)
+        tile_dataset = OTXTileDetTestDataset(dataset, tile_config)
+        spy_cache = mocker.spy(tile_dataset, "_cache_transform_outputs")
+
+        item = next(iter(dm_subset))
+        image, _ = tile_dataset._get_img_data_and_shape(item.media)
+        tile_entities, tile_attrs = tile_dataset.get_tiles(image, item)
+
+        # The same tiles as the ones of Datumaro
+        dm_dataset = DmDataset.from_iterable([item]).transform(
+            OTXTileTransform,
+            tile_size=tile_config.tile_size,
+            overlap=(tile_config.overlap, tile_config.overlap),
+            threshold_drop_ann=0.5,
+        )
+        if subset == "val":
+            dm_dataset = dm_dataset.filter("/item/annotation", filter_annotations=True, remove_empty=True)
+        assert tile_attrs == [tile.attributes for tile in dm_dataset]
+        for tile_entity, (x, y, w, h) in zip(tile_entities, (attrs["roi"] for attrs in tile_attrs)):
+            assert np.shares_memory(tile_entity.image, image)
+            assert np.array_equal(tile_entity.image, image[y : y + h, x : x + w])
+        # The tiles sharing the image index are not cached
+        spy_cache.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "annotations",
+        [
+            [Points([10, 10, 20, 20], label=0)],
+            [Label(label=0)],
+            [Mask(np.zeros((10, 10), dtype=np.uint8), label=0), Bbox(0, 0, 10, 10, label=0)],
+        ],
+    )
+    def test_get_val_tiles_other_annotations(self, annotations) -> None:
+        dm_subset = DmDataset.import_from(str(DATA_ROOT), "coco_instances").get_subset("val")
+        tile_config = TileConfig(tile_size=(200, 200), overlap=0.2)
+        dataset = OTXDetectionDataset(dm_subset, transforms=[lambda x: x])
+        tile_dataset = OTXTileDetTestDataset(dataset, tile_config)
+
+        item = next(iter(dm_subset)).wrap(annotations=annotations)
+        image, _ = tile_dataset._get_img_data_and_shape(item.media)
+        _, tile_attrs = tile_dataset.get_tiles(image, item)
+
+        # The tiles keeping the annotations other than the boxes and the polygons are retrieved as before
+        dm_dataset = (
+            DmDataset.from_iterable([item])
+            .transform(
+                OTXTileTransform,
+                tile_size=tile_config.tile_size,
+                overlap=(tile_config.overlap, tile_config.overlap),
+                threshold_drop_ann=0.5,
+            )
+            .filter("/item/annotation", filter_annotations=True, remove_empty=True)
+        )
+        assert tile_attrs == [tile.attributes for tile in dm_dataset]
+        assert len(tile_attrs) > 0
+
+    def test_get_tiles_transformed_none(self, fxt_dm_subset) -> None:
+        dataset = OTXDetectionDataset(fxt_dm_subset, transforms=[lambda x: x, lambda _: None])
+        tile_dataset = OTXTileDetTestDataset(dataset, TileConfig(tile_size=(200, 200), overlap=0.2))
+
+        item = next(iter(fxt_dm_subset))
+        image, _ = tile_dataset._get_img_data_and_shape(item.media)
+        with pytest.raises(RuntimeError, match="Transformed tile is None"):
+            tile_dataset.get_tiles(image, item)
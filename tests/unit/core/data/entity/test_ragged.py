@@ -0,0 +1,58 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests of ragged tensor."""
+
+import pytest
+import torch
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetBatchPredEntity
+from otx.core.data.entity.ragged import RaggedTensor
+from torchvision import tv_tensors
+
+
+class TestRaggedTensor:
+    def test_from_tensors(self) -> None:
+        bboxes = [
+            tv_tensors.BoundingBoxes(torch.rand(2, 4), format="xyxy", canvas_size=(10, 20)),
+            tv_tensors.BoundingBoxes(torch.rand(0, 4), format="xyxy", canvas_size=(30, 40)),
+            tv_tensors.BoundingBoxes(torch.rand(3, 4), format="xywh", canvas_size=(50, 60)),
+        ]
+        ragged = RaggedTensor.from_tensors(bboxes)
+
+        assert len(ragged) == 3
+        assert ragged.data.shape == (5, 4)
+        assert ragged.lengths.tolist() == [2, 0, 3]
+        assert ragged.batch_index().tolist() == [0, 0, 2, 2, 2]
+        for bbox, expected in zip(ragged, bboxes):
+            assert isinstance(bbox, tv_tensors.BoundingBoxes)
+            assert bbox.format == expected.format
+            assert bbox.canvas_size == expected.canvas_size
+            assert torch.equal(bbox, expected)
+
+        # Each item is a view of the data
+        ragged[-1][0, 0] = -1.0
+        assert ragged.data[2, 0] == -1.0
+        assert len(ragged[1:]) == 2
+        with pytest.raises(IndexError):
+            ragged[3]
+        assert RaggedTensor.from_tensors(ragged) is ragged
+        with pytest.raises(ValueError, match="at least one tensor"):
+            RaggedTensor.from_tensors([])
+
+    def test_pack_ragged(self) -> None:
+        batch = DetBatchPredEntity(
+            batch_size=2,
+            images=[],
+            imgs_info=[ImageInfo(img_idx=i, img_shape=(10, 10), ori_shape=(10, 10)) for i in range(2)],
+            bboxes=[tv_tensors.BoundingBoxes(torch.rand(n, 4), format="xyxy", canvas_size=(10, 10)) for n in (1, 2)],
+            labels=[torch.LongTensor([0]), torch.LongTensor([1, 2])],
+            scores=[torch.rand(1), torch.rand(2)],
+        )
+        packed = batch.pack_ragged()
+
+        assert isinstance(packed, DetBatchPredEntity)
+        for name in ("bboxes", "labels", "scores"):
+            assert isinstance(getattr(packed, name), RaggedTensor)
+            for tensor, expected in zip(getattr(packed, name), getattr(batch, name)):
+                assert torch.equal(tensor, expected)
+        assert packed.labels.data.tolist() == [0, 1, 2]
@@ -0,0 +1,65 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests of tile data entity."""
+
+from __future__ import annotations
+
+import pytest
+import torch
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetBatchDataEntity
+from otx.core.data.entity.instance_segmentation import InstanceSegBatchDataEntity
+from otx.core.data.entity.tile import TileBatchDetDataEntity, TileBatchInstSegDataEntity
+from torchvision import tv_tensors
+
+# The second image has no tile
+NUM_TILES = [1, 0, 4]
+
+
+def _get_tile_batch_kwargs() -> dict:
+    return {
+        "batch_size": len(NUM_TILES),
+        "batch_tiles": [
+            [tv_tensors.Image(torch.full((3, 4, 4), i)) for _ in range(num_tiles)]
+            for i, num_tiles in enumerate(NUM_TILES)
+        ],
+        "batch_tile_img_infos": [
+            [ImageInfo(img_idx=i, img_shape=(4, 4), ori_shape=(4, 4)) for _ in range(num_tiles)]
+            for i, num_tiles in enumerate(NUM_TILES)
+        ],
+        "batch_tile_attr_list": [
+            [{"tile_id": f"img{i}", "tile_idx": j, "roi": (j, 0, 4, 4)} for j in range(num_tiles)]
+            for i, num_tiles in enumerate(NUM_TILES)
+        ],
+        "imgs_info": [ImageInfo(img_idx=i, img_shape=(4, 8), ori_shape=(4, 8)) for i in range(len(NUM_TILES))],
+        "bboxes": [],
+        "labels": [],
+    }
+
+
+class TestOTXTileBatchDataEntity:
+    @pytest.mark.parametrize(("batch_size", "expected_sizes"), [(None, [3, 2]), (2, [2, 2, 1]), (8, [5])])
+    def test_unbind(self, batch_size, expected_sizes) -> None:
+        tile_batch = TileBatchDetDataEntity(**_get_tile_batch_kwargs())
+        assert tile_batch.tile_img_indices == [0, 2, 2, 2, 2]
+
+        micro_batches = tile_batch.unbind(batch_size)
+        # The tiles are flattened across the images
+        assert [len(tile_attrs) for tile_attrs, _ in micro_batches] == expected_sizes
+        for tile_attrs, micro_batch in micro_batches:
+            assert isinstance(micro_batch, DetBatchDataEntity)
+            assert micro_batch.batch_size == len(micro_batch.images) == len(micro_batch.bboxes) == len(tile_attrs)
+            for tile_attr, img_info in zip(tile_attrs, micro_batch.imgs_info):
+                assert tile_attr["tile_id"] == f"img{img_info.img_idx}"
+
+        tile_ids = [tile_attr["tile_id"] for tile_attrs, _ in micro_batches for tile_attr in tile_attrs]
+        assert [int(tile_id[3:]) for tile_id in tile_ids] == tile_batch.tile_img_indices
+
+    def test_unbind_inst_seg(self) -> None:
+        tile_batch = TileBatchInstSegDataEntity(**_get_tile_batch_kwargs(), masks=[], polygons=[])
+
+        micro_batches = tile_batch.unbind(4)
+        assert [len(micro_batch.images) for _, micro_batch in micro_batches] == [4, 1]
+        for _, micro_batch in micro_batches:
+            assert isinstance(micro_batch, InstanceSegBatchDataEntity)
+            assert micro_batch.batch_size == len(micro_batch.masks) == len(micro_batch.polygons)
@@ -0,0 +1,150 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from datumaro import Bbox, DatasetItem, Label, LabelCategories, Polygon
+from datumaro import Dataset as DmDataset
+from datumaro.components.annotation import AnnotationType
+from datumaro.components.media import Image
+from otx.core.data.annotation_index import AnnotationIndex, compute_dataset_hash, get_dataset_cache_dir
+from otx.core.utils.utils import get_idx_list_per_classes
+
+
+@pytest.fixture()
+def fxt_dm_dataset() -> DmDataset:
+    items = [
+        DatasetItem(
+            id="a",
+            subset="train",
+            media=Image.from_numpy(np.zeros((10, 20, 3), dtype=np.uint8)),
+            annotations=[Bbox(0, 0, 4, 5, label=1), Polygon([0, 0, 4, 0, 4, 4], label=0)],
+        ),
+        DatasetItem(
+            id="b",
+            subset="train",
+            media=Image.from_file("missing.jpg"),
+            annotations=[Label(label=2), Bbox(1, 1, 2, 2, label=1)],
+        ),
+        DatasetItem(id="c", subset="train", media=Image.from_numpy(np.zeros((8, 8, 3), dtype=np.uint8))),
+    ]
+    categories = {AnnotationType.label: LabelCategories.from_iterable(["x", "y", "z"])}
+    return DmDataset.from_iterable(items, categories=categories)
+
+
+class TestAnnotationIndex:
+    def test_build(self, fxt_dm_dataset) -> None:
+        index = AnnotationIndex.build(fxt_dm_dataset.get_subset("train"))
+
+        assert len(index) == 3
+        assert index.item_ids.tolist() == ["a", "b", "c"]
+        assert index.image_sizes.tolist() == [[10, 20], [-1, -1], [8, 8]]
+        assert index.ann_offsets.tolist() == [0, 2, 4, 4]
+        assert index.ann_items.tolist() == [0, 0, 1, 1]
+        assert index.ann_labels.tolist() == [1, 0, 2, 1]
+        assert index.ann_types.tolist() == [
+            AnnotationType.bbox.value,
+            AnnotationType.polygon.value,
+            AnnotationType.label.value,
+            AnnotationType.bbox.value,
+        ]
+        assert np.allclose(index.boxes[[0, 1, 3]], [[0, 0, 4, 5], [0, 0, 4, 4], [1, 1, 3, 3]])
+        assert np.isnan(index.boxes[2]).all()
+        assert np.allclose(index.areas, [20, 8, 0, 4])
+        assert index.label_names.tolist() == ["x", "y", "z"]
+
+    def test_build_probe_image_size(self, tmp_path) -> None:
+        img_file = tmp_path / "img.png"
+        cv2.imwrite(str(img_file), np.zeros((6, 7, 3), dtype=np.uint8))
+        items = [DatasetItem(id="a", subset="train", media=Image.from_file(str(img_file)))]
+
+        index = AnnotationIndex.build(DmDataset.from_iterable(items).get_subset("train"))
+        # The image size is probed from the file header without decoding the image
+        assert index.image_sizes.tolist() == [[6, 7]]
+        assert not items[0].media.has_size
+
+    @pytest.mark.parametrize("use_string_label", [False, True])
+    def test_get_idx_list_per_classes(self, fxt_dm_dataset, use_string_label) -> None:
+        dm_subset = fxt_dm_dataset.get_subset("train")
+        index = AnnotationIndex.build(dm_subset)
+
+        expected = get_idx_list_per_classes(dm_subset, use_string_label)
+        actual = index.get_idx_list_per_classes(use_string_label)
+        assert actual == expected
+        assert list(actual.keys()) == list(expected.keys())
+
+    def test_load_or_build(self, fxt_dm_dataset, tmp_path, mocker) -> None:
+        dm_subset = fxt_dm_dataset.get_subset("train")
+        index = AnnotationIndex.load_or_build(dm_subset, tmp_path, "key")
+        assert (tmp_path / "key_train.npz").exists()
+
+        spy_build = mocker.spy(AnnotationIndex, "build")
+        loaded = AnnotationIndex.load_or_build(dm_subset, tmp_path, "key")
+        spy_build.assert_not_called()
+        for name in ["item_ids", "image_sizes", "ann_offsets", "ann_labels", "label_names"]:
+            assert np.array_equal(getattr(loaded, name), getattr(index, name))
+        assert np.array_equal(loaded.boxes, index.boxes, equal_nan=True)
+
+        # Outdated index is built again
+        mocker.patch.object(AnnotationIndex, "VERSION", AnnotationIndex.VERSION + 1)
+        AnnotationIndex.load_or_build(dm_subset, tmp_path, "key")
+        spy_build.assert_called_once()
+
+    def test_compute_dataset_hash(self, tmp_path) -> None:
+        (tmp_path / "images").mkdir()
+        (tmp_path / "images" / "0.jpg").write_bytes(b"0")
+        ann_file = tmp_path / "annotations.json"
+        ann_file.write_text("{}")
+
+        key = compute_dataset_hash(tmp_path, "coco")
+        assert compute_dataset_hash(tmp_path, "coco") == key
+        assert compute_dataset_hash(tmp_path, "voc") != key
+
+        # The images are not stat-ed, since the items are defined by the annotation files
+        (tmp_path / "images" / "0.jpg").write_bytes(b"00")
+        (tmp_path / "images" / "1.jpg").write_bytes(b"1")
+        assert compute_dataset_hash(tmp_path, "coco") == key
+
+        ann_file.write_text('{"images": []}')
+        assert compute_dataset_hash(tmp_path, "coco") != key
+        key = compute_dataset_hash(tmp_path, "coco")
+        (tmp_path / "instances_val.json").write_text("{}")
+        assert compute_dataset_hash(tmp_path, "coco") != key
+
+    def test_compute_dataset_hash_folder_format(self, tmp_path, mocker) -> None:
+        for path in ["train/images/0.jpg", "train/masks/0.png", "train/1/0.jpg"]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_bytes(b"0")
+
+        spy_stat = mocker.spy(Path, "stat")
+        key = compute_dataset_hash(tmp_path, "imagenet_with_subset_dirs")
+        # Only the mask image is stat-ed in the data root
+        stat_paths = [call.args[0] for call in spy_stat.call_args_list if tmp_path in call.args[0].parents]
+        assert stat_paths == [tmp_path / "train" / "masks" / "0.png"]
+
+        # The listing of the media files is hashed
+        (tmp_path / "train" / "1" / "1.jpg").write_bytes(b"1")
+        assert compute_dataset_hash(tmp_path, "imagenet_with_subset_dirs") != key
+        key = compute_dataset_hash(tmp_path, "imagenet_with_subset_dirs")
+        (tmp_path / "train" / "1" / "1.jpg").write_bytes(b"11")
+        assert compute_dataset_hash(tmp_path, "imagenet_with_subset_dirs") == key
+
+        # The mask images are hashed as the annotation files
+        (tmp_path / "train" / "masks" / "0.png").write_bytes(b"00")
+        assert compute_dataset_hash(tmp_path, "imagenet_with_subset_dirs") != key
+
+    def test_get_dataset_cache_dir(self, tmp_path, monkeypatch) -> None:
+        data_root = tmp_path / "dataset"
+        cache_dir = get_dataset_cache_dir(data_root, tmp_path / "cache")
+        assert cache_dir.parent == tmp_path / "cache"
+        assert cache_dir.name.startswith("dataset-")
+        assert get_dataset_cache_dir(tmp_path / "other" / "dataset", tmp_path / "cache") != cache_dir
+
+        # The caches are never stored in the data root by default
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        assert get_dataset_cache_dir(data_root).parent == tmp_path / "xdg" / "otx" / "datasets"
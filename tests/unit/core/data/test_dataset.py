@@ -4,6 +4,7 @@
 from unittest.mock import MagicMock
 
 import pytest
+from otx.core.data.entity.base import OTXDataEntity
 
 
 class TestDataset:
@@ -71,3 +72,123 @@ class TestDataset:
 
         assert item.image.shape[:2] == (h_expected, w_expected)
         assert item.img_info.img_shape == (h_expected, w_expected)
+
+    @pytest.mark.parametrize("num_deterministic_transforms", [1, 2])
+    def test_cache_deterministic_transforms(
+        self,
+        mocker,
+        num_deterministic_transforms,
+        fxt_mem_cache_handler,
+        fxt_dataset_and_data_entity_cls,
+        fxt_mock_dm_subset: MagicMock,
+        fxt_dm_item,
+    ) -> None:
+        dataset_cls, data_entity_cls = fxt_dataset_and_data_entity_cls
+        fxt_mock_dm_subset.__iter__.side_effect = lambda: iter([fxt_dm_item])
+        deterministic = MagicMock(side_effect=lambda x: x)
+        random = MagicMock(side_effect=lambda x: x)
+        dataset = dataset_cls(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=[deterministic] * num_deterministic_transforms + [random],
+            mem_cache_handler=fxt_mem_cache_handler,
+            num_deterministic_transforms=num_deterministic_transforms,
+        )
+
+        item = dataset[0]  # Put the outputs of the deterministic transforms in the cache
+        spy_get_item_impl = mocker.spy(dataset, "_get_item_impl")
+        cached_item = dataset[0]  # Take them from the cache
+
+        assert isinstance(cached_item, data_entity_cls)
+        assert deterministic.call_count == num_deterministic_transforms
+        assert random.call_count == 2
+        assert (cached_item.image == item.image).all()
+        # Neither the item nor its image is loaded on a hit
+        spy_get_item_impl.assert_not_called()
+        assert fxt_mock_dm_subset.get.call_count == 1
+
+        # Another dataset of the same subset and transforms, e.g., in another rank, takes the cached outputs
+        same_dataset = dataset_cls(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=[deterministic] * num_deterministic_transforms + [random],
+            mem_cache_handler=fxt_mem_cache_handler,
+            num_deterministic_transforms=num_deterministic_transforms,
+        )
+        same_dataset[0]
+        assert deterministic.call_count == num_deterministic_transforms
+
+        # Another dataset with different deterministic transforms does not take them
+        dataset = dataset_cls(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=[MagicMock(side_effect=lambda x: x), random],
+            mem_cache_handler=fxt_mem_cache_handler,
+            num_deterministic_transforms=1,
+        )
+        dataset[0]
+        dataset.transforms[0].assert_called_once()
+        assert deterministic.call_count == num_deterministic_transforms
+
+    def test_cache_transforms_by_index(
+        self,
+        mocker,
+        fxt_mem_cache_handler,
+        fxt_dataset_and_data_entity_cls,
+        fxt_mock_dm_subset: MagicMock,
+        fxt_dm_item,
+    ) -> None:
+        dataset_cls, _ = fxt_dataset_and_data_entity_cls
+        fxt_mock_dm_subset.__iter__.side_effect = lambda: iter([fxt_dm_item])
+
+        def set_img_idx(x: OTXDataEntity) -> OTXDataEntity:
+            x.img_info.img_idx = 7
+            return x
+
+        deterministic = MagicMock(side_effect=set_img_idx)
+        dataset = dataset_cls(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=[deterministic, lambda x: x],
+            mem_cache_handler=fxt_mem_cache_handler,
+            num_deterministic_transforms=1,
+        )
+
+        # The outputs are cached under the fetched index even if the image index of the item is different
+        dataset[0]
+        spy_get_item_impl = mocker.spy(dataset, "_get_item_impl")
+        dataset[0]
+        spy_get_item_impl.assert_not_called()
+        deterministic.assert_called_once()
+
+    def test_random_item_construction(
+        self,
+        fxt_mem_cache_handler,
+        fxt_dataset_and_data_entity_cls,
+        fxt_mock_dm_subset: MagicMock,
+        fxt_dm_item,
+    ) -> None:
+        dataset_cls, _ = fxt_dataset_and_data_entity_cls
+        fxt_mock_dm_subset.__iter__.side_effect = lambda: iter([fxt_dm_item])
+        random_dataset_cls = type("RandomDataset", (dataset_cls,), {"has_random_item_construction": True})
+        deterministic = MagicMock(side_effect=lambda x: x)
+        dataset = random_dataset_cls(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=[deterministic, lambda x: x],
+            mem_cache_handler=fxt_mem_cache_handler,
+            num_deterministic_transforms=1,
+        )
+        assert dataset.num_deterministic_transforms == 0
+
+        # The outputs are not cached, since they depend on the random choices of the item construction
+        dataset[0]
+        dataset[0]
+        assert deterministic.call_count == 2
+
+    def test_prefetch(
+        self,
+        fxt_dataset_and_data_entity_cls,
+        fxt_mock_dm_subset: MagicMock,
+    ) -> None:
+        dataset_cls, _ = fxt_dataset_and_data_entity_cls
+        dataset = dataset_cls(dm_subset=fxt_mock_dm_subset, transforms=lambda x: x)
+        dataset.prefetcher = MagicMock()
+
+        dataset[0]
+        dataset.prefetcher.on_fetch.assert_called_once_with(0, dataset._prefetch_img)
@@ -0,0 +1,90 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from otx.core.data.disk_cache import DiskCacheHandler
+from otx.core.data.mem_cache import MemCacheHandlerSingleton
+
+
+@pytest.fixture()
+def fxt_img_file(tmp_path) -> Path:
+    img_file = tmp_path / "images" / "img.jpg"
+    img_file.parent.mkdir()
+    img_file.write_bytes(b"fake-jpeg")
+    return img_file
+
+
+@pytest.fixture()
+def fxt_img_data() -> np.ndarray:
+    return np.random.default_rng(3003).integers(0, 256, size=(16, 24, 3), dtype=np.uint8)
+
+
+class TestDiskCacheHandler:
+    def test_put_and_get(self, tmp_path, fxt_img_file, fxt_img_data) -> None:
+        handler = DiskCacheHandler(tmp_path / "cache")
+
+        assert handler.get(str(fxt_img_file)) is None
+        assert handler.put(str(fxt_img_file), fxt_img_data)
+        # Already stored
+        assert not handler.put(str(fxt_img_file), fxt_img_data)
+
+        cached = handler.get(str(fxt_img_file))
+        assert isinstance(cached, np.memmap)
+        assert not cached.flags.writeable
+        assert np.array_equal(cached, fxt_img_data)
+
+        # Another process or run can open it with the same cache directory
+        assert np.array_equal(DiskCacheHandler(tmp_path / "cache").get(str(fxt_img_file)), fxt_img_data)
+
+    def test_invalidate(self, tmp_path, fxt_img_file, fxt_img_data) -> None:
+        handler = DiskCacheHandler(tmp_path / "cache")
+        handler.put(str(fxt_img_file), fxt_img_data)
+
+        # The cached image for the different variant is not shared
+        assert DiskCacheHandler(tmp_path / "cache", variant="BGR").get(str(fxt_img_file)) is None
+
+        # The cached image is invalidated if the image file is modified
+        stat = fxt_img_file.stat()
+        os.utime(fxt_img_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        assert handler.get(str(fxt_img_file)) is None
+
+    def test_non_existing_file(self, tmp_path, fxt_img_data) -> None:
+        handler = DiskCacheHandler(tmp_path / "cache")
+
+        assert not handler.put(str(tmp_path / "non_existing.jpg"), fxt_img_data)
+        assert handler.get(str(tmp_path / "non_existing.jpg")) is None
+
+    def test_min_free_space(self, tmp_path, fxt_img_file, fxt_img_data) -> None:
+        handler = DiskCacheHandler(tmp_path / "cache", min_free_space=2**62)
+
+        assert not handler.put(str(fxt_img_file), fxt_img_data)
+        assert not list((tmp_path / "cache").rglob("*.npy"))
+
+    @pytest.mark.parametrize("mem_size", [0, 1024**2])
+    def test_behind_mem_cache_handler(self, mem_size, tmp_path, fxt_img_file, fxt_img_data, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        key = str(fxt_img_file)
+
+        handler = MemCacheHandlerSingleton.create(
+            "singleprocessing",
+            mem_size,
+            disk_cache=DiskCacheHandler(tmp_path / "cache"),
+        )
+        handler.put(key, fxt_img_data)
+
+        # New run with the empty memory pool
+        handler = MemCacheHandlerSingleton.create(
+            "singleprocessing",
+            mem_size,
+            disk_cache=DiskCacheHandler(tmp_path / "cache"),
+        )
+        data, _ = handler.get(key)
+        assert data.flags.writeable
+        assert np.array_equal(data, fxt_img_data)
+        # It is also stored in the memory pool
+        assert len(handler) == (1 if mem_size > 0 else 0)
@@ -37,6 +37,24 @@ class TestTransformLibFactory:
         _ = TransformLibFactory.generate(config)
         mock_generate.assert_called_once_with(config)
 
+    @pytest.mark.parametrize(
+        ("lib_type", "lib"),
+        [
+            (TransformLibType.TORCHVISION, TorchVisionTransformLib),
+            (TransformLibType.MMCV, MMCVTransformLib),
+            (TransformLibType.MMPRETRAIN, MMPretrainTransformLib),
+            (TransformLibType.MMDET, MMDetTransformLib),
+            (TransformLibType.MMSEG, MMSegTransformLib),
+        ],
+    )
+    def test_count_deterministic_prefix(self, lib_type, lib, mocker) -> None:
+        mock_count = mocker.patch.object(lib, "count_deterministic_prefix", return_value=1)
+        config = mocker.MagicMock(spec=SubsetConfig)
+        config.transform_lib_type = lib_type
+        transforms = mocker.MagicMock()
+        assert TransformLibFactory.count_deterministic_prefix(config, transforms) == 1
+        mock_count.assert_called_once_with(transforms)
+
 
 class TestOTXDatasetFactory:
     @pytest.mark.parametrize(
@@ -51,6 +69,7 @@ class TestOTXDatasetFactory:
     )
     def test_create(self, fxt_mock_dm_subset, fxt_mem_cache_handler, task_type, dataset_cls, mocker) -> None:
         mocker.patch.object(TransformLibFactory, "generate", return_value=None)
+        mocker.patch.object(TransformLibFactory, "count_deterministic_prefix", return_value=0)
         cfg_subset = mocker.MagicMock(spec=SubsetConfig)
         cfg_data_module = mocker.MagicMock(spec=DataModuleConfig)
         cfg_data_module.tile_config = mocker.MagicMock(spec=TileConfig)
@@ -0,0 +1,146 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from datumaro.components.media import Image, Video
+from otx.core.data.media_meta import MediaMetaCache, probe_image_size
+from PIL import Image as PILImage
+
+VIDEO_PATH = Path(__file__).parents[3] / "assets" / "action_classification_dataset" / "train" / "1.mp4"
+
+
+@pytest.fixture()
+def fxt_img_file(tmp_path) -> Path:
+    img_file = tmp_path / "img.png"
+    cv2.imwrite(str(img_file), np.zeros((13, 21, 3), dtype=np.uint8))
+    return img_file
+
+
+@pytest.mark.parametrize(
+    ("ext", "kwargs"),
+    [
+        (".png", {}),
+        (".jpg", {}),
+        (".jpg", {"progressive": True}),
+        (".jpg", {"exif": PILImage.Exif()}),
+        (".tif", {}),
+        (".tif", {"compression": "tiff_lzw"}),
+        (".bmp", {}),
+    ],
+)
+@pytest.mark.parametrize("mode", ["RGB", "L"])
+def test_probe_image_size(tmp_path, ext, kwargs, mode) -> None:
+    path = tmp_path / f"img{ext}"
+    image = PILImage.fromarray(np.zeros((13, 21, 3), dtype=np.uint8)).convert(mode)
+    if "exif" in kwargs:
+        # The EXIF orientation is not applied as the image is decoded by Datumaro
+        kwargs["exif"][0x0112] = 6
+    image.save(path, **kwargs)
+
+    assert probe_image_size(path) == (13, 21)
+    assert probe_image_size(path) == Image.from_file(str(path)).size
+
+
+def test_probe_image_size_big_endian_tiff(tmp_path) -> None:
+    path = tmp_path / "img.tif"
+    cv2.imwrite(str(path), np.zeros((300, 233, 3), dtype=np.uint8))
+    # Swap the byte order of the header, the IFD and the entries of the width and height
+    data = bytearray(path.read_bytes())
+    assert data[:2] == b"II"
+    ifd_offset = int.from_bytes(data[4:8], "little")
+    num_entries = int.from_bytes(data[ifd_offset : ifd_offset + 2], "little")
+    data[:8] = b"MM\x00*" + ifd_offset.to_bytes(4, "big")
+    data[ifd_offset : ifd_offset + 2] = num_entries.to_bytes(2, "big")
+    for i in range(num_entries):
+        entry = ifd_offset + 2 + 12 * i
+        tag, value_type = (int.from_bytes(data[entry + j : entry + j + 2], "little") for j in (0, 2))
+        value_size = 2 if value_type == 3 else 4
+        value = int.from_bytes(data[entry + 8 : entry + 8 + value_size], "little")
+        data[entry : entry + 8] = tag.to_bytes(2, "big") + value_type.to_bytes(2, "big") + b"\x00\x00\x00\x01"
+        data[entry + 8 : entry + 12] = value.to_bytes(value_size, "big").ljust(4, b"\x00")
+    path.write_bytes(bytes(data))
+
+    assert probe_image_size(path) == (300, 233)
+
+
+def test_probe_image_size_unsupported(tmp_path) -> None:
+    path = tmp_path / "img.jpg"
+    path.write_bytes(b"fake-jpeg")
+    assert probe_image_size(path) is None
+    path.write_bytes(b"\xff\xd8\xff")
+    assert probe_image_size(path) is None
+    assert probe_image_size(tmp_path / "missing.png") is None
+
+
+class TestMediaMetaCache:
+    def test_get_image_size(self, tmp_path, fxt_img_file, mocker) -> None:
+        cache_path = tmp_path / "cache" / "media_meta.jsonl"
+        cache = MediaMetaCache(cache_path)
+        spy_get = mocker.spy(cache, "_get")
+
+        image = Image.from_file(str(fxt_img_file))
+        assert cache.get_image_size(image) == (13, 21)
+        # The image is not decoded
+        assert not image.has_size
+        assert cache.get_image_size(image) == (13, 21)
+        assert len(cache) == 1
+        # The size of the decoded image is used as it is
+        assert cache.get_image_size(Image.from_numpy(np.zeros((4, 5, 3), dtype=np.uint8))) == (4, 5)
+        assert spy_get.call_count == 2
+
+        # The next run loads the metadata
+        mock_probe = mocker.patch("otx.core.data.media_meta.probe_image_size")
+        cache.close()
+        assert MediaMetaCache(cache_path).get_image_size(image) == (13, 21)
+        mock_probe.assert_not_called()
+
+        # It is invalidated if the file is modified
+        stat = fxt_img_file.stat()
+        os.utime(fxt_img_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        mock_probe.return_value = (1, 2)
+        assert MediaMetaCache(cache_path).get_image_size(image) == (1, 2)
+        mock_probe.assert_called_once()
+
+    def test_broken_file(self, tmp_path, fxt_img_file) -> None:
+        cache_path = tmp_path / "media_meta.jsonl"
+        cache = MediaMetaCache(cache_path)
+        cache.get_image_size(Image.from_file(str(fxt_img_file)))
+        cache.close()
+        # A partial line written by a killed process is skipped
+        with cache_path.open("a") as fp:
+            fp.write('{"key": ["image_size", ')
+
+        cache = MediaMetaCache(cache_path)
+        assert len(cache) == 1
+        assert cache.get_image_size(Image.from_file(str(tmp_path / "missing.png"))) is None
+
+    @pytest.mark.usefixtures("fxt_clear_media_manager")
+    def test_get_num_frames(self, tmp_path, mocker) -> None:
+        cache = MediaMetaCache(tmp_path / "media_meta.jsonl")
+        num_frames = sum(1 for _ in Video(str(VIDEO_PATH)))
+
+        assert cache.get_num_frames(Video(str(VIDEO_PATH))) == num_frames
+        assert cache.get_num_frames(Video(str(VIDEO_PATH), step=2)) == (num_frames + 1) // 2
+        cache.close()
+
+        spy_iter = mocker.spy(Video, "__iter__")
+        cache = MediaMetaCache(tmp_path / "media_meta.jsonl")
+        assert cache.get_num_frames(Video(str(VIDEO_PATH))) == num_frames
+        assert cache.get_num_frames(Video(str(VIDEO_PATH), step=2)) == (num_frames + 1) // 2
+        spy_iter.assert_not_called()
+
+    def test_current(self, tmp_path) -> None:
+        default_cache = MediaMetaCache.current()
+        assert default_cache.path is None
+        assert MediaMetaCache.current() is default_cache
+
+        cache = MediaMetaCache(tmp_path / "media_meta.jsonl")
+        MediaMetaCache.set_current(cache)
+        assert MediaMetaCache.current() is cache
+        MediaMetaCache.set_current(None)
@@ -3,16 +3,33 @@
 #
 from __future__ import annotations
 
+import multiprocessing as mp
+import os
+import pickle
 import string
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
 import numpy as np
 import psutil
 import pytest
 from otx.core.data.mem_cache import (
+    MemCacheHandlerBase,
+    MemCacheHandlerError,
+    MemCacheHandlerForMP,
     MemCacheHandlerSingleton,
+    SharedMemoryIndex,
+    _BlockAllocator,
+    _hash_key,
+    _hash_key_with_check,
     parse_mem_cache_size_to_int,
 )
 
+if TYPE_CHECKING:
+    from multiprocessing.managers import SyncManager
+
 
 @pytest.fixture()
 def fxt_data_list() -> list:
@@ -100,6 +117,521 @@ class TestMemCacheHandler:
         # Unfully (half) cached
         assert len(handler) == len(fxt_data_list) // 2
 
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_too_large_meta(self, mode, fxt_data_list, monkeypatch) -> None:
+        mem_size = get_data_list_size(fxt_data_list)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create(mode, mem_size)
+
+        # The item whose metadata cannot be stored in the index is rejected without freezing the pool
+        key, data, _ = fxt_data_list[0]
+        assert handler.put(key, data, {"key": "x" * 1024}) is None
+        assert not handler.frozen
+
+        for key, data, meta in fxt_data_list[1:]:
+            assert handler.put(key, data, meta) > 0
+        assert handler.get(fxt_data_list[0][0])[0] is None
+        assert len(handler) == len(fxt_data_list) - 1
+
+
+class TestMemCacheEviction:
+    @pytest.fixture()
+    def fxt_create_handler(self, monkeypatch) -> Callable[[str, str, int], MemCacheHandlerBase]:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+
+        def _create(mode: str, eviction_policy: str, num_blocks: int) -> MemCacheHandlerBase:
+            return MemCacheHandlerSingleton.create(mode, num_blocks * _BlockAllocator.GRANULE, eviction_policy)
+
+        return _create
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    @pytest.mark.parametrize("eviction_policy", ["lru", "clock", "frequency"])
+    def test_evict(self, mode, eviction_policy, fxt_data_list, fxt_create_handler) -> None:
+        num_cached = len(fxt_data_list) // 2
+        handler = fxt_create_handler(mode, eviction_policy, num_cached)
+
+        for key, data, meta in fxt_data_list:
+            handler.get(key)
+            handler.put(key, data, meta)
+
+        assert not handler.frozen
+        assert len(handler) == num_cached
+
+        num_hits = 0
+        for key, data, meta in fxt_data_list:
+            get_data, get_meta = handler.get(key)
+            if get_data is not None:
+                assert np.array_equal(get_data, data)
+                assert get_meta == meta
+                num_hits += 1
+
+        assert num_hits == num_cached
+
+    def test_lru(self, fxt_data_list, fxt_create_handler) -> None:
+        handler = fxt_create_handler("singleprocessing", "lru", 5)
+        keys = [key for key, _, _ in fxt_data_list]
+
+        for key, data, meta in fxt_data_list[:5]:
+            handler.put(key, data, meta)
+
+        handler.get(keys[0])
+        handler.put(*fxt_data_list[5])
+
+        assert handler.get(keys[0])[0] is not None
+        assert handler.get(keys[1])[0] is None
+        assert handler.get(keys[5])[0] is not None
+
+    def test_clock(self, fxt_data_list, fxt_create_handler) -> None:
+        handler = fxt_create_handler("singleprocessing", "clock", 5)
+        keys = [key for key, _, _ in fxt_data_list]
+
+        for key, data, meta in fxt_data_list[:5]:
+            handler.put(key, data, meta)
+
+        # All items are referenced, so that the clock hand sweeps all of them and evicts the first one.
+        handler.put(*fxt_data_list[5])
+        assert handler.get(keys[0])[0] is None
+
+        # Give a second chance to keys[1]
+        handler.get(keys[1])
+        handler.put(*fxt_data_list[6])
+        assert handler.get(keys[1])[0] is not None
+        assert handler.get(keys[2])[0] is None
+
+    def test_frequency(self, fxt_data_list, fxt_create_handler) -> None:
+        handler = fxt_create_handler("singleprocessing", "frequency", 5)
+        keys = [key for key, _, _ in fxt_data_list]
+
+        for key, data, meta in fxt_data_list[:5]:
+            handler.get(key)
+            handler.put(key, data, meta)
+        for _ in range(3):
+            for key in keys[:5]:
+                handler.get(key)
+
+        # The new item requested only once is not admitted.
+        handler.get(keys[5])
+        assert handler.put(*fxt_data_list[5]) is None
+        assert all(handler.get(key)[0] is not None for key in keys[:5])
+
+        # The new item becomes requested more frequently than the cached items.
+        for _ in range(10):
+            handler.get(keys[5])
+        assert handler.put(*fxt_data_list[5]) is not None
+        assert handler.get(keys[5])[0] is not None
+        assert len(handler) == 5
+
+    def test_reuse_evicted_block(self, fxt_create_handler) -> None:
+        handler = fxt_create_handler("singleprocessing", "lru", 8)
+        large = np.ones(8 * _BlockAllocator.GRANULE, dtype=np.uint8)
+        small = np.zeros(_BlockAllocator.GRANULE, dtype=np.uint8)
+
+        assert handler.put("large", large) is not None
+
+        # The large item is evicted and its block is split to the small items
+        for i in range(8):
+            assert handler.put(f"small_{i}", small + i) is not None
+
+        assert handler.get("large")[0] is None
+        assert len(handler) == 8
+        assert handler._cur_page.value == handler.mem_size
+        for i in range(8):
+            assert np.array_equal(handler.get(f"small_{i}")[0], small + i)
+
+        # The item larger than the memory pool cannot be cached
+        assert handler.put("too_large", np.ones(9 * _BlockAllocator.GRANULE, dtype=np.uint8)) is None
+
+    def test_unknown_policy(self) -> None:
+        with pytest.raises(MemCacheHandlerError):
+            MemCacheHandlerBase(mem_size=1024, eviction_policy="unknown")
+
+
+class TestMemCacheCodec:
+    @pytest.fixture()
+    def fxt_image_list(self) -> list[tuple[str, np.ndarray]]:
+        # Smooth images are compressible
+        grad = np.linspace(0, 255, 64, dtype=np.uint8)
+        return [(f"image_{i}", np.stack([np.add.outer(grad, grad) // 2 + i] * 3, axis=-1)) for i in range(4)]
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    @pytest.mark.parametrize("eviction_policy", ["freeze", "lru"])
+    @pytest.mark.parametrize("codec", ["lz4", "zstd"])
+    def test_lossless(self, mode, eviction_policy, codec, fxt_image_list, monkeypatch) -> None:
+        pytest.importorskip({"lz4": "lz4", "zstd": "zstandard"}[codec])
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        mem_size = sum(image.nbytes for _, image in fxt_image_list) // 2
+        handler = MemCacheHandlerSingleton.create(mode, mem_size, eviction_policy, codec=codec)
+
+        # Every image can be cached even though the memory pool is a half of the total size
+        for key, image in fxt_image_list:
+            assert handler.put(key, image, {"key": key}) is not None
+
+        for key, image in fxt_image_list:
+            get_data, get_meta = handler.get(key)
+            assert np.array_equal(get_data, image)
+            assert get_data.flags.writeable
+            assert get_meta == {"key": key}
+
+        stats = handler.codec_stats
+        assert stats["compression_ratio"] > 2.0
+        assert stats["decode_ms"] > 0.0
+        assert codec in repr(handler)
+
+    def test_lossy(self, fxt_image_list, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create("singleprocessing", 1024 * 1024, codec="jpeg", codec_quality=90)
+
+        key, image = fxt_image_list[0]
+        handler.put(key, image)
+        get_data, _ = handler.get(key)
+        assert get_data.shape == image.shape
+        assert np.abs(get_data.astype(np.int32) - image).mean() < 2.0
+
+        # Non-image data is stored without the lossy codec
+        data = np.arange(1000, dtype=np.float32)
+        handler.put("non_image", data)
+        assert np.array_equal(handler.get("non_image")[0], data)
+        assert handler.codec_stats["compression_ratio"] > 1.0
+
+        # Label maps are stored without the lossy codec even if they are uint8 images
+        label_map = np.random.default_rng(0).integers(0, 5, size=(32, 32), dtype=np.uint8)
+        handler.put("label_map", label_map, kind="label_map")
+        assert np.array_equal(handler.get("label_map", kind="label_map")[0], label_map)
+
+    def test_load_time(self) -> None:
+        handler = MemCacheHandlerBase(mem_size=1024, codec="jpeg")
+        handler.record_load_time(0.01)
+        handler.record_load_time(0.03)
+        assert handler.codec_stats["load_ms"] == pytest.approx(20.0)
+
+    def test_unknown_codec(self) -> None:
+        with pytest.raises(MemCacheHandlerError):
+            MemCacheHandlerBase(mem_size=1024, codec="unknown")
+
+
+def _get_many_times(handler: MemCacheHandlerBase, keys: list[str], num_iters: int) -> None:
+    for _ in range(num_iters):
+        for key in keys:
+            handler.get(key)
+
+
+class TestMemCacheStats:
+    def test_stats(self, fxt_data_list, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        mem_size = get_data_list_size(fxt_data_list[:5])
+        handler = MemCacheHandlerSingleton.create("singleprocessing", mem_size)
+
+        for key, data, meta in fxt_data_list:
+            handler.get(key)
+            handler.put(key, data, meta)
+        for key, _, _ in fxt_data_list:
+            handler.get(key)
+
+        stats = handler.stats
+        assert stats["hits"] == 5
+        assert stats["misses"] == 15
+        assert stats["hit_bytes"] == mem_size
+        assert stats["inserts"] == 5
+        assert stats["rejects"] == 5
+        assert stats["frozen"] == 1.0
+
+    def test_stats_by_kind(self, fxt_data_list, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create("singleprocessing", get_data_list_size(fxt_data_list))
+        (key, data, meta), (other_key, other_data, _) = fxt_data_list[:2]
+
+        handler.get(key)
+        handler.put(key, data, meta)
+        handler.get(key)
+        handler.get(other_key, kind="label_map")
+        handler.put(other_key, other_data, kind="label_map")
+
+        stats = handler.stats_by_kind
+        assert stats["image"]["hits"] == stats["image"]["misses"] == stats["image"]["inserts"] == 1
+        assert stats["label_map"]["hits"] == 0
+        assert stats["label_map"]["misses"] == stats["label_map"]["inserts"] == 1
+        assert stats["prefetch"]["misses"] == 0
+        # The totals are aggregated over the kinds
+        assert handler.stats["misses"] == 2
+
+        with pytest.raises(MemCacheHandlerError, match="unknown entry kind"):
+            handler.get(key, kind="unknown")
+
+    def test_aggregate_over_processes(self, fxt_data_list, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create("multiprocessing", get_data_list_size(fxt_data_list))
+        keys = [key for key, _, _ in fxt_data_list]
+        for key, data, meta in fxt_data_list:
+            handler.put(key, data, meta)
+
+        ctx = mp.get_context("fork")
+        num_workers, num_iters = 4, 100
+        procs = [ctx.Process(target=_get_many_times, args=(handler, keys, num_iters)) for _ in range(num_workers)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+
+        assert handler.stats["hits"] == num_workers * num_iters * len(keys)
+
+
+@pytest.mark.skipif(not MemCacheHandlerForMP.NODE_SHARING, reason="Named shared memory pool is not supported.")
+class TestMemCacheNodeSharing:
+    def test_attach_by_name(self, fxt_data_list) -> None:
+        mem_size = len(fxt_data_list) * _BlockAllocator.GRANULE
+        handler = MemCacheHandlerForMP(mem_size, "lru", name=f"otx_mem_cache_test_{uuid.uuid4().hex[:8]}")
+        # Unpickled handler attaches to the same pool, e.g., in the spawned process
+        attached = pickle.loads(pickle.dumps(handler))  # noqa: S301
+        assert attached.name == handler.name
+
+        for key, data, meta in fxt_data_list:
+            attached.put(key, data, meta)
+        for key, data, meta in fxt_data_list:
+            cached_data, cached_meta = handler.get(key)
+            assert np.array_equal(cached_data, data)
+            assert cached_meta == meta
+        assert handler.stats["inserts"] == len(fxt_data_list)
+
+        with pytest.raises(MemCacheHandlerError):
+            MemCacheHandlerForMP(mem_size // 2, "lru", name=handler.name, attach=True, attach_timeout=0)
+
+        handler.shutdown()
+        with pytest.raises(MemCacheHandlerError):
+            MemCacheHandlerForMP(mem_size, "lru", name=handler.name, attach=True, attach_timeout=0)
+
+    @pytest.fixture()
+    def fxt_node_env(self, monkeypatch) -> None:
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        monkeypatch.delenv(MemCacheHandlerSingleton.NODE_SHM_NAME_ENV, raising=False)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_num_node_pools", 0)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_exported_prefix", None)
+        monkeypatch.setenv("LOCAL_RANK", "0")
+        monkeypatch.setenv("WORLD_SIZE", "2")
+        yield
+        MemCacheHandlerSingleton.delete()
+
+    def test_local_ranks(self, fxt_data_list, fxt_node_env, monkeypatch) -> None:
+        mem_size = get_data_list_size(fxt_data_list)
+
+        handler = MemCacheHandlerSingleton.create("multiprocessing", mem_size)
+        for key, data, meta in fxt_data_list:
+            handler.put(key, data, meta)
+
+        # The other local rank launched by the local rank 0 inherits the name and the whole pool
+        monkeypatch.setenv("LOCAL_RANK", "1")
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_num_node_pools", 0)
+        attached = MemCacheHandlerSingleton.create("multiprocessing", mem_size)
+        assert attached.name == handler.name
+        assert attached.mem_size == mem_size
+        assert len(attached) == len(fxt_data_list)
+
+        status_paths = list(MemCacheHandlerSingleton._status_paths)
+        assert len(status_paths) == 1
+        MemCacheHandlerSingleton.delete()
+        # The exported name and the published status are removed at shutdown
+        assert MemCacheHandlerSingleton.NODE_SHM_NAME_ENV not in os.environ
+        assert not any(Path(path).exists() for path in status_paths)
+
+    @pytest.mark.parametrize("no_pool", ["no_memory", "no_shm_space"])
+    def test_local_rank_without_pool(self, no_pool, fxt_node_env, monkeypatch) -> None:
+        if no_pool == "no_memory":
+            monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: False)
+        else:
+            monkeypatch.setattr("otx.core.data.mem_cache._has_shm_space", lambda _: False)
+        handler = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+        assert getattr(handler, "name", None) is None
+
+        # The other local rank does not wait for the pool which the local rank 0 did not create
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "ATTACH_TIMEOUT", 60.0)
+        monkeypatch.setenv("LOCAL_RANK", "1")
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_num_node_pools", 0)
+        start = time.monotonic()
+        other = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+        assert time.monotonic() - start < 10.0
+        assert other.name is None
+
+    def test_single_process(self, fxt_node_env, monkeypatch) -> None:
+        monkeypatch.setenv("WORLD_SIZE", "1")
+        handler = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+
+        # The pool is not located in a named shared memory nor exported if there is no other rank
+        assert handler.name is None
+        assert handler.mem_size == 1024 * 1024
+        assert MemCacheHandlerSingleton.NODE_SHM_NAME_ENV not in os.environ
+
+    def test_ignore_inherited_name(self, fxt_node_env, monkeypatch) -> None:
+        parent = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+        inherited_prefix = os.environ[MemCacheHandlerSingleton.NODE_SHM_NAME_ENV]
+
+        # A child process of the local rank 0, e.g., a HPO trial, is the local rank 0 of its own
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_num_node_pools", 0)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_exported_prefix", None)
+        child = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+        assert child.name != parent.name
+        assert not child.name.startswith(inherited_prefix)
+
+    def test_name_exists(self, fxt_node_env, monkeypatch) -> None:
+        existing = MemCacheHandlerForMP(1024 * 1024, name=f"otx_mem_cache_test_{uuid.uuid4().hex[:8]}")
+        monkeypatch.setattr(MemCacheHandlerSingleton, "_get_node_shm_name", lambda *_: existing.name)
+
+        handler = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+        assert handler.name not in (None, existing.name)
+
+        # The other local rank attaches to the pool with the new name
+        monkeypatch.setenv("LOCAL_RANK", "1")
+        attached = MemCacheHandlerSingleton.create("multiprocessing", 1024 * 1024)
+        assert attached.name == handler.name
+        existing.shutdown()
+
+
+def _insert_key(index: SharedMemoryIndex, key: Any, value: Any) -> int:  # noqa: ANN401
+    key_hash, key_check = _hash_key_with_check(key)
+    return index.insert(key_hash, value, key_check)
+
+
+class TestSharedMemoryIndex:
+    def test_insert_and_lookup(self) -> None:
+        index = SharedMemoryIndex(capacity=16, value_bytes=64)
+
+        for i in range(16):
+            _insert_key(index, f"key_{i}", (i, {"meta": i}))
+
+        assert len(index) == 16
+        assert index.full
+        for i in range(16):
+            assert index.get(f"key_{i}") == (i, {"meta": i})
+        assert index.get("unknown") is None
+
+        # Overwrite an existing key is possible even if it is full
+        _insert_key(index, "key_0", (100, None))
+        assert index.get("key_0") == (100, None)
+        assert len(index) == 16
+
+        with pytest.raises(MemCacheHandlerError):
+            index.insert(_hash_key("key_16"), (16, None))
+
+        with pytest.raises(MemCacheHandlerError):
+            index.insert(_hash_key("key_1"), "x" * 128)
+
+    def test_key_check(self) -> None:
+        index = SharedMemoryIndex(capacity=4, value_bytes=64)
+
+        # The keys of different types are not confused even if their repr() are the same
+        assert _hash_key_with_check(1) != _hash_key_with_check("1")
+        key_hash, key_check = _hash_key_with_check(1)
+        index.insert(key_hash, 1, key_check=key_check)
+        assert index.get(1) == 1
+        assert index.get("1") is None
+
+        # Another key colliding with the key hash is neither found nor overwrites it
+        key_hash, key_check = _hash_key_with_check("key")
+        index.insert(key_hash, "value", key_check=key_check)
+        assert index.lookup(key_hash, key_check + 1) is None
+        with pytest.raises(MemCacheHandlerError):
+            index.insert(key_hash, "other", key_check=key_check + 1)
+        assert index.get("key") == "value"
+
+    def test_remove(self) -> None:
+        index = SharedMemoryIndex(capacity=4, value_bytes=64)
+
+        # Repeat insertion and removal more than the number of slots to trigger the rehash
+        for i in range(32):
+            entry = index.insert(_hash_key(f"key_{i}"), i)
+            found = index.lookup(_hash_key(f"key_{i}"))
+            assert found is not None
+            _, version, value = found
+            assert value == i
+
+            assert index.remove(_hash_key(f"key_{i}")) == entry
+            assert index.get(f"key_{i}") is None
+            assert not index.validate(entry, version)
+            assert len(index) == 0
+
+        assert index.remove(_hash_key("unknown")) == -1
+
+    def test_shared_with_forked_process(self) -> None:
+        index = SharedMemoryIndex(capacity=16)
+        ctx = mp.get_context("fork")
+
+        def _insert(index: SharedMemoryIndex) -> None:
+            _insert_key(index, "from_child", (1, 2, 3))
+
+        proc = ctx.Process(target=_insert, args=(index,))
+        proc.start()
+        proc.join()
+
+        assert index.get("from_child") == (1, 2, 3)
+
+
+class _DictProxyIndex:
+    """The previous index which lives in the manager process."""
+
+    def __init__(self, manager: SyncManager) -> None:
+        self._dict = manager.dict()
+
+    def __len__(self) -> int:
+        return len(self._dict)
+
+    def lookup(self, key_hash: int, key_check: int = 0) -> tuple[int, int, Any] | None:
+        value = self._dict.get((key_hash, key_check), None)
+        return None if value is None else (0, 0, value)
+
+    def insert(self, key_hash: int, value: Any, key_check: int = 0) -> int:  # noqa: ANN401
+        self._dict[(key_hash, key_check)] = value
+        return 0
+
+
+class _DictProxyMemCacheHandler(MemCacheHandlerForMP):
+    """The previous multiprocessing handler whose index lives in the manager process."""
+
+    def _init_data_structs(self, mem_size: int) -> None:
+        super()._init_data_structs(mem_size)
+        self._manager = mp.Manager()
+        self._cache_addr = _DictProxyIndex(self._manager)
+
+    def shutdown(self) -> None:
+        self._manager.shutdown()
+        super().shutdown()
+
+
+def _measure_hit_latency(handler: MemCacheHandlerForMP, keys: list[str], num_iters: int, queue: mp.Queue) -> None:
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        for key in keys:
+            handler.get(key)
+    queue.put((time.perf_counter() - start) / (num_iters * len(keys)))
+
+
+@pytest.mark.benchmark()
+class TestMemCacheHandlerBenchmark:
+    @pytest.mark.parametrize("num_workers", [1, 4, 8])
+    def test_hit_latency(self, num_workers, fxt_data_list) -> None:
+        ctx = mp.get_context("fork")
+        mem_size = get_data_list_size(fxt_data_list)
+        keys = [key for key, _, _ in fxt_data_list]
+
+        latency = {}
+        for handler_cls in [_DictProxyMemCacheHandler, MemCacheHandlerForMP]:
+            handler = handler_cls(mem_size)
+            for key, data, meta in fxt_data_list:
+                handler.put(key, data, meta)
+
+            queue = ctx.Queue()
+            workers = [
+                ctx.Process(target=_measure_hit_latency, args=(handler, keys, 100, queue)) for _ in range(num_workers)
+            ]
+            for worker in workers:
+                worker.start()
+            latencies = [queue.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            handler.shutdown()
+
+            latency[handler_cls.__name__] = np.mean(latencies)
+
+        assert latency["MemCacheHandlerForMP"] < latency["_DictProxyMemCacheHandler"]
+
 
 @pytest.mark.parametrize(
     ("mem_size_arg", "expected"),
@@ -0,0 +1,48 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from otx.core.data.mem_cache_codec import MEM_CACHE_CODECS, JPEGCodec, WebPCodec
+
+
+@pytest.fixture()
+def fxt_image() -> np.ndarray:
+    grad = np.linspace(0, 255, 32, dtype=np.uint8)
+    return np.stack([np.add.outer(grad, grad) // 2] * 3, axis=-1)
+
+
+class TestMemCacheCodec:
+    @pytest.mark.parametrize(("codec", "module"), [("lz4", "lz4"), ("zstd", "zstandard")])
+    @pytest.mark.parametrize("dtype", [np.uint8, np.float32])
+    def test_lossless(self, codec, module, dtype, fxt_image) -> None:
+        pytest.importorskip(module)
+        codec = MEM_CACHE_CODECS[codec]()
+        data = fxt_image.astype(dtype)
+
+        assert codec.accepts(data)
+        buf = codec.encode(data)
+        assert buf.dtype == np.uint8
+        assert buf.ndim == 1
+        assert buf.nbytes < data.nbytes
+
+        decoded = codec.decode(buf, data.dtype.str, data.shape)
+        assert np.array_equal(decoded, data)
+        assert decoded.flags.writeable
+
+    @pytest.mark.parametrize("codec_cls", [JPEGCodec, WebPCodec])
+    def test_lossy(self, codec_cls, fxt_image) -> None:
+        codec = codec_cls(quality=95)
+
+        buf = codec.encode(fxt_image)
+        decoded = codec.decode(buf, fxt_image.dtype.str, fxt_image.shape)
+        assert decoded.shape == fxt_image.shape
+        assert np.abs(decoded.astype(np.int32) - fxt_image).mean() < 2.0
+
+    def test_lossy_accepts(self, fxt_image) -> None:
+        assert JPEGCodec().accepts(fxt_image)
+        assert JPEGCodec().accepts(fxt_image[..., 0])
+        assert not JPEGCodec().accepts(fxt_image.astype(np.float32))
+        assert not JPEGCodec().accepts(fxt_image.reshape(-1))
+        assert not WebPCodec().accepts(fxt_image[..., 0])
@@ -19,9 +19,15 @@ from otx.core.data.module import (
 )
 
 
-def mock_data_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio: float) -> DmDataset:
+def mock_data_filtering(
+    dataset: DmDataset,
+    data_format: str,
+    unannotated_items_ratio: float,
+    **kwargs,
+) -> DmDataset:
     del data_format
     del unannotated_items_ratio
+    del kwargs
     return dataset
 
 
@@ -32,6 +38,15 @@ class TestModule:
         mock.data_format = "coco_instances"
         mock.data_root = "."
         mock.mem_cache_size = "1GB"
+        mock.mem_cache_eviction_policy = "freeze"
+        mock.mem_cache_codec = "none"
+        mock.mem_cache_codec_quality = 95
+        mock.disk_cache_dir = None
+        mock.dataset_cache_dir = None
+        mock.persist_annotation_index = False
+        mock.persist_dataset_snapshot = False
+        mock.defer_normalization = False
+        mock.pack_batches = False
         mock.train_subset = MagicMock(spec=SubsetConfig)
         mock.train_subset.num_workers = 0
         mock.val_subset = MagicMock(spec=SubsetConfig)
@@ -44,7 +59,7 @@ class TestModule:
         return mock
 
     @patch("otx.core.data.module.OTXDatasetFactory")
-    @patch("otx.core.data.module.DmDataset.import_from")
+    @patch("otx.core.data.snapshot.DmDataset.import_from")
     @pytest.mark.parametrize(
         "task",
         [
@@ -91,6 +106,10 @@ class TestModule:
         cfg.test_subset.subset_name = "test"
         cfg.test_subset.num_workers = 0
         cfg.mem_cache_size = "1GB"
+        cfg.persist_annotation_index = False
+        cfg.persist_dataset_snapshot = False
+        cfg.defer_normalization = False
+        cfg.pack_batches = False
         cfg.tile_config = {}
         cfg.tile_config.enable_tiler = False
         cfg.auto_num_workers = False
@@ -98,7 +117,7 @@ class TestModule:
         return cfg
 
     @patch("otx.core.data.module.OTXDatasetFactory")
-    @patch("otx.core.data.module.DmDataset.import_from")
+    @patch("otx.core.data.snapshot.DmDataset.import_from")
     def test_hparams_initial_is_loggable(
         self,
         mock_dm_dataset,
@@ -0,0 +1,101 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+import pickle
+from functools import partial
+
+import pytest
+import torch
+from datumaro import Polygon
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.instance_segmentation import InstanceSegBatchDataEntity, InstanceSegDataEntity
+from otx.core.data.packed_batch import PackedBatch, PackedCollateFn
+from otx.core.types.image import ImageColorChannel
+from torch.utils.data import DataLoader
+from torchvision import tv_tensors
+
+
+def _make_entity(idx: int, height: int = 8, width: int = 10) -> InstanceSegDataEntity:
+    return InstanceSegDataEntity(
+        image=tv_tensors.Image(torch.randint(0, 256, (3, height, width), dtype=torch.uint8)),
+        img_info=ImageInfo(
+            img_idx=idx,
+            img_shape=(height, width),
+            ori_shape=(height * 2, width * 2),
+            scale_factor=(0.5, 0.5) if idx % 2 else None,
+            norm_mean=(1.0, 2.0, 3.0),
+            image_color_channel=ImageColorChannel.BGR,
+            ignored_labels=[idx],
+        ),
+        bboxes=tv_tensors.BoundingBoxes(
+            torch.rand(idx + 1, 4),
+            format=tv_tensors.BoundingBoxFormat.XYWH,
+            canvas_size=(height, width),
+        ),
+        masks=tv_tensors.Mask(torch.randint(0, 2, (idx + 1, height, width), dtype=torch.uint8)),
+        labels=torch.arange(idx + 1),
+        polygons=[Polygon([0, 0, width, 0, width, height])] * (idx + 1),
+    )
+
+
+def _assert_equal_batch(batch: InstanceSegBatchDataEntity, expected: InstanceSegBatchDataEntity) -> None:
+    assert type(batch) is type(expected)
+    assert batch.batch_size == expected.batch_size
+    if isinstance(expected.images, list):
+        assert all(isinstance(image, tv_tensors.Image) for image in batch.images)
+    else:
+        assert isinstance(batch.images, tv_tensors.Image)
+    for field in ("images", "bboxes", "masks", "labels"):
+        for tensor, expected_tensor in zip(getattr(batch, field), getattr(expected, field)):
+            assert type(tensor) is type(expected_tensor)
+            assert torch.equal(tensor, expected_tensor)
+    for bbox, expected_bbox in zip(batch.bboxes, expected.bboxes):
+        assert bbox.format == expected_bbox.format
+        assert bbox.canvas_size == expected_bbox.canvas_size
+    assert batch.polygons == expected.polygons
+    assert [repr(img_info) for img_info in batch.imgs_info] == [repr(img_info) for img_info in expected.imgs_info]
+
+
+class TestPackedBatch:
+    @pytest.mark.parametrize("stack_images", [True, False])
+    def test_pack_unpack(self, stack_images) -> None:
+        sizes = [(8, 10)] * 3 if stack_images else [(8, 10), (6, 4), (8, 10)]
+        batch = InstanceSegBatchDataEntity.collate_fn([_make_entity(i, *size) for i, size in enumerate(sizes)])
+
+        packed = pickle.loads(pickle.dumps(PackedBatch(batch)))  # noqa: S301
+
+        # uint8 images and masks, float32 boxes and int64 labels
+        assert set(packed.buffers) == {torch.uint8, torch.float32, torch.int64}
+        _assert_equal_batch(packed.unpack(), batch)
+
+    def test_unpack_views(self) -> None:
+        batch = InstanceSegBatchDataEntity.collate_fn([_make_entity(i) for i in range(2)])
+        packed = PackedBatch(batch).to("cpu")
+        unpacked = packed.unpack()
+
+        buffer = packed.buffers[torch.int64]
+        assert unpacked.labels[1].untyped_storage().data_ptr() == buffer.untyped_storage().data_ptr()
+
+    def test_unpack_device(self) -> None:
+        batch = InstanceSegBatchDataEntity.collate_fn([_make_entity(i) for i in range(2)])
+        # The buffers moved to an accelerator are mimicked by the meta device
+        unpacked = PackedBatch(batch).to("meta").unpack()
+
+        assert unpacked.labels[1].device.type == "meta"
+        for img_info, expected in zip(unpacked.imgs_info, batch.imgs_info):
+            assert isinstance(img_info, ImageInfo)
+            assert img_info.device.type == "meta"
+            assert img_info.img_idx == expected.img_idx
+            assert img_info.ignored_labels == expected.ignored_labels
+
+    def test_dataloader(self) -> None:
+        entities = [_make_entity(i) for i in range(6)]
+        collate_fn = partial(InstanceSegBatchDataEntity.collate_fn, stack_images=True)
+        expected = [collate_fn(entities[i : i + 3]) for i in range(0, 6, 3)]
+
+        dataloader = DataLoader(entities, batch_size=3, num_workers=2, collate_fn=PackedCollateFn(collate_fn))
+        for packed, expected_batch in zip(dataloader, expected):
+            assert isinstance(packed, PackedBatch)
+            _assert_equal_batch(packed.unpack(), expected_batch)
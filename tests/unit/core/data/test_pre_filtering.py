@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import pytest
-from datumaro.components.annotation import Label
+from datumaro.components.annotation import Bbox, Label, Polygon
 from datumaro.components.dataset import Dataset as DmDataset
 from datumaro.components.dataset_base import DatasetItem
-from otx.core.data.pre_filtering import pre_filtering
+from otx.core.data import pre_filtering as target_file
+from otx.core.data.pre_filtering import is_valid_annot, pre_filtering
 
 
 @pytest.fixture()
@@ -58,3 +59,61 @@ def test_pre_filtering(fxt_dm_dataset_with_unannotated: DmDataset, unannotated_i
         unannotated_items_ratio=unannotated_items_ratio,
     )
     assert len(filtered_dataset) == 80 + int(len(empty_items) * unannotated_items_ratio)
+
+
+@pytest.fixture()
+def fxt_dm_dataset_with_invalid_annotations() -> DmDataset:
+    dataset_items = [
+        DatasetItem(
+            id="item000",
+            subset="train",
+            media=None,
+            annotations=[
+                Bbox(0, 0, 10, 10, label=0),
+                Bbox(5, 5, 0, 3, label=1),
+                Polygon([0, 0, 10, 0, 10, 10], label=2),
+            ],
+        ),
+        DatasetItem(
+            id="item001",
+            subset="train",
+            media=None,
+            annotations=[
+                Polygon([0, 0, 10, 0, 20, 0], label=3),
+                Polygon([0, 0, 0.2, 0, 0.2, 0.2], label=1),
+                Label(label=0),
+            ],
+        ),
+        DatasetItem(id="item002", subset="val", media=None, annotations=[Bbox(1, 1, 2, 2, label=3)]),
+    ]
+    return DmDataset.from_iterable(dataset_items, categories=["0", "1", "2", "3"])
+
+
+def test_pre_filtering_invalid_annotations(fxt_dm_dataset_with_invalid_annotations: DmDataset, mocker) -> None:
+    def _summarize(label_names: list, anns: list) -> list:
+        return [(ann.type, getattr(ann, "points", None), label_names[ann.label]) for ann in anns]
+
+    label_names = fxt_dm_dataset_with_invalid_annotations.get_label_cat_names()
+    expected = {
+        (item.subset, item.id): _summarize(label_names, [ann for ann in item.annotations if is_valid_annot(item, ann)])
+        for item in fxt_dm_dataset_with_invalid_annotations
+    }
+
+    mocker.patch.object(target_file, "MIN_POLYGONS_PER_WORKER", 1)
+    filtered_dataset = pre_filtering(fxt_dm_dataset_with_invalid_annotations, "coco", 0.0)
+
+    label_names = filtered_dataset.get_label_cat_names()
+    actual = {(item.subset, item.id): _summarize(label_names, item.annotations) for item in filtered_dataset}
+    assert actual == expected
+    # Label 1 is used only by the invalid annotations
+    assert filtered_dataset.get_label_cat_names() == ["0", "2", "3"]
+
+
+def test_pre_filtering_cache(fxt_dm_dataset_with_invalid_annotations: DmDataset, tmp_path, mocker) -> None:
+    filtered_dataset = pre_filtering(fxt_dm_dataset_with_invalid_annotations, "coco", 0.0, tmp_path, "key")
+    assert (tmp_path / "key.npz").exists()
+
+    spy_collect = mocker.spy(target_file, "_collect_stats")
+    cached_dataset = pre_filtering(fxt_dm_dataset_with_invalid_annotations, "coco", 0.0, tmp_path, "key")
+    spy_collect.assert_not_called()
+    assert [item.annotations for item in cached_dataset] == [item.annotations for item in filtered_dataset]
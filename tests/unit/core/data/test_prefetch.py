@@ -0,0 +1,148 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+import ctypes as ct
+import multiprocessing as mp
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from otx.core.data import prefetch as target_file
+from otx.core.data.prefetch import ImagePrefetcher, PrefetchSampler
+from torch.utils.data import DataLoader, Dataset, RandomSampler
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.loaded: list[int] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, index: int) -> None:
+        with self._lock:
+            self.loaded.append(index)
+
+
+class _PrefetchedDataset(Dataset):
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.prefetcher: ImagePrefetcher | None = None
+        self.num_loaded = mp.Value(ct.c_int64, 0)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _load(self, index: int) -> None:
+        with self.num_loaded.get_lock():
+            self.num_loaded.value += 1
+
+    def __getitem__(self, index: int) -> int:
+        if self.prefetcher is not None:
+            self.prefetcher.on_fetch(index, self._load)
+        return index
+
+
+class TestImagePrefetcher:
+    def test_read_ahead(self) -> None:
+        prefetcher = ImagePrefetcher(depth=3, num_threads=2, batch_size=2, num_workers=1)
+        order = [5, 3, 9, 1, 0, 7]
+        prefetcher.reserve(len(order))
+        prefetcher.publish(order)
+
+        recorder = _Recorder()
+        prefetcher.on_fetch(5, recorder)
+        prefetcher._executor.shutdown(wait=True)
+        assert sorted(recorder.loaded) == sorted([3, 9, 1])
+
+        prefetcher._executor = None
+        prefetcher.on_fetch(3, recorder)
+        prefetcher._executor.shutdown(wait=True)
+        # Only the next index which is not scheduled yet
+        assert sorted(recorder.loaded) == sorted([3, 9, 1, 0])
+
+    def test_follow_own_batches(self, mocker) -> None:
+        # The second worker fetches the second, fourth, ... batches
+        mocker.patch.object(target_file, "get_worker_info", return_value=SimpleNamespace(id=1))
+        prefetcher = ImagePrefetcher(depth=3, num_threads=1, batch_size=2, num_workers=2)
+        order = list(range(10, 20))
+        prefetcher.reserve(len(order))
+        prefetcher.publish(order)
+
+        recorder = _Recorder()
+        prefetcher.on_fetch(12, recorder)
+        prefetcher._executor.shutdown(wait=True)
+        assert sorted(recorder.loaded) == [13, 16, 17]
+
+    def test_resync(self) -> None:
+        prefetcher = ImagePrefetcher(depth=1, num_threads=1, batch_size=1, num_workers=1)
+        prefetcher.reserve(5)
+        prefetcher.publish([0, 1, 2, 3, 4])
+
+        recorder = _Recorder()
+        prefetcher.on_fetch(2, recorder)
+        prefetcher.on_fetch(3, recorder)
+        prefetcher._executor.shutdown(wait=True)
+        assert recorder.loaded == [3, 4]
+
+        # New epoch starts from the beginning
+        prefetcher._executor = None
+        prefetcher.publish([4, 3, 2, 1, 0])
+        prefetcher.on_fetch(4, recorder)
+        prefetcher._executor.shutdown(wait=True)
+        assert recorder.loaded == [3, 4, 3]
+
+        # Unknown index is ignored
+        prefetcher.on_fetch(100, recorder)
+        assert recorder.loaded == [3, 4, 3]
+
+
+class TestPrefetchSampler:
+    def test_publish(self) -> None:
+        dataset = _PrefetchedDataset(16)
+        prefetcher = ImagePrefetcher(depth=4, num_threads=1, batch_size=4, num_workers=1)
+        sampler = PrefetchSampler(RandomSampler(dataset, num_samples=8), prefetcher)
+
+        assert len(sampler) == 8
+        indices = list(sampler)
+        assert len(indices) == 8
+        assert np.array_equal(prefetcher._order[: prefetcher._order_len.value], indices)
+        assert prefetcher._epoch.value == 1
+
+    @pytest.mark.parametrize("num_workers", [0, 2])
+    def test_dataloader(self, num_workers) -> None:
+        dataset = _PrefetchedDataset(32)
+        dataset.prefetcher = ImagePrefetcher(depth=4, num_threads=2, batch_size=4, num_workers=num_workers)
+        sampler = PrefetchSampler(RandomSampler(dataset), dataset.prefetcher)
+        dataloader = DataLoader(dataset, batch_size=4, sampler=sampler, num_workers=num_workers)
+
+        for _ in range(2):
+            indices = [int(index) for batch in dataloader for index in batch]
+            assert sorted(indices) == list(range(32))
+
+        # Every index except the first ones of each worker is read ahead
+        assert dataset.num_loaded.value >= 2 * (32 - 4 * max(num_workers, 1))
+
+    def test_distributed(self, mocker) -> None:
+        dataset = _PrefetchedDataset(10)
+        mocker.patch.object(target_file.distributed, "is_available", return_value=True)
+        mocker.patch.object(target_file.distributed, "is_initialized", return_value=True)
+        mocker.patch.object(target_file.distributed, "get_world_size", return_value=2)
+
+        samplers = []
+        for rank in range(2):
+            mocker.patch.object(target_file.distributed, "get_rank", return_value=rank)
+            prefetcher = ImagePrefetcher(depth=4, num_threads=1, batch_size=4, num_workers=1)
+            samplers.append(PrefetchSampler(RandomSampler(dataset), prefetcher))
+
+        epoch_shards = []
+        for epoch in range(2):
+            for sampler in samplers:
+                sampler.set_epoch(epoch)
+            shards = [list(sampler) for sampler in samplers]
+            # Every replica draws the same permutation, so that the shards partition the dataset
+            assert all(len(shard) == 5 for shard in shards)
+            assert sorted(shards[0] + shards[1]) == list(range(10))
+            epoch_shards.append(shards)
+        assert epoch_shards[0] != epoch_shards[1]
@@ -0,0 +1,64 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from datumaro import Dataset as DmDataset
+from otx.core.data import snapshot
+from otx.core.data.annotation_index import compute_dataset_hash
+from otx.core.data.snapshot import import_dataset
+
+
+@pytest.fixture()
+def fxt_data_root(tmp_path) -> Path:
+    data_root = tmp_path / "dataset"
+    src = Path(__file__).parents[3] / "assets" / "car_tree_bug"
+    DmDataset.import_from(str(src), format="coco_instances").export(str(data_root), "coco_instances", save_media=True)
+    return data_root
+
+
+class TestImportDataset:
+    def test_snapshot(self, fxt_data_root, tmp_path, mocker) -> None:
+        cache_dir = tmp_path / "cache"
+        key = compute_dataset_hash(fxt_data_root, "coco_instances")
+        dataset = import_dataset(fxt_data_root, "coco_instances", cache_dir, key)
+        assert (cache_dir / key).is_dir()
+
+        spy_import = mocker.spy(DmDataset, "import_from")
+        snapshot = import_dataset(fxt_data_root, "coco_instances", cache_dir, key)
+        spy_import.assert_called_once_with(str(cache_dir / key), format="datumaro_binary")
+
+        assert snapshot.categories() == dataset.categories()
+        for name, dm_subset in dataset.subsets().items():
+            items = list(snapshot.get_subset(name))
+            assert [item.id for item in items] == [item.id for item in dm_subset]
+            for expected, actual in zip(dm_subset, items):
+                assert actual.annotations == expected.annotations
+                assert actual.media.path == expected.media.path
+                assert Path(actual.media.path).exists()
+
+    def test_invalidate(self, fxt_data_root, tmp_path) -> None:
+        key = compute_dataset_hash(fxt_data_root, "coco_instances")
+
+        ann_file = next((fxt_data_root / "annotations").glob("*.json"))
+        ann_file.write_text(ann_file.read_text() + " ")
+        assert compute_dataset_hash(fxt_data_root, "coco_instances") != key
+
+    def test_no_snapshot(self, tmp_path, mocker) -> None:
+        src = Path(__file__).parents[3] / "assets" / "common_semantic_segmentation_dataset" / "supervised"
+        cache_dir = tmp_path / "cache"
+        spy_available = mocker.spy(snapshot, "_is_snapshot_available")
+        import_dataset(src, "common_semantic_segmentation_with_subset_dirs", cache_dir, "key")
+        assert not (cache_dir / "key").exists()
+        spy_available.assert_called_once()
+
+        # The unavailability is recorded, so that the annotations are not checked again
+        import_dataset(src, "common_semantic_segmentation_with_subset_dirs", cache_dir, "key")
+        assert not (cache_dir / "key").exists()
+        spy_available.assert_called_once()
+
+        import_dataset(src, "common_semantic_segmentation_with_subset_dirs")
+        assert [path.name for path in cache_dir.iterdir()] == ["key.unavailable"]
@@ -3,15 +3,19 @@
 #
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pytest
 import torch
+from datumaro.components.media import Video
 from lightning.pytorch.cli import instantiate_class
 from omegaconf import OmegaConf
 from otx.core.config.data import SubsetConfig
 from otx.core.data.entity.base import Points
 from otx.core.data.transform_libs.torchvision import (
+    DecodeVideo,
     PadtoSquare,
     PerturbBoundingBoxes,
     ResizetoLongestEdge,
@@ -115,6 +119,24 @@ class TestResizetoLongestEdge:
         assert results[1]["target_size"] == (10, 10)
 
 
+class TestDecodeVideo:
+    @pytest.mark.parametrize("test_mode", [True, False])
+    def test_transform(self, test_mode) -> None:
+        path = Path(__file__).parents[3] / "assets" / "action_classification_dataset" / "train" / "0.mp4"
+        transform = DecodeVideo(test_mode=test_mode, clip_len=8, frame_interval=4)
+        video = Video(str(path))
+        expected_frames = np.stack([frame.data for frame in video])
+
+        outputs = transform(video)
+
+        assert isinstance(outputs, tv_tensors.Video)
+        assert outputs.shape == (8, 3, 224, 224)
+        assert outputs.dtype == torch.uint8
+        # The frames are looped over the 10 frames of the video
+        frames = outputs.permute(0, 2, 3, 1).numpy()
+        assert any(np.array_equal(frames, expected_frames[(np.arange(8) * 4 + offset) % 10]) for offset in range(10))
+
+
 class TestTorchVisionTransformLib:
     @pytest.fixture(params=["from_dict", "from_list", "from_compose"])
     def fxt_config(self, request) -> list[dict[str, Any]]:
@@ -174,6 +196,22 @@ class TestTorchVisionTransformLib:
         item = dataset[0]
         assert isinstance(item, data_entity_cls)
 
+    def test_count_deterministic_prefix(self, fxt_config) -> None:
+        transform = TorchVisionTransformLib.generate(fxt_config)
+        assert TorchVisionTransformLib.count_deterministic_prefix(transform) == 0
+
+        transform = v2.Compose(
+            [
+                ResizetoLongestEdge(size=8),
+                PadtoSquare(),
+                v2.RandomHorizontalFlip(p=0.5),
+                v2.ToDtype(torch.float32, scale=True),
+            ],
+        )
+        assert TorchVisionTransformLib.count_deterministic_prefix(transform) == 2
+        transform.transforms.pop(2)
+        assert TorchVisionTransformLib.count_deterministic_prefix(transform) == 3
+
     @pytest.fixture(params=["RGB", "BGR"])
     def fxt_image_color_channel(self, request) -> ImageColorChannel:
         return ImageColorChannel(request.param)
@@ -0,0 +1,137 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+import torch
+from datumaro.components.media import Video
+from otx.core.data.mem_cache import NULL_MEM_CACHE_HANDLER
+from otx.core.data.transform_libs.torchvision import DecodeVideo
+from otx.core.data.video import SEEK_MIN_GAP, VideoFrameCache, decode_video_frames, probe_num_frames
+from torchvision.transforms import v2
+
+NUM_FRAMES = 4 * SEEK_MIN_GAP
+
+pytestmark = pytest.mark.usefixtures("fxt_clear_media_manager")
+
+
+@pytest.fixture(scope="module")
+def fxt_video(tmp_path_factory) -> tuple[str, np.ndarray]:
+    path = tmp_path_factory.mktemp("video") / "video.mp4"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (32, 24))
+    base = np.random.default_rng(0).integers(0, 256, (24, 32, 3), dtype=np.uint8)
+    for i in range(NUM_FRAMES):
+        writer.write(np.roll(base, i, axis=1))
+    writer.release()
+
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while (frame := cap.read()[1]) is not None:
+        frames.append(frame)
+    cap.release()
+    return str(path), np.stack(frames)
+
+
+def test_probe_num_frames(fxt_video, tmp_path) -> None:
+    path, frames = fxt_video
+    assert probe_num_frames(path) == len(frames) == NUM_FRAMES
+    assert probe_num_frames(str(tmp_path / "missing.mp4")) is None
+
+
+@pytest.mark.parametrize(
+    "frame_inds",
+    [
+        [0, 1, 2, 3],
+        # Unsorted and repeated indices
+        [5, 3, 3, 0, 5],
+        # Large gaps to seek
+        [NUM_FRAMES - 1, 1, 2 * SEEK_MIN_GAP + 1, 2 * SEEK_MIN_GAP + 1, 3 * SEEK_MIN_GAP + 7],
+        list(range(0, NUM_FRAMES, 7)),
+    ],
+)
+def test_decode_video_frames(fxt_video, frame_inds) -> None:
+    path, frames = fxt_video
+    decoded = decode_video_frames(path, np.array(frame_inds))
+
+    assert decoded.dtype == np.uint8
+    assert np.array_equal(decoded, frames[frame_inds])
+
+
+def test_decode_video_frames_out_of_range(fxt_video, tmp_path) -> None:
+    path, frames = fxt_video
+    # The frames after the end are filled with the last decoded frame
+    decoded = decode_video_frames(path, [NUM_FRAMES - 2, NUM_FRAMES, NUM_FRAMES + 1])
+    assert np.array_equal(decoded, frames[[NUM_FRAMES - 2] * 3])
+
+    with pytest.raises(IndexError):
+        decode_video_frames(path, [-1, 0])
+    with pytest.raises(IndexError):
+        decode_video_frames(path, [NUM_FRAMES + SEEK_MIN_GAP * 2])
+    with pytest.raises(OSError, match="Cannot open"):
+        decode_video_frames(str(Path(tmp_path) / "missing.mp4"), [0])
+
+
+class TestVideoFrameCache:
+    def test_get_frames(self, fxt_video, fxt_mem_cache_handler, mocker) -> None:
+        path, frames = fxt_video
+        cache = VideoFrameCache(fxt_mem_cache_handler)
+        decode = mocker.Mock(side_effect=lambda inds: decode_video_frames(path, inds))
+
+        assert np.array_equal(cache.get_frames(path, [3, 1, 3], decode), frames[[3, 1, 3]])
+        assert decode.call_args.args[0].tolist() == [1, 3]
+        assert len(fxt_mem_cache_handler) == 2
+        assert fxt_mem_cache_handler.get((path, 3, None))[0] is not None
+
+        # Only the missing frames are decoded
+        assert np.array_equal(cache.get_frames(path, [1, 2, 3], decode), frames[[1, 2, 3]])
+        assert decode.call_args.args[0].tolist() == [2]
+        decode.reset_mock()
+        assert np.array_equal(cache.get_frames(path, [2, 1], decode), frames[[2, 1]])
+        decode.assert_not_called()
+        assert fxt_mem_cache_handler.stats["hits"] == 5
+
+    def test_get_frames_max_size(self, fxt_video, fxt_mem_cache_handler) -> None:
+        path, _ = fxt_video
+        cache = VideoFrameCache(fxt_mem_cache_handler, max_size=(12, 12))
+
+        decoded = cache.get_frames(path, [0, 1], lambda inds: decode_video_frames(path, inds))
+        assert decoded.shape == (2, 9, 12, 3)
+        # The cached frames are the same as the decoded ones
+        assert np.array_equal(cache.get_frames(path, [1, 0], lambda _: None), decoded[[1, 0]])
+        # The frames of the different target size are not shared
+        assert fxt_mem_cache_handler.get((path, 0, None))[0] is None
+
+    def test_bind(self, fxt_video, fxt_mem_cache_handler, mocker) -> None:
+        path, _ = fxt_video
+        transforms = v2.Compose([DecodeVideo(test_mode=True, clip_len=4, frame_interval=2), v2.Identity()])
+        VideoFrameCache(NULL_MEM_CACHE_HANDLER).bind(transforms)
+        assert transforms.transforms[0].frame_cache is None
+
+        cache = VideoFrameCache(fxt_mem_cache_handler)
+        cache.bind(transforms)
+        assert transforms.transforms[0].frame_cache is cache
+
+        outputs = transforms(Video(path))
+        assert len(fxt_mem_cache_handler) == 4
+        # The second access to the same clip does not decode the video
+        spy_decode = mocker.patch("otx.core.data.transform_libs.torchvision.decode_video_frames")
+        assert torch.equal(transforms(Video(path)), outputs)
+        spy_decode.assert_not_called()
+
+    def test_decode_video_clip(self, fxt_video, fxt_mem_cache_handler, mocker) -> None:
+        path, frames = fxt_video
+        transform = DecodeVideo(test_mode=True, clip_len=4, frame_interval=2)
+        mocker.patch.object(transform, "_sample_clips", return_value=np.array([1]))
+        VideoFrameCache(fxt_mem_cache_handler).bind(transform)
+        inds = np.array([1, 3, 5, 7])
+
+        outputs = transform(Video(path))
+        assert np.array_equal(outputs.permute(0, 2, 3, 1).numpy(), frames[inds])
+
+        # The indices are mapped to the frames of the clip, which are not confused with the cached frames
+        outputs = transform(Video(path, start_frame=10, end_frame=70, step=3))
+        assert np.array_equal(outputs.permute(0, 2, 3, 1).numpy(), frames[10 + inds * 3])
@@ -0,0 +1,168 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+import pickle
+from functools import partial
+
+import pytest
+import torch
+import torchvision.transforms.v2 as tvt_v2
+from datumaro import Polygon
+from omegaconf import OmegaConf
+from otx.core.config.data import SubsetConfig
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.instance_segmentation import InstanceSegBatchDataEntity, InstanceSegDataEntity
+from otx.core.data.transform_libs.batch import (
+    BatchColorJitter,
+    BatchNormalize,
+    BatchRandomFlip,
+    BatchResize,
+    BatchTransformCollateFn,
+    BatchTransformLib,
+)
+from torchvision import tv_tensors
+from torchvision.transforms.v2 import functional as F  # noqa: N812
+
+
+def _make_entity(idx: int, height: int, width: int) -> InstanceSegDataEntity:
+    return InstanceSegDataEntity(
+        image=tv_tensors.Image(torch.randint(0, 256, (3, height, width), dtype=torch.uint8)),
+        img_info=ImageInfo(img_idx=idx, img_shape=(height, width), ori_shape=(height, width)),
+        bboxes=tv_tensors.BoundingBoxes(
+            [[1, 2, 5, 6], [0, 0, width, height]],
+            format=tv_tensors.BoundingBoxFormat.XYXY,
+            canvas_size=(height, width),
+            dtype=torch.float32,
+        ),
+        masks=tv_tensors.Mask(torch.randint(0, 2, (2, height, width), dtype=torch.uint8)),
+        labels=torch.LongTensor([0, 1]),
+        polygons=[Polygon([1, 2, 5, 2, 5, 6]), Polygon([0, 0, width, 0, width, height])],
+    )
+
+
+def _make_batch(sizes: list[tuple[int, int]]) -> InstanceSegBatchDataEntity:
+    entities = [_make_entity(idx, *size) for idx, size in enumerate(sizes)]
+    return InstanceSegBatchDataEntity.collate_fn(entities)
+
+
+class TestBatchTransforms:
+    def test_normalize(self) -> None:
+        batch = _make_batch([(8, 10)] * 3)
+        expected = [
+            F.normalize(F.to_dtype(image, torch.float32, scale=True), mean=[0.4, 0.5, 0.6], std=[0.2, 0.3, 0.4])
+            for image in batch.images
+        ]
+
+        batch = BatchNormalize(mean=[0.4, 0.5, 0.6], std=[0.2, 0.3, 0.4], scale=True)(batch)
+
+        assert batch.images.dtype == torch.float32
+        assert torch.allclose(batch.images, torch.stack(expected))
+        for img_info in batch.imgs_info:
+            assert img_info.normalized
+            assert img_info.norm_mean == (0.4, 0.5, 0.6)
+            assert img_info.norm_std == (0.2, 0.3, 0.4)
+
+    @pytest.mark.parametrize("direction", ["horizontal", "vertical"])
+    def test_random_flip(self, direction) -> None:
+        batch = _make_batch([(8, 10)] * 2)
+        images = batch.images.clone()
+        bboxes = [bbox.clone() for bbox in batch.bboxes]
+        masks = [mask.clone() for mask in batch.masks]
+
+        batch = BatchRandomFlip(p=0.0, direction=direction)(batch)
+        assert torch.equal(batch.images, images)
+
+        batch = BatchRandomFlip(p=1.0, direction=direction)(batch)
+        flip_fn = F.horizontal_flip if direction == "horizontal" else F.vertical_flip
+        assert torch.equal(batch.images, flip_fn(images))
+        for i in range(2):
+            assert torch.equal(batch.bboxes[i], flip_fn(bboxes[i]))
+            assert torch.equal(batch.masks[i], flip_fn(masks[i]))
+            assert isinstance(batch.masks[i], tv_tensors.Mask)
+
+        expected_points = [9, 2, 5, 2, 5, 6] if direction == "horizontal" else [1, 6, 5, 6, 5, 2]
+        assert batch.polygons[0][0].points == expected_points
+
+    def test_resize(self) -> None:
+        batch = _make_batch([(8, 10), (16, 10), (8, 10)])
+        assert isinstance(batch.images, list)
+
+        batch = BatchResize(size=(4, 20))(batch)
+
+        assert isinstance(batch.images, tv_tensors.Image)
+        assert batch.images.shape == (3, 3, 4, 20)
+        assert batch.imgs_info[0].img_shape == (4, 20)
+        assert batch.imgs_info[0].scale_factor == (0.5, 2.0)
+        assert batch.imgs_info[1].scale_factor == (0.25, 2.0)
+        assert batch.bboxes[0].canvas_size == (4, 20)
+        assert torch.allclose(batch.bboxes[0], torch.tensor([[2.0, 1.0, 10.0, 3.0], [0.0, 0.0, 20.0, 4.0]]))
+        assert torch.allclose(batch.bboxes[1], torch.tensor([[2.0, 0.5, 10.0, 1.5], [0.0, 0.0, 20.0, 4.0]]))
+        assert batch.masks[1].shape == (2, 4, 20)
+        assert batch.polygons[1][1].points == [0, 0, 20, 0, 20, 4]
+
+    def test_color_jitter(self) -> None:
+        batch = _make_batch([(8, 10)] * 2)
+        images = batch.images.clone()
+        batch = BatchColorJitter(brightness=(0.5, 0.5))(batch)
+        assert batch.images.dtype == torch.uint8
+        assert torch.equal(batch.images, F.adjust_brightness(images, 0.5))
+
+        batch.images = F.to_dtype(images, torch.float32, scale=True)
+        images = batch.images.clone()
+        batch = BatchColorJitter(contrast=(1.5, 1.5))(batch)
+        expected = torch.stack([F.adjust_contrast(image, 1.5) for image in images])
+        assert torch.allclose(batch.images, expected, atol=1e-6)
+
+        batch.images = images.clone()
+        batch = BatchColorJitter(saturation=(0.3, 0.3))(batch)
+        assert torch.allclose(batch.images, F.adjust_saturation(images, 0.3), atol=1e-6)
+
+        # Each image has its own factor
+        batch.images = tv_tensors.Image(torch.ones((16, 3, 4, 4)))
+        batch = BatchColorJitter(brightness=0.5)(batch)
+        factors = batch.images[:, 0, 0, 0]
+        assert ((factors >= 0.5) & (factors <= 1.0)).all()
+        assert len(factors.unique()) > 1
+
+    def test_different_image_shapes(self) -> None:
+        batch = _make_batch([(8, 10), (16, 10)])
+        with pytest.raises(ValueError, match="different shapes"):
+            BatchRandomFlip(p=1.0)(batch)
+
+
+class TestBatchTransformLib:
+    def test_generate(self) -> None:
+        config = SubsetConfig(
+            batch_size=2,
+            subset_name="train",
+            transforms=[],
+            batch_transforms=[
+                OmegaConf.create(
+                    {"class_path": "otx.core.data.transform_libs.batch.BatchResize", "init_args": {"size": [4, 4]}},
+                ),
+                {"class_path": "otx.core.data.transform_libs.batch.BatchRandomFlip", "init_args": {"p": 0.5}},
+                BatchNormalize(mean=[0.0, 0.0, 0.0], std=[255.0, 255.0, 255.0]),
+            ],
+        )
+        transforms = BatchTransformLib.generate(config)
+        assert isinstance(transforms, tvt_v2.Compose)
+        assert [type(transform) for transform in transforms.transforms] == [
+            BatchResize,
+            BatchRandomFlip,
+            BatchNormalize,
+        ]
+
+        collate_fn = pickle.loads(  # noqa: S301
+            pickle.dumps(BatchTransformCollateFn(partial(InstanceSegBatchDataEntity.collate_fn), transforms)),
+        )
+        batch = collate_fn([_make_entity(0, 8, 10), _make_entity(1, 16, 10)])
+        assert batch.images.shape == (2, 3, 4, 4)
+        assert batch.images.dtype == torch.float32
+        assert batch.images.max() <= 1.0
+
+    def test_generate_invalid(self) -> None:
+        config = SubsetConfig(batch_size=2, subset_name="train", transforms=[], batch_transforms=[1])
+        with pytest.raises(TypeError):
+            BatchTransformLib.generate(config)
@@ -0,0 +1,45 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests of mmaction data transform."""
+
+from pathlib import Path
+
+import numpy as np
+from otx.core.data.transform_libs.mmaction import RawFrameDecode
+from otx.core.data.video import VideoFrameCache
+
+FRAME_DIR = Path(__file__).parents[4] / "assets" / "action_detection_dataset" / "frames" / "train_video0"
+
+
+def _get_results() -> dict:
+    return {
+        "frame_dir": str(FRAME_DIR),
+        "filename_tmpl": "{video}_{idx:04d}.{ext}",
+        "extension": "jpg",
+        "frame_inds": np.array([0, 2, 2, 5]),
+        "offset": 1,
+        "gt_bboxes": np.array([[0.0, 0.0, 0.5, 0.5]]),
+    }
+
+
+class TestRawFrameDecode:
+    def test_transform_with_frame_cache(self, fxt_mem_cache_handler, mocker) -> None:
+        transform = RawFrameDecode()
+        expected = transform.transform(_get_results())
+
+        transform.frame_cache = VideoFrameCache(fxt_mem_cache_handler)
+        results = transform.transform(_get_results())
+        # The unique frames are cached with the frame indices with the offset
+        assert len(fxt_mem_cache_handler) == 3
+        assert fxt_mem_cache_handler.get((str(FRAME_DIR), 6, None))[0] is not None
+
+        spy_get = mocker.spy(transform.file_client, "get")
+        cached = transform.transform(_get_results())
+        spy_get.assert_not_called()
+
+        for outputs in (results, cached):
+            assert len(outputs["imgs"]) == 4
+            for img, expected_img in zip(outputs["imgs"], expected["imgs"]):
+                assert np.array_equal(img, expected_img)
+            assert outputs["img_shape"] == expected["img_shape"]
+            assert np.array_equal(outputs["gt_bboxes"], expected["gt_bboxes"])
@@ -47,3 +47,14 @@ class TestMMCVTransformLib:
         config.transforms.pop(0)
         with pytest.raises(RuntimeError):
             transforms = MMCVTransformLib.generate(config)
+
+    def test_count_deterministic_prefix(self) -> None:
+        transforms = [
+            TRANSFORMS.build({"type": "LoadImageFromFile"}),
+            TRANSFORMS.build({"type": "Resize", "scale": (32, 32)}),
+            TRANSFORMS.build({"type": "RandomFlip", "prob": 0.5}),
+            TRANSFORMS.build({"type": "Normalize", "mean": [0, 0, 0], "std": [1, 1, 1]}),
+        ]
+        assert MMCVTransformLib.count_deterministic_prefix(transforms) == 2
+        assert MMCVTransformLib.count_deterministic_prefix(transforms[:2]) == 2
+        assert MMCVTransformLib.count_deterministic_prefix(transforms[2:]) == 0
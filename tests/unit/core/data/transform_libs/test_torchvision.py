@@ -0,0 +1,80 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+from copy import deepcopy
+
+import pytest
+import torch
+import torchvision.transforms.v2 as tvt_v2
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.classification import MulticlassClsBatchDataEntity, MulticlassClsDataEntity
+from otx.core.data.entity.utils import normalize_images
+from otx.core.data.transform_libs.torchvision import DeferredNormalize, TorchVisionTransformLib
+from torchvision import tv_tensors
+
+
+def _make_entity(idx: int, height: int = 8, width: int = 10) -> MulticlassClsDataEntity:
+    return MulticlassClsDataEntity(
+        image=torch.randint(0, 256, (height, width, 3), dtype=torch.uint8).numpy(),
+        img_info=ImageInfo(img_idx=idx, img_shape=(height, width), ori_shape=(height, width)),
+        labels=torch.LongTensor([0]),
+    )
+
+
+class TestTorchVisionTransformLib:
+    @pytest.mark.parametrize(
+        ("scale", "mean", "std"),
+        [
+            (True, [0.485, 0.456, 0.406], [0.229, 0.224, 0.225]),
+            (False, [123.675, 116.28, 103.53], [58.395, 57.12, 57.375]),
+        ],
+    )
+    @pytest.mark.parametrize("stack_images", [True, False])
+    def test_defer_normalization(self, scale, mean, std, stack_images) -> None:
+        transforms = tvt_v2.Compose(
+            [
+                tvt_v2.ToImage(),
+                tvt_v2.Resize((4, 6)),
+                tvt_v2.ToDtype(torch.float32, scale=scale),
+                tvt_v2.Normalize(mean=mean, std=std),
+            ],
+        )
+        deferred = TorchVisionTransformLib.defer_normalization(transforms)
+        assert [type(transform) for transform in deferred.transforms] == [
+            tvt_v2.ToImage,
+            tvt_v2.Resize,
+            DeferredNormalize,
+        ]
+        assert TorchVisionTransformLib.count_deterministic_prefix(deferred) == 3
+
+        entities = [_make_entity(idx) for idx in range(3)]
+        expected = [transforms(deepcopy(entity).to_tv_image()).image for entity in entities]
+        outputs = [deferred(entity.to_tv_image()) for entity in entities]
+        for output in outputs:
+            assert output.image.dtype == torch.uint8
+            assert not output.img_info.normalized
+
+        batch = MulticlassClsBatchDataEntity.collate_fn(outputs, stack_images=stack_images)
+        images = normalize_images(batch.images, batch.imgs_info)
+        assert all(img_info.normalized for img_info in batch.imgs_info)
+        assert all(isinstance(image, tv_tensors.Image) for image in ([images] if stack_images else images))
+        for image, expected_image in zip(images, expected):
+            assert image.dtype == torch.float32
+            assert torch.allclose(image, expected_image, atol=1e-4)
+
+        # The images are normalized only once
+        assert normalize_images(images, batch.imgs_info) is images
+
+    def test_defer_normalization_unchanged(self) -> None:
+        transforms = tvt_v2.Compose([tvt_v2.ToImage(), tvt_v2.Normalize(mean=[0.0], std=[1.0]), tvt_v2.RandomErasing()])
+        assert TorchVisionTransformLib.defer_normalization(transforms) is transforms
+
+        transforms = tvt_v2.Compose([tvt_v2.ToDtype(torch.int32), tvt_v2.Normalize(mean=[0.0], std=[1.0])])
+        assert TorchVisionTransformLib.defer_normalization(transforms) is transforms
+
+    def test_normalize_images_without_deferred_normalization(self) -> None:
+        images = tv_tensors.Image(torch.randint(0, 256, (2, 3, 4, 4), dtype=torch.uint8))
+        imgs_info = [ImageInfo(img_idx=idx, img_shape=(4, 4), ori_shape=(4, 4)) for idx in range(2)]
+        assert normalize_images(images, imgs_info) is images
@@ -2,8 +2,9 @@ import numpy as np
 import pytest
 import torch
 from openvino.model_api.models.utils import ClassificationResult
-from otx.core.data.entity.base import OTXBatchDataEntity
+from otx.core.data.entity.base import ImageInfo, OTXBatchDataEntity
 from otx.core.model.base import OTXModel, OVModel
+from torchvision import tv_tensors
 
 
 class MockNNModule(torch.nn.Module):
@@ -46,6 +47,30 @@ class TestOTXModel:
             prev_state_dict["model.head.bias"],
         )
 
+    def test_on_after_batch_transfer(self, mocker) -> None:
+        with mocker.patch.object(OTXModel, "_create_model", return_value=MockNNModule(2)):
+            model = OTXModel(num_classes=2)
+
+        imgs_info = [
+            ImageInfo(
+                img_idx=0,
+                img_shape=(2, 2),
+                ori_shape=(2, 2),
+                norm_mean=(10.0, 20.0, 30.0),
+                norm_std=(2.0, 4.0, 5.0),
+            ),
+            ImageInfo(img_idx=1, img_shape=(2, 2), ori_shape=(2, 2)),
+        ]
+        images = tv_tensors.Image(torch.full((2, 3, 2, 2), 30, dtype=torch.uint8))
+        batch = OTXBatchDataEntity(batch_size=2, images=images, imgs_info=imgs_info)
+
+        batch = model.on_after_batch_transfer(batch, dataloader_idx=0)
+
+        assert batch.images.dtype == torch.float32
+        assert torch.allclose(batch.images[0, :, 0, 0], torch.tensor([10.0, 2.5, 0.0]), atol=1e-6)
+        assert torch.allclose(batch.images[1], torch.full((3, 2, 2), 30.0))
+        assert batch.imgs_info[0].normalized
+
 
 class TestOVModel:
     @pytest.fixture()
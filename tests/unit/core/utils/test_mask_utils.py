@@ -1,6 +1,7 @@
 import numpy as np
 import torch
-from otx.core.utils.mask_util import encode_rle
+from datumaro import Polygon
+from otx.core.utils.mask_util import encode_rle, encode_rles, polygon_to_bitmap, polygon_to_rle
 from pycocotools import mask as mask_utils
 
 
@@ -18,3 +19,37 @@ def test_encode_rle(num_test_cases=30):
         np_rle = mask_utils.encode(np.asfortranarray(mask.numpy()))
         assert torch_rle["counts"] == np_rle["counts"], f"Expected {np_rle['counts']} but got {torch_rle['counts']}"
         assert torch_rle["size"] == np_rle["size"], f"Expected {np_rle['size']} but got {torch_rle['size']}"
+
+
+def test_encode_rles():
+    masks = torch.randint(low=0, high=2, size=(5, 37, 23)).bool()
+    rles = encode_rles(masks)
+    assert len(rles) == 5
+    for mask, rle in zip(masks, rles):
+        torch_rle = encode_rle(mask)
+        torch_rle = mask_utils.frPyObjects(torch_rle, *torch_rle["size"])
+        assert rle["counts"] == torch_rle["counts"]
+        assert rle["size"] == torch_rle["size"]
+
+    assert encode_rles(torch.zeros((0, 37, 23), dtype=torch.bool)) == []
+
+
+def test_polygon_to_bitmap():
+    polygons = [
+        Polygon([1, 1, 10, 1, 10, 8, 1, 8]),
+        Polygon([2, 3, 9, 4, 5, 11]),
+        Polygon([0, 0, 5, 0, 0, 5]),
+    ]
+    bitmaps = polygon_to_bitmap(polygons, 12, 15)
+    assert bitmaps.shape == (3, 12, 15)
+    assert bitmaps.dtype == bool
+    assert bitmaps.flags.c_contiguous
+    for polygon, bitmap in zip(polygons, bitmaps):
+        expected = mask_utils.decode(mask_utils.frPyObjects([polygon.points], 12, 15))[:, :, 0]
+        assert np.array_equal(bitmap, expected.astype(bool))
+
+    rles = polygon_to_rle(polygons, 12, 15)
+    assert [rle["counts"] for rle in rles] == [
+        rle["counts"] for rle in mask_utils.encode(bitmaps.transpose(1, 2, 0).copy(order="F").astype(np.uint8))
+    ]
+    assert polygon_to_bitmap([], 12, 15).shape == (0, 12, 15)
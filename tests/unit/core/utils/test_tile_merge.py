@@ -0,0 +1,127 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+from __future__ import annotations
+
+import torch
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetBatchPredEntity
+from otx.core.data.entity.instance_segmentation import InstanceSegBatchPredEntity
+from otx.core.utils.tile_merge import DetectionTileMerge, InstanceSegTileMerge
+from torchvision import tv_tensors
+
+TILE_SIZE = 10
+# The left and right tiles of two 10 x 15 images
+TILE_ATTRS = [{"tile_id": img_id, "roi": (x, 0, TILE_SIZE, TILE_SIZE)} for img_id in ("img0", "img1") for x in (0, 5)]
+# The same box of the original image on both tiles and another box with the other label on the right tile
+TILE_BBOXES = [[[6, 1, 9, 4]], [[1, 1, 4, 4], [1, 1, 4, 4]]] * 2
+TILE_LABELS = [[0], [0, 1]] * 2
+TILE_SCORES = [[0.9], [0.8, 0.7]] * 2
+
+
+def _get_img_infos() -> list[ImageInfo]:
+    return [ImageInfo(img_idx=i, img_shape=(10, 15), ori_shape=(10, 15)) for i in range(2)]
+
+
+def _get_tile_preds(instance_segmentation: bool = False) -> list[DetBatchPredEntity | InstanceSegBatchPredEntity]:
+    kwargs_list = [
+        {
+            "bboxes": [
+                tv_tensors.BoundingBoxes(bboxes, format="xyxy", canvas_size=(TILE_SIZE, TILE_SIZE))
+                for bboxes in TILE_BBOXES[i : i + 2]
+            ],
+            "labels": [torch.LongTensor(labels) for labels in TILE_LABELS[i : i + 2]],
+            "scores": [torch.tensor(scores) for scores in TILE_SCORES[i : i + 2]],
+            "imgs_info": [
+                ImageInfo(img_idx=j, img_shape=(TILE_SIZE, TILE_SIZE), ori_shape=(TILE_SIZE, TILE_SIZE))
+                for j in range(i, i + 2)
+            ],
+        }
+        for i in (0, 2)
+    ]
+    if not instance_segmentation:
+        return [DetBatchPredEntity(batch_size=2, images=[], **kwargs) for kwargs in kwargs_list]
+
+    preds = []
+    for kwargs in kwargs_list:
+        masks = []
+        for bboxes in kwargs["bboxes"]:
+            mask = torch.zeros((len(bboxes), TILE_SIZE, TILE_SIZE), dtype=torch.bool)
+            for mask_i, (x1, y1, x2, y2) in zip(mask, bboxes.int().tolist()):
+                mask_i[y1:y2, x1:x2] = True
+            masks.append(tv_tensors.Mask(mask))
+        preds.append(InstanceSegBatchPredEntity(batch_size=2, images=[], masks=masks, polygons=[], **kwargs))
+    return preds
+
+
+def test_detection_tile_merge() -> None:
+    merger = DetectionTileMerge(_get_img_infos(), iou_threshold=0.45, max_num_instances=500)
+    entities = merger.merge(_get_tile_preds(), [TILE_ATTRS[:2], TILE_ATTRS[2:]])
+
+    assert len(entities) == 2
+    for entity in entities:
+        assert entity.bboxes.canvas_size == (10, 15)
+        # The duplicated box on the right tile is suppressed only for the same label in the same image
+        assert entity.bboxes.tolist() == [[6, 1, 9, 4], [6, 1, 9, 4]]
+        assert entity.labels.tolist() == [0, 1]
+        assert torch.allclose(entity.score, torch.tensor([0.9, 0.7]))
+
+    merger = DetectionTileMerge(_get_img_infos(), iou_threshold=0.45, max_num_instances=1)
+    entities = merger.merge(_get_tile_preds(), [TILE_ATTRS[:2], TILE_ATTRS[2:]])
+    assert [len(entity.bboxes) for entity in entities] == [1, 1]
+
+
+def test_instance_seg_tile_merge() -> None:
+    merger = InstanceSegTileMerge(_get_img_infos(), iou_threshold=0.45, max_num_instances=500)
+    entities = merger.merge(_get_tile_preds(instance_segmentation=True), [TILE_ATTRS[:2], TILE_ATTRS[2:]])
+
+    assert len(entities) == 2
+    expected_mask = torch.zeros((10, 15), dtype=torch.bool)
+    expected_mask[1:4, 6:9] = True
+    for entity in entities:
+        assert entity.labels.tolist() == [0, 1]
+        assert entity.masks.shape == (2, 10, 15)
+        assert entity.masks.dtype == torch.bool
+        assert all(torch.equal(mask, expected_mask) for mask in entity.masks)
+
+
+def test_tile_merge_with_tile_img_indices() -> None:
+    # The first image has no tile and the tiles are split into micro-batches of a single tile
+    img_infos = [ImageInfo(img_idx=2, img_shape=(10, 15), ori_shape=(10, 15)), *_get_img_infos()]
+    tile_preds = [pred for preds in _get_tile_preds() for pred in _split_tile_preds(preds)]
+    tile_attrs = [[tile_attr] for tile_attr in TILE_ATTRS]
+
+    merger = DetectionTileMerge(img_infos, iou_threshold=0.45, max_num_instances=500)
+    entities = merger.merge(tile_preds, tile_attrs, tile_img_indices=[1, 1, 2, 2])
+
+    assert [entity.img_info.img_idx for entity in entities] == [2, 0, 1]
+    assert len(entities[0].bboxes) == 0
+    expected = DetectionTileMerge(_get_img_infos()).merge(_get_tile_preds(), [TILE_ATTRS[:2], TILE_ATTRS[2:]])
+    for entity, expected_entity in zip(entities[1:], expected):
+        assert torch.equal(entity.bboxes, expected_entity.bboxes)
+        assert torch.equal(entity.labels, expected_entity.labels)
+
+    merger = InstanceSegTileMerge(img_infos, iou_threshold=0.45, max_num_instances=500)
+    entities = merger.merge(
+        [pred for preds in _get_tile_preds(instance_segmentation=True) for pred in _split_tile_preds(preds)],
+        tile_attrs,
+        tile_img_indices=[1, 1, 2, 2],
+    )
+    assert [len(entity.masks) for entity in entities] == [0, 2, 2]
+    assert entities[0].masks.shape == (0, 10, 15)
+
+
+def _split_tile_preds(preds: DetBatchPredEntity | InstanceSegBatchPredEntity) -> list:
+    fields = ["imgs_info", "bboxes", "labels", "scores"]
+    if isinstance(preds, InstanceSegBatchPredEntity):
+        fields.append("masks")
+    return [
+        preds.__class__(
+            batch_size=1,
+            images=[],
+            **{field: getattr(preds, field)[i : i + 1] for field in fields},
+            **({"polygons": []} if isinstance(preds, InstanceSegBatchPredEntity) else {}),
+        )
+        for i in range(preds.batch_size)
+    ]